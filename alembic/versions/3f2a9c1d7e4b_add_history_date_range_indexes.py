@@ -0,0 +1,51 @@
+"""Add composite index for per-user date range queries
+
+Revision ID: 3f2a9c1d7e4b
+Revises: b71cd69b97c0
+Create Date: 2025-12-01 10:00:00.000000
+
+UserFoodHistory(user_id, consumed_at): 사용자별 `consumed_at >= start AND consumed_at < end`
+
+ERDCloud 테이블은 직접 SQL로 만들었으므로 같은 선두 컬럼의 인덱스가 이미 있으면
+(예: add_meal_type_to_user_food_history.sql의 idx_user_consumed_meal) 건너뛴다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e4b'
+down_revision = 'b71cd69b97c0'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("idx_user_consumed_at", "UserFoodHistory", ["user_id", "consumed_at"]),
+]
+
+
+def _has_covering_index(table: str, columns: list) -> bool:
+    """columns로 시작하는 인덱스(또는 PK)가 이미 있는지"""
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return True  # 테이블이 없으면 건너뜀
+    candidates = [index["column_names"] for index in inspector.get_indexes(table)]
+    candidates.append(inspector.get_pk_constraint(table).get("constrained_columns") or [])
+    return any(existing[: len(columns)] == columns for existing in candidates)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if _has_covering_index(table, columns):
+            print(f"skip {name}: {table}{tuple(columns)} 인덱스가 이미 있습니다.")
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in INDEXES:
+        if table in inspector.get_table_names() and any(
+            index["name"] == name for index in inspector.get_indexes(table)
+        ):
+            op.drop_index(name, table_name=table)
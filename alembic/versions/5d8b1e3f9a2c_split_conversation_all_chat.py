@@ -0,0 +1,206 @@
+"""Split UserConversation.all_chat into ChatHistory rows
+
+Revision ID: 5d8b1e3f9a2c
+Revises: 3f2a9c1d7e4b
+Create Date: 2025-12-08 10:00:00.000000
+
+대화 원문을 UserConversation.all_chat TEXT에 이어 붙이던 방식을 ChatHistory append-only로 바꾼다.
+
+1. ChatHistory(session_id, created_at) 인덱스 추가
+2. all_chat을 턴 단위 메시지로 분리해 ChatHistory에 없는 앞부분을 채운다
+   - ChatHistory 도입 전 대화: ChatHistory 행이 없으므로 전체를 추가
+   - 도입 전에 시작해 이후에도 이어진 대화: 뒤쪽 턴만 ChatHistory에 있으므로
+     all_chat 메시지 수와 ChatHistory 행 수의 차이만큼 앞쪽 메시지를 추가
+   - 도입 후 대화: ChatHistory가 all_chat과 같으므로 추가하지 않음
+3. all_chat 컬럼 삭제
+
+all_chat 파싱/포맷은 이후 앱 코드가 바뀌어도 마이그레이션 결과가 달라지지 않도록 이 파일에 둔다.
+"""
+import re
+from datetime import timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8b1e3f9a2c'
+down_revision = '3f2a9c1d7e4b'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "idx_chat_session_created"
+BATCH_SIZE = 500
+
+conversations = sa.table(
+    "UserConversation",
+    sa.column("session_id", sa.String),
+    sa.column("user_id", sa.BigInteger),
+    sa.column("all_chat", sa.Text),
+    sa.column("created_at", sa.DateTime),
+)
+chat_history = sa.table(
+    "ChatHistory",
+    sa.column("id", sa.BigInteger),
+    sa.column("user_id", sa.BigInteger),
+    sa.column("session_id", sa.String),
+    sa.column("message_type", sa.String),
+    sa.column("content", sa.Text),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+# all_chat 한 턴: "Human: {질문}\nAI: {응답}\n\n" (내용에 줄바꿈이 있을 수 있다)
+_ALL_CHAT_TURN = re.compile(r"Human: (.*?)\nAI: (.*?)\n\n(?=Human: |\Z)", re.DOTALL)
+_LAST_TURN = re.compile(r"Human: (.*?)\nAI: (.*)", re.DOTALL)
+_SPEAKER_LABELS = {"human": "Human", "ai": "AI"}
+
+
+def split_all_chat(all_chat: Optional[str]) -> List[Tuple[str, str]]:
+    """all_chat 텍스트 → [(message_type, content), ...] (형식이 깨진 꼬리는 마지막 AI 메시지로)"""
+    if not all_chat:
+        return []
+    messages: List[Tuple[str, str]] = []
+    position = 0
+    for match in _ALL_CHAT_TURN.finditer(all_chat):
+        if match.start() != position:
+            break
+        messages.append(("human", match.group(1)))
+        messages.append(("ai", match.group(2)))
+        position = match.end()
+
+    rest = all_chat[position:].strip()
+    last_turn = _LAST_TURN.fullmatch(rest)
+    if last_turn:
+        messages.append(("human", last_turn.group(1)))
+        messages.append(("ai", last_turn.group(2)))
+    elif rest:
+        if messages:
+            messages[-1] = ("ai", f"{messages[-1][1]}\n\n{rest}")
+        else:
+            messages.append(("ai", rest))
+    return messages
+
+
+def format_transcript(messages: Sequence) -> str:
+    """(message_type, content) 행 → all_chat 텍스트 (downgrade용)"""
+    lines = []
+    for message in messages:
+        lines.append(f"{_SPEAKER_LABELS.get(message.message_type, message.message_type)}: {message.content}\n")
+        if message.message_type == "ai":
+            lines.append("\n")
+    return "".join(lines)
+
+
+def _has_index(inspector, table: str, columns: list) -> bool:
+    return any(index["column_names"][: len(columns)] == columns for index in inspector.get_indexes(table))
+
+
+def _split_all_chat(bind) -> None:
+    last_session_id = ""
+    migrated = 0
+    while True:
+        rows = bind.execute(
+            sa.select(conversations)
+            .where(
+                conversations.c.session_id > last_session_id,
+                conversations.c.all_chat.is_not(None),
+                conversations.c.all_chat != "",
+            )
+            .order_by(conversations.c.session_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        # 세션별 기존 ChatHistory 행 수 / 가장 이른 시각
+        existing = {
+            session_id: (count, earliest)
+            for session_id, count, earliest in bind.execute(
+                sa.select(
+                    chat_history.c.session_id,
+                    sa.func.count(),
+                    sa.func.min(chat_history.c.created_at),
+                )
+                .where(chat_history.c.session_id.in_([row.session_id for row in rows]))
+                .group_by(chat_history.c.session_id)
+            ).all()
+        }
+
+        values = []
+        for row in rows:
+            messages = split_all_chat(row.all_chat)
+            count, earliest = existing.get(row.session_id, (0, None))
+            missing = messages[: max(len(messages) - count, 0)]
+            if not missing:
+                continue
+            # 원래 시각은 알 수 없으므로 세션 생성 시각. 기존 행보다 앞에 정렬되도록
+            # (created_at, id 순) 가장 이른 기존 행보다 1초 앞으로 맞춘다.
+            created_at = row.created_at
+            if earliest is not None and (created_at is None or created_at >= earliest):
+                created_at = earliest - timedelta(seconds=1)
+            values.extend(
+                {
+                    "user_id": row.user_id,
+                    "session_id": row.session_id,
+                    "message_type": message_type,
+                    "content": content,
+                    "created_at": created_at,
+                }
+                for message_type, content in missing
+            )
+            migrated += 1
+        if values:
+            bind.execute(chat_history.insert(), values)
+        last_session_id = rows[-1].session_id
+    print(f"all_chat → ChatHistory: {migrated}개 세션 복원")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if "ChatHistory" in tables and not _has_index(inspector, "ChatHistory", ["session_id", "created_at"]):
+        op.create_index(INDEX_NAME, "ChatHistory", ["session_id", "created_at"], unique=False)
+
+    if "UserConversation" not in tables or "ChatHistory" not in tables:
+        return
+    if "all_chat" not in {column["name"] for column in inspector.get_columns("UserConversation")}:
+        return
+
+    _split_all_chat(bind)
+    op.drop_column("UserConversation", "all_chat")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if "UserConversation" in tables and "all_chat" not in {
+        column["name"] for column in inspector.get_columns("UserConversation")
+    }:
+        op.add_column(
+            "UserConversation",
+            sa.Column("all_chat", sa.Text(), nullable=True, comment="전체 원본 대화 저장"),
+        )
+        # ChatHistory에서 all_chat 텍스트를 다시 만든다
+        session_ids = bind.execute(sa.select(conversations.c.session_id)).scalars().all()
+        for session_id in session_ids:
+            messages = bind.execute(
+                sa.select(chat_history.c.message_type, chat_history.c.content)
+                .where(chat_history.c.session_id == session_id)
+                .order_by(chat_history.c.created_at, chat_history.c.id)
+            ).all()
+            bind.execute(
+                conversations.update()
+                .where(conversations.c.session_id == session_id)
+                .values(all_chat=format_transcript(messages))
+            )
+
+    if "ChatHistory" in tables and any(
+        index["name"] == INDEX_NAME for index in inspector.get_indexes("ChatHistory")
+    ):
+        op.drop_index(INDEX_NAME, table_name="ChatHistory")
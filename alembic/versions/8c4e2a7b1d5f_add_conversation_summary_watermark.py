@@ -0,0 +1,52 @@
+"""Add incremental summary watermark and token counters to UserConversation
+
+Revision ID: 8c4e2a7b1d5f
+Revises: 5d8b1e3f9a2c
+Create Date: 2025-12-09 10:00:00.000000
+
+- last_summarized_message_id: sum_chat이 포함하는 마지막 ChatHistory.id.
+  기존 세션은 NULL로 두고 다음 요약 때 last_message_summarized_at 기준으로 한 번 이어 받는다.
+- transcript_tokens / summary_input_tokens: 요약된 원문과 요약 LLM 입력의 누적 토큰 어림값
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2a7b1d5f'
+down_revision = '5d8b1e3f9a2c'
+branch_labels = None
+depends_on = None
+
+def _columns() -> list:
+    return [
+        sa.Column('last_summarized_message_id', sa.BigInteger(), nullable=True,
+                  comment='sum_chat이 포함하는 마지막 ChatHistory.id (증분 요약 워터마크)'),
+        sa.Column('transcript_tokens', sa.Integer(), nullable=False, server_default='0',
+                  comment='요약된 대화 원문의 누적 토큰 어림값'),
+        sa.Column('summary_input_tokens', sa.Integer(), nullable=False, server_default='0',
+                  comment='요약 LLM에 보낸 입력의 누적 토큰 어림값'),
+    ]
+
+
+def _existing_columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if "UserConversation" not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns("UserConversation")}
+
+
+def upgrade() -> None:
+    existing = _existing_columns()
+    if not existing:
+        return
+    for column in _columns():
+        if column.name not in existing:
+            op.add_column("UserConversation", column)
+
+
+def downgrade() -> None:
+    existing = _existing_columns()
+    for column in reversed(_columns()):
+        if column.name in existing:
+            op.drop_column("UserConversation", column.name)
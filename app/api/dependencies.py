@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import User
 from app.db.session import get_session
-from app.services import auth_service
+from app.services.user_loader import UserLoader, get_user_snapshot_cache
 from app.utils.session import get_current_user_id, is_authenticated
 
 
@@ -29,18 +29,28 @@ async def require_authentication(request: Request) -> int:
     return user_id
 
 
+def get_user_loader(session: AsyncSession = Depends(get_session)) -> UserLoader:
+    """
+    요청 단위 사용자 로더 의존성
+    
+    FastAPI가 요청 안에서 의존성 결과를 재사용하므로 get_current_active_user와 라우트 본문이
+    같은 로더(같은 세션)를 공유한다. User/질환·알레르기 조회는 요청당 한 번만 실행된다.
+    """
+    return UserLoader(session, get_user_snapshot_cache())
+
+
 async def get_current_active_user(
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    loader: UserLoader = Depends(get_user_loader),
 ) -> User:
     """
     현재 활성화된 사용자 객체를 반환하는 의존성
     
     - 세션을 확인하여 인증된 사용자인지 검증
-    - DB에서 최신 사용자 정보를 조회하여 User 모델 객체로 반환
+    - 요청 단위 로더로 사용자 정보를 조회 (짧은 TTL 캐시, 프로필 수정 시 무효화)
     """
     user_id = await require_authentication(request)
-    user = await auth_service.get_user_by_id(session, user_id)
+    user = await loader.get_user(user_id)
     
     if not user:
         # 이 경우는 거의 발생하지 않아야 함 (세션이 있는데 DB에 유저가 없는 경우)
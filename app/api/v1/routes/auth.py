@@ -152,7 +152,7 @@ async def logout(request: Request) -> LogoutResponse:
     user_id = get_current_user_id(request)
     logout_user(request)
     if user_id:
-        invalidate_user_context(user_id)
+        await invalidate_user_context(user_id)
 
     return LogoutResponse(
         success=True,
@@ -4,10 +4,10 @@ import re
 import uuid
 from contextlib import suppress
 from datetime import datetime
-from functools import lru_cache
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from sqlalchemy import select
@@ -16,11 +16,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_current_active_user
 from app.api.v1.schemas.chat import ChatMessageRequest, ChatMessageResponse
 from app.core.config import get_settings
-from app.db.models import ChatHistory, Conversation, User
+from app.db.models import Conversation, User
 from app.db.redis_session import get_redis_client
-from app.db.session import get_session
+from app.db.session import SessionLocal, get_session
 from app.services.chat_service import ChatService
+from app.services.chat_stream import ChatEvents, stream_chat_events
+from app.services.chat_transcript import chat_turn_rows
+from app.workers.jobs import enqueue_chat_summary
 from app.services.langchain_agent import AgentContext, get_langchain_agent_factory
+from app.services.llm_gateway import get_llm_gateway
 from app.services.recipe_recommendation_service import get_recipe_recommendation_service
 from app.services.user_context_cache import get_or_build_user_context, refresh_user_context
 
@@ -31,16 +35,10 @@ router = APIRouter(prefix="/chat", tags=["Chat"])
 settings = get_settings()
 
 
-@lru_cache
 def get_clarify_llm() -> ChatOpenAI:
     if not settings.openai_api_key:
         raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not configured.")
-    return ChatOpenAI(
-        api_key=settings.openai_api_key,
-        model="gpt-4o-mini",
-        temperature=0.4,
-        model_kwargs={"response_format": {"type": "json_object"}},
-    )
+    return get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0.4, json_mode=True)
 
 
 CLARIFY_CONFIRMATION_MESSAGE = "레시피를 추천해드릴까요? 진행을 원하시면 '네' 또는 '응'이라고 답해주세요."
@@ -135,7 +133,7 @@ async def _generate_clarify_payload(summary: str, user_message: str) -> dict:
         user_message=user_message,
     )
     try:
-        response = await clarify_llm.ainvoke(messages)
+        response = await get_llm_gateway().ainvoke(clarify_llm, messages, call_site="chat.clarify")
         payload = json.loads(response.content)
     except Exception:
         payload = {}
@@ -176,25 +174,19 @@ async def prewarm_chat_agent(
 ) -> dict:
     """Recommend 탭 진입 직후 AI가 기본 정보를 읽어들이도록 워밍업."""
     cached_context = await get_or_build_user_context(db, current_user.user_id)
-    conversation = await db.get(Conversation, f"prewarm-{current_user.user_id}")
     agent_context = AgentContext(
         user=current_user,
-        session=db,
-        conversation_summary=conversation.sum_chat if conversation else None,
         diseases=cached_context.diseases,
         allergies=cached_context.allergies,
-        has_eaten_today=cached_context.has_eaten_today,
     )
-    agent_factory = get_langchain_agent_factory()
-    agent_executor = await agent_factory.create_executor(context=agent_context)
-    await agent_executor.ainvoke({"input": "사용자 정보를 준비하고 다음 질문을 받을 준비를 하세요."})
+    # 에이전트 그래프만 미리 만들어 캐시 (대화 요약/세션은 메시지마다 실행 시 넘긴다)
+    get_langchain_agent_factory().get_prepared_agent(agent_context)
     return {"success": True, "message": "에이전트 워밍업 완료"}
 
 
 @router.post("", response_model=ChatMessageResponse)
 async def handle_chat_message(
     request: ChatMessageRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_session),
     redis_client = Depends(get_redis_client),
@@ -204,6 +196,39 @@ async def handle_chat_message(
     - LangChain Agent 사용을 최소화하고, 명확한 레시피 요청 시 단축 경로(Shortcut)를 사용
     - 건강 유해성 체크 선행 (quick_analyze_intent)
     """
+    return await _process_chat_message(request, current_user, db, redis_client, ChatEvents())
+
+
+@router.post("/stream")
+async def stream_chat_message(
+    request: ChatMessageRequest,
+    current_user: User = Depends(get_current_active_user),
+    redis_client = Depends(get_redis_client),
+):
+    """
+    [v2] SSE 스트리밍 버전 (이벤트 종류는 app.services.chat_stream 참고)
+    - 건강 체크 결과와 레시피 추천 시작/종료를 생기는 즉시 보내고 마지막에 final 응답을 보낸다.
+    - 의존성 세션은 스트리밍 전에 닫히므로 처리 작업이 세션을 직접 연다.
+    """
+
+    async def run(events: ChatEvents) -> ChatMessageResponse:
+        async with SessionLocal() as db:
+            return await _process_chat_message(request, current_user, db, redis_client, events)
+
+    return StreamingResponse(
+        stream_chat_events(run),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _process_chat_message(
+    request: ChatMessageRequest,
+    current_user: User,
+    db: AsyncSession,
+    redis_client,
+    events: ChatEvents,
+) -> ChatMessageResponse:
     chat_service = ChatService(redis_client=redis_client, db_session=db)
 
     previous_session_id = await chat_service.get_previous_session_id_and_update(
@@ -211,9 +236,8 @@ async def handle_chat_message(
     )
 
     if previous_session_id and previous_session_id != request.session_id:
-        background_tasks.add_task(
-            chat_service.summarize_conversation_if_needed, previous_session_id
-        )
+        # 이전 세션은 끝난 대화이므로 남은 메시지를 모두 요약 (응답 후 워커에서)
+        await enqueue_chat_summary(previous_session_id, force=True)
 
     cached_context = await get_or_build_user_context(db, current_user.user_id)
     diseases = cached_context.diseases
@@ -299,6 +323,10 @@ async def handle_chat_message(
                 
                 disease_conflict = bool(quick_analysis.get("disease_conflict"))
                 allergy_conflict = bool(quick_analysis.get("allergy_conflict"))
+                await events.send(
+                    "health_check",
+                    {"disease_conflict": disease_conflict, "allergy_conflict": allergy_conflict},
+                )
                 
                 if disease_conflict or allergy_conflict:
                     # 위험 감지 -> 즉시 경고 리턴 (Agent 실행 X)
@@ -368,6 +396,7 @@ async def handle_chat_message(
                 
                 intent_metadata = {"safety_mode": safety_mode} if safety_mode else None
                 
+                await events.send("tool_start", {"tool": "recipe_recommendation"})
                 result = await recipe_service.get_recipe_recommendations(
                     user=current_user,
                     user_request=request.message,
@@ -381,6 +410,7 @@ async def handle_chat_message(
                     meal_type=None, # 자동 감지 맡김
                     safety_mode=safety_mode, # 명시적 전달
                 )
+                await events.send("tool_end", {"tool": "recipe_recommendation"})
                 
                 # 응답 포맷팅
                 response_payload = {
@@ -418,39 +448,20 @@ async def handle_chat_message(
         conversation = Conversation(
             session_id=request.session_id,
             user_id=current_user.user_id,
-            all_chat="",
             sum_chat=conversation_summary,
             last_message_summarized_at=datetime.utcnow(),
+            last_summarized_message_id=0,  # 새 세션: 모든 메시지가 요약 대상
         )
         db.add(conversation)
 
-    new_turn = f"Human: {request.message}\nAI: {display_text}\n\n"
-    conversation.all_chat = (conversation.all_chat or "") + new_turn
+    # 대화 원문은 ChatHistory에 추가만 한다 (UserConversation은 메타데이터만 갱신)
     conversation.last_message_timestamp = datetime.utcnow()
-
-    db.add_all(
-        [
-            ChatHistory(
-                user_id=current_user.user_id,
-                session_id=request.session_id,
-                message_type="human",
-                content=request.message,
-            ),
-            ChatHistory(
-                user_id=current_user.user_id,
-                session_id=request.session_id,
-                message_type="ai",
-                content=display_text,
-            ),
-        ]
-    )
+    db.add_all(chat_turn_rows(current_user.user_id, request.session_id, request.message, display_text))
 
     await db.commit()
 
-    if not redis_client:
-        background_tasks.add_task(
-            chat_service.summarize_conversation_if_needed, request.session_id
-        )
+    # 새 메시지가 임계값 이상 쌓였으면 워커가 증분 요약
+    await enqueue_chat_summary(request.session_id)
 
     return ChatMessageResponse(
         session_id=request.session_id,
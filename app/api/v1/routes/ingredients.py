@@ -1,12 +1,12 @@
 """식재료 관련 라우트"""
 from datetime import datetime
-from functools import lru_cache
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas.common import ApiResponse
@@ -16,26 +16,29 @@ from app.api.v1.schemas.ingredient import (
     IngredientResponse,
     RecommendationData,
 )
-from app.api.dependencies import require_authentication
+from app.api.dependencies import get_user_loader, require_authentication
 from app.core.config import get_settings
-from app.db.models import UserIngredient, User, DiseaseAllergyProfile
+from app.db.models import UserIngredient, User
 from app.db.session import get_session
 from app.services.roboflow_service import get_roboflow_service
 from app.services.gpt_vision_service import get_gpt_vision_service
+from app.services.llm_gateway import get_llm_gateway
+from app.services.user_loader import UserLoader
+from app.workers.jobs import enqueue_major_conversation
 
 router = APIRouter()
 settings = get_settings()
 
 
-@lru_cache
 def get_recommendation_llm() -> ChatOpenAI:
     if not settings.openai_api_key:
         raise ValueError("OPENAI_API_KEY 환경 변수가 필요합니다.")
-    return ChatOpenAI(
-        api_key=settings.openai_api_key,
-        model="gpt-4o-mini",
-        temperature=0.7,
-    )
+    return get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0.7)
+
+
+def _ingredient_key(name: str) -> str:
+    """DB 콜레이션(utf8mb4_unicode_ci)처럼 대소문자와 끝 공백을 무시한 식재료 이름 키"""
+    return name.rstrip().casefold()
 
 
 async def save_major_conversation(session: AsyncSession, user: User, raw_text: str) -> None:
@@ -45,10 +48,10 @@ async def save_major_conversation(session: AsyncSession, user: User, raw_text: s
     llm = get_recommendation_llm()
     try:
         summary_prompt = f"다음 내용을 400자 이내 한국어로 요약하세요:\n\n{raw_text}"
-        summary_response = await llm.ainvoke([
+        summary_response = await get_llm_gateway().ainvoke(llm, [
             SystemMessage(content="당신은 요약 도우미입니다."),
             HumanMessage(content=summary_prompt)
-        ])
+        ], call_site="ingredients.summary")
         summary = summary_response.content.strip()
     except Exception as exc:
         print(f"⚠️ 대화 요약 실패, 원문 일부 저장: {exc}")
@@ -67,7 +70,13 @@ async def save_ingredients(
     식재료 저장
     
     Roboflow로 분석한 식재료들을 데이터베이스에 저장합니다.
-    이미 같은 이름의 식재료가 있으면 수량을 누적합니다.
+    이미 같은 이름의 식재료가 있으면 재활용(사용됨 → 미사용)하거나 건너뜁니다.
+    
+    식재료 수와 관계없이 집합 단위로 처리합니다.
+    1. 제출된 이름의 기존 행을 한 번에 조회
+    2. 사용된 식재료를 UPDATE 한 번으로 재활용
+    3. 새 식재료를 multi-row INSERT ... ON DUPLICATE KEY UPDATE 한 번으로 추가
+       (unique (user_id, ingredient_name) 기준) 후 한 번에 다시 조회
     
     **Args:**
         request: 저장할 식재료 목록
@@ -77,38 +86,80 @@ async def save_ingredients(
         저장된 식재료 정보
     """
     try:
-        saved_ingredients = []
+        names = list(dict.fromkeys(item.name for item in request.ingredients))
         
-        for item in request.ingredients:
-            # 같은 사용자의 같은 이름 식재료 조회 (is_used 상관없이)
-            stmt = select(UserIngredient).where(
+        # 1. 같은 사용자의 같은 이름 식재료 일괄 조회 (is_used 상관없이, 최신 행 우선)
+        existing_result = await session.execute(
+            select(UserIngredient).where(
                 UserIngredient.user_id == user_id,
-                UserIngredient.ingredient_name == item.name
-            ).order_by(UserIngredient.created_at.desc()).limit(1)
-            
-            result = await session.execute(stmt)
-            existing_ingredient = result.scalar_one_or_none()
-            
-            if existing_ingredient:
-                # 이미 존재하면 재활용 (is_used = False로 복구)
-                if existing_ingredient.is_used:
-                    existing_ingredient.is_used = False
-                    print(f"  ♻️ {item.name}: 사용됨 → 재활용 (is_used = False)")
-                else:
-                    print(f"  ✅ {item.name}: 이미 보유 중 (스킵)")
-                saved_ingredient = existing_ingredient
+                UserIngredient.ingredient_name.in_(names)
+            ).order_by(UserIngredient.created_at, UserIngredient.ingredient_id)
+        )
+        ingredients_by_key = {
+            _ingredient_key(ingredient.ingredient_name): ingredient
+            for ingredient in existing_result.scalars().all()
+        }
+        
+        statuses = {}
+        new_names = []
+        for name in names:
+            key = _ingredient_key(name)
+            if key in statuses:
+                continue
+            existing_ingredient = ingredients_by_key.get(key)
+            if existing_ingredient is None:
+                statuses[key] = "added"
+                new_names.append(name)
+            elif existing_ingredient.is_used:
+                statuses[key] = "recycled"
             else:
-                # 새로 추가
-                new_ingredient = UserIngredient(
-                    user_id=user_id,
-                    ingredient_name=item.name,
-                    is_used=False
+                statuses[key] = "kept"
+        
+        # 2. 이미 존재하지만 사용된 식재료는 재활용 (is_used = False로 일괄 복구)
+        recycle_ids = [
+            ingredient.ingredient_id
+            for key, ingredient in ingredients_by_key.items()
+            if statuses.get(key) == "recycled"
+        ]
+        if recycle_ids:
+            await session.execute(
+                update(UserIngredient)
+                .where(UserIngredient.ingredient_id.in_(recycle_ids))
+                .values(is_used=False)
+                .execution_options(synchronize_session="evaluate")
+            )
+        
+        # 3. 새 식재료 일괄 추가 (동시 저장으로 이미 생긴 행은 재활용)
+        if new_names:
+            insert_stmt = mysql_insert(UserIngredient).values([
+                {"user_id": user_id, "ingredient_name": name, "is_used": False}
+                for name in new_names
+            ])
+            await session.execute(insert_stmt.on_duplicate_key_update(is_used=False))
+            
+            inserted_result = await session.execute(
+                select(UserIngredient).where(
+                    UserIngredient.user_id == user_id,
+                    UserIngredient.ingredient_name.in_(new_names)
                 )
-                session.add(new_ingredient)
-                await session.flush()  # ID 생성을 위해 flush
-                await session.refresh(new_ingredient)  # 모든 필드 다시 로드
-                saved_ingredient = new_ingredient
+            )
+            for ingredient in inserted_result.scalars().all():
+                ingredients_by_key[_ingredient_key(ingredient.ingredient_name)] = ingredient
+        
+        saved_ingredients = []
+        logged = set()
+        for item in request.ingredients:
+            key = _ingredient_key(item.name)
+            saved_ingredient = ingredients_by_key[key]
+            
+            status = statuses[key] if key not in logged else "kept"
+            logged.add(key)
+            if status == "added":
                 print(f"  ➕ {item.name}: 새로 추가")
+            elif status == "recycled":
+                print(f"  ♻️ {item.name}: 사용됨 → 재활용 (is_used = False)")
+            else:
+                print(f"  ✅ {item.name}: 이미 보유 중 (스킵)")
             
             saved_ingredients.append(IngredientResponse(
                 ingredient_id=saved_ingredient.ingredient_id,
@@ -245,7 +296,8 @@ async def get_my_ingredients(
 @router.get("/recommendations", response_model=ApiResponse[RecommendationData])
 async def get_food_recommendations(
     session: AsyncSession = Depends(get_session),
-    user_id: int = Depends(require_authentication)
+    user_id: int = Depends(require_authentication),
+    loader: UserLoader = Depends(get_user_loader)
 ) -> ApiResponse[RecommendationData]:
     """
     보유 재료 기반 음식 추천 (전략 패턴 적용)
@@ -260,22 +312,13 @@ async def get_food_recommendations(
     
     try:
         # 1. 사용자 정보 조회
-        user_stmt = select(User).where(User.user_id == user_id)
-        user_result = await session.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
+        user = await loader.get_user(user_id)
         
         if not user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
         
         # 2. 알러지/질병 조회
-        profile_stmt = select(DiseaseAllergyProfile).where(
-            DiseaseAllergyProfile.user_id == user_id
-        )
-        profile_result = await session.execute(profile_stmt)
-        profiles = profile_result.scalars().all()
-        
-        allergies = [p.allergy_name for p in profiles if p.allergy_name]
-        diseases = [p.disease_name for p in profiles if p.disease_name]
+        diseases, allergies = await loader.get_health_profile(user_id)
         
         # 3. 미사용 식재료 조회
         ingredient_stmt = select(UserIngredient).where(
@@ -334,9 +377,9 @@ async def get_food_recommendations(
                 SystemMessage(content="전문 영양사. JSON만 응답."),
                 HumanMessage(content=prompt)
             ]
-            response = await llm.ainvoke(messages)
+            response = await get_llm_gateway().ainvoke(llm, messages, call_site="ingredients.recommend")
             recommendation_text = response.content
-            await save_major_conversation(session, user, recommendation_text)
+            await enqueue_major_conversation(user.user_id, recommendation_text)
             
         except Exception as e:
             print(f"⚠️ LLM 실패, 폴백: {e}")
@@ -354,7 +397,7 @@ async def get_food_recommendations(
                 "steps": ["재료 준비", "볶기", "완성"]
             }]}
             recommendation_text = json.dumps(fallback, ensure_ascii=False)
-            await save_major_conversation(session, user, recommendation_text)
+            await enqueue_major_conversation(user.user_id, recommendation_text)
         
         # 메시지 (간소화)
         n = len(ingredients)
@@ -1,9 +1,13 @@
 """음식 기록 및 건강 점수 관리 API"""
+import csv
+import io
+import json
 from datetime import datetime, date, timedelta
-from functools import lru_cache
+from decimal import Decimal
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from sqlalchemy import select, func, and_
@@ -11,34 +15,49 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.api.v1.schemas.common import ApiResponse
-from app.api.dependencies import require_authentication
+from app.api.dependencies import get_user_loader, require_authentication
 from app.core.config import get_settings
-from app.db.models import UserFoodHistory, HealthScore, User, Food, UserIngredient
+from app.db.models import UserFoodHistory, HealthScore, Food, UserIngredient, DietPlan, DietPlanMeal
 from app.db.models_food_nutrients import FoodNutrient
 from app.db.models_user_contributed import UserContributedFood
-from app.db.session import get_session
+from app.db.session import SessionLocal, get_session
+from app.services.food_history_service import (
+    bulk_create_food_history,
+    count_food_history_capped,
+    food_history_page_query,
+    stream_food_history,
+)
+from app.services.food_nutrients_service import get_foods_by_ids
 from app.services.health_score_service import (
     create_health_score,
-    calculate_korean_nutrition_score,
+    create_health_scores,
+    calculate_korean_nutrition_scores,
     calculate_nrf93_score,
     get_user_health_scores,
     calculate_daily_comprehensive_score
 )
 from app.services.user_service import calculate_daily_calories
+from app.services.daily_nutrition_service import (
+    apply_meal_to_daily_nutrition,
+    apply_meals_to_daily_nutrition,
+    get_daily_nutrition_rows,
+    get_top_foods,
+    summarize_by_date,
+)
+from app.services.llm_gateway import get_llm_gateway
+from app.services.user_context_cache import invalidate_user_context
+from app.services.user_loader import UserLoader
+from app.utils.date_window import local_today
+from app.utils.history_cursor import HistoryCursor, InvalidCursorError
 
 router = APIRouter()
 settings = get_settings()
 
 
-@lru_cache
 def get_nutrition_llm() -> ChatOpenAI:
     if not settings.openai_api_key:
         raise ValueError("OPENAI_API_KEY 환경 변수가 필요합니다.")
-    return ChatOpenAI(
-        api_key=settings.openai_api_key,
-        model="gpt-4o-mini",
-        temperature=0.3,
-    )
+    return get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0)
 
 
 # ========== Request/Response 스키마 ==========
@@ -94,6 +113,13 @@ class MealRecordResponse(BaseModel):
     meal_type: Optional[str] = None  # 식사 유형 추가
 
 
+class MealHistoryResponse(ApiResponse[List[MealRecordResponse]]):
+    """음식 기록 페이지 응답 (data는 기록 목록)"""
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+    total_count: Optional[int] = None  # include_count=true일 때만 채움
+    total_count_capped: bool = False  # True면 total_count 이상 (근사 개수 상한 도달)
+
+
 class DashboardStatsResponse(BaseModel):
     """대시보드 통계 응답"""
     total_calories_today: int = Field(..., description="오늘 총 칼로리")
@@ -146,9 +172,11 @@ async def save_meal_records(
     """
     음식 기록 저장 + 건강 점수 자동 계산
     
-    1. UserFoodHistory에 음식 기록 저장
-    2. FoodNutrient에서 영양소 정보 조회
-    3. HealthScore 자동 계산 및 저장
+    음식 수와 관계없이 몇 개의 쿼리로 처리한다.
+    1. FoodNutrient에서 모든 음식의 영양소 정보를 IN 쿼리 한 번으로 조회
+    2. 건강 점수 배치 계산
+    3. UserFoodHistory / HealthScore multi-row INSERT
+    4. 일별 영양 집계 반영 (한 번에)
     
     **Args:**
         request: 음식 기록 정보
@@ -158,63 +186,69 @@ async def save_meal_records(
         저장된 음식 기록 + 건강 점수
     """
     try:
-        saved_records = []
+        # 1. FoodNutrient에서 영양소 정보 일괄 조회
+        nutrients = await get_foods_by_ids(session, (food_item.food_id for food_item in request.foods))
         
-        for food_item in request.foods:
-            # 1. UserFoodHistory 저장
-            history = UserFoodHistory(
+        # 2. UserFoodHistory 일괄 저장 (DATETIME 컬럼과 같도록 초 단위로 맞춤)
+        consumed_at = datetime.now().replace(microsecond=0)
+        histories = await bulk_create_food_history(session, [
+            UserFoodHistory(
                 user_id=user_id,
                 food_id=food_item.food_id,
                 food_name=food_item.food_name,
-                consumed_at=datetime.now(),
+                consumed_at=consumed_at,
                 portion_size_g=food_item.portion_size_g
                 # memo=request.memo  # 임시로 제거 (DB에 memo 컬럼 없음)
             )
-            session.add(history)
-            await session.flush()  # history_id 생성
-            await session.refresh(history)
-            
-            # 2. FoodNutrient에서 영양소 정보 조회
-            nutrient_stmt = select(FoodNutrient).where(
-                FoodNutrient.food_id == food_item.food_id
+            for food_item in request.foods
+        ])
+        
+        # 3. 영양소 정보가 있는 음식만 한국식 영양 점수 배치 계산
+        scored = [
+            (index, nutrients[food_item.food_id])
+            for index, food_item in enumerate(request.foods)
+            if food_item.food_id in nutrients
+        ]
+        score_results = calculate_korean_nutrition_scores([
+            {
+                "protein": nutrient.protein,
+                "fiber": nutrient.fiber,
+                "calcium": nutrient.calcium,
+                "iron": nutrient.iron,
+                "sodium": nutrient.sodium,
+                "sugar": nutrient.added_sugar,
+                "saturated_fat": nutrient.saturated_fat,
+            }
+            for _, nutrient in scored
+        ])
+        
+        # 4. HealthScore 일괄 저장
+        health_scores = {}
+        for (index, nutrient), score_result in zip(scored, score_results):
+            food_item = request.foods[index]
+            health_scores[index] = HealthScore(
+                history_id=histories[index].history_id,
+                user_id=user_id,
+                food_id=food_item.food_id,
+                reference_value=int(nutrient.reference_value) if nutrient.reference_value else None,
+                kcal=food_item.calories,
+                positive_score=score_result["positive_score"],
+                negative_score=score_result["negative_score"],
+                final_score=score_result["final_score"],
+                food_grade=score_result["food_grade"],
+                calc_method=score_result["calc_method"]
             )
-            nutrient_result = await session.execute(nutrient_stmt)
-            nutrient = nutrient_result.scalar_one_or_none()
-            
-            # 3. 건강 점수 계산
-            health_score_data = None
-            if nutrient:
-                # 한국식 영양 점수 계산
-                score_result = await calculate_korean_nutrition_score(
-                    protein=nutrient.protein or 0,
-                    fiber=nutrient.fiber or 0,
-                    calcium=nutrient.calcium or 0,
-                    iron=nutrient.iron or 0,
-                    sodium=nutrient.sodium or 0,
-                    sugar=nutrient.added_sugar or 0,
-                    saturated_fat=nutrient.saturated_fat or 0
-                )
-                
-                # 4. HealthScore 저장
-                health_score_obj = await create_health_score(
-                    session=session,
-                    history_id=history.history_id,
-                    user_id=user_id,
-                    food_id=food_item.food_id,
-                    reference_value=int(nutrient.reference_value) if nutrient.reference_value else None,
-                    kcal=food_item.calories,
-                    positive_score=score_result["positive_score"],
-                    negative_score=score_result["negative_score"],
-                    final_score=score_result["final_score"],
-                    food_grade=score_result["food_grade"],
-                    calc_method=score_result["calc_method"]
-                )
-                
-                health_score_data = {
-                    "final_score": health_score_obj.final_score,
-                    "food_grade": health_score_obj.food_grade
-                }
-            
+        await create_health_scores(session, list(health_scores.values()))
+        
+        # 5. 일별 영양 집계 반영
+        await apply_meals_to_daily_nutrition(session, [
+            (history, health_scores.get(index), nutrients.get(history.food_id))
+            for index, history in enumerate(histories)
+        ])
+        
+        saved_records = []
+        for index, (food_item, history) in enumerate(zip(request.foods, histories)):
+            health_score_obj = health_scores.get(index)
             saved_records.append(MealRecordResponse(
                 history_id=history.history_id,
                 user_id=history.user_id,
@@ -223,11 +257,12 @@ async def save_meal_records(
                 consumed_at=history.consumed_at,
                 portion_size_g=history.portion_size_g,
                 calories=food_item.calories,
-                health_score=health_score_data["final_score"] if health_score_data else None,
-                food_grade=health_score_data["food_grade"] if health_score_data else None
+                health_score=health_score_obj.final_score if health_score_obj else None,
+                food_grade=health_score_obj.food_grade if health_score_obj else None
             ))
         
         await session.commit()
+        await invalidate_user_context(user_id)  # has_eaten_today 갱신
         
         return ApiResponse(
             success=True,
@@ -246,7 +281,8 @@ async def save_meal_records(
 @router.get("/dashboard-stats", response_model=ApiResponse[DashboardStatsResponse])
 async def get_dashboard_stats(
     session: AsyncSession = Depends(get_session),
-    user_id: int = Depends(require_authentication)
+    user_id: int = Depends(require_authentication),
+    loader: UserLoader = Depends(get_user_loader)
 ) -> ApiResponse[DashboardStatsResponse]:
     """
     대시보드 통계 조회
@@ -264,40 +300,28 @@ async def get_dashboard_stats(
         대시보드 통계 데이터
     """
     try:
-        today = datetime.now().date()
+        today = local_today()
         
         # 0. 사용자 정보 조회 및 목표 칼로리 계산
-        user_stmt = select(User).where(User.user_id == user_id)
-        user_result = await session.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
+        user = await loader.get_user(user_id)
         
         target_calories = calculate_daily_calories(user) if user else 2000
         
-        # 1. 오늘 총 칼로리
-        today_stmt = select(func.sum(HealthScore.kcal)).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == today
-            )
-        ).join(UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id)
+        # 일별 영양 집계(UserDailyNutrition)에서 최근 7일(오늘 포함)만 읽는다
+        seven_days_ago = today - timedelta(days=6)
+        daily_summaries = summarize_by_date(
+            await get_daily_nutrition_rows(session, user_id, seven_days_ago, today)
+        )
+        today_summary = daily_summaries.get(today)
         
-        today_result = await session.execute(today_stmt)
-        total_calories_today = today_result.scalar() or 0
+        # 1. 오늘 총 칼로리
+        total_calories_today = today_summary.kcal if today_summary else 0
         
         # 2. 이번 주 총 칼로리 (일요일 시작)
         # TODO: 주 시작일 계산 로직 추가
         
         # 3. 오늘 평균 건강 점수 (종합 점수로 개선)
-        today_avg_stmt = select(func.avg(HealthScore.final_score)).join(
-            UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id
-        ).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == today
-            )
-        )
-        today_avg_result = await session.execute(today_avg_stmt)
-        raw_avg_score = today_avg_result.scalar() or 0
+        raw_avg_score = (today_summary.avg_score if today_summary else None) or 0
         
         # ✨ 종합 점수 계산 (양 + 질) - HealthScoreService 활용
         comp_result = calculate_daily_comprehensive_score(
@@ -312,16 +336,8 @@ async def get_dashboard_stats(
         # 4. 전날 평균 건강 점수 (전날도 종합 점수로 계산해야 정확하지만, 일단 단순 평균 사용하거나 0 처리)
         # 개선점: 전날 데이터도 동일한 로직으로 계산하면 좋음
         yesterday = today - timedelta(days=1)
-        yesterday_avg_stmt = select(func.avg(HealthScore.final_score)).join(
-            UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id
-        ).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == yesterday
-            )
-        )
-        yesterday_avg_result = await session.execute(yesterday_avg_stmt)
-        previous_day_score = yesterday_avg_result.scalar()
+        yesterday_summary = daily_summaries.get(yesterday)
+        previous_day_score = yesterday_summary.avg_score if yesterday_summary else None
         
         # 전날 대비 점수 변화 계산
         score_change = None
@@ -329,83 +345,28 @@ async def get_dashboard_stats(
             score_change = round(avg_health_score - previous_day_score, 1)
         
         # 5. 자주 먹는 음식 Top 5
-        frequent_stmt = select(
-            UserFoodHistory.food_name,
-            func.count(UserFoodHistory.food_name).label('count')
-        ).where(
-            UserFoodHistory.user_id == user_id
-        ).group_by(
-            UserFoodHistory.food_name
-        ).order_by(
-            func.count(UserFoodHistory.food_name).desc()
-        ).limit(5)
-        
-        frequent_result = await session.execute(frequent_stmt)
         frequent_foods = [
-            {"food_name": row[0], "count": row[1]} 
-            for row in frequent_result.all()
+            {"food_name": food_name, "count": count}
+            for food_name, count in await get_top_foods(session, user_id, limit=5)
         ]
         
-        # 6. 최근 7일 일일 칼로리
-        seven_days_ago = today - timedelta(days=6)  # 오늘 포함 7일
-        
-        daily_stmt = select(
-            func.date(UserFoodHistory.consumed_at).label('date'),
-            func.sum(HealthScore.kcal).label('total_calories')
-        ).join(
-            HealthScore, 
-            UserFoodHistory.history_id == HealthScore.history_id
-        ).where(
-            and_(
-                UserFoodHistory.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) >= seven_days_ago,
-                func.date(UserFoodHistory.consumed_at) <= today
-            )
-        ).group_by(
-            func.date(UserFoodHistory.consumed_at)
-        ).order_by(
-            func.date(UserFoodHistory.consumed_at)
-        )
-        
-        daily_result = await session.execute(daily_stmt)
-        daily_data = {row[0]: int(row[1]) for row in daily_result.all()}
-        
-        # 7일치 데이터 채우기 (데이터 없는 날은 0)
+        # 6. 최근 7일 일일 칼로리 (데이터 없는 날은 0)
         daily_calories = []
         for i in range(7):
             date = seven_days_ago + timedelta(days=i)
-            calories = daily_data.get(date, 0)
+            summary = daily_summaries.get(date)
             daily_calories.append({
                 "date": date.strftime("%m/%d"),
-                "calories": calories
+                "calories": summary.kcal if summary else 0
             })
         
         # 7. 이번 주 총 칼로리 (지난 7일 합계)
         total_calories_week = sum(item["calories"] for item in daily_calories)
 
         # 8. 영양소 밸런스 (최근 7일)
-        portion_ratio = func.coalesce(
-            func.coalesce(UserFoodHistory.portion_size_g, 0)
-            / func.nullif(func.coalesce(FoodNutrient.reference_value, 0), 0),
-            0,
-        )
-        nutrition_stmt = (
-            select(
-                func.sum(func.coalesce(FoodNutrient.protein, 0) * portion_ratio),
-                func.sum(func.coalesce(FoodNutrient.carb, 0) * portion_ratio),
-                func.sum(func.coalesce(FoodNutrient.fat, 0) * portion_ratio),
-            )
-            .select_from(UserFoodHistory)
-            .join(FoodNutrient, UserFoodHistory.food_id == FoodNutrient.food_id)
-            .where(
-                and_(
-                    UserFoodHistory.user_id == user_id,
-                    func.date(UserFoodHistory.consumed_at) >= seven_days_ago,
-                )
-            )
-        )
-        nutrition_result = await session.execute(nutrition_stmt)
-        protein, carbs, fat = nutrition_result.one_or_none() or (0, 0, 0)
+        protein = sum(summary.nutrients["protein"] for summary in daily_summaries.values())
+        carbs = sum(summary.nutrients["carb"] for summary in daily_summaries.values())
+        fat = sum(summary.nutrients["fat"] for summary in daily_summaries.values())
         
         total_macros = (protein or 0) + (carbs or 0) + (fat or 0)
         nutrition_balance = {
@@ -437,40 +398,67 @@ async def get_dashboard_stats(
         raise HTTPException(status_code=500, detail=f"통계 조회 중 오류 발생: {str(e)}")
 
 
-@router.get("/history", response_model=ApiResponse[List[MealRecordResponse]])
+def _diet_plan_meal_page_query(user_id: int, cursor: Optional[HistoryCursor], limit: int):
+    """
+    추천 식단 끼니 keyset 페이지 쿼리 (limit+1개)
+    
+    기록 목록에서는 (plan.created_at, -meal_id)를 정렬 키로 쓰므로
+    UserFoodHistory와 같은 커서로 이어 읽는다.
+    """
+    stmt = select(DietPlanMeal, DietPlan).join(
+        DietPlan, DietPlanMeal.diet_plan_id == DietPlan.diet_plan_id
+    ).where(DietPlan.user_id == user_id)
+    if cursor is not None:
+        stmt = stmt.where(cursor.before(DietPlan.created_at, -DietPlanMeal.meal_id))
+    return stmt.order_by(DietPlan.created_at.desc(), DietPlanMeal.meal_id.asc()).limit(limit + 1)
+
+
+@router.get("/history", response_model=MealHistoryResponse)
 async def get_meal_history(
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    offset: int = Query(0, ge=0, deprecated=True),
     include_diet_plans: bool = True,
+    include_count: bool = False,
     session: AsyncSession = Depends(get_session),
     user_id: int = Depends(require_authentication)
-) -> ApiResponse[List[MealRecordResponse]]:
+) -> MealHistoryResponse:
     """
-    음식 섭취 기록 조회 (추천 식단 포함)
+    음식 섭취 기록 조회 (추천 식단 포함, keyset 페이지)
     
     **Args:**
         limit: 조회 개수
-        offset: 오프셋
+        cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+        offset: (deprecated) cursor 위치에서 건너뛸 개수 - next_cursor를 사용하세요
         include_diet_plans: 추천 식단 포함 여부 (기본 True)
+        include_count: 전체 개수(근사) 포함 여부 (기본 False)
         session: DB 세션
         
     **Returns:**
-        음식 기록 목록 (UserFoodHistory + DietPlanMeal 통합)
+        음식 기록 목록 (UserFoodHistory + DietPlanMeal 통합, 최신순) 및 다음 페이지 커서
     """
-    from app.db.models import DietPlan, DietPlanMeal
     try:
+        page_cursor = HistoryCursor.decode(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        fetch_limit = offset + limit
+        
         # UserFoodHistory + HealthScore 조인 조회
-        stmt = select(UserFoodHistory, HealthScore).where(
-            UserFoodHistory.user_id == user_id
-        ).outerjoin(
-            HealthScore,
-            and_(
-                HealthScore.history_id == UserFoodHistory.history_id,
-                HealthScore.user_id == UserFoodHistory.user_id
-            )
-        ).order_by(
-            UserFoodHistory.consumed_at.desc()
-        ).limit(limit).offset(offset)
+        stmt = food_history_page_query(
+            select(UserFoodHistory, HealthScore).where(
+                UserFoodHistory.user_id == user_id
+            ).outerjoin(
+                HealthScore,
+                and_(
+                    HealthScore.history_id == UserFoodHistory.history_id,
+                    HealthScore.user_id == UserFoodHistory.user_id
+                )
+            ),
+            page_cursor,
+            fetch_limit,
+        )
         
         result = await session.execute(stmt)
         rows = result.all()
@@ -490,13 +478,11 @@ async def get_meal_history(
                 meal_type=history.meal_type  # 식사 유형 추가
             ))
         
-        # ✅ 추천 식단(DietPlanMeal) 조회 및 통합
+        # ✅ 추천 식단(DietPlanMeal)도 같은 커서 위치부터 필요한 만큼만 조회해 통합
         if include_diet_plans:
-            diet_stmt = select(DietPlanMeal, DietPlan).where(
-                DietPlan.user_id == user_id
-            ).join(DietPlan, DietPlanMeal.diet_plan_id == DietPlan.diet_plan_id)
-            
-            diet_result = await session.execute(diet_stmt)
+            diet_result = await session.execute(
+                _diet_plan_meal_page_query(user_id, page_cursor, fetch_limit)
+            )
             diet_rows = diet_result.all()
             
             for meal, plan in diet_rows:
@@ -508,7 +494,7 @@ async def get_meal_history(
                     user_id=user_id,
                     food_id=f"diet_plan_{meal.diet_plan_id}",
                     food_name=food_name,
-                    consumed_at=plan.created_at or datetime.now(),
+                    consumed_at=plan.created_at,
                     portion_size_g=0,
                     calories=int(meal.calories) if meal.calories else 0,
                     health_score=None,
@@ -516,13 +502,34 @@ async def get_meal_history(
                     meal_type=meal.meal_type
                 ))
         
-        # 날짜 기준 정렬 (최신순)
-        records.sort(key=lambda x: x.consumed_at, reverse=True)
+        # (consumed_at, history_id) 기준 정렬 (최신순) 후 이번 페이지만 잘라냄
+        records.sort(key=lambda x: (x.consumed_at, x.history_id), reverse=True)
+        page = records[offset:fetch_limit]
+        next_cursor = (
+            HistoryCursor.of(page[-1]).encode() if page and len(records) > fetch_limit else None
+        )
         
-        return ApiResponse(
+        total_count = None
+        total_count_capped = False
+        if include_count:
+            total_count, total_count_capped = await count_food_history_capped(
+                session, user_id, settings.meal_history_count_cap
+            )
+            if include_diet_plans:
+                diet_count = await session.execute(
+                    select(func.count(DietPlanMeal.meal_id)).join(
+                        DietPlan, DietPlanMeal.diet_plan_id == DietPlan.diet_plan_id
+                    ).where(DietPlan.user_id == user_id)
+                )
+                total_count += diet_count.scalar() or 0
+        
+        return MealHistoryResponse(
             success=True,
-            data=records,
-            message=f"✅ {len(records)}개의 기록 조회 완료"
+            data=page,
+            message=f"✅ {len(page)}개의 기록 조회 완료",
+            next_cursor=next_cursor,
+            total_count=total_count,
+            total_count_capped=total_count_capped,
         )
         
     except Exception as e:
@@ -532,6 +539,81 @@ async def get_meal_history(
         raise HTTPException(status_code=500, detail=f"기록 조회 중 오류 발생: {str(e)}")
 
 
+# 내보내기 컬럼 (stream_food_history 행 필드 → 출력 이름)
+EXPORT_COLUMNS = {
+    "history_id": "history_id",
+    "consumed_at": "consumed_at",
+    "meal_type": "meal_type",
+    "food_id": "food_id",
+    "food_name": "food_name",
+    "portion_size_g": "portion_size_g",
+    "kcal": "calories",
+    "final_score": "health_score",
+    "food_grade": "food_grade",
+}
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_record(row) -> dict:
+    record = {}
+    for field, name in EXPORT_COLUMNS.items():
+        value = getattr(row, field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = float(value)
+        record[name] = value
+    return record
+
+
+def encode_export_chunk(rows, export_format: str) -> str:
+    """기록 청크 → NDJSON 줄들 / CSV 줄들 (헤더 제외)"""
+    records = [_export_record(row) for row in rows]
+    if export_format == "ndjson":
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(EXPORT_COLUMNS.values()), lineterminator="\n")
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+async def _iter_history_export(user_id: int, export_format: str):
+    # 응답을 보내는 동안 커서를 열어 두어야 하므로 요청 의존성 세션 대신 직접 세션을 연다
+    async with SessionLocal() as session:
+        if export_format == "csv":
+            # Excel에서 한글이 깨지지 않도록 BOM 추가
+            yield "\ufeff" + ",".join(EXPORT_COLUMNS.values()) + "\n"
+        async for rows in stream_food_history(
+            session, user_id, settings.meal_history_export_chunk_size
+        ):
+            yield encode_export_chunk(rows, export_format)
+
+
+@router.get("/history/export")
+async def export_meal_history(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    user_id: int = Depends(require_authentication)
+) -> StreamingResponse:
+    """
+    음식 섭취 기록 전체 내보내기 (NDJSON / CSV 스트리밍)
+    
+    서버 측 커서로 청크 단위로 읽어 바로 전송하므로 기록 수와 상관없이 메모리 사용량이 일정하다.
+    
+    **Args:**
+        format: ndjson (기본) 또는 csv
+    """
+    filename = f"meal_history_{user_id}_{local_today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        _iter_history_export(user_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/save-recommended", response_model=ApiResponse[MealRecordResponse])
 async def save_recommended_meal(
     request: SaveRecommendedMealRequest,
@@ -654,7 +736,7 @@ async def save_recommended_meal(
             ]
             
             import json
-            response = await llm.ainvoke(messages)
+            response = await get_llm_gateway().ainvoke(llm, messages, call_site="meals.nutrition_estimate", validate=json.loads)
             nutrition_data = json.loads(response.content)
             print(f"  ✅ 영양소 추론 완료: {nutrition_data['calories']}kcal")
             
@@ -846,7 +928,9 @@ async def save_recommended_meal(
         )
         print(f"  ✅ HealthScore 저장 완료")
         
+        await apply_meal_to_daily_nutrition(session, history, health_score_obj)
         await session.commit()
+        await invalidate_user_context(user_id)  # has_eaten_today 갱신
         
         # ========== 응답 생성 ==========
         response_data = MealRecordResponse(
@@ -883,7 +967,8 @@ async def save_recommended_meal(
 @router.get("/score-detail", response_model=ApiResponse[ScoreDetailResponse])
 async def get_score_detail(
     session: AsyncSession = Depends(get_session),
-    user_id: int = Depends(require_authentication)
+    user_id: int = Depends(require_authentication),
+    loader: UserLoader = Depends(get_user_loader)
 ) -> ApiResponse[ScoreDetailResponse]:
     """
     상세 점수 현황 조회
@@ -900,65 +985,31 @@ async def get_score_detail(
         상세 점수 현황 데이터
     """
     try:
-        today = datetime.now().date()
+        today = local_today()
         yesterday = today - timedelta(days=1)
         
-        # 1. 오늘 전체 평균 점수
-        today_score_stmt = select(func.avg(HealthScore.final_score)).join(
-            UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id
-        ).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == today
-            )
+        # 일별 영양 집계(UserDailyNutrition)에서 최근 7일(오늘 포함)만 읽는다
+        seven_days_ago = today - timedelta(days=6)
+        daily_summaries = summarize_by_date(
+            await get_daily_nutrition_rows(session, user_id, seven_days_ago, today)
         )
-        today_score_result = await session.execute(today_score_stmt)
-        overall_score = today_score_result.scalar() or 0
+        today_summary = daily_summaries.get(today)
+        yesterday_summary = daily_summaries.get(yesterday)
+        
+        # 1. 오늘 전체 평균 점수
+        overall_score = (today_summary.avg_score if today_summary else None) or 0
         
         # 2. 전날 평균 점수
-        yesterday_score_stmt = select(func.avg(HealthScore.final_score)).join(
-            UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id
-        ).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == yesterday
-            )
-        )
-        yesterday_score_result = await session.execute(yesterday_score_stmt)
-        previous_score = yesterday_score_result.scalar()
+        previous_score = yesterday_summary.avg_score if yesterday_summary else None
         
         # score_change 계산은 종합 점수 산출 후로 이동
         score_change = None
         
-        # 3. 오늘 섭취한 음식들의 영양소 정보 조회
-        today_foods_stmt = select(
-            HealthScore.kcal,
-            HealthScore.final_score,
-            FoodNutrient.protein,
-            FoodNutrient.carb,
-            FoodNutrient.fat,
-            FoodNutrient.fiber,
-            FoodNutrient.sodium,
-            FoodNutrient.saturated_fat,
-            FoodNutrient.added_sugar
-        ).join(
-            UserFoodHistory, HealthScore.history_id == UserFoodHistory.history_id
-        ).outerjoin(
-            FoodNutrient, UserFoodHistory.food_id == FoodNutrient.food_id
-        ).where(
-            and_(
-                HealthScore.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) == today
-            )
-        )
-        
-        foods_result = await session.execute(today_foods_stmt)
-        foods_data = foods_result.all()
+        # 3. 오늘 섭취한 영양소 합계 (섭취량 기준)
+        today_nutrients = today_summary.nutrients if today_summary else {}
         
         # 4. 사용자 정보 조회 (목표 칼로리 등)
-        user_stmt = select(User).where(User.user_id == user_id)
-        user_result = await session.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
+        user = await loader.get_user(user_id)
         
         # 목표 칼로리 계산 (공통 함수 사용)
         target_calories = calculate_daily_calories(user) if user else 2000
@@ -971,9 +1022,9 @@ async def get_score_detail(
         quantity_score_val = 0.0
         calorie_ratio_val = 0.0
         
-        if foods_data:
+        if today_summary and today_summary.item_count > 0:
             # 총 칼로리
-            total_calories = sum(row[0] or 0 for row in foods_data)
+            total_calories = today_summary.kcal
             
             # ✨ 종합 점수 재계산 (양 + 질)
             comp_result = calculate_daily_comprehensive_score(
@@ -1025,9 +1076,9 @@ async def get_score_detail(
             ))
             
             # 영양소 균형 점수 (단백질, 탄수화물, 지방 비율)
-            total_protein = sum(row[2] or 0 for row in foods_data)
-            total_carbs = sum(row[3] or 0 for row in foods_data)
-            total_fat = sum(row[4] or 0 for row in foods_data)
+            total_protein = today_nutrients["protein"]
+            total_carbs = today_nutrients["carb"]
+            total_fat = today_nutrients["fat"]
             total_macros = total_protein + total_carbs + total_fat
             
             if total_macros > 0:
@@ -1062,7 +1113,7 @@ async def get_score_detail(
             ))
             
             # 식이섬유 점수
-            total_fiber = sum(row[5] or 0 for row in foods_data)
+            total_fiber = today_nutrients["fiber"]
             fiber_target = 25.0  # 일일 권장량
             fiber_score = min(100, (total_fiber / fiber_target) * 100) if fiber_target > 0 else 0
             
@@ -1081,7 +1132,7 @@ async def get_score_detail(
             ))
             
             # 나트륨 점수 (낮을수록 좋음)
-            total_sodium = sum(row[6] or 0 for row in foods_data)
+            total_sodium = today_nutrients["sodium"]
             sodium_target = 2000.0  # 일일 권장량
             sodium_ratio = (total_sodium / sodium_target) * 100 if sodium_target > 0 else 0
             sodium_score = max(0, 100 - sodium_ratio)  # 낮을수록 좋으므로 역산
@@ -1101,7 +1152,7 @@ async def get_score_detail(
             ))
             
             # 포화지방 점수 (낮을수록 좋음)
-            total_saturated_fat = sum(row[7] or 0 for row in foods_data)
+            total_saturated_fat = today_nutrients["saturated_fat"]
             saturated_fat_target = 15.0  # 일일 권장량
             saturated_fat_ratio = (total_saturated_fat / saturated_fat_target) * 100 if saturated_fat_target > 0 else 0
             saturated_fat_score = max(0, 100 - saturated_fat_ratio)
@@ -1130,26 +1181,7 @@ async def get_score_detail(
             ))
         
         # 6. 주간 트렌드 (최근 7일)
-        seven_days_ago = today - timedelta(days=6)
-        weekly_trend_stmt = select(
-            func.date(UserFoodHistory.consumed_at).label('date'),
-            func.avg(HealthScore.final_score).label('avg_score')
-        ).join(
-            HealthScore, UserFoodHistory.history_id == HealthScore.history_id
-        ).where(
-            and_(
-                UserFoodHistory.user_id == user_id,
-                func.date(UserFoodHistory.consumed_at) >= seven_days_ago,
-                func.date(UserFoodHistory.consumed_at) <= today
-            )
-        ).group_by(
-            func.date(UserFoodHistory.consumed_at)
-        ).order_by(
-            func.date(UserFoodHistory.consumed_at)
-        )
-        
-        weekly_result = await session.execute(weekly_trend_stmt)
-        weekly_data = {row[0]: row[1] for row in weekly_result.all()}
+        weekly_data = {day: summary.avg_score for day, summary in daily_summaries.items()}
         
         weekly_trend = []
         for i in range(7):
@@ -1228,9 +1260,13 @@ async def delete_meal_history(
         if health_score:
             await session.delete(health_score)
         
+        # 일별 영양 집계에서 차감
+        await apply_meal_to_daily_nutrition(session, history, health_score, remove=True)
+        
         # UserFoodHistory 삭제
         await session.delete(history)
         await session.commit()
+        await invalidate_user_context(user_id)  # has_eaten_today 갱신
         
         return ApiResponse(
             success=True,
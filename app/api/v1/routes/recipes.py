@@ -1,7 +1,7 @@
 """레시피 추천 API 라우트"""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 
@@ -23,17 +23,28 @@ from app.api.v1.schemas.recipe import (
     RecipeActionType
 )
 from app.api.v1.schemas.common import ApiResponse
-from app.db.models import User, Food, UserFoodHistory, HealthScore, DiseaseAllergyProfile
+from app.db.models import User, Food, UserFoodHistory, HealthScore
 from app.db.models_food_nutrients import FoodNutrient
 from app.db.models_user_contributed import UserContributedFood
 from app.db.session import get_session
-from app.api.dependencies import get_current_active_user, require_authentication
+from app.api.dependencies import get_current_active_user, get_user_loader, require_authentication
 from app.services.recipe_recommendation_service import get_recipe_recommendation_service
 from app.services.health_score_service import calculate_nrf93_score
+from app.services.food_search_index import get_food_search_index
+from app.services.food_taxonomy import get_food_taxonomy_cache
+from app.services.nutrient_matrix import get_nutrient_matrix_cache
+from app.services.daily_nutrition_service import apply_meal_to_daily_nutrition, get_daily_summary
+from app.services.user_context_cache import invalidate_user_context
+from app.services.user_loader import UserLoader
+from app.utils.date_window import local_today
+from app.workers.jobs import enqueue_recipe_detail_prefetch
 import uuid
 
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
+# 추천 후 상세 조리법을 미리 만들어 둘 상위 카드 수
+PREFETCH_DETAIL_COUNT = 2
+
 
 def detect_meal_type_from_text(text: str | None) -> Optional[str]:
     if not text:
@@ -86,7 +97,8 @@ def build_user_intent_text(
 async def get_recipe_recommendations(
     request: RecipeRecommendationRequest,
     current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    loader: UserLoader = Depends(get_user_loader)
 ):
     """
     사용자 건강 정보와 선호도를 기반으로 레시피 3개를 추천합니다.
@@ -118,50 +130,15 @@ async def get_recipe_recommendations(
         print(f"📊 사용자 정보 조회 완료: {user.nickname or user.username}")
         
         # 3. 사용자 질병 및 알레르기 정보 조회
-        profile_stmt = select(DiseaseAllergyProfile).where(
-            DiseaseAllergyProfile.user_id == user.user_id
-        )
-        profile_result = await session.execute(profile_stmt)
-        profiles = profile_result.scalars().all()
-        
-        diseases = [p.disease_name for p in profiles if p.disease_name]
-        allergies = [p.allergy_name for p in profiles if p.allergy_name]
+        diseases, allergies = await loader.get_health_profile(user.user_id)
         
         print(f"🏥 사용자 건강 정보: 질병={diseases}, 알레르기={allergies}")
         
         # 5. 오늘 섭취한 영양소 집계 및 부족 영양소 분석
-        from datetime import datetime, date
-        today = datetime.now().date()
-        
-        # 오늘 섭취한 음식들의 영양소 정보 조회 (칼로리, 나트륨 포함)
-        # FoodNutrient 모델에는 vitamin_e 필드가 없으므로 제외
-        today_nutrients_stmt = select(
-            FoodNutrient.protein,
-            FoodNutrient.carb,
-            FoodNutrient.fat,
-            FoodNutrient.fiber,
-            FoodNutrient.vitamin_a,
-            FoodNutrient.vitamin_c,
-            FoodNutrient.calcium,
-            FoodNutrient.iron,
-            FoodNutrient.potassium,
-            FoodNutrient.magnesium,
-            FoodNutrient.sodium,
-            HealthScore.kcal,
-            UserFoodHistory.portion_size_g
-        ).join(
-            UserFoodHistory, FoodNutrient.food_id == UserFoodHistory.food_id
-        ).outerjoin(
-            HealthScore, UserFoodHistory.history_id == HealthScore.history_id
-        ).where(
-            and_(
-                UserFoodHistory.user_id == user.user_id,
-                func.date(UserFoodHistory.consumed_at) == today
-            )
-        )
+        today = local_today()
         
-        nutrients_result = await session.execute(today_nutrients_stmt)
-        nutrients_data = nutrients_result.all()
+        # 오늘 섭취한 영양소 합계 (일별 영양 집계, 섭취량 기준)
+        today_summary = await get_daily_summary(session, user.user_id, today)
         
         # 일일 권장량 (한국인 영양소 섭취기준)
         # vitamin_e는 FoodNutrient에 없으므로 제외
@@ -197,35 +174,13 @@ async def get_recipe_recommendations(
             else:
                 target_calories = int(tdee)
         
-        # 오늘 섭취한 영양소 합계 계산
+        # 오늘 섭취한 영양소 합계
+        # vitamin_e는 FoodNutrient에 없으므로 제외
         total_nutrients = {
-            'protein': 0.0,
-            'fiber': 0.0,
-            'vitamin_a': 0.0,
-            'vitamin_c': 0.0,
-            'calcium': 0.0,
-            'iron': 0.0,
-            'potassium': 0.0,
-            'magnesium': 0.0,
-            'sodium': 0.0,
+            key: today_summary.nutrients[key]
+            for key in ('protein', 'fiber', 'vitamin_a', 'vitamin_c', 'calcium', 'iron', 'potassium', 'magnesium', 'sodium')
         }
-        total_calories = 0.0
-        
-        for row in nutrients_data:
-            # Decimal 타입을 float로 변환하여 연산 오류 방지
-            portion_size = float(row[12] or 100.0)
-            portion_ratio = portion_size / 100.0  # portion_size_g / reference_value(100g)
-            
-            total_nutrients['protein'] += float(row[0] or 0.0) * portion_ratio
-            total_nutrients['fiber'] += float(row[3] or 0.0) * portion_ratio
-            total_nutrients['vitamin_a'] += float(row[4] or 0.0) * portion_ratio
-            total_nutrients['vitamin_c'] += float(row[5] or 0.0) * portion_ratio
-            total_nutrients['calcium'] += float(row[6] or 0.0) * portion_ratio
-            total_nutrients['iron'] += float(row[7] or 0.0) * portion_ratio
-            total_nutrients['potassium'] += float(row[8] or 0.0) * portion_ratio
-            total_nutrients['magnesium'] += float(row[9] or 0.0) * portion_ratio
-            total_nutrients['sodium'] += float(row[10] or 0.0) * portion_ratio
-            total_calories += float(row[11] or 0.0)  # HealthScore.kcal은 이미 실제 섭취량
+        total_calories = float(today_summary.kcal)  # HealthScore.kcal 합계 (이미 실제 섭취량)
         
         # 부족한 영양소 분석 (권장량의 50% 미만인 경우)
         deficient_nutrients = []
@@ -255,7 +210,7 @@ async def get_recipe_recommendations(
                 })
         
         # 오늘 아무것도 안 먹었는지 확인
-        has_eaten_today = len(nutrients_data) > 0
+        has_eaten_today = today_summary.item_count > 0
         
         # 칼로리 및 나트륨 초과 여부 확인
         calories_exceeded = total_calories >= target_calories * 1.1  # 목표 칼로리의 110% 이상
@@ -269,7 +224,7 @@ async def get_recipe_recommendations(
             excess_warnings.append(f"오늘 이미 권장 나트륨량({daily_values['sodium']:.0f}mg)의 120% 이상을 섭취하셨습니다.")
         
         print(f"📊 오늘 섭취 영양소 분석:")
-        print(f"  - 섭취한 음식 수: {len(nutrients_data)}개")
+        print(f"  - 섭취한 음식 수: {today_summary.item_count}개")
         print(f"  - 총 칼로리: {total_calories:.0f}kcal (목표: {target_calories}kcal)")
         print(f"  - 총 나트륨: {total_nutrients['sodium']:.0f}mg (권장: {daily_values['sodium']:.0f}mg)")
         print(f"  - 부족한 영양소: {[n['name'] for n in deficient_nutrients]}")
@@ -442,10 +397,16 @@ async def get_recipe_recommendations(
         pipeline_tasks = recipe_service.launch_parallel_recipe_pipeline(
             recommendation_kwargs=recommendation_kwargs,
             health_check_kwargs=None,
-            prefetch_detail_limit=2,
         )
 
         result_data = await pipeline_tasks.get_recommendations()
+        # 상위 카드의 상세 조리법은 응답 후 워커가 미리 생성 (상세 요청 시 캐시에서 응답)
+        await enqueue_recipe_detail_prefetch(
+            user.user_id,
+            [rec.get("name") for rec in (result_data.get("recommendations") or [])[:PREFETCH_DETAIL_COUNT] if rec.get("name")],
+            diseases=recommendation_kwargs["diseases"],
+            allergies=recommendation_kwargs["allergies"],
+        )
 
         print(f"[Recommend] Phase-1 카드 추천 완료 user={user.user_id}, count={len(result_data.get('recommendations', []))}")
         
@@ -524,7 +485,8 @@ async def get_recipe_recommendations(
 async def get_recipe_detail(
     request: RecipeDetailRequest,
     current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    loader: UserLoader = Depends(get_user_loader)
 ):
     """
     선택한 레시피의 상세 단계별 조리법을 제공합니다.
@@ -549,14 +511,7 @@ async def get_recipe_detail(
         print(f"📖 '{request.recipe_name}' 레시피 상세 조회 중...")
         
         # 3. 사용자 질병 및 알레르기 정보 조회 (안전성 유지를 위해 필수)
-        profile_stmt = select(DiseaseAllergyProfile).where(
-            DiseaseAllergyProfile.user_id == user.user_id
-        )
-        profile_result = await session.execute(profile_stmt)
-        profiles = profile_result.scalars().all()
-        
-        diseases = [p.disease_name for p in profiles if p.disease_name]
-        allergies = [p.allergy_name for p in profiles if p.allergy_name]
+        diseases, allergies = await loader.get_health_profile(user.user_id)
         
         # 4. 레시피 상세 정보 조회
         recipe_service = get_recipe_recommendation_service()
@@ -830,6 +785,7 @@ async def save_recipe_as_meal(
         nutrient_stmt = select(FoodNutrient).where(FoodNutrient.food_id == food_id)
         nutrient_result = await session.execute(nutrient_stmt)
         nutrient = nutrient_result.scalar_one_or_none()
+        nutrient_created = nutrient is None
         
         if not nutrient:
             # FoodNutrient 레코드 생성
@@ -912,7 +868,14 @@ async def save_recipe_as_meal(
         await session.flush()
         print(f"✅ HealthScore 저장 완료")
         
+        await apply_meal_to_daily_nutrition(session, food_history, health_score, nutrient=nutrient)
         await session.commit()
+        if nutrient_created:
+            # commit 후에 무효화해야 다른 요청의 버전 확인이 새 행을 본다
+            get_food_search_index().invalidate()
+            get_food_taxonomy_cache().invalidate()
+            get_nutrient_matrix_cache().invalidate()
+        await invalidate_user_context(user_id)  # has_eaten_today 갱신
         
         # ========== STEP 6: 응답 반환 ==========
         # 프론트엔드에서 nrf_score를 기대하므로 health_score 대신 nrf_score 사용
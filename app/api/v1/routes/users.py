@@ -3,9 +3,9 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, delete
+from sqlalchemy import select, and_, delete
 
-from app.api.dependencies import get_current_active_user
+from app.api.dependencies import get_current_active_user, get_user_loader
 from app.api.v1.schemas.users import (
     NutrientInfo, 
     UserHealthInfo, 
@@ -18,9 +18,13 @@ from app.api.v1.schemas.users import (
     AddHealthProfileRequest,
 )
 from app.api.v1.schemas.common import ApiResponse
-from app.db.models import DiseaseAllergyProfile, User, HealthScore
+from app.db.models import DiseaseAllergyProfile, User
 from app.db.session import get_session
 from app.services.auth_service import verify_password, hash_password
+from app.services.daily_nutrition_service import get_daily_summary
+from app.services.user_context_cache import invalidate_user_context
+from app.services.user_loader import UserLoader, invalidate_cached_user
+from app.utils.date_window import local_today
 
 router = APIRouter()
 
@@ -31,7 +35,7 @@ async def get_user_intake_data(
     session: AsyncSession = Depends(get_session),
 ) -> UserIntakeData:
     """오늘의 사용자 섭취 현황 조회"""
-    today = datetime.now().date()
+    today = local_today()
     user_id = current_user.user_id
 
     # 1. 목표 칼로리 계산
@@ -51,24 +55,18 @@ async def get_user_intake_data(
         else:
             target_calories = int(tdee)
     
-    # 2. 오늘 섭취한 칼로리 합계
-    total_calories_stmt = select(func.sum(HealthScore.kcal)).where(
-        and_(
-            HealthScore.user_id == user_id,
-            func.date(HealthScore.created_at) == today,
-        )
-    )
-    total_calories_result = await session.execute(total_calories_stmt)
-    total_calories = total_calories_result.scalar_one_or_none() or 0
+    # 2. 오늘 섭취 합계 (일별 영양 집계)
+    summary = await get_daily_summary(session, user_id, today)
 
-    # 3. 주요 영양소 섭취량 (TODO)
-    # TODO: meals.py의 /daily-summary 로직과 통합하거나 재사용하여 실제 영양소 값 조회
-    
     return UserIntakeData(
-        totalCalories=int(total_calories),
+        totalCalories=int(summary.kcal),
         targetCalories=target_calories,
         nutrients=NutrientInfo(
-            sodium=0, carbs=0, protein=0, fat=0, sugar=0,
+            sodium=round(summary.nutrients["sodium"]),
+            carbs=round(summary.nutrients["carb"]),
+            protein=round(summary.nutrients["protein"]),
+            fat=round(summary.nutrients["fat"]),
+            sugar=round(summary.nutrients["added_sugar"]),
         ),
     )
 
@@ -76,18 +74,11 @@ async def get_user_intake_data(
 @router.get("/me/health-info", response_model=UserHealthInfo)
 async def get_user_health_info(
     current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_session),
+    loader: UserLoader = Depends(get_user_loader),
 ) -> UserHealthInfo:
     """사용자 건강 정보 조회"""
     # 사용자의 질병 및 알레르기 정보 조회
-    profile_stmt = select(DiseaseAllergyProfile).where(
-        DiseaseAllergyProfile.user_id == current_user.user_id
-    )
-    profile_result = await session.execute(profile_stmt)
-    profiles = profile_result.scalars().all()
-
-    diseases = [p.disease_name for p in profiles if p.disease_name]
-    allergies = [p.allergy_name for p in profiles if p.allergy_name]
+    diseases, allergies = await loader.get_health_profile(current_user.user_id)
 
     # 간단한 BMR 계산 (Mifflin-St Jeor)
     bmr, tdee, target_calories = 0, 0, 2000 # 기본값
@@ -157,6 +148,7 @@ async def update_user_profile(
         current_user.updated_at = datetime.now()
         
         await session.commit()
+        await invalidate_cached_user(current_user.user_id)
         await session.refresh(current_user)
         
         return ApiResponse(
@@ -186,6 +178,9 @@ async def change_password(
     session: AsyncSession = Depends(get_session),
 ) -> ApiResponse[dict]:
     """비밀번호 변경"""
+    # 비밀번호 해시는 사용자 캐시에 없으므로 DB에서 읽는다
+    await session.refresh(current_user, attribute_names=["password"])
+    
     # 현재 비밀번호 확인
     if not verify_password(password_data.current_password, current_user.password):
         raise HTTPException(
@@ -199,6 +194,7 @@ async def change_password(
         current_user.updated_at = datetime.now()
         
         await session.commit()
+        await invalidate_cached_user(current_user.user_id)
         
         return ApiResponse(
             success=True,
@@ -295,6 +291,7 @@ async def add_health_profile(
         session.add(new_profile)
         await session.flush()
         await session.commit()
+        await invalidate_user_context(current_user.user_id)  # 질환/알레르기 목록 갱신
         
         return ApiResponse(
             success=True,
@@ -341,6 +338,7 @@ async def delete_health_profile(
         
         await session.delete(profile)
         await session.commit()
+        await invalidate_user_context(current_user.user_id)  # 질환/알레르기 목록 갱신
         
         return ApiResponse(
             success=True,
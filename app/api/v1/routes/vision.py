@@ -1,9 +1,11 @@
 """음식 이미지 분석 관련 라우트"""
 
+import asyncio
+import base64
 import time
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas.common import ApiResponse
@@ -19,19 +21,25 @@ from app.api.v1.schemas.vision import (
     PreviewNutritionResponse,
     FoodCandidate,
 )
+from app.core.config import get_settings
 from app.db.session import get_session
 from app.db.models_food_nutrients import FoodNutrient
 from app.db.models_user_contributed import UserContributedFood
 from app.services.gpt_vision_service import get_gpt_vision_service
-from app.services.yolo_service import get_yolo_service
+from app.services.yolo_service import YOLOQueueFullError, get_yolo_service
+from app.services.vision_result_cache import get_vision_result_cache
 from app.services.food_matching_service import get_food_matching_service
 from app.services.llm_nutrient_estimator import get_nutrient_estimator
 from app.services.health_score_service import calculate_nrf93_score, create_health_score, calculate_food_grade
 from app.services.food_service import get_or_create_food
 from app.services.food_history_service import create_food_history
+from app.services.daily_nutrition_service import apply_meal_to_daily_nutrition
+from app.services.user_context_cache import invalidate_user_context
 from app.utils.food_name import extract_display_name
+from app.utils.prepared_image import PreparedImage
 
 router = APIRouter()
+settings = get_settings()
 
 
 def _analyze_food_image(file_name: str) -> FoodAnalysisResult:
@@ -124,7 +132,9 @@ async def analyze_food_image(request: FoodAnalysisRequest) -> ApiResponse[FoodAn
 
 @router.post("/analysis-upload", response_model=ApiResponse[FoodAnalysisData])
 async def analyze_food_image_with_yolo_gpt(
+    response: Response,
     file: UploadFile = File(...),
+    include_annotated: bool = Query(False, description="YOLO 바운딩 박스를 그린 이미지도 반환 (디버그용)"),
     session: AsyncSession = Depends(get_session)
 ) -> ApiResponse[FoodAnalysisData]:
     """
@@ -145,10 +155,15 @@ async def analyze_food_image_with_yolo_gpt(
     
     **Args:**
         file: 업로드된 이미지 파일 (JPEG, PNG 등)
+        include_annotated: true면 YOLO 박스 이미지를 `annotatedImage`(base64 JPEG)로 함께 반환
+            (박스 렌더링 비용이 있으므로 기본은 false, 분석 결과 캐시도 건너뛰고 YOLO를 실행)
         session: DB 세션
         
     **Returns:**
         음식 분석 결과 (음식명, 재료, 칼로리, 영양소, 건강 제안 등)
+        YOLO 대기/추론 시간은 `Server-Timing` 헤더로 제공
+        (YOLO 대기열이 가득 차면 503 + `Retry-After`)
+        같은 이미지는 분석 결과 캐시에서 바로 반환 (`Server-Timing: vision-cache;desc=hit`)
     """
     start_time = time.time()
     
@@ -159,26 +174,73 @@ async def analyze_food_image_with_yolo_gpt(
         if not image_bytes:
             raise HTTPException(status_code=400, detail="이미지 파일이 비어있습니다.")
         
-        # 2. YOLO detection 실행
-        print("🔍 YOLO detection 시작...")
-        yolo_service = get_yolo_service()
-        yolo_result = yolo_service.detect_food(image_bytes)
-        print(f"✅ YOLO detection 완료: {yolo_result['summary']}")
-        
-        # 3. GPT-Vision 간단 분석 (음식명 + 재료 추출)
-        print("🤖 GPT-Vision 분석 시작...")
-        gpt_service = get_gpt_vision_service()
-        gpt_result = await gpt_service.analyze_food_with_detection(
-            image_bytes, 
-            yolo_result
-        )
-        print(f"✅ GPT-Vision 분석 완료: {gpt_result['food_name']}")
-        print(f"📝 추출된 재료: {', '.join(gpt_result['ingredients'])}")
-        
-        # 4. LangChain을 이용한 DB 조회 및 영양소 추론 로직 제거
+        # 디코딩/리사이즈/base64 인코딩은 여기서 한 번만 하고 YOLO와 GPT가 공유
+        try:
+            prepared_image = await asyncio.to_thread(
+                PreparedImage.from_bytes,
+                image_bytes,
+                max_size=settings.vision_detection_image_max_size,
+                jpeg_quality=settings.vision_detection_image_jpeg_quality,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # 2. 분석 결과 캐시 조회 (같은 사진 재업로드/재시도면 YOLO + GPT 생략)
+        cache_key = None
+        cached = None
+        annotated_image = None
+        if settings.vision_cache_enabled:
+            vision_cache = get_vision_result_cache()
+            cache_key = await asyncio.to_thread(vision_cache.make_key, prepared_image, "detection")
+            if not include_annotated:  # 캐시에는 박스 이미지가 없음
+                cached = await vision_cache.get(cache_key)
+
+        if cached:
+            gpt_result = cached["analysis"]
+            response.headers["Server-Timing"] = "vision-cache;desc=hit"
+            print(f"⚡ 분석 결과 캐시 적중: {gpt_result['food_name']} (YOLO/GPT 생략)")
+        else:
+            # 3. YOLO detection 실행
+            print("🔍 YOLO detection 시작...")
+            yolo_service = get_yolo_service()
+            yolo_result = await yolo_service.detect_food_async(
+                prepared_image, include_annotated=include_annotated
+            )
+            if yolo_result.get("image_with_boxes"):
+                annotated_image = base64.b64encode(yolo_result["image_with_boxes"]).decode("utf-8")
+            timings = yolo_result["timings"]
+            response.headers["Server-Timing"] = (
+                f"yolo-queue;dur={timings['queue_wait_ms']}, yolo-inference;dur={timings['inference_ms']}"
+            )
+            print(
+                f"✅ YOLO detection 완료: {yolo_result['summary']} "
+                f"(대기 {timings['queue_wait_ms']}ms, 추론 {timings['inference_ms']}ms)"
+            )
+            
+            # 4. GPT-Vision 간단 분석 (음식명 + 재료 추출)
+            print("🤖 GPT-Vision 분석 시작...")
+            gpt_service = get_gpt_vision_service()
+            gpt_result = await gpt_service.analyze_food_with_detection(
+                prepared_image,
+                yolo_result
+            )
+            print(f"✅ GPT-Vision 분석 완료: {gpt_result['food_name']}")
+            print(f"📝 추출된 재료: {', '.join(gpt_result['ingredients'])}")
+
+            if cache_key is not None:
+                await get_vision_result_cache().set(cache_key, {
+                    "yolo": {
+                        "detected_objects": yolo_result["detected_objects"],
+                        "summary": yolo_result["summary"],
+                        "total_objects": yolo_result["total_objects"],
+                    },
+                    "analysis": gpt_result,
+                })
+        
+        # 5. LangChain을 이용한 DB 조회 및 영양소 추론 로직 제거
         #    이 단계에서는 오직 AI가 인식한 음식명과 재료만 반환합니다.
         
-        # 5. 응답 데이터 구성 (간소화)
+        # 6. 응답 데이터 구성 (간소화)
         
         # 메인 음식명에서 표시용 이름 추출 (언더스코어 뒤 부분만)
         display_food_name = extract_display_name(gpt_result["food_name"])
@@ -233,10 +295,19 @@ async def analyze_food_image_with_yolo_gpt(
                 analysis=analysis_result,
                 timestamp=datetime.now(timezone.utc).isoformat(),
                 processingTime=processing_time,
+                annotatedImage=annotated_image,
             ),
             message=f"✅ 분석 완료: {display_food_name} (건강점수: {gpt_result.get('health_score', 0)}점)"
         )
         
+    except HTTPException:
+        raise
+    except YOLOQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(settings.yolo_retry_after_seconds)},
+        )
     except RuntimeError as e:
         # YOLO 또는 GPT-Vision 서비스 오류
         raise HTTPException(status_code=500, detail=str(e))
@@ -620,7 +691,7 @@ async def save_user_food(
         
         food_grade = await calculate_food_grade(request.health_score)
         
-        await create_health_score(
+        health_score = await create_health_score(
             session=session,
             history_id=history.history_id,
             user_id=request.user_id,
@@ -636,7 +707,10 @@ async def save_user_food(
             calc_method="NRF9.3 (Pre-calculated)"
         )
         
+        # 4. 일별 영양 집계 반영
+        await apply_meal_to_daily_nutrition(session, history, health_score)
         await session.commit()
+        await invalidate_user_context(request.user_id)  # has_eaten_today 갱신
         
         response = SaveFoodResponse(
             history_id=history.history_id,
@@ -55,6 +55,8 @@ class FoodAnalysisData(BaseModel):
     analysis: FoodAnalysisResult
     timestamp: str
     processing_time: int = Field(alias="processingTime")
+    # include_annotated=true 요청 시 YOLO 바운딩 박스를 그린 JPEG (base64)
+    annotated_image: str | None = Field(None, alias="annotatedImage")
 
 
 class FoodReanalysisRequest(BaseModel):
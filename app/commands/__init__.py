@@ -0,0 +1 @@
+"""운영용 관리 명령 (python -m app.commands.<name>)"""
@@ -0,0 +1,54 @@
+"""UserDailyNutrition 집계 재구축 (backfill)
+
+UserFoodHistory를 기준으로 일별 집계를 다시 계산한다. 최초 도입 시 backfill,
+또는 집계가 어긋났을 때 사용한다. 사용자 단위로 commit 한다.
+
+    python -m app.commands.rebuild_daily_nutrition
+    python -m app.commands.rebuild_daily_nutrition --user-id 3 --user-id 7
+    python -m app.commands.rebuild_daily_nutrition --start 2025-11-01 --end 2025-11-30
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+from typing import List, Optional
+
+from app.db.session import SessionLocal, engine
+from app.services.daily_nutrition_service import get_user_ids_with_history, rebuild_daily_nutrition
+
+
+async def rebuild(user_ids: Optional[List[int]], start: Optional[date], end: Optional[date]) -> None:
+    async with SessionLocal() as session:
+        if not user_ids:
+            user_ids = list(await get_user_ids_with_history(session))
+
+    print(f"🔄 일별 영양 집계 재구축: 사용자 {len(user_ids)}명 (기간: {start or '처음'} ~ {end or '끝'})")
+    started_at = time.perf_counter()
+    total_rows = 0
+    for index, user_id in enumerate(user_ids, 1):
+        async with SessionLocal() as session:
+            try:
+                rows = await rebuild_daily_nutrition(session, user_id, start, end)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                print(f"❌ user_id={user_id} 재구축 실패: {e}")
+                continue
+        total_rows += rows
+        print(f"  [{index}/{len(user_ids)}] user_id={user_id}: {rows}행")
+
+    print(f"✅ 완료: {total_rows}행, {time.perf_counter() - started_at:.1f}초")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UserDailyNutrition 집계 재구축")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="대상 사용자 (반복 가능, 기본: 전체)")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="종료 날짜 (YYYY-MM-DD, 포함)")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.user_ids, args.start, args.end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""health_score 일괄 재계산 (DV 상수 / 등급 기준 변경 후)
+
+UserFoodHistory × health_score × food_nutrients를 (history_id, food_id) keyset 청크로
+읽어 현재 공식으로 다시 계산하고, 바뀐 행만 청크당 UPDATE 한 번으로 되쓴다.
+청크마다 commit 후 체크포인트 파일에 위치를 저장하므로 중단돼도 이어서 실행할 수 있다.
+운영 트래픽을 방해하지 않도록 --max-rows-per-second로 처리 속도를 제한한다.
+
+    python -m app.commands.rescore_health_scores --dry-run
+    python -m app.commands.rescore_health_scores --max-rows-per-second 500
+    python -m app.commands.rescore_health_scores --resume            # 체크포인트부터 이어서
+    python -m app.commands.rescore_health_scores --method korean     # 공식 강제 (calc_method도 변경)
+
+NRF9.3 행은 food_nutrients로 계산한 점수가 아니므로 기본적으로 건너뛴다 (--include-nrf93).
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.db.session import SessionLocal, engine
+from app.services.health_score_rescoring import (
+    METHOD_AUTO,
+    METHOD_KOREAN,
+    METHOD_NRF93,
+    RescoreCursor,
+    apply_score_updates,
+    fetch_rescore_chunk,
+    rescore_rows,
+)
+
+DEFAULT_CHECKPOINT = ".rescore_health_scores.checkpoint.json"
+
+
+@dataclass
+class Checkpoint:
+    """재계산 진행 상태 (청크 commit 후 저장)"""
+
+    history_id: int = 0
+    food_id: str = ""
+    processed: int = 0
+    updated: int = 0
+    skipped: int = 0
+    method: str = METHOD_AUTO
+    include_nrf93: bool = False
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    @property
+    def cursor(self) -> RescoreCursor:
+        return RescoreCursor(self.history_id, self.food_id)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        if not path.exists():
+            return None
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        """임시 파일에 쓴 뒤 교체 (중단돼도 파일이 깨지지 않게)"""
+        self.updated_at = datetime.now().isoformat(timespec="seconds")
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+class RateLimiter:
+    """누적 처리량이 max_rows_per_second를 넘지 않도록 대기"""
+
+    def __init__(self, max_rows_per_second: float, clock=time.monotonic, sleep=asyncio.sleep):
+        self.max_rows_per_second = max_rows_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._started_at = clock()
+        self._rows = 0
+
+    async def throttle(self, rows: int) -> float:
+        """rows건 처리 후 호출, 실제로 대기한 초를 반환"""
+        self._rows += rows
+        if self.max_rows_per_second <= 0:
+            return 0.0
+        delay = self._rows / self.max_rows_per_second - (self._clock() - self._started_at)
+        if delay > 0:
+            await self._sleep(delay)
+            return delay
+        return 0.0
+
+
+async def rescore(
+    checkpoint_path: Path,
+    resume: bool,
+    method: str,
+    chunk_size: int,
+    max_rows_per_second: float,
+    dry_run: bool,
+    limit: Optional[int],
+    include_nrf93: bool = False,
+) -> None:
+    checkpoint = Checkpoint.load(checkpoint_path) if resume else None
+    if checkpoint is not None:
+        if checkpoint.method != method:
+            raise SystemExit(f"❌ 체크포인트 공식({checkpoint.method})과 --method({method})가 다릅니다.")
+        if checkpoint.include_nrf93 != include_nrf93:
+            raise SystemExit("❌ 체크포인트와 --include-nrf93 설정이 다릅니다.")
+        print(
+            f"↪️ 체크포인트에서 재개: history_id={checkpoint.history_id} "
+            f"(처리 {checkpoint.processed}, 갱신 {checkpoint.updated})"
+        )
+    else:
+        checkpoint = Checkpoint(method=method, include_nrf93=include_nrf93)
+
+    mode = " (dry-run)" if dry_run else ""
+    print(f"🔄 health_score 재계산{mode}: 공식={method}, 청크={chunk_size}, 최대 {max_rows_per_second or '∞'}행/초")
+    limiter = RateLimiter(max_rows_per_second)
+    started_at = time.perf_counter()
+    processed_this_run = 0
+
+    while limit is None or processed_this_run < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - processed_this_run)
+        async with SessionLocal() as session:
+            rows = await fetch_rescore_chunk(session, checkpoint.cursor, size)
+            if not rows:
+                break
+            updates, skipped = rescore_rows(rows, method, include_nrf93)
+            if not dry_run:
+                try:
+                    await apply_score_updates(session, updates)
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    print(f"❌ 청크 갱신 실패 (history_id > {checkpoint.history_id}), 체크포인트에서 다시 실행하세요.")
+                    raise
+
+        last = rows[-1]
+        checkpoint.history_id, checkpoint.food_id = last.history_id, last.food_id
+        checkpoint.processed += len(rows)
+        checkpoint.updated += len(updates)
+        checkpoint.skipped += skipped
+        if not dry_run:
+            checkpoint.save(checkpoint_path)
+        processed_this_run += len(rows)
+
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"  history_id≤{checkpoint.history_id}: 처리 {checkpoint.processed}, 갱신 {checkpoint.updated}, "
+            f"건너뜀 {checkpoint.skipped} | {processed_this_run / elapsed:.0f}행/초"
+        )
+        await limiter.throttle(len(rows))
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"✅ 완료{mode}: 이번 실행 {processed_this_run}행, {elapsed:.1f}초 "
+        f"({processed_this_run / elapsed if elapsed else 0:.0f}행/초), 누적 갱신 {checkpoint.updated}행"
+    )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="health_score 일괄 재계산")
+    parser.add_argument(
+        "--method", choices=[METHOD_AUTO, METHOD_NRF93, METHOD_KOREAN], default=METHOD_AUTO,
+        help="auto: 저장된 calc_method 기준 (기본), nrf93/korean: 모든 행을 해당 공식으로",
+    )
+    parser.add_argument(
+        "--include-nrf93", action="store_true",
+        help="auto일 때 NRF9.3 행도 food_nutrients 기준으로 재계산 (저장 시 GPT 추정값으로 계산한 행도 바뀜)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=500, help="청크당 행 수")
+    parser.add_argument("--max-rows-per-second", type=float, default=1000, help="처리 속도 상한 (0이면 무제한)")
+    parser.add_argument("--checkpoint", type=Path, default=Path(DEFAULT_CHECKPOINT), help="체크포인트 파일 경로")
+    parser.add_argument("--resume", action="store_true", help="체크포인트 위치부터 이어서 실행")
+    parser.add_argument("--limit", type=int, help="이번 실행에서 처리할 최대 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음 (체크포인트도 저장 안 함)")
+    args = parser.parse_args()
+    asyncio.run(
+        rescore(
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+            method=args.method,
+            chunk_size=args.chunk_size,
+            max_rows_per_second=args.max_rows_per_second,
+            dry_run=args.dry_run,
+            limit=args.limit,
+            include_nrf93=args.include_nrf93,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
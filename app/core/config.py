@@ -26,10 +26,81 @@ class Settings(BaseSettings):
     # Redis settings (optional, for distributed session storage)
     redis_url: str | None = None  # e.g., "redis://localhost:6379/0"
     
+    # Time zones (consumed_at 등 DB 시각은 db_timezone 기준 naive datetime으로 저장)
+    db_timezone: str = "Asia/Seoul"
+    default_user_timezone: str = "Asia/Seoul"  # "오늘" 등 날짜 구간 계산 기준
+    
     # AI/ML Settings
     openai_api_key: str | None = None  # OpenAI API Key
     vision_model_path: str | None = "models/yolo_food.pt"
 
+    # YOLO inference pool (이벤트 루프 밖 스레드에서 실행)
+    yolo_max_workers: int = 1  # 동시에 실행할 YOLO 추론 수
+    yolo_max_queue_size: int = 4  # 실행 대기 가능한 요청 수 (초과 시 503)
+    yolo_retry_after_seconds: int = 5  # 503 응답의 Retry-After 값
+    yolo_batch_max_size: int = 1  # 마이크로 배치 최대 이미지 수 (1이면 배치 비활성화)
+    yolo_batch_max_wait_ms: float = 10.0  # 배치를 모으는 최대 대기 시간 (ms)
+
+    # food_nutrients 후보 검색 n-gram 색인
+    food_search_index_check_interval_seconds: int = 300  # 버전(행 수 + 최대 food_id) 확인 주기
+
+    # food_nutrients 분류 트리 캐시 (대분류 → 대표식품명 → 음식)
+    food_taxonomy_check_interval_seconds: int = 300  # 버전(행 수 + 최대 food_id) 확인 주기
+
+    # food_nutrients 영양소 행렬 스냅샷 (NumPy, 끼니/기간 합산용)
+    nutrient_matrix_check_interval_seconds: int = 300  # 버전(행 수 + 최대 food_id) 확인 주기
+
+    # 식사 기록 조회 (keyset 페이지 / 내보내기)
+    meal_history_count_cap: int = 10000  # 근사 개수를 셀 최대 행 수 (넘으면 "N+"로 표시)
+    meal_history_export_chunk_size: int = 1000  # 내보내기 시 서버 커서에서 한 번에 가져올 행 수
+
+    # 사용자 건강/채팅 컨텍스트 캐시 (질환/알레르기, 오늘 식사 여부)
+    user_context_cache_backend: str = "auto"  # auto(redis_url 있으면 Redis) | memory | redis
+    user_context_cache_max_entries: int = 10000  # 프로세스 내 LRU 최대 개수
+    user_context_cache_ttl_seconds: int = 900  # 보관 시간 (Redis 포함)
+    user_context_cache_local_ttl_seconds: int = 60  # Redis 사용 시 프로세스 내 사본 보관 시간
+
+    # 현재 사용자(User 행) 캐시 (요청 간 공유, 프로필 수정 시 무효화)
+    user_cache_max_entries: int = 10000  # 프로세스 내 LRU 최대 개수 (Redis 미사용 시)
+    user_cache_ttl_seconds: int = 30  # 보관 시간 (다른 워커의 수정은 최대 이 시간 뒤 반영)
+
+    # 대화 증분 요약 (마지막 요약 이후 메시지만 LLM에 보냄)
+    chat_summary_min_delta_tokens: int = 400  # 새 메시지 토큰이 이보다 적으면 요약 생략 (세션 전환 시에는 항상 요약)
+    chat_summary_batch_token_budget: int = 3000  # 한 번의 요약 호출에 넣을 새 메시지 토큰 상한 (턴 단위)
+    chat_summary_max_messages: int = 400  # 한 번에 읽을 미요약 메시지 최대 개수
+
+    # 백그라운드 작업 큐 (대화 요약, 레시피 상세 미리 생성 등 응답 후 LLM 작업)
+    job_queue_backend: str = "auto"  # auto(redis_url 있으면 Redis) | memory | redis
+    job_worker_in_process: bool = False  # Redis 큐여도 API 프로세스 안에서 워커 실행 (memory는 항상 내장)
+    job_worker_concurrency: int = 4  # 워커당 동시 실행 작업 수
+    job_max_attempts: int = 3  # 이 횟수만큼 실패하면 dead-letter
+    job_retry_base_seconds: float = 2.0  # 재시도 대기 (실패마다 2배)
+    job_retry_max_seconds: float = 60.0  # 재시도 대기 상한
+    job_timeout_seconds: float = 120.0  # 작업 한 건 실행 시간 상한
+    job_pending_key_ttl_seconds: int = 600  # 중복 방지 키 보관 시간 (Redis)
+    job_running_key_ttl_seconds: int = 300  # 실행 중 표시 보관 시간 (Redis, job_timeout_seconds보다 길게)
+
+    # 채팅 에이전트 그래프 캐시 ((user_id, 프로필 버전)별 도구/프롬프트/AgentExecutor 재사용)
+    chat_agent_cache_max_entries: int = 512
+
+    # LLM 게이트웨이 응답 캐시 (프롬프트 해시 키, 호출 지점별 TTL)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 1024  # 프로세스 내 LRU 최대 개수
+    llm_cache_ttl_overrides: dict[str, int] = {}  # 예: {"recipe.ingredient_check": 3600}, 0이면 비활성화
+
+    # 업로드 이미지 전처리 (요청당 한 번 디코딩해 YOLO/GPT가 공유)
+    vision_image_max_size: int = 1536  # GPT 전송용 이미지 최대 변 길이 (px, DB 가이드 분석)
+    vision_image_jpeg_quality: int = 90  # 재인코딩 JPEG 품질 (DB 가이드 분석)
+    vision_detection_image_max_size: int = 1024  # 단일 호출 분석(analyze_food_with_detection) 최대 변 길이
+    vision_detection_image_jpeg_quality: int = 85  # 단일 호출 분석 재인코딩 JPEG 품질
+    vision_image_passthrough_kb: int = 1000  # 이 크기 이하 JPEG는 원본 그대로 전송
+
+    # 이미지 분석 결과 캐시 (같은 사진 재업로드/재시도 시 YOLO + GPT 생략)
+    vision_cache_enabled: bool = True
+    vision_cache_max_entries: int = 256  # 프로세스 내 LRU 최대 개수
+    vision_cache_ttl_seconds: int = 86400  # 결과 보관 시간 (Redis 포함)
+    vision_cache_perceptual_hash: bool = False  # dHash로 재압축된 같은 사진도 매칭
+
     @field_validator("cors_allow_origins", mode="before")
     @classmethod
     def split_origins(cls, value: str | list[str]) -> list[str]:
@@ -1,8 +1,8 @@
 """데이터베이스 모델 정의 - ERDCloud 스키마 원본"""
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Date, DateTime, Enum, Integer, String, DECIMAL, BigInteger, Boolean, Text, func
+from sqlalchemy import JSON, Date, DateTime, Enum, Index, Integer, String, DECIMAL, BigInteger, Boolean, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -52,6 +52,10 @@ class UserFoodHistory(Base):
     """UserFoodHistory 테이블 - ERDCloud 원본 + meal_type 추가"""
 
     __tablename__ = "UserFoodHistory"
+    __table_args__ = (
+        # 사용자별 기간 조회 (consumed_at >= start AND consumed_at < end)
+        Index("idx_user_consumed_at", "user_id", "consumed_at"),
+    )
 
     history_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -85,6 +89,38 @@ class HealthScore(Base):
         return f"<HealthScore(history_id={self.history_id}, final_score={self.final_score})>"
 
 
+class UserDailyNutrition(Base):
+    """사용자 일별 · 끼니별 섭취 영양 집계 (UserFoodHistory 저장/삭제 시 같은 트랜잭션에서 갱신)"""
+
+    __tablename__ = "UserDailyNutrition"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    intake_date: Mapped[date] = mapped_column("date", Date, primary_key=True, comment='섭취 날짜 (consumed_at 기준)')
+    meal_type: Mapped[str] = mapped_column(Enum('breakfast', 'lunch', 'dinner', 'snack', name='meal_type_enum'), primary_key=True, comment='식사 유형')
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='기록된 음식 수')
+    kcal: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='SUM(health_score.kcal)')
+    protein: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    carb: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    fat: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    fiber: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    sodium: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    saturated_fat: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    added_sugar: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    vitamin_a: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    vitamin_c: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    calcium: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    iron: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    potassium: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    magnesium: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0, server_default='0')
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='SUM(health_score.final_score)')
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='final_score가 있는 기록 수')
+    top_foods: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, comment='음식명별 섭취 횟수 {food_name: count}')
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+    def __repr__(self) -> str:
+        return f"<UserDailyNutrition(user_id={self.user_id}, date={self.intake_date}, meal_type={self.meal_type}, kcal={self.kcal})>"
+
+
 class HealthReport(Base):
     """HealthReport 테이블 - ERDCloud 원본"""
 
@@ -239,6 +275,10 @@ class UserIngredient(Base):
     """사용자 식재료 테이블 - Roboflow 분석 결과 저장"""
 
     __tablename__ = "UserIngredient"
+    __table_args__ = (
+        # /ingredients/save 집합 단위 upsert 기준
+        UniqueConstraint("user_id", "ingredient_name", name="uq_user_ingredient_name"),
+    )
 
     ingredient_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, comment='사용자 ID')
@@ -253,6 +293,10 @@ class ChatHistory(Base):
     """사용자와 AI 간의 대화 기록 테이블"""
 
     __tablename__ = "ChatHistory"
+    __table_args__ = (
+        # 세션 대화를 순서대로 범위 조회 (session_id, created_at) - PK(id)가 뒤에 붙어 동시각도 순서 유지
+        Index("idx_chat_session_created", "session_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, comment='사용자 ID')
@@ -266,16 +310,18 @@ class ChatHistory(Base):
 
 
 class Conversation(Base):
-    """대화 세션 및 요약 관리 테이블"""
+    """대화 세션 메타데이터 및 요약 관리 테이블 (대화 원문은 ChatHistory)"""
 
     __tablename__ = "UserConversation" # Changed table name
 
     session_id: Mapped[str] = mapped_column(String(255), primary_key=True, comment='대화 세션 ID (UUID 또는 고유 식별자)')
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, comment='사용자 ID')
-    all_chat: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment='전체 원본 대화 저장')
     sum_chat: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment='AI 요약본 저장')
-    last_message_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, comment='all_chat에 있는 가장 최신 메시지의 시각')
+    last_message_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, comment='ChatHistory에 있는 가장 최신 메시지의 시각')
     last_message_summarized_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, comment='sum_chat이 포함하는 가장 최신 메시지의 시각')
+    last_summarized_message_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True, comment='sum_chat이 포함하는 마지막 ChatHistory.id (증분 요약 워터마크)')
+    transcript_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='요약된 대화 원문의 누적 토큰 어림값')
+    summary_input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0', comment='요약 LLM에 보낸 입력의 누적 토큰 어림값')
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.current_timestamp(), comment='생성일시')
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.current_timestamp(), onupdate=func.current_timestamp(), comment='수정일시')
 
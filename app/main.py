@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,6 +11,18 @@ load_dotenv()
 
 from app.api.v1.router import api_router
 from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.food_search_index import get_food_search_index
+from app.services.food_taxonomy import get_food_taxonomy_cache
+from app.services.nutrient_matrix import get_nutrient_matrix_cache
+from app.services.langchain_agent import get_langchain_agent_factory
+from app.services.llm_gateway import get_llm_gateway
+from app.services.user_context_cache import get_user_context_cache
+from app.workers import jobs as _jobs  # noqa: F401  (작업 핸들러 등록)
+from app.workers.queue import get_job_queue, uses_in_process_worker
+from app.workers.worker import Worker
+
+logger = logging.getLogger(__name__)
 
 
 def configure_sqlalchemy_logging() -> None:
@@ -33,9 +46,47 @@ configure_sqlalchemy_logging()
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """애플리케이션 시작 시 공용 인메모리 자원 준비"""
+    # food_nutrients 검색 색인 (실패해도 첫 매칭 요청 시 재시도하며, 그 전까지는 LIKE 검색 사용)
+    try:
+        async with SessionLocal() as session:
+            await get_food_search_index().refresh(session)
+    except Exception as exc:
+        logger.warning("food_nutrients 검색 색인 사전 구성 실패: %s", exc)
+    # GPT-Vision DB 가이드 분석용 분류 트리 (실패 시 첫 분석 요청에서 구성)
+    try:
+        async with SessionLocal() as session:
+            await get_food_taxonomy_cache().get(session)
+    except Exception as exc:
+        logger.warning("food_nutrients 분류 트리 사전 구성 실패: %s", exc)
+    # 영양소 행렬 스냅샷 (실패 시 첫 사용 시 구성)
+    try:
+        async with SessionLocal() as session:
+            await get_nutrient_matrix_cache().get(session)
+    except Exception as exc:
+        logger.warning("food_nutrients 영양소 행렬 사전 구성 실패: %s", exc)
+    # 다른 워커가 보낸 사용자 컨텍스트 무효화 구독 (Redis 사용 시)
+    user_context_cache = get_user_context_cache()
+    user_context_cache.start_invalidation_listener()
+    # 프로세스 내 큐(Redis 없음)이면 응답 후 LLM 작업을 여기서 처리, Redis 큐는 `python -m app.workers`
+    worker = None
+    job_queue = get_job_queue()
+    if uses_in_process_worker(job_queue):
+        worker = Worker.from_settings(job_queue)
+        worker.start()
+    yield
+    if worker is not None:
+        await worker.stop()
+    await user_context_cache.stop_invalidation_listener()
+
+
 app = FastAPI(
     title="Food Calorie Vision API",
     version="0.1.0",
+    lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -70,6 +121,21 @@ async def root_health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/healthz/llm", tags=["health"])
+async def llm_gateway_stats() -> dict:
+    """Per-call-site LLM call counts, response cache hit rate and upstream latency."""
+    return get_llm_gateway().stats()
+
+
+@app.get("/healthz/agents", tags=["health"])
+async def agent_cache_stats() -> dict:
+    """Chat agent graph cache size, hit rate and average build time."""
+    try:
+        return get_langchain_agent_factory().stats()
+    except ValueError as exc:
+        return {"error": str(exc)}
+
+
 if __name__ == "__main__":
     import uvicorn
     from app.core.config import get_settings
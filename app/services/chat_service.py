@@ -1,14 +1,26 @@
+import logging
 from typing import Optional
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema.output_parser import StrOutputParser
 
 from app.db.models import Conversation
+from app.services.chat_transcript import (
+    estimate_tokens,
+    format_transcript,
+    load_chat_messages,
+    message_tokens,
+    summary_batches,
+)
+from app.services.llm_gateway import get_llm_gateway
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# 요약 프롬프트의 고정 지시문 토큰 어림값
+SUMMARY_PROMPT_TOKENS = 120
+
 class ChatService:
     def __init__(self, redis_client: redis.Redis, db_session: AsyncSession):
         self.redis_client = redis_client
@@ -16,7 +28,7 @@ class ChatService:
         settings = get_settings()
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is not set.")
-        self.llm = ChatOpenAI(api_key=settings.openai_api_key, model="gpt-4o-mini", temperature=0)
+        self.llm = get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0)
 
     async def get_previous_session_id_and_update(
         self, user_id: int, current_session_id: str
@@ -32,9 +44,16 @@ class ChatService:
         
         return old_session_id
 
-    async def summarize_conversation_if_needed(self, session_id: str) -> None:
+    async def summarize_conversation_if_needed(self, session_id: str, force: bool = False) -> None:
         """
-        Checks if a conversation needs summarization and performs it.
+        Folds messages newer than the summary watermark into the conversation summary.
+
+        Only unsummarized ChatHistory rows are read and sent to the LLM, split into
+        whole-turn batches under `chat_summary_batch_token_budget`. Unless `force`
+        (e.g. the user moved on to a new session), summarization is skipped while the
+        new messages are below `chat_summary_min_delta_tokens`. Summary jobs are
+        deduplicated per session, so a session the user has already left is always
+        treated as forced even if the forced job was merged into a pending one.
         """
         stmt = select(Conversation).where(Conversation.session_id == session_id)
         result = await self.db_session.execute(stmt)
@@ -43,29 +62,72 @@ class ChatService:
         if not conversation:
             return
 
-        # Check if summarization is needed
-        if conversation.last_message_timestamp and (
-            not conversation.last_message_summarized_at or 
-            conversation.last_message_timestamp > conversation.last_message_summarized_at
-        ):
-            # Extract new messages (this logic assumes all_chat is a structured log)
-            # For simplicity here, we'll just use the whole chat.
-            # A more robust solution would parse messages after the last summary timestamp.
-            full_chat_history = conversation.all_chat or ""
-            previous_summary = conversation.sum_chat or ""
-
-            new_summary = await self._generate_incremental_summary(
-                previous_summary, full_chat_history
+        if not force:
+            force = await self._has_newer_session(conversation)
+
+        settings = get_settings()
+        while True:
+            pending = await self._load_unsummarized_messages(conversation, settings.chat_summary_max_messages)
+            if not pending:
+                return
+            delta_tokens = sum(message_tokens(message) for message in pending)
+            if not force and delta_tokens < settings.chat_summary_min_delta_tokens:
+                return
+
+            for batch in summary_batches(pending, settings.chat_summary_batch_token_budget):
+                await self._apply_summary_batch(conversation, batch)
+
+            if len(pending) < settings.chat_summary_max_messages:
+                return
+            force = True  # 한 번에 못 읽은 나머지도 이어서 요약
+
+    async def _has_newer_session(self, conversation: Conversation) -> bool:
+        stmt = (
+            select(Conversation.session_id)
+            .where(
+                Conversation.user_id == conversation.user_id,
+                Conversation.created_at > conversation.created_at,
             )
+            .limit(1)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.first() is not None
 
-            # Update conversation in DB
-            conversation.sum_chat = new_summary
-            conversation.last_message_summarized_at = conversation.last_message_timestamp
-            self.db_session.add(conversation)
-            await self.db_session.commit()
+    async def _load_unsummarized_messages(self, conversation: Conversation, limit: int) -> list:
+        if conversation.last_summarized_message_id is not None:
+            return await load_chat_messages(
+                self.db_session, conversation.session_id, limit=limit,
+                after_id=conversation.last_summarized_message_id,
+            )
+        # 워터마크 도입 전 세션: 시각 기준으로 한 번만 찾고 이후에는 id 워터마크 사용
+        return await load_chat_messages(
+            self.db_session, conversation.session_id, limit=limit,
+            since=conversation.last_message_summarized_at,
+        )
+
+    async def _apply_summary_batch(self, conversation: Conversation, batch: list) -> None:
+        previous_summary = conversation.sum_chat or ""
+        new_messages = format_transcript(batch)
+
+        new_summary = await self._generate_incremental_summary(previous_summary, new_messages)
+
+        batch_tokens = sum(message_tokens(message) for message in batch)
+        input_tokens = estimate_tokens(previous_summary) + estimate_tokens(new_messages) + SUMMARY_PROMPT_TOKENS
+        conversation.sum_chat = new_summary
+        conversation.last_summarized_message_id = batch[-1].id
+        conversation.last_message_summarized_at = batch[-1].created_at
+        conversation.transcript_tokens = (conversation.transcript_tokens or 0) + batch_tokens
+        conversation.summary_input_tokens = (conversation.summary_input_tokens or 0) + input_tokens
+        self.db_session.add(conversation)
+        await self.db_session.commit()
+
+        logger.info(
+            "대화 요약 %s: 새 메시지 %d개 (%d tokens), 입력 %d tokens (전체 원문 %d tokens)",
+            conversation.session_id, len(batch), batch_tokens, input_tokens, conversation.transcript_tokens,
+        )
 
     async def _generate_incremental_summary(
-        self, old_summary: str, full_chat_history: str
+        self, old_summary: str, new_messages: str
     ) -> str:
         """
         Generates a new summary based on an old summary and new chat messages.
@@ -75,24 +137,24 @@ class ChatService:
                 (
                     "system",
                     "You are a summarization assistant. Your task is to create a concise summary of a user's conversation with a nutritionist chatbot. "
-                    "An optional previous summary is provided. Integrate the key information from the full chat history into the previous summary. "
+                    "An optional previous summary is provided. Integrate the key information from the new messages into the previous summary, "
+                    "keeping everything from the previous summary that is still relevant. "
                     "Focus on the user's goals, preferences, questions, and any important conclusions or recommendations made."
                     "The final summary should be a self-contained, coherent paragraph in Korean."
                 ),
                 ("human", 
                  "Previous Summary:\n"
                  "{old_summary}\n\n"
-                 "Full Chat History (use this to update the summary):\n"
+                 "New Messages (use these to update the summary):\n"
                  "{chat_history}"
                 ),
             ]
         )
         
-        chain = prompt | self.llm | StrOutputParser()
-        
-        new_summary = await chain.ainvoke({
-            "old_summary": old_summary or "이전 요약 없음",
-            "chat_history": full_chat_history,
-        })
+        messages = prompt.format_messages(
+            old_summary=old_summary or "이전 요약 없음",
+            chat_history=new_messages,
+        )
+        response = await get_llm_gateway().ainvoke(self.llm, messages, call_site="chat.summary")
         
-        return new_summary
+        return response.content
@@ -0,0 +1,147 @@
+"""채팅 응답 SSE 스트리밍
+
+채팅 핸들러는 처리 중 생기는 이벤트를 ChatEvents로 보낸다. JSON 응답 경로에서는 ChatEvents()가
+아무것도 하지 않고, `/chat/stream`에서는 큐에 쌓인 이벤트를 바로 SSE 프레임으로 내보낸다.
+
+이벤트 종류
+- health_check: 건강 유해성 체크 결과 (disease_conflict, allergy_conflict)
+- tool_start / tool_end: 에이전트 도구(또는 직접 호출한 추천 서비스) 실행 시작/종료
+- token: 에이전트 LLM 출력 조각. ReAct 형식이므로 "Final Answer:" 이전은 channel="reasoning",
+  이후는 channel="answer"
+- final: 저장까지 끝난 최종 응답 (ChatMessageResponse). 클라이언트는 앞서 받은 token 대신 이것을 표시한다
+  (건강 체크에서 충돌이 나면 에이전트는 취소되고 final은 HEALTH_CONFIRMATION이 된다)
+- error: 처리 실패
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+HEARTBEAT_SECONDS = 15.0
+
+# 클라이언트가 끊겨도 저장까지 마치도록 참조를 유지하는 처리 작업
+_detached_tasks: Set[asyncio.Task] = set()
+
+
+class ChatEvents:
+    """스트리밍 이벤트 전달 (큐가 없으면 아무것도 하지 않는다)"""
+
+    def __init__(self, queue: Optional["asyncio.Queue[Optional[Tuple[str, Any]]]"] = None):
+        self._queue = queue
+
+    @property
+    def streaming(self) -> bool:
+        return self._queue is not None
+
+    async def send(self, event: str, data: Any) -> None:
+        if self._queue is not None:
+            await self._queue.put((event, data))
+
+
+def sse_event(event: str, data: Any) -> str:
+    """SSE 프레임 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def stream_chat_events(
+    run: Callable[[ChatEvents], Awaitable[Any]],
+    heartbeat_seconds: float = HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    run(events)를 백그라운드 작업으로 실행하면서 보낸 이벤트를 SSE로 내보낸다.
+
+    run이 반환한 값(pydantic 모델 또는 dict)은 마지막 final 이벤트가 된다.
+    클라이언트가 연결을 끊어도 run은 취소하지 않는다 (대화 저장까지 마친다).
+    """
+    queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue()
+    task = asyncio.create_task(run(ChatEvents(queue)))
+    _detached_tasks.add(task)
+    task.add_done_callback(_detached_tasks.discard)
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"  # 프록시 유휴 연결 종료 방지
+            continue
+        if item is None:
+            break
+        yield sse_event(*item)
+
+    exc = task.exception()
+    if exc is None:
+        result = task.result()
+        yield sse_event("final", result.model_dump() if hasattr(result, "model_dump") else result)
+    elif isinstance(exc, HTTPException):
+        yield sse_event("error", {"status_code": exc.status_code, "detail": exc.detail})
+    else:
+        logger.error("채팅 스트리밍 처리 실패: %s", exc, exc_info=exc)
+        yield sse_event("error", {"status_code": 500, "detail": "응답 생성 중 오류가 발생했습니다."})
+
+
+class _ReactTokenSplitter:
+    """LLM 호출별 출력에서 "Final Answer:" 이후만 answer 채널로 나눈다"""
+
+    def __init__(self):
+        self._buffers: Dict[str, str] = {}
+
+    def split(self, run_id: str, text: str) -> Tuple[str, str]:
+        before = self._buffers.get(run_id, "")
+        buffer = before + text
+        self._buffers[run_id] = buffer
+        marker = buffer.find(FINAL_ANSWER_MARKER)
+        if marker < 0:
+            return text, ""
+        answer_start = marker + len(FINAL_ANSWER_MARKER)
+        reasoning = buffer[len(before):answer_start] if len(before) < answer_start else ""
+        answer = buffer[max(len(before), answer_start):]
+        if len(before) <= answer_start:
+            answer = answer.lstrip()
+        return reasoning, answer
+
+
+async def run_agent_with_events(agent_run, inputs: Dict[str, Any], events: ChatEvents) -> Dict[str, Any]:
+    """
+    에이전트 실행. 스트리밍이면 LLM 토큰과 도구 시작/종료를 이벤트로 보낸다.
+
+    도구 내부의 LLM 호출(레시피 서비스 등) 토큰은 보내지 않는다.
+    """
+    if not events.streaming:
+        return await agent_run.ainvoke(inputs)
+
+    splitter = _ReactTokenSplitter()
+    active_tools: Set[str] = set()
+    output: Optional[Dict[str, Any]] = None
+    async for event in agent_run.astream_events(inputs):
+        kind = event["event"]
+        run_id = event["run_id"]
+        parents = event.get("parent_ids") or []
+        if kind == "on_tool_start":
+            active_tools.add(run_id)
+            await events.send("tool_start", {"tool": event["name"]})
+        elif kind == "on_tool_end":
+            active_tools.discard(run_id)
+            await events.send("tool_end", {"tool": event["name"]})
+        elif kind == "on_chat_model_stream":
+            if active_tools.intersection(parents):
+                continue
+            text = getattr(event["data"].get("chunk"), "content", "") or ""
+            if not text:
+                continue
+            reasoning, answer = splitter.split(run_id, text)
+            if reasoning:
+                await events.send("token", {"channel": "reasoning", "text": reasoning})
+            if answer:
+                await events.send("token", {"channel": "answer", "text": answer})
+        elif kind == "on_chain_end" and not parents:
+            output = event["data"].get("output")
+    return output or {}
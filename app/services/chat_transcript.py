@@ -0,0 +1,122 @@
+"""채팅 대화 기록 (ChatHistory append-only)
+
+대화 원문은 턴마다 ChatHistory에 두 행(human, ai)을 추가하는 것으로만 저장한다.
+UserConversation은 세션 메타데이터와 요약(sum_chat)만 가지므로 턴당 쓰기 비용이
+대화 길이와 상관없이 일정하고, 대화를 읽을 때는 (session_id, created_at) 인덱스 범위만 읽는다.
+
+예전에는 UserConversation.all_chat에 "Human: ...\\nAI: ...\\n\\n" 형식으로 전체를 이어 붙였다.
+요약 프롬프트는 같은 형식(format_transcript)을 그대로 쓴다.
+
+요약은 증분으로만 한다: UserConversation.last_summarized_message_id 이후의 메시지만 읽어
+턴 단위 배치(summary_batches)로 나눠 이전 요약에 합친다. 토큰 수는 estimate_tokens로 어림한다.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ChatHistory
+
+SPEAKER_LABELS = {"human": "Human", "ai": "AI"}
+
+
+def chat_turn_rows(user_id: int, session_id: str, human_message: str, ai_message: str) -> List[ChatHistory]:
+    """한 턴을 ChatHistory 두 행으로 (human → ai 순서로 추가해야 id 순서가 대화 순서)"""
+    return [
+        ChatHistory(user_id=user_id, session_id=session_id, message_type="human", content=human_message),
+        ChatHistory(user_id=user_id, session_id=session_id, message_type="ai", content=ai_message),
+    ]
+
+
+def chat_messages_query(
+    session_id: str,
+    since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Select:
+    """
+    세션의 메시지를 대화 순서로 조회 (idx_chat_session_created 범위 스캔)
+
+    Args:
+        session_id: 대화 세션 ID
+        since: 이 시각 이후(포함) 메시지만
+        limit: 최대 개수 (None이면 전체)
+        after_id: 이 ChatHistory.id보다 뒤의 메시지만 (요약 워터마크)
+    """
+    query = select(ChatHistory).where(ChatHistory.session_id == session_id)
+    if since is not None:
+        query = query.where(ChatHistory.created_at >= since)
+    if after_id is not None:
+        query = query.where(ChatHistory.id > after_id)
+    query = query.order_by(ChatHistory.created_at, ChatHistory.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+async def load_chat_messages(
+    session: AsyncSession,
+    session_id: str,
+    since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> List[ChatHistory]:
+    result = await session.execute(chat_messages_query(session_id, since, limit, after_id))
+    return list(result.scalars().all())
+
+
+def format_transcript(messages: Sequence[ChatHistory]) -> str:
+    """메시지 목록 → 예전 all_chat과 같은 "Human: ...\\nAI: ...\\n\\n" 텍스트"""
+    lines = []
+    for message in messages:
+        lines.append(f"{SPEAKER_LABELS.get(message.message_type, message.message_type)}: {message.content}\n")
+        if message.message_type == "ai":
+            lines.append("\n")
+    return "".join(lines)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    토큰 수 어림값 (gpt-4o 계열 기준)
+
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 약 1토큰으로 센다.
+    인코딩 파일을 받아야 하는 tiktoken 없이 요청 경로에서 바로 쓸 수 있도록 한 근사치다.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def message_tokens(message: ChatHistory) -> int:
+    """format_transcript 한 줄 기준 토큰 어림값 (화자 라벨 포함)"""
+    return estimate_tokens(message.content) + 2
+
+
+def summary_batches(messages: Iterable[ChatHistory], token_budget: int) -> List[List[ChatHistory]]:
+    """
+    요약할 메시지를 턴(human → ai) 단위로 묶어 배치당 token_budget 이하로 나눈다.
+
+    턴을 쪼개지 않으므로 한 턴이 예산보다 크면 그 턴 하나가 한 배치가 된다.
+    """
+    turns: List[List[ChatHistory]] = []
+    for message in messages:
+        if message.message_type == "human" or not turns or turns[-1][-1].message_type == "ai":
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+
+    batches: List[List[ChatHistory]] = []
+    batch_tokens = 0
+    for turn in turns:
+        tokens = sum(message_tokens(message) for message in turn)
+        if batches and batch_tokens + tokens <= token_budget:
+            batches[-1].extend(turn)
+            batch_tokens += tokens
+        else:
+            batches.append(list(turn))
+            batch_tokens = tokens
+    return batches
@@ -0,0 +1,402 @@
+"""사용자 일별 섭취 영양 집계 서비스 - UserDailyNutrition 테이블
+
+대시보드(/meals/dashboard-stats, /meals/score-detail, /users/me/status,
+/recipes/recommendations)가 요청마다 UserFoodHistory × health_score × food_nutrients를
+다시 합산하지 않도록 (user_id, 날짜, 끼니) 단위 합계를 유지한다.
+
+- 음식 기록 저장/삭제 경로에서 `apply_meal_to_daily_nutrition`을 같은 세션(트랜잭션)으로 호출
+- 집계가 어긋났을 때는 `rebuild_daily_nutrition` (python -m app.commands.rebuild_daily_nutrition)
+- 음식 한 건의 영양소 = food_nutrients 값 × (portion_size_g / reference_value)
+  (기준량이 없으면 100g, 섭취량이 없으면 기준량 1회분으로 본다)
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Select, and_, delete, select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import HealthScore, UserDailyNutrition, UserFoodHistory
+from app.db.models_food_nutrients import FoodNutrient
+from app.services.nutrient_matrix import get_nutrient_matrix_cache
+from app.utils.date_window import day_window, local_today, to_local_date
+
+logger = logging.getLogger(__name__)
+
+# 집계하는 영양소 (UserDailyNutrition 컬럼명 = FoodNutrient 속성명)
+ROLLUP_NUTRIENTS: Tuple[str, ...] = (
+    "protein",
+    "carb",
+    "fat",
+    "fiber",
+    "sodium",
+    "saturated_fat",
+    "added_sugar",
+    "vitamin_a",
+    "vitamin_c",
+    "calcium",
+    "iron",
+    "potassium",
+    "magnesium",
+)
+
+DEFAULT_REFERENCE_G = 100.0
+
+
+@dataclass
+class MealContribution:
+    """음식 기록 1건이 일별 집계에 더하는 값"""
+
+    food_name: str
+    kcal: int = 0
+    final_score: Optional[int] = None
+    nutrients: Dict[str, float] = field(default_factory=dict)
+
+
+def meal_contribution(
+    food_name: str,
+    portion_size_g: Optional[float],
+    kcal: Optional[int],
+    final_score: Optional[int],
+    nutrient: Optional[Any],
+) -> MealContribution:
+    """
+    음식 기록 1건의 기여분 계산
+
+    Args:
+        food_name: 음식명 (top_foods 집계용)
+        portion_size_g: 섭취량 (g)
+        kcal: health_score.kcal (이미 실제 섭취량 기준)
+        final_score: health_score.final_score
+        nutrient: FoodNutrient (없으면 영양소 0)
+    """
+    nutrients = {name: 0.0 for name in ROLLUP_NUTRIENTS}
+    if nutrient is not None:
+        reference_g = float(nutrient.reference_value or 0) or DEFAULT_REFERENCE_G
+        ratio = float(portion_size_g) / reference_g if portion_size_g else 1.0
+        for name in ROLLUP_NUTRIENTS:
+            nutrients[name] = float(getattr(nutrient, name, None) or 0) * ratio
+
+    return MealContribution(
+        food_name=food_name,
+        kcal=int(kcal or 0),
+        final_score=final_score,
+        nutrients=nutrients,
+    )
+
+
+def apply_contribution(row: UserDailyNutrition, contribution: MealContribution, sign: int = 1) -> None:
+    """집계 행에 기여분을 더하거나(sign=1) 뺀다(sign=-1)"""
+    row.item_count = max(0, (row.item_count or 0) + sign)
+    row.kcal = (row.kcal or 0) + sign * contribution.kcal
+    for name, value in contribution.nutrients.items():
+        current = float(getattr(row, name) or 0)
+        setattr(row, name, max(0.0, round(current + sign * value, 2)))
+
+    if contribution.final_score is not None:
+        row.score_sum = (row.score_sum or 0) + sign * contribution.final_score
+        row.score_count = max(0, (row.score_count or 0) + sign)
+
+    # JSON 컬럼은 새 dict를 할당해야 변경이 감지된다
+    top_foods = dict(row.top_foods or {})
+    count = top_foods.get(contribution.food_name, 0) + sign
+    if count > 0:
+        top_foods[contribution.food_name] = count
+    else:
+        top_foods.pop(contribution.food_name, None)
+    row.top_foods = top_foods
+
+
+async def apply_meal_to_daily_nutrition(
+    session: AsyncSession,
+    history: UserFoodHistory,
+    health_score: Optional[HealthScore],
+    nutrient: Optional[FoodNutrient] = None,
+    remove: bool = False,
+) -> None:
+    """
+    음식 기록 저장/삭제를 일별 집계에 반영 (commit은 호출자가 수행)
+
+    Args:
+        session: 기록 저장/삭제와 같은 DB 세션
+        history: 저장(또는 삭제)할 UserFoodHistory
+        health_score: 함께 저장(또는 삭제)되는 HealthScore (없으면 None)
+        nutrient: 이미 조회한 FoodNutrient (None이면 food_id로 조회)
+        remove: True면 삭제 반영
+    """
+    if nutrient is None:
+        nutrient = (
+            await session.execute(select(FoodNutrient).where(FoodNutrient.food_id == history.food_id))
+        ).scalar_one_or_none()
+
+    await apply_meals_to_daily_nutrition(session, [(history, health_score, nutrient)], remove=remove)
+
+
+async def apply_meals_to_daily_nutrition(
+    session: AsyncSession,
+    entries: Sequence[Tuple[UserFoodHistory, Optional[HealthScore], Optional[FoodNutrient]]],
+    remove: bool = False,
+) -> None:
+    """
+    여러 음식 기록을 일별 집계에 한 번에 반영 (commit은 호출자가 수행)
+
+    건수와 관계없이 집계 행 보장 INSERT 1번 + 행 잠금 SELECT 1번으로 처리한다.
+
+    Args:
+        session: 기록 저장/삭제와 같은 DB 세션
+        entries: (UserFoodHistory, HealthScore 또는 None, FoodNutrient 또는 None) 목록
+        remove: True면 삭제 반영
+    """
+    contributions: Dict[Tuple[int, date, str], List[MealContribution]] = defaultdict(list)
+    for history, health_score, nutrient in entries:
+        intake_date = to_local_date(history.consumed_at) if history.consumed_at else local_today()
+        key = (history.user_id, intake_date, history.meal_type or "lunch")
+        contributions[key].append(
+            meal_contribution(
+                food_name=history.food_name,
+                portion_size_g=history.portion_size_g,
+                kcal=health_score.kcal if health_score else None,
+                final_score=health_score.final_score if health_score else None,
+                nutrient=nutrient,
+            )
+        )
+    if not contributions:
+        return
+
+    # 행이 없으면 만들고, 있으면 행 잠금만 잡는다 (동시 저장 시 첫 INSERT 충돌 방지)
+    await session.execute(ensure_daily_rows_statement(contributions))
+
+    rows = (
+        await session.execute(
+            select(UserDailyNutrition)
+            .where(
+                tuple_(
+                    UserDailyNutrition.user_id,
+                    UserDailyNutrition.intake_date,
+                    UserDailyNutrition.meal_type,
+                ).in_(list(contributions))
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().all()
+
+    sign = -1 if remove else 1
+    for row in rows:
+        for contribution in contributions[(row.user_id, row.intake_date, row.meal_type)]:
+            apply_contribution(row, contribution, sign=sign)
+        if row.item_count == 0:
+            await session.delete(row)
+    await session.flush()
+
+
+def ensure_daily_rows_statement(keys: Iterable[Tuple[int, date, str]]):
+    """(user_id, 날짜, 끼니) 집계 행을 없으면 만드는 multi-row INSERT ... ON DUPLICATE KEY UPDATE"""
+    statement = mysql_insert(UserDailyNutrition).values([
+        {"user_id": user_id, "intake_date": intake_date, "meal_type": meal_type}
+        for user_id, intake_date, meal_type in keys
+    ])
+    return statement.on_duplicate_key_update(item_count=UserDailyNutrition.item_count)
+
+
+# ============================================================================
+# 조회
+# ============================================================================
+
+@dataclass
+class DailyNutritionSummary:
+    """기간(하루 또는 여러 날) 합계"""
+
+    item_count: int = 0
+    kcal: int = 0
+    score_sum: int = 0
+    score_count: int = 0
+    nutrients: Dict[str, float] = field(default_factory=lambda: {name: 0.0 for name in ROLLUP_NUTRIENTS})
+    top_foods: Counter = field(default_factory=Counter)
+
+    @property
+    def avg_score(self) -> Optional[float]:
+        """final_score 평균 (기록이 없으면 None)"""
+        return self.score_sum / self.score_count if self.score_count else None
+
+    def add(self, row: UserDailyNutrition) -> None:
+        self.item_count += row.item_count or 0
+        self.kcal += row.kcal or 0
+        self.score_sum += row.score_sum or 0
+        self.score_count += row.score_count or 0
+        for name in ROLLUP_NUTRIENTS:
+            self.nutrients[name] += float(getattr(row, name) or 0)
+        self.top_foods.update(row.top_foods or {})
+
+
+def daily_nutrition_rows_query(user_id: int, start_date: date, end_date: date) -> Select:
+    """[start_date, end_date] 기간의 집계 행 조회 쿼리 (PK range scan)"""
+    return (
+        select(UserDailyNutrition)
+        .where(
+            and_(
+                UserDailyNutrition.user_id == user_id,
+                UserDailyNutrition.intake_date >= start_date,
+                UserDailyNutrition.intake_date <= end_date,
+            )
+        )
+        .order_by(UserDailyNutrition.intake_date)
+    )
+
+
+async def get_daily_nutrition_rows(
+    session: AsyncSession,
+    user_id: int,
+    start_date: date,
+    end_date: date,
+) -> List[UserDailyNutrition]:
+    """[start_date, end_date] 기간의 집계 행 (날짜순)"""
+    stmt = daily_nutrition_rows_query(user_id, start_date, end_date)
+    return list((await session.execute(stmt)).scalars().all())
+
+
+def summarize_by_date(rows: Iterable[UserDailyNutrition]) -> Dict[date, DailyNutritionSummary]:
+    """집계 행을 날짜별 합계로 (끼니 합산)"""
+    by_date: Dict[date, DailyNutritionSummary] = defaultdict(DailyNutritionSummary)
+    for row in rows:
+        by_date[row.intake_date].add(row)
+    return by_date
+
+
+async def get_daily_summary(session: AsyncSession, user_id: int, day: date) -> DailyNutritionSummary:
+    """하루 합계"""
+    return summarize_by_date(await get_daily_nutrition_rows(session, user_id, day, day)).get(
+        day, DailyNutritionSummary()
+    )
+
+
+async def get_top_foods(session: AsyncSession, user_id: int, limit: int = 5) -> List[Tuple[str, int]]:
+    """전체 기간 자주 먹은 음식 (집계 행의 top_foods 합산)"""
+    stmt = select(UserDailyNutrition.top_foods).where(UserDailyNutrition.user_id == user_id)
+    counts: Counter = Counter()
+    for top_foods in (await session.execute(stmt)).scalars():
+        counts.update(top_foods or {})
+    return counts.most_common(limit)
+
+
+# ============================================================================
+# 재구축 (backfill)
+# ============================================================================
+
+async def rebuild_daily_nutrition(
+    session: AsyncSession,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """
+    한 사용자의 집계를 UserFoodHistory에서 다시 계산 (commit은 호출자가 수행)
+
+    증분 갱신과 같은 규칙(기준량 대비 배수, 기록별 반올림)으로 계산하므로 결과가 일치한다.
+    영양소는 영양소 행렬(NutrientMatrix)에서 가져온다.
+
+    Returns:
+        생성된 집계 행 수
+    """
+    history_filter = [UserFoodHistory.user_id == user_id]
+    rollup_filter = [UserDailyNutrition.user_id == user_id]
+    if start_date:
+        history_filter.append(UserFoodHistory.consumed_at >= day_window(start_date).start)
+        rollup_filter.append(UserDailyNutrition.intake_date >= start_date)
+    if end_date:
+        history_filter.append(UserFoodHistory.consumed_at < day_window(end_date).end)
+        rollup_filter.append(UserDailyNutrition.intake_date <= end_date)
+
+    stmt = (
+        select(
+            UserFoodHistory.food_id,
+            UserFoodHistory.food_name,
+            UserFoodHistory.consumed_at,
+            UserFoodHistory.meal_type,
+            UserFoodHistory.portion_size_g,
+            HealthScore.kcal,
+            HealthScore.final_score,
+        )
+        .outerjoin(
+            HealthScore,
+            and_(
+                HealthScore.history_id == UserFoodHistory.history_id,
+                HealthScore.user_id == UserFoodHistory.user_id,
+            ),
+        )
+        .where(and_(*history_filter), UserFoodHistory.consumed_at.is_not(None))
+    )
+
+    # 영양소는 FoodNutrient ORM 행 대신 영양소 행렬에서 청크 단위로 gather + 합산한다
+    # (스트리밍 중에는 같은 세션으로 다른 쿼리를 실행할 수 없으므로 먼저 최신 버전을 확인)
+    matrix = await get_nutrient_matrix_cache().get(session, force=True)
+    rows: Dict[Tuple[date, str], UserDailyNutrition] = {}
+    nutrient_totals: Dict[Tuple[date, str], np.ndarray] = {}
+
+    result = await session.stream(stmt.execution_options(yield_per=1000))
+    async for records in result.partitions():
+        chunk_keys: Dict[Tuple[date, str], int] = {}
+        positions: List[int] = []
+        for record in records:
+            key = (to_local_date(record.consumed_at), record.meal_type or "lunch")
+            positions.append(chunk_keys.setdefault(key, len(chunk_keys)))
+            row = rows.get(key)
+            if row is None:
+                row = _empty_row(user_id, *key)
+                rows[key] = row
+            # kcal, 점수, top_foods (영양소는 아래에서 한 번에)
+            apply_contribution(
+                row,
+                meal_contribution(record.food_name, None, record.kcal, record.final_score, None),
+            )
+
+        # 증분 갱신(apply_contribution)과 같게 기록별로 소수 둘째 자리에서 반올림 후 합산
+        scaled = np.round(
+            matrix.scale(
+                [record.food_id for record in records],
+                [record.portion_size_g for record in records],
+                ROLLUP_NUTRIENTS,
+            ),
+            2,
+        )
+        chunk_totals = np.zeros((len(chunk_keys), len(ROLLUP_NUTRIENTS)))
+        np.add.at(chunk_totals, positions, scaled)
+        for key, position in chunk_keys.items():
+            nutrient_totals[key] = nutrient_totals.get(key, 0.0) + chunk_totals[position]
+
+    for key, totals in nutrient_totals.items():
+        for name, value in zip(ROLLUP_NUTRIENTS, totals):
+            setattr(rows[key], name, round(float(value), 2))
+
+    await session.execute(delete(UserDailyNutrition).where(and_(*rollup_filter)))
+    session.add_all(rows.values())
+    await session.flush()
+    return len(rows)
+
+
+async def get_user_ids_with_history(session: AsyncSession) -> Sequence[int]:
+    """섭취 기록이 있는 사용자 ID 목록"""
+    stmt = select(UserFoodHistory.user_id).distinct().order_by(UserFoodHistory.user_id)
+    return list((await session.execute(stmt)).scalars().all())
+
+
+def _empty_row(user_id: int, intake_date: date, meal_type: str) -> UserDailyNutrition:
+    row = UserDailyNutrition(
+        user_id=user_id,
+        intake_date=intake_date,
+        meal_type=meal_type,
+        item_count=0,
+        kcal=0,
+        score_sum=0,
+        score_count=0,
+        top_foods={},
+    )
+    for name in ROLLUP_NUTRIENTS:
+        setattr(row, name, 0.0)
+    return row
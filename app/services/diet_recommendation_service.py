@@ -1,9 +1,9 @@
 """식단 추천 서비스 - GPT 기반 건강 목표별 식단 추천"""
 from typing import Optional
-from openai import AsyncOpenAI
 
 from app.core.config import get_settings
 from app.db.models import User
+from app.services.llm_gateway import get_llm_gateway
 
 settings = get_settings()
 
@@ -14,7 +14,7 @@ class DietRecommendationService:
     def __init__(self):
         if not settings.openai_api_key:
             raise ValueError("❌ OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.gateway = get_llm_gateway()
     
     def calculate_bmr(self, gender: str, age: int, weight: float, height: Optional[float] = None) -> float:
         """
@@ -231,7 +231,8 @@ class DietRecommendationService:
         
         # 6. GPT API 호출
         print(f"🤖 GPT에게 식단 추천 요청 중...")
-        response = await self.client.chat.completions.create(
+        response = await self.gateway.chat_completion(
+            call_site="diet.recommend",
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "당신은 전문 영양사입니다. 사용자의 건강 목표에 맞는 식단을 추천합니다."},
@@ -3,15 +3,27 @@ import json
 from typing import Optional, Dict, Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 
 from app.core.config import get_settings
 from app.db.models_food_nutrients import FoodNutrient
+from app.services.llm_gateway import get_llm_gateway
+from app.utils.single_flight import SingleFlight
 
 settings = get_settings()
 
 
+def parse_json_response(content: str) -> Dict[str, Any]:
+    """LLM 응답 본문을 JSON으로 파싱 (마크다운 코드 블록 제거, 실패 시 JSONDecodeError)"""
+    response_text = content.strip()
+    if response_text.startswith("```"):
+        response_text = response_text.split("```")[1]
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+        response_text = response_text.strip()
+    return json.loads(response_text)
+
+
 class FoodDBFinder:
     """LangChain을 활용한 의미 기반 음식 DB 검색"""
     
@@ -19,11 +31,9 @@ class FoodDBFinder:
         if not settings.openai_api_key:
             raise ValueError("❌ OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
         
-        self.llm = ChatOpenAI(
-            api_key=settings.openai_api_key,
-            model="gpt-4o-mini",
-            temperature=0.3,  # 낮은 temperature로 일관성 있는 판단
-        )
+        # temperature=0으로 일관성 있는 판단 (게이트웨이 응답 캐시 조건)
+        self.llm = get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0)
+        self._validate_flights: SingleFlight[Dict[str, Any]] = SingleFlight("food_db_finder.validate")
     
     async def find_exact_match(
         self,
@@ -200,17 +210,10 @@ class FoodDBFinder:
         ]
         
         try:
-            response = await self.llm.ainvoke(messages)
-            response_text = response.content.strip()
-            
-            # JSON 파싱
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            result = json.loads(response_text)
+            response = await get_llm_gateway().ainvoke(
+                self.llm, messages, call_site="food_db_finder.estimate", validate=parse_json_response
+            )
+            result = parse_json_response(response.content)
             
             print(f"✅ [LangChain] 영양성분 추정 완료: {result['calories']} kcal (신뢰도: {result['confidence']}%)")
             print(f"📝 [LangChain] 추정 근거: {result['estimation_note']}")
@@ -303,17 +306,10 @@ class FoodDBFinder:
         ]
         
         try:
-            response = await self.llm.ainvoke(messages)
-            response_text = response.content.strip()
-            
-            # JSON 파싱
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            result = json.loads(response_text)
+            response = await get_llm_gateway().ainvoke(
+                self.llm, messages, call_site="food_db_finder.calculate", validate=parse_json_response
+            )
+            result = parse_json_response(response.content)
             
             print(f"✅ [LangChain] 칼로리 계산 완료: {result['calories']} kcal")
             print(f"📊 [LangChain] 계산 방식: {result['calculation_method']}")
@@ -355,6 +351,8 @@ class FoodDBFinder:
         """
         LLM을 사용하여 음식명의 의미를 분석하고 매칭 검증
         
+        같은 음식명 + 같은 후보 목록으로 동시에 들어온 검증은 한 번의 LLM 호출을 공유한다.
+        
         Args:
             detected_food_name: 감지된 음식명
             candidates: DB 후보 음식 리스트
@@ -362,6 +360,17 @@ class FoodDBFinder:
         Returns:
             검증 결과 딕셔너리
         """
+        flight_key = (detected_food_name, tuple(candidate.food_id for candidate in candidates))
+        return await self._validate_flights.do(
+            flight_key, lambda: self._request_llm_validation(detected_food_name, candidates)
+        )
+    
+    async def _request_llm_validation(
+        self,
+        detected_food_name: str,
+        candidates: list
+    ) -> Dict[str, Any]:
+        """_validate_with_llm의 실제 LLM 호출"""
         # 후보 음식 정보 구성
         candidates_info = []
         for i, candidate in enumerate(candidates, 1):
@@ -420,18 +429,10 @@ class FoodDBFinder:
         ]
         
         try:
-            response = await self.llm.ainvoke(messages)
-            response_text = response.content.strip()
-            
-            # JSON 파싱
-            # 코드 블록 제거
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            result = json.loads(response_text)
+            response = await get_llm_gateway().ainvoke(
+                self.llm, messages, call_site="food_db_finder.validate", validate=parse_json_response
+            )
+            result = parse_json_response(response.content)
             
             print(f"🤖 [LLM 응답] found={result.get('found')}, confidence={result.get('confidence')}%")
             print(f"📝 [LLM 이유] {result.get('reason')}")
@@ -440,7 +441,7 @@ class FoodDBFinder:
             
         except json.JSONDecodeError as e:
             print(f"❌ [LLM] JSON 파싱 실패: {e}")
-            print(f"📄 [LLM 응답] {response_text}")
+            print(f"📄 [LLM 응답] {response.content}")
             return {
                 "found": False,
                 "confidence": 0,
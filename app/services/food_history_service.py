@@ -1,11 +1,13 @@
 """음식 섭취 기록 서비스 - UserFoodHistory 테이블"""
 from datetime import datetime, date
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import Row, Select, insert, select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import UserFoodHistory, Food
+from app.db.models import UserFoodHistory, Food, HealthScore
+from app.utils.date_window import DateWindow, day_window
+from app.utils.history_cursor import HistoryCursor
 
 
 async def create_food_history(
@@ -47,6 +49,69 @@ async def create_food_history(
     return history
 
 
+async def bulk_create_food_history(
+    session: AsyncSession,
+    histories: Sequence[UserFoodHistory],
+) -> List[UserFoodHistory]:
+    """
+    음식 섭취 기록 여러 건을 multi-row INSERT 한 번으로 저장
+    
+    MySQL은 INSERT ... RETURNING이 없으므로 lastrowid(첫 행 ID)부터 방금 넣은 행의
+    history_id를 한 번 더 조회해 입력 순서대로 채운다. 같은 INSERT의 행은 입력 순서대로
+    연속된 ID를 받으므로 [lastrowid, lastrowid + n - 1] 구간으로 다시 찾는다.
+    consumed_at은 DATETIME(초 단위)로 저장되므로 조회 조건에 쓰지 않는다.
+    
+    Args:
+        session: DB 세션
+        histories: 저장할 UserFoodHistory 객체 목록 (세션에 add 하지 않은 상태)
+    
+    Returns:
+        history_id가 채워진 histories
+    """
+    if not histories:
+        return []
+    
+    now = datetime.now().replace(microsecond=0)
+    for history in histories:
+        history.consumed_at = history.consumed_at or now
+        history.meal_type = history.meal_type or "lunch"
+    
+    result = await session.execute(
+        insert(UserFoodHistory).values([
+            {
+                "user_id": history.user_id,
+                "food_id": history.food_id,
+                "food_name": history.food_name,
+                "meal_type": history.meal_type,
+                "consumed_at": history.consumed_at,
+                "portion_size_g": history.portion_size_g,
+            }
+            for history in histories
+        ])
+    )
+    first_id = result.lastrowid
+    
+    id_result = await session.execute(
+        select(UserFoodHistory.history_id)
+        .where(
+            and_(
+                UserFoodHistory.history_id.between(first_id, first_id + len(histories) - 1),
+                UserFoodHistory.user_id.in_({history.user_id for history in histories}),
+            )
+        )
+        .order_by(UserFoodHistory.history_id)
+    )
+    history_ids = list(id_result.scalars().all())
+    if len(history_ids) != len(histories):
+        raise RuntimeError(
+            f"저장한 음식 기록 ID 조회 실패: {len(histories)}건 저장, {len(history_ids)}건 조회"
+        )
+    
+    for history, history_id in zip(histories, history_ids):
+        history.history_id = history_id
+    return list(histories)
+
+
 async def get_food_history_by_id(
     session: AsyncSession,
     history_id: int,
@@ -107,6 +172,19 @@ async def get_user_food_history(
     return list(result.scalars().all())
 
 
+def food_history_window_query(user_id: int, window: DateWindow) -> Select:
+    """
+    기간 내 음식 섭취 기록 조회 쿼리 (최신순)
+    
+    (user_id, consumed_at) 인덱스 range scan으로 처리되도록 컬럼에 함수를 씌우지 않는다.
+    """
+    return (
+        select(UserFoodHistory)
+        .where(and_(UserFoodHistory.user_id == user_id, window.clause(UserFoodHistory.consumed_at)))
+        .order_by(UserFoodHistory.consumed_at.desc())
+    )
+
+
 async def get_daily_food_history(
     session: AsyncSession,
     user_id: int,
@@ -123,15 +201,12 @@ async def get_daily_food_history(
     Returns:
         해당 날짜의 UserFoodHistory 리스트
     """
-    start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_of_day = date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    # 사용자 시간대 기준 하루를 반열린 구간 [00:00, 다음 날 00:00)으로 조회
+    window = day_window(date.date() if isinstance(date, datetime) else date)
+    query = food_history_window_query(user_id, window)
     
-    return await get_user_food_history(
-        session=session,
-        user_id=user_id,
-        start_date=start_of_day,
-        end_date=end_of_day,
-    )
+    result = await session.execute(query)
+    return list(result.scalars().all())
 
 
 async def update_food_history(
@@ -223,16 +298,63 @@ async def get_food_history_count(
     return result.scalar() or 0
 
 
+async def count_food_history_capped(
+    session: AsyncSession,
+    user_id: int,
+    cap: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Tuple[int, bool]:
+    """
+    사용자의 음식 섭취 기록 근사 개수 (최대 cap개까지만 센다)
+    
+    기록이 수만 건인 사용자도 인덱스에서 cap+1행만 읽고 멈추므로 비용이 일정하다.
+    
+    Returns:
+        (개수, cap을 넘었는지) 튜플 - 넘었으면 개수는 cap ("cap+"로 표시)
+    """
+    query = select(UserFoodHistory.history_id).where(UserFoodHistory.user_id == user_id)
+    if start_date:
+        query = query.where(UserFoodHistory.consumed_at >= start_date)
+    if end_date:
+        query = query.where(UserFoodHistory.consumed_at <= end_date)
+    
+    limited = query.limit(cap + 1).subquery()
+    result = await session.execute(select(func.count()).select_from(limited))
+    count = result.scalar() or 0
+    return min(count, cap), count > cap
+
+
+def food_history_page_query(
+    query: Select,
+    cursor: Optional[HistoryCursor],
+    limit: int,
+) -> Select:
+    """
+    (consumed_at, history_id) 내림차순 keyset 페이지 쿼리
+    
+    limit+1개를 조회하므로 결과가 limit개보다 많으면 다음 페이지가 있다.
+    consumed_at이 없는 기록은 정렬 키가 없으므로 페이지에 포함하지 않는다.
+    """
+    query = query.where(UserFoodHistory.consumed_at.is_not(None))
+    if cursor is not None:
+        query = query.where(cursor.before(UserFoodHistory.consumed_at, UserFoodHistory.history_id))
+    return query.order_by(
+        UserFoodHistory.consumed_at.desc(),
+        UserFoodHistory.history_id.desc(),
+    ).limit(limit + 1)
+
+
 async def get_user_food_history_with_details(
     session: AsyncSession,
     user_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     limit: int = 100,
-    offset: int = 0,
-) -> Tuple[List[dict], int]:
+    cursor: Optional[HistoryCursor] = None,
+) -> Tuple[List[dict], Optional[str]]:
     """
-    사용자의 음식 섭취 기록을 Food 정보와 함께 조회
+    사용자의 음식 섭취 기록을 Food 정보와 함께 조회 (keyset 페이지)
     
     Args:
         session: DB 세션
@@ -240,14 +362,12 @@ async def get_user_food_history_with_details(
         start_date: 시작 날짜 (선택)
         end_date: 종료 날짜 (선택)
         limit: 최대 결과 개수
-        offset: 결과 오프셋
+        cursor: 이전 페이지가 돌려준 커서 (None이면 첫 페이지)
     
     Returns:
-        (기록 리스트, 전체 개수) 튜플
+        (기록 리스트, 다음 페이지 커서) 튜플 - 마지막 페이지면 커서는 None
+        (전체 개수가 필요하면 count_food_history_capped를 따로 호출)
     """
-    # 전체 개수 조회
-    total = await get_food_history_count(session, user_id, start_date, end_date)
-    
     # LEFT JOIN으로 Food 정보와 함께 조회
     query = (
         select(
@@ -273,18 +393,12 @@ async def get_user_food_history_with_details(
     if end_date:
         query = query.where(UserFoodHistory.consumed_at <= end_date)
     
-    # 최신순 정렬
-    query = query.order_by(UserFoodHistory.consumed_at.desc())
-    
-    # 페이지네이션
-    query = query.limit(limit).offset(offset)
-    
-    result = await session.execute(query)
+    result = await session.execute(food_history_page_query(query, cursor, limit))
     rows = result.all()
     
     # 딕셔너리 리스트로 변환
     histories = []
-    for row in rows:
+    for row in rows[:limit]:
         histories.append({
             "history_id": row.history_id,
             "user_id": row.user_id,
@@ -299,5 +413,48 @@ async def get_user_food_history_with_details(
             "image_ref": row.image_ref,
         })
     
-    return histories, total
+    next_cursor = HistoryCursor.of(histories[-1]).encode() if len(rows) > limit else None
+    return histories, next_cursor
+
+
+def food_history_export_query(user_id: int) -> Select:
+    """내보내기용 전체 기록 쿼리 (건강 점수 포함, 최신순)"""
+    return (
+        select(
+            UserFoodHistory.history_id,
+            UserFoodHistory.consumed_at,
+            UserFoodHistory.meal_type,
+            UserFoodHistory.food_id,
+            UserFoodHistory.food_name,
+            UserFoodHistory.portion_size_g,
+            HealthScore.kcal,
+            HealthScore.final_score,
+            HealthScore.food_grade,
+        )
+        .outerjoin(
+            HealthScore,
+            and_(
+                HealthScore.history_id == UserFoodHistory.history_id,
+                HealthScore.user_id == UserFoodHistory.user_id,
+            ),
+        )
+        .where(UserFoodHistory.user_id == user_id)
+        .order_by(UserFoodHistory.consumed_at.desc(), UserFoodHistory.history_id.desc())
+    )
+
 
+async def stream_food_history(
+    session: AsyncSession,
+    user_id: int,
+    chunk_size: int = 1000,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    사용자의 전체 기록을 chunk_size행씩 순회
+    
+    서버 측 커서(session.stream + yield_per)로 읽으므로 기록 수와 상관없이
+    메모리에는 한 청크만 올라온다.
+    """
+    stmt = food_history_export_query(user_id).execution_options(yield_per=chunk_size)
+    result = await session.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
@@ -1,15 +1,17 @@
 """음식 매칭 서비스 - GPT 추천 음식을 food_nutrients DB와 매칭"""
-from typing import Optional, List, Dict, Union
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Sequence, Tuple, Union
 import json
 from sqlalchemy import select, or_, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 import re
 
 from app.db.models_food_nutrients import FoodNutrient
 from app.db.models_user_contributed import UserContributedFood
 from app.core.config import get_settings
+from app.services.food_search_index import IndexedFood, get_food_search_index
+from app.services.llm_gateway import get_llm_gateway
 
 settings = get_settings()
 
@@ -36,6 +38,20 @@ def normalize_food_name(food_name: str, ingredients: List[str] = None) -> str:
     return " ".join(food_name.split())
 
 
+@dataclass
+class FoodMatchQuery:
+    """일괄 매칭(match_foods_to_db) 입력 항목"""
+
+    food_name: str
+    ingredients: List[str] = field(default_factory=list)
+    food_class_hint: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, Tuple[str, ...], Optional[str]]:
+        """동일 요청 중복 제거용 키"""
+        return (normalize_food_name(self.food_name), tuple(self.ingredients), self.food_class_hint)
+
+
 class FoodMatchingService:
     """GPT 추천 음식을 DB의 실제 음식과 매칭하는 서비스"""
     
@@ -81,11 +97,8 @@ class FoodMatchingService:
     
     def __init__(self):
         if settings.openai_api_key:
-            self.llm = ChatOpenAI(
-                api_key=settings.openai_api_key,
-                model="gpt-4o-mini",
-                temperature=0.2,
-            )
+            # 같은 입력에 같은 답을 주도록 temperature=0 (게이트웨이 응답 캐시 조건)
+            self.llm = get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0)
         else:
             self.llm = None
     
@@ -118,10 +131,10 @@ class FoodMatchingService:
         """
         
         try:
-            response = await self.llm.ainvoke([
+            response = await get_llm_gateway().ainvoke(self.llm, [
                 SystemMessage(content="당신은 식품 영양 전문가입니다. 정확한 중량을 JSON으로 반환하세요."),
                 HumanMessage(content=prompt)
-            ])
+            ], call_site="food_matching.interpret_portion", validate=json.loads)
             data = json.loads(response.content)
             return float(data.get("weight_g", 100.0))
         except Exception as e:
@@ -195,6 +208,175 @@ class FoodMatchingService:
         print(f"❌ 매칭 실패: '{food_name}'에 대한 적합한 음식을 찾을 수 없음")
         return None
     
+    async def match_foods_to_db(
+        self,
+        session: AsyncSession,
+        items: Sequence[Union[FoodMatchQuery, str]],
+        user_id: int = None
+    ) -> List[Optional[Union[FoodNutrient, UserContributedFood]]]:
+        """
+        여러 음식을 한 번에 매칭 (match_food_to_db의 일괄 버전)
+        
+        매칭 우선순위는 match_food_to_db와 동일하지만 단계별로 모든 음식을 함께 처리해
+        음식 개수와 무관하게 DB 왕복 횟수가 일정하다.
+        1. 정확한 이름 매칭: 모든 음식명을 IN (...) 쿼리 1회로 조회
+        2. 사용자 기여 음식: 남은 음식명을 OR 조건 쿼리 1회로 조회
+        3. 재료 기반 매칭: 후보 검색 결과를 음식 간 공유하고, 최종 선택된 음식만 IN 쿼리 1회로 조회
+        4. GPT 기반 유사도 매칭 (활성화된 경우에만, 음식별)
+        
+        Args:
+            session: DB 세션
+            items: FoodMatchQuery 또는 음식명 리스트
+            user_id: 사용자 ID (사용자 기여 음식 우선 검색용)
+        
+        Returns:
+            입력 순서와 동일한 매칭 결과 리스트 (매칭 실패 항목은 None)
+        """
+        queries = [
+            item if isinstance(item, FoodMatchQuery) else FoodMatchQuery(food_name=item)
+            for item in items
+        ]
+        
+        # 중복 제거 (동일 음식명/재료/힌트는 한 번만 매칭)
+        unique: Dict[tuple, FoodMatchQuery] = {}
+        for query in queries:
+            unique.setdefault(query.key, query)
+        
+        print(f"\n🔍 일괄 음식 매칭 시작: {len(queries)}개 요청 ({len(unique)}개 고유)")
+        
+        matches: Dict[tuple, Optional[Union[FoodNutrient, UserContributedFood]]] = {}
+        
+        # ========== STEP 1: 정확한 이름 매칭 (공식 DB) ==========
+        exact_matches = await self._exact_name_match_bulk(
+            session, [query.food_name for query in unique.values()]
+        )
+        for key, query in unique.items():
+            exact_match = exact_matches.get(query.food_name)
+            if exact_match:
+                print(f"✅ [STEP 1] 정확한 이름 매칭 성공: {query.food_name} → {exact_match.food_id}")
+                matches[key] = exact_match
+        
+        # ========== STEP 2: 사용자 기여 음식 검색 ==========
+        remaining = {key: query for key, query in unique.items() if key not in matches}
+        if user_id and remaining:
+            contributed_matches = await self._search_user_contributed_foods_bulk(
+                session, [query.food_name for query in remaining.values()], user_id
+            )
+            for key, query in remaining.items():
+                contributed_match = contributed_matches.get(query.food_name)
+                if contributed_match:
+                    print(f"✅ [STEP 2] 사용자 기여 음식 매칭 성공: {query.food_name} → {contributed_match.food_id}")
+                    matches[key] = contributed_match
+            
+            if contributed_matches:
+                # 사용 횟수 증가 (요청 항목마다 1회씩, 커밋은 한 번)
+                for query in queries:
+                    match = matches.get(query.key)
+                    if isinstance(match, UserContributedFood):
+                        match.usage_count += 1
+                await session.commit()
+        
+        # ========== STEP 3: 재료 기반 매칭 (공식 DB) ==========
+        remaining = {key: query for key, query in unique.items() if key not in matches}
+        candidate_cache: Dict[tuple, list] = {}
+        best_candidates = {}
+        for key, query in remaining.items():
+            best_candidates[key] = await self._select_best_candidate(
+                session,
+                query.food_name,
+                query.ingredients,
+                query.food_class_hint,
+                candidate_cache=candidate_cache,
+            )
+        
+        # 색인 후보는 최종 선택된 음식만 한 번에 조회
+        indexed_ids = {
+            candidate.food_id
+            for candidate in best_candidates.values()
+            if isinstance(candidate, IndexedFood)
+        }
+        hydrated: Dict[str, FoodNutrient] = {}
+        if indexed_ids:
+            result = await session.execute(
+                select(FoodNutrient).where(FoodNutrient.food_id.in_(indexed_ids))
+            )
+            hydrated = {food.food_id: food for food in result.scalars().all()}
+        
+        for key, candidate in best_candidates.items():
+            if isinstance(candidate, IndexedFood):
+                candidate = hydrated.get(candidate.food_id)
+            if candidate:
+                print(f"✅ [STEP 3] 재료 기반 매칭 성공: {remaining[key].food_name} → {candidate.food_id}")
+                matches[key] = candidate
+        
+        # ========== STEP 4: GPT 기반 유사 음식 찾기 (최후의 수단) ==========
+        if hasattr(self, 'client') and self.client:
+            for key, query in unique.items():
+                if key in matches:
+                    continue
+                gpt_match = await self._gpt_similarity_match(session, query.food_name, query.ingredients)
+                if gpt_match:
+                    print(f"✅ [STEP 4] GPT 유사도 매칭 성공: {query.food_name} → {gpt_match.food_id}")
+                    matches[key] = gpt_match
+        
+        failed = [query.food_name for key, query in unique.items() if key not in matches]
+        if failed:
+            print(f"❌ 매칭 실패: {failed}")
+        
+        return [matches.get(query.key) for query in queries]
+    
+    async def match_food_item_async(
+        self,
+        session: AsyncSession,
+        food_name: str,
+        ingredients: List[str] = None,
+        food_class_hint: str = None,
+        user_id: int = None
+    ) -> Optional[Union[FoodNutrient, UserContributedFood]]:
+        """LangChain 도구용 단일 음식 매칭 (match_foods_to_db 사용)"""
+        results = await self.match_foods_to_db(
+            session,
+            [FoodMatchQuery(food_name, ingredients or [], food_class_hint)],
+            user_id=user_id,
+        )
+        return results[0]
+    
+    async def _exact_name_match_bulk(
+        self,
+        session: AsyncSession,
+        food_names: List[str]
+    ) -> Dict[str, FoodNutrient]:
+        """
+        여러 음식명의 정확한 이름 매칭을 쿼리 1회로 처리
+        
+        Returns:
+            {음식명: FoodNutrient} (nutrient_name 일치를 representative_food_name 일치보다 우선)
+        """
+        names = list(dict.fromkeys(name for name in food_names if name))
+        if not names:
+            return {}
+        
+        stmt = select(FoodNutrient).where(
+            or_(
+                FoodNutrient.nutrient_name.in_(names),
+                FoodNutrient.representative_food_name.in_(names)
+            )
+        ).order_by(FoodNutrient.food_id)
+        
+        result = await session.execute(stmt)
+        by_nutrient_name: Dict[str, FoodNutrient] = {}
+        by_representative_name: Dict[str, FoodNutrient] = {}
+        for food in result.scalars().all():
+            by_nutrient_name.setdefault(food.nutrient_name, food)
+            by_representative_name.setdefault(food.representative_food_name, food)
+        
+        matches = {}
+        for name in names:
+            food = by_nutrient_name.get(name) or by_representative_name.get(name)
+            if food:
+                matches[name] = food
+        return matches
+    
     async def _exact_name_match(
         self,
         session: AsyncSession,
@@ -218,6 +400,23 @@ class FoodMatchingService:
         ingredients: List[str],
         food_class_hint: str = None
     ) -> Optional[FoodNutrient]:
+        """재료 기반 매칭 - 최고 점수 후보를 골라 FoodNutrient로 반환"""
+        best_match = await self._select_best_candidate(
+            session, food_name, ingredients, food_class_hint
+        )
+        # 색인에서 나온 후보는 최종 선택된 음식만 DB에서 조회
+        if isinstance(best_match, IndexedFood):
+            return await session.get(FoodNutrient, best_match.food_id)
+        return best_match
+    
+    async def _select_best_candidate(
+        self,
+        session: AsyncSession,
+        food_name: str,
+        ingredients: List[str],
+        food_class_hint: str = None,
+        candidate_cache: Optional[Dict[tuple, list]] = None
+    ) -> Optional[Union[FoodNutrient, IndexedFood]]:
         """
         재료 기반 매칭 (DB 구조에 최적화)
         
@@ -233,6 +432,8 @@ class FoodMatchingService:
         - food_class2 정확 일치: +50점
         - 부분 매칭: +20~40점
         - 재료 매칭: +15점
+        
+        candidate_cache를 넘기면 같은 검색어의 후보 검색 결과를 여러 음식이 공유한다.
         """
         # 1. 음식명 전처리 및 키워드 추출
         food_name_clean = self._clean_food_name(food_name)
@@ -249,7 +450,7 @@ class FoodMatchingService:
         if food_keywords:
             for keyword in food_keywords:
                 keyword_candidates = await self._search_candidates(
-                    session, keyword, food_class_hint, limit=30
+                    session, keyword, food_class_hint, limit=30, cache=candidate_cache
                 )
                 candidates.extend(keyword_candidates)
                 if candidates:
@@ -258,14 +459,14 @@ class FoodMatchingService:
         # 2-2. 키워드 검색 실패 시 전체 음식명으로 검색
         if not candidates:
             candidates = await self._search_candidates(
-                session, food_name_clean, food_class_hint, limit=30
+                session, food_name_clean, food_class_hint, limit=30, cache=candidate_cache
             )
         
         # 2-3. 여전히 실패 시 재료 카테고리로 검색
         if not candidates and ingredient_categories:
             for category in ingredient_categories:
                 category_candidates = await self._search_candidates(
-                    session, category, food_class_hint, limit=20
+                    session, category, food_class_hint, limit=20, cache=candidate_cache
                 )
                 candidates.extend(category_candidates)
                 if category_candidates:
@@ -275,7 +476,7 @@ class FoodMatchingService:
         if not candidates and ingredients:
             main_ingredient = ingredients[0]
             candidates = await self._search_candidates(
-                session, main_ingredient, food_class_hint, limit=20
+                session, main_ingredient, food_class_hint, limit=20, cache=candidate_cache
             )
         
         # 중복 제거
@@ -373,7 +574,7 @@ class FoodMatchingService:
     
     def _calculate_match_score(
         self,
-        food: FoodNutrient,
+        food: Union[FoodNutrient, IndexedFood],
         food_name: str,
         ingredients: List[str],
         food_class_hint: str = None,
@@ -558,8 +759,9 @@ class FoodMatchingService:
         session: AsyncSession,
         search_term: str,
         food_class_hint: str = None,
-        limit: int = 50
-    ) -> List[FoodNutrient]:
+        limit: int = 50,
+        cache: Optional[Dict[tuple, list]] = None
+    ) -> List[Union[FoodNutrient, IndexedFood]]:
         """
         후보 음식 검색 (DB 구조에 최적화)
         
@@ -567,9 +769,38 @@ class FoodMatchingService:
         1. food_class_hint가 있으면 해당 분류 내에서 우선 검색
         2. 언더스코어 패턴 고려 (nutrient_name)
         3. "류" 제거하고 검색 (food_class1)
+        
+        인메모리 n-gram 색인이 준비되어 있으면 색인에서 후보를 찾고(IndexedFood 반환),
+        색인을 쓸 수 없을 때만 LIKE 쿼리로 DB를 직접 검색한다.
         """
         search_term_clean = search_term.replace(" ", "")
         
+        cache_key = (search_term_clean, food_class_hint, limit)
+        if cache is not None and cache_key in cache:
+            return cache[cache_key]
+        
+        search_index = get_food_search_index()
+        if await search_index.ensure_loaded(session):
+            candidates = self._search_candidates_in_index(
+                search_index, search_term_clean, food_class_hint, limit
+            )
+        else:
+            candidates = await self._search_candidates_in_db(
+                session, search_term_clean, food_class_hint, limit
+            )
+        
+        if cache is not None:
+            cache[cache_key] = candidates
+        return candidates
+    
+    async def _search_candidates_in_db(
+        self,
+        session: AsyncSession,
+        search_term_clean: str,
+        food_class_hint: str = None,
+        limit: int = 50
+    ) -> List[FoodNutrient]:
+        """LIKE 쿼리로 DB에서 직접 후보 검색 (색인을 쓸 수 없을 때의 폴백)"""
         # 검색 조건 (공백 제거 후 검색)
         conditions = [
             FoodNutrient.nutrient_name.like(f"%{search_term_clean}%"),
@@ -614,6 +845,30 @@ class FoodMatchingService:
         print(f"  → 일반 검색으로 {len(candidates)}개 후보 검색")
         return candidates
     
+    def _search_candidates_in_index(
+        self,
+        search_index,
+        search_term_clean: str,
+        food_class_hint: str = None,
+        limit: int = 50
+    ) -> List[IndexedFood]:
+        """_search_candidates와 동일한 조건/우선순위로 색인에서 후보 검색"""
+        if food_class_hint:
+            hint_clean = food_class_hint.replace(" ", "")
+            hint_patterns = [hint_clean]
+            if not hint_clean.endswith("류"):
+                hint_patterns.append(f"{hint_clean}류")
+            
+            for pattern in hint_patterns:
+                candidates = search_index.search(search_term_clean, class1_pattern=pattern, limit=limit)
+                if candidates:
+                    print(f"  → food_class_hint '{food_class_hint}'로 {len(candidates)}개 후보 검색 (색인)")
+                    return candidates
+        
+        candidates = search_index.search(search_term_clean, limit=limit)
+        print(f"  → 일반 검색으로 {len(candidates)}개 후보 검색 (색인)")
+        return candidates
+    
     async def _gpt_similarity_match(
         self,
         session: AsyncSession,
@@ -699,10 +954,16 @@ class FoodMatchingService:
 **중요:** food_id만 정확히 답변하세요. (예: D101-00431000D-0001)
 설명 없이 food_id만 출력하세요."""
             
-            response = await self.llm.ainvoke([
+            candidate_ids = {row[0] for row in all_candidates}
+
+            def _is_candidate_id(content: str) -> None:
+                if content.strip() not in candidate_ids:
+                    raise ValueError(f"후보에 없는 food_id: {content.strip()!r}")
+
+            response = await get_llm_gateway().ainvoke(self.llm, [
                 SystemMessage(content="당신은 한국 음식 분류 전문가입니다. food_id만 정확히 답변하세요."),
                 HumanMessage(content=prompt)
-            ])
+            ], call_site="food_matching.gpt_match", validate=_is_candidate_id)
             
             selected_food_id = response.content.strip()
             print(f"  → GPT 선택: {selected_food_id}")
@@ -867,6 +1128,56 @@ class FoodMatchingService:
         
         return None
 
+    
+    async def _search_user_contributed_foods_bulk(
+        self,
+        session: AsyncSession,
+        food_names: List[str],
+        user_id: int
+    ) -> Dict[str, UserContributedFood]:
+        """
+        여러 음식명에 대한 사용자 기여 음식 검색을 쿼리 1회로 처리
+        
+        _search_user_contributed_foods와 같은 우선순위(본인 음식 → 인기 음식, 사용 횟수 순)를
+        조회 결과에 대해 파이썬에서 적용한다.
+        """
+        patterns = list(dict.fromkeys(self._clean_food_name(name) for name in food_names))
+        if not patterns:
+            return {}
+        
+        stmt = select(UserContributedFood).where(
+            or_(
+                UserContributedFood.user_id == user_id,
+                UserContributedFood.usage_count >= 3
+            ),
+            or_(*[
+                condition
+                for pattern in patterns
+                for condition in (
+                    UserContributedFood.food_name.like(f"%{pattern}%"),
+                    UserContributedFood.nutrient_name.like(f"%{pattern}%"),
+                )
+            ])
+        ).order_by(UserContributedFood.usage_count.desc())
+        
+        result = await session.execute(stmt)
+        rows = list(result.scalars().all())
+        
+        def contains(food: UserContributedFood, pattern: str) -> bool:
+            return any(
+                value and pattern.lower() in value.lower()
+                for value in (food.food_name, food.nutrient_name)
+            )
+        
+        matches = {}
+        for name in food_names:
+            pattern = self._clean_food_name(name)
+            own = next((f for f in rows if f.user_id == user_id and contains(f, pattern)), None)
+            popular = next((f for f in rows if f.usage_count >= 3 and contains(f, pattern)), None)
+            if own or popular:
+                matches[name] = own or popular
+        return matches
+
 
 # 싱글톤 인스턴스
 _food_matching_service: Optional[FoodMatchingService] = None
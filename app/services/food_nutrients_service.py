@@ -5,12 +5,13 @@
 - food_class1: 대분류 (예: "국밥", "피자")
 - food_class2: 중분류/재료 (예: "돼지머리", "페퍼로니")
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models_food_nutrients import FoodNutrient
+from app.services.nutrient_matrix import get_nutrient_matrix_cache
 
 
 async def search_food_by_name(
@@ -72,6 +73,29 @@ async def get_food_by_id(
     return result.scalar_one_or_none()
 
 
+async def get_foods_by_ids(
+    session: AsyncSession,
+    food_ids: Iterable[str]
+) -> Dict[str, FoodNutrient]:
+    """
+    여러 food_id의 영양소 정보를 한 번의 IN 쿼리로 조회
+    
+    Args:
+        session: DB 세션
+        food_ids: 음식 ID 목록 (중복 허용)
+        
+    Returns:
+        {food_id: FoodNutrient} (없는 ID는 빠짐)
+    """
+    unique_ids = list(dict.fromkeys(food_ids))
+    if not unique_ids:
+        return {}
+    
+    stmt = select(FoodNutrient).where(FoodNutrient.food_id.in_(unique_ids))
+    result = await session.execute(stmt)
+    return {nutrient.food_id: nutrient for nutrient in result.scalars().all()}
+
+
 async def search_ingredients(
     session: AsyncSession,
     ingredient_names: List[str],
@@ -392,6 +416,20 @@ async def get_foods_by_class(
     return foods
 
 
+# calculate_combined_nutrients 결과 키 → FoodNutrient 컬럼
+COMBINED_NUTRIENT_COLUMNS = {
+    "protein": "protein",
+    "carbs": "carb",
+    "fat": "fat",
+    "fiber": "fiber",
+    "sodium": "sodium",
+    "calcium": "calcium",
+    "iron": "iron",
+    "vitamin_a": "vitamin_a",
+    "vitamin_c": "vitamin_c",
+}
+
+
 async def calculate_combined_nutrients(
     session: AsyncSession,
     ingredient_matches: dict[str, FoodNutrient],
@@ -413,31 +451,19 @@ async def calculate_combined_nutrients(
         num_ingredients = len(ingredient_matches)
         portions = {name: 1.0 / num_ingredients for name in ingredient_matches.keys()}
     
-    combined = {
-        "protein": 0.0,
-        "carbs": 0.0,
-        "fat": 0.0,
-        "fiber": 0.0,
-        "sodium": 0.0,
-        "calcium": 0.0,
-        "iron": 0.0,
-        "vitamin_a": 0.0,
-        "vitamin_c": 0.0,
-    }
-    
-    for ingredient_name, food_nutrient in ingredient_matches.items():
-        portion = portions.get(ingredient_name, 0.0)
-        
-        if food_nutrient:
-            combined["protein"] += (food_nutrient.protein or 0.0) * portion
-            combined["carbs"] += (food_nutrient.carb or 0.0) * portion
-            combined["fat"] += (food_nutrient.fat or 0.0) * portion
-            combined["fiber"] += (food_nutrient.fiber or 0.0) * portion
-            combined["sodium"] += (food_nutrient.sodium or 0.0) * portion
-            combined["calcium"] += (food_nutrient.calcium or 0.0) * portion
-            combined["iron"] += (food_nutrient.iron or 0.0) * portion
-            combined["vitamin_a"] += (food_nutrient.vitamin_a or 0.0) * portion
-            combined["vitamin_c"] += (food_nutrient.vitamin_c or 0.0) * portion
-    
-    return combined
+    # 영양소 행렬에서 재료 벡터를 모아 비율 가중합 한 번으로 계산
+    matched = [
+        (food_nutrient.food_id, portions.get(ingredient_name, 0.0))
+        for ingredient_name, food_nutrient in ingredient_matches.items()
+        if food_nutrient
+    ]
+    food_ids = [food_id for food_id, _ in matched]
+    matrix = await get_nutrient_matrix_cache().get_covering(session, food_ids)
+    totals = matrix.combine(
+        food_ids,
+        [portion for _, portion in matched],
+        columns=list(COMBINED_NUTRIENT_COLUMNS.values()),
+    )
+    
+    return {key: totals[column] for key, column in COMBINED_NUTRIENT_COLUMNS.items()}
 
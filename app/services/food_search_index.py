@@ -0,0 +1,256 @@
+"""food_nutrients 문자열 컬럼용 인메모리 n-gram 역색인
+
+FoodMatchingService의 후보 검색은 `LIKE '%term%'` 조건을 4개 컬럼
+(nutrient_name, representative_food_name, food_class1, food_class2)에 걸기 때문에
+검색어 하나마다 food_nutrients 풀 스캔이 발생한다.
+
+이 모듈은 한 번의 벌크 조회로 각 컬럼의 문자 1~3-gram 역색인을 만들어 두고
+부분 문자열 검색을 집합 교집합으로 처리한다. 결과 semantics는 LIKE와 동일하다.
+- 검색어 길이 <= 3: n-gram 포스팅 리스트가 곧 정답 집합
+- 검색어 길이 > 3: 3-gram 포스팅 교집합 후 실제 부분 문자열 여부로 검증
+
+분류 트리/영양소 행렬 캐시와 같이 주기적으로 버전(행 수 + 최대 food_id)을 확인해
+food_nutrients가 바뀌었으면 다시 만든다. 워커마다 따로 확인하므로 다른 워커에서
+추가된 음식도 확인 주기 안에 후보로 잡힌다.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.models_food_nutrients import FoodNutrient
+
+logger = logging.getLogger(__name__)
+
+# 색인 대상 컬럼 (FoodMatchingService._search_candidates의 LIKE 대상과 동일)
+INDEXED_COLUMNS: Tuple[str, ...] = (
+    "nutrient_name",
+    "representative_food_name",
+    "food_class1",
+    "food_class2",
+)
+
+# 색인하는 최대 n-gram 길이
+MAX_GRAM = 3
+
+
+@dataclass(frozen=True)
+class IndexedFood:
+    """색인에 보관하는 음식 행 (점수 계산에 필요한 문자열 컬럼만 보관)"""
+
+    food_id: str
+    nutrient_name: Optional[str]
+    representative_food_name: Optional[str]
+    food_class1: Optional[str]
+    food_class2: Optional[str]
+
+
+def _normalize(value: str) -> str:
+    """MySQL 기본 collation(대소문자 무시)에 맞춰 소문자로 비교"""
+    return value.lower()
+
+
+def _ngrams(value: str, n: int) -> Iterable[str]:
+    return (value[i:i + n] for i in range(len(value) - n + 1))
+
+
+async def fetch_indexed_foods(session: AsyncSession) -> List[IndexedFood]:
+    """food_nutrients 전체의 문자열 컬럼을 한 번의 쿼리로 조회 (PK 순서)"""
+    stmt = select(
+        FoodNutrient.food_id,
+        FoodNutrient.nutrient_name,
+        FoodNutrient.representative_food_name,
+        FoodNutrient.food_class1,
+        FoodNutrient.food_class2,
+    ).order_by(FoodNutrient.food_id)
+    result = await session.execute(stmt)
+    return [IndexedFood(*row) for row in result.all()]
+
+
+async def fetch_food_nutrients_version(session: AsyncSession) -> str:
+    """food_nutrients 버전 (행 수 + 최대 food_id, 인메모리 스냅샷 갱신 판단용)"""
+    stmt = select(func.count(), func.max(FoodNutrient.food_id)).select_from(FoodNutrient)
+    count, max_food_id = (await session.execute(stmt)).one()
+    return f"{count}:{max_food_id}"
+
+
+class _ColumnIndex:
+    """단일 컬럼의 n-gram 역색인"""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, food_id: str, raw_value: Optional[str]) -> None:
+        if raw_value is None:
+            return
+        value = _normalize(raw_value)
+        self.values[food_id] = value
+        for n in range(1, MAX_GRAM + 1):
+            for gram in _ngrams(value, n):
+                self.postings[gram].add(food_id)
+
+    def contains(self, term: str) -> Set[str]:
+        """`column LIKE '%term%'`에 해당하는 food_id 집합"""
+        term = _normalize(term)
+        if not term:
+            return set(self.values)
+        if len(term) <= MAX_GRAM:
+            return self.postings.get(term, set())
+
+        grams = sorted(
+            (self.postings.get(gram, set()) for gram in set(_ngrams(term, MAX_GRAM))),
+            key=len,
+        )
+        if not grams[0]:
+            return set()
+        matched = set(grams[0])
+        for posting in grams[1:]:
+            matched &= posting
+            if not matched:
+                return matched
+        return {food_id for food_id in matched if term in self.values[food_id]}
+
+
+class FoodSearchIndex:
+    """food_nutrients 후보 검색용 프로세스 상주 역색인"""
+
+    def __init__(self, check_interval_seconds: float = 300) -> None:
+        self.check_interval_seconds = check_interval_seconds
+        self._columns: Dict[str, _ColumnIndex] = {}
+        self._foods: Dict[str, IndexedFood] = {}
+        self._rank: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._checked_at = float("-inf")
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[datetime] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._foods)
+
+    # ------------------------------------------------------------------
+    # 로드 / 갱신
+    # ------------------------------------------------------------------
+    async def refresh(self, session: AsyncSession) -> None:
+        """food_nutrients 전체를 한 번에 읽어 색인을 다시 만든다."""
+        async with self._lock:
+            await self._rebuild(session)
+
+    def _fresh(self) -> bool:
+        return self.is_loaded and time.monotonic() - self._checked_at < self.check_interval_seconds
+
+    async def ensure_loaded(self, session: AsyncSession) -> bool:
+        """
+        색인이 없거나 오래됐으면 구성한다. 실패 시 False (호출자는 DB 검색으로 폴백).
+
+        마지막 확인 후 check_interval_seconds가 지났을 때만 버전 쿼리 1회를 실행하고,
+        버전이 바뀐 경우에만 다시 만든다. 갱신에 실패하면 기존 색인을 계속 쓴다.
+        """
+        if self._fresh():
+            return True
+        try:
+            async with self._lock:
+                if not self._fresh():
+                    version = await fetch_food_nutrients_version(session)
+                    if not self.is_loaded or self.version != version:
+                        await self._rebuild(session, version)
+                    self._checked_at = time.monotonic()
+        except Exception as exc:
+            if self.is_loaded:
+                logger.warning("food_nutrients 검색 색인 갱신 실패 (%s). 기존 색인을 사용합니다.", exc)
+                return True
+            logger.warning("food_nutrients 검색 색인 구성 실패 (%s). LIKE 검색으로 폴백합니다.", exc)
+            return False
+        return self.is_loaded
+
+    async def _rebuild(self, session: AsyncSession, version: Optional[str] = None) -> None:
+        if version is None:
+            version = await fetch_food_nutrients_version(session)
+        rows = await fetch_indexed_foods(session)
+
+        # 색인 구성은 CPU 작업이므로 이벤트 루프 밖에서 수행
+        await asyncio.to_thread(self.load_rows, rows, version)
+        logger.info("food_nutrients 검색 색인 구성 완료: %d개 음식 (version=%s)", len(rows), version)
+
+    def load_rows(self, rows: Sequence[IndexedFood], version: Optional[str] = None) -> None:
+        """행 목록으로 색인을 구성하고 기존 색인과 원자적으로 교체"""
+        columns = {column: _ColumnIndex() for column in INDEXED_COLUMNS}
+        foods: Dict[str, IndexedFood] = {}
+        for row in rows:
+            foods[row.food_id] = row
+            for column in INDEXED_COLUMNS:
+                columns[column].add(row.food_id, getattr(row, column))
+
+        # LIMIT만 있고 ORDER BY가 없는 기존 쿼리는 PK(클러스터드 인덱스) 순서로 행을 돌려준다.
+        rank = {food_id: i for i, food_id in enumerate(sorted(foods))}
+
+        self._columns, self._foods, self._rank = columns, foods, rank
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        다음 ensure_loaded 호출에서 버전을 다시 확인하도록 표시 (food_nutrients 변경 commit 직후 호출)
+
+        색인은 비우지 않는다. 버전이 바뀌었을 때만 다시 만들고, 그동안 기존 색인으로 검색한다.
+        """
+        self._checked_at = float("-inf")
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def contains(self, column: str, term: str) -> Set[str]:
+        """`column LIKE '%term%'`에 해당하는 food_id 집합"""
+        return self._columns[column].contains(term)
+
+    def search(
+        self,
+        search_term: str,
+        class1_pattern: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[IndexedFood]:
+        """
+        FoodMatchingService._search_candidates의 WHERE 조건과 동일한 후보 검색
+
+        (nutrient_name | food_class1 | food_class2 | representative_food_name) LIKE %term%
+        [AND food_class1 LIKE %class1_pattern%]
+
+        기존의 `food_class1 LIKE '%{term}류%'` 조건은 `food_class1 LIKE '%{term}%'`에
+        포함되므로 따로 계산하지 않는다.
+        """
+        matched: Set[str] = set()
+        for column in INDEXED_COLUMNS:
+            matched |= self.contains(column, search_term)
+
+        if class1_pattern is not None and matched:
+            matched &= self.contains("food_class1", class1_pattern)
+
+        top_ids = heapq.nsmallest(limit, matched, key=self._rank.__getitem__)
+        return [self._foods[food_id] for food_id in top_ids]
+
+
+# 싱글톤 인스턴스
+_food_search_index: Optional[FoodSearchIndex] = None
+
+
+def get_food_search_index() -> FoodSearchIndex:
+    """FoodSearchIndex 싱글톤 인스턴스 반환"""
+    global _food_search_index
+    if _food_search_index is None:
+        _food_search_index = FoodSearchIndex(get_settings().food_search_index_check_interval_seconds)
+    return _food_search_index
@@ -0,0 +1,163 @@
+"""food_nutrients 분류 트리 (대분류 → 대표식품명 → 음식) 인메모리 캐시
+
+GPT-Vision DB 가이드 분석은 이미지마다 `SELECT DISTINCT food_class1`,
+`SELECT DISTINCT representative_food_name`, 대표식품명별 음식 조회를 차례로 실행한다.
+food_nutrients는 거의 바뀌지 않는 참조 테이블이므로 한 번 읽어 트리로 만들어 두고,
+버전(행 수 + 최대 food_id)이 바뀌었을 때만 다시 만든다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.services.food_search_index import IndexedFood, fetch_food_nutrients_version, fetch_indexed_foods
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class KeywordOrderedList(Generic[T]):
+    """
+    키워드 우선순위 정렬을 지원하는 목록
+
+    키워드별 포함 위치를 한 번 계산해 메모해 두고, 정렬은 집합으로 중복을 걸러
+    O(n) 으로 처리한다. 결과 순서는 기존 방식과 같다:
+    첫 번째 키워드를 포함한 항목(원래 순서) → 두 번째 키워드 → ... → 나머지 항목.
+    """
+
+    items: Tuple[T, ...]
+    texts: Tuple[str, ...]
+    _keyword_hits: Dict[str, Tuple[int, ...]] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def matching(self, keyword: str) -> Tuple[int, ...]:
+        """keyword를 포함하는 항목의 위치 (메모)"""
+        hits = self._keyword_hits.get(keyword)
+        if hits is None:
+            hits = tuple(i for i, text in enumerate(self.texts) if keyword in text)
+            self._keyword_hits[keyword] = hits
+        return hits
+
+    def ordered(self, keywords: Sequence[str] = ()) -> Tuple[List[T], int]:
+        """
+        키워드 포함 항목을 앞으로 올린 목록
+
+        Returns:
+            (정렬된 항목 리스트, 키워드에 매칭된 항목 수)
+        """
+        if not keywords:
+            return list(self.items), 0
+
+        seen = set()
+        order: List[int] = []
+        for keyword in keywords:
+            for i in self.matching(keyword):
+                if i not in seen:
+                    seen.add(i)
+                    order.append(i)
+        matched = len(order)
+        order.extend(i for i in range(len(self.items)) if i not in seen)
+        return [self.items[i] for i in order], matched
+
+
+class FoodTaxonomy:
+    """대분류 → 대표식품명 → 음식 목록 스냅샷 (불변)"""
+
+    def __init__(self, rows: Sequence[IndexedFood], version: str):
+        self.version = version
+
+        foods_by_leaf: Dict[Tuple[str, str], List[IndexedFood]] = defaultdict(list)
+        names_by_class: Dict[str, set] = defaultdict(set)
+        for row in rows:
+            if not row.food_class1:
+                continue
+            names = names_by_class[row.food_class1]  # 대표식품명이 없어도 대분류는 노출
+            if row.representative_food_name:
+                names.add(row.representative_food_name)
+                foods_by_leaf[(row.food_class1, row.representative_food_name)].append(row)
+
+        self.food_classes: List[str] = sorted(names_by_class)
+        self._names: Dict[str, KeywordOrderedList[str]] = {}
+        for class1, names in names_by_class.items():
+            ordered_names = tuple(sorted(names))
+            self._names[class1] = KeywordOrderedList(ordered_names, ordered_names)
+        self._foods: Dict[Tuple[str, str], KeywordOrderedList[IndexedFood]] = {
+            leaf: KeywordOrderedList(tuple(foods), tuple(food.nutrient_name or "" for food in foods))
+            for leaf, foods in foods_by_leaf.items()
+        }
+
+    def representative_names(self, food_class1: str) -> KeywordOrderedList[str]:
+        """대분류의 대표식품명 목록 (가나다순)"""
+        return self._names.get(food_class1, KeywordOrderedList((), ()))
+
+    def foods(self, food_class1: str, representative_food_name: str) -> KeywordOrderedList[IndexedFood]:
+        """대분류 + 대표식품명에 속하는 음식 목록 (food_id 순)"""
+        return self._foods.get((food_class1, representative_food_name), KeywordOrderedList((), ()))
+
+
+class FoodTaxonomyCache:
+    """FoodTaxonomy를 보관하고 food_nutrients 변경 시 다시 만든다."""
+
+    def __init__(self, check_interval_seconds: float):
+        self.check_interval_seconds = check_interval_seconds
+        self._taxonomy: Optional[FoodTaxonomy] = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> FoodTaxonomy:
+        """
+        최신 분류 트리 반환
+
+        마지막 확인 후 check_interval_seconds가 지났을 때만 버전 쿼리 1회를 실행하고,
+        버전이 바뀐 경우에만 전체를 다시 읽는다.
+        """
+        if self._taxonomy is not None and time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return self._taxonomy
+
+        async with self._lock:
+            if self._taxonomy is not None and time.monotonic() - self._checked_at < self.check_interval_seconds:
+                return self._taxonomy
+
+            version = await self._fetch_version(session)
+            if self._taxonomy is None or self._taxonomy.version != version:
+                rows = await fetch_indexed_foods(session)
+                self._taxonomy = await asyncio.to_thread(FoodTaxonomy, rows, version)
+                logger.info(
+                    "food_nutrients 분류 트리 구성 완료: 대분류 %d개, 음식 %d개 (version=%s)",
+                    len(self._taxonomy.food_classes), len(rows), version,
+                )
+            self._checked_at = time.monotonic()
+            return self._taxonomy
+
+    def invalidate(self) -> None:
+        """다음 get 호출에서 버전을 다시 확인하도록 표시 (food_nutrients 변경 직후 호출)"""
+        self._checked_at = float("-inf")
+
+    @staticmethod
+    async def _fetch_version(session: AsyncSession) -> str:
+        return await fetch_food_nutrients_version(session)
+
+
+# 싱글톤 인스턴스
+_food_taxonomy_cache: Optional[FoodTaxonomyCache] = None
+
+
+def get_food_taxonomy_cache() -> FoodTaxonomyCache:
+    """FoodTaxonomyCache 싱글톤 인스턴스 반환"""
+    global _food_taxonomy_cache
+    if _food_taxonomy_cache is None:
+        _food_taxonomy_cache = FoodTaxonomyCache(settings.food_taxonomy_check_interval_seconds)
+    return _food_taxonomy_cache
@@ -1,7 +1,8 @@
 """GPT-Vision 음식 분석 서비스"""
+import asyncio
 import base64
 import io
-from typing import Optional, List
+from typing import Optional, List, Union
 
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage
@@ -10,12 +11,24 @@ from PIL import Image
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.services.food_nutrients_service import get_all_food_classes, get_foods_by_class
 from app.db.models_food_nutrients import FoodNutrient
+from app.services.food_search_index import IndexedFood
+from app.services.food_taxonomy import get_food_taxonomy_cache
+from app.services.llm_gateway import get_llm_gateway
+from app.services.vision_result_cache import get_vision_result_cache
+from app.utils.prepared_image import PreparedImage
 
 settings = get_settings()
 
 
+def _first_line_answer(content: str) -> str:
+    """식재료 식별 응답의 첫 줄 (비었거나 '알 수 없음'이면 캐시하지 않도록 ValueError)"""
+    answer = content.strip().split('\n')[0].strip().replace('**', '').replace('*', '')
+    if not answer or answer == "알 수 없음":
+        raise ValueError(f"식재료 식별 실패 응답: {content!r}")
+    return answer
+
+
 class GPTVisionService:
     """GPT-Vision 음식 분석 서비스"""
     
@@ -28,13 +41,9 @@ class GPTVisionService:
         """OpenAI 클라이언트 초기화"""
         if settings.openai_api_key:
             try:
-                self.llm = ChatOpenAI(
-                    api_key=settings.openai_api_key,
-                    model="gpt-4o",
-                    temperature=0.7,
-                    max_tokens=1500,
-                )
-                self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+                gateway = get_llm_gateway()
+                self.llm = gateway.chat_model(model="gpt-4o", temperature=0.7, max_tokens=1500)
+                self.client = gateway.openai_client()
                 print("✅ OpenAI GPT-Vision 클라이언트 초기화 완료!")
             except Exception as e:
                 print(f"❌ OpenAI 클라이언트 초기화 실패: {e}")
@@ -51,40 +60,30 @@ class GPTVisionService:
     
     async def analyze_food_with_detection(
         self,
-        image_bytes: bytes,
+        image: Union[bytes, PreparedImage],
         yolo_detection_result: dict
     ) -> dict:
         """
         YOLO detection 결과와 함께 GPT-Vision으로 음식 분석
+        
+        Args:
+            image: 이미지 바이트 또는 라우트에서 준비한 PreparedImage (리사이즈/base64 재사용)
+            yolo_detection_result: YOLO detection 결과
         """
         if self.llm is None:
             raise RuntimeError("OpenAI 클라이언트가 초기화되지 않았습니다. OPENAI_API_KEY를 확인하세요.")
         
         try:
-            # 이미지 크기 확인 및 압축 (1MB 이상이면 리사이즈)
-            image_size_kb = len(image_bytes) / 1024
-            if image_size_kb > 1000:
-                print(f"⚠️ 이미지가 큽니다 ({image_size_kb:.2f} KB). 압축 중...")
-                from PIL import Image
-                import io
-                
-                img = Image.open(io.BytesIO(image_bytes))
-                
-                # 최대 1024px로 리사이즈
-                max_size = 1024
-                if max(img.size) > max_size:
-                    ratio = max_size / max(img.size)
-                    new_size = tuple(int(dim * ratio) for dim in img.size)
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # JPEG로 압축
-                compressed_buffer = io.BytesIO()
-                img.convert('RGB').save(compressed_buffer, format='JPEG', quality=85)
-                image_bytes = compressed_buffer.getvalue()
-                print(f"✅ 압축 완료: {image_size_kb:.2f} KB → {len(image_bytes)/1024:.2f} KB")
-
-            # 이미지를 base64로 인코딩
-            base64_image = self._image_to_base64(image_bytes)
+            # 리사이즈 + JPEG 압축 + base64 인코딩은 PreparedImage에서 한 번만 수행
+            prepared = image
+            if not isinstance(prepared, PreparedImage):
+                prepared = await asyncio.to_thread(
+                    PreparedImage.from_bytes,
+                    image,
+                    max_size=settings.vision_detection_image_max_size,
+                    jpeg_quality=settings.vision_detection_image_jpeg_quality,
+                )
+            base64_image = prepared.base64
             
             # YOLO detection 결과 요약
             detected_objects_summary = yolo_detection_result.get("summary", "객체 감지 안됨")
@@ -106,7 +105,9 @@ class GPTVisionService:
                     },
                 ]
             )
-            response = await self.llm.ainvoke([message])
+            response = await get_llm_gateway().ainvoke(
+                self.llm, [message], call_site="gpt_vision.analyze"
+            )
             gpt_response = response.content
             
             # 디버깅: GPT 원본 응답 출력
@@ -324,7 +325,7 @@ class GPTVisionService:
     
     async def analyze_food_with_db_guidance(
         self,
-        image_bytes: bytes,
+        image: Union[bytes, PreparedImage],
         yolo_detection_result: dict,
         session: AsyncSession
     ) -> dict:
@@ -332,7 +333,7 @@ class GPTVisionService:
         2단계 GPT 방식: DB 대분류 → GPT → DB 음식 목록 → GPT
         
         Args:
-            image_bytes: 원본 이미지 바이트 데이터
+            image: 원본 이미지 바이트 또는 PreparedImage (모든 GPT 단계가 같은 base64 재사용)
             yolo_detection_result: YOLO detection 결과
             session: DB 세션
         
@@ -342,57 +343,37 @@ class GPTVisionService:
         if self.client is None:
             raise RuntimeError("OpenAI 클라이언트가 초기화되지 않았습니다. OPENAI_API_KEY를 확인하세요.")
         
+        prepared = image
+        if not isinstance(prepared, PreparedImage):
+            prepared = await asyncio.to_thread(PreparedImage.from_bytes, image)
+        
+        # 같은 이미지의 최종 매칭 결과가 캐시에 있으면 GPT 3회 호출을 생략
+        cache_key = None
+        if settings.vision_cache_enabled:
+            vision_cache = get_vision_result_cache()
+            cache_key = await asyncio.to_thread(vision_cache.make_key, prepared, "db_guidance")
+            cached = await vision_cache.get(cache_key)
+            if cached:
+                print(f"⚡ 분석 결과 캐시 적중: {cached['analysis']['food_name']} (GPT 생략)")
+                return cached["analysis"]
+        
         try:
-            # 이미지를 base64로 인코딩
-            base64_image = self._image_to_base64(image_bytes)
-            
-            # 디버깅: 이미지 크기 확인
-            original_image_bytes = image_bytes  # 원본 보관
-            image_size_kb = len(image_bytes) / 1024
-            print(f"📊 원본 이미지 크기: {image_size_kb:.2f} KB")
-            
-            # 이미지가 1MB 이상이면 압축 (OpenAI 권장: 20MB 이하)
-            # 압축 기준을 완화하여 이미지 품질 유지
-            if image_size_kb > 1000:  # 1MB
-                print(f"⚠️ 이미지가 큽니다 ({image_size_kb:.2f} KB). 압축 중...")
-                from PIL import Image
-                import io
-                
-                # 이미지 로드
-                img = Image.open(io.BytesIO(image_bytes))
-                original_size = img.size
-                
-                # 최대 1536px로 리사이즈 (기존 1024px에서 증가)
-                # 더 큰 이미지로 세부 사항 보존
-                max_size = 1536
-                if max(img.size) > max_size:
-                    ratio = max_size / max(img.size)
-                    new_size = tuple(int(dim * ratio) for dim in img.size)
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
-                    print(f"🔧 이미지 리사이즈: {original_size} → {new_size}")
-                
-                # JPEG로 압축 (품질 90으로 향상)
-                # 높은 품질로 GPT Vision이 세부 사항 인식 가능
-                compressed_buffer = io.BytesIO()
-                img.convert('RGB').save(compressed_buffer, format='JPEG', quality=90)
-                image_bytes = compressed_buffer.getvalue()
-                
-                compressed_size_kb = len(image_bytes) / 1024
-                print(f"✅ 압축 완료: {image_size_kb:.2f} KB → {compressed_size_kb:.2f} KB")
-                
-                # 다시 base64 인코딩
-                base64_image = self._image_to_base64(image_bytes)
+            # 리사이즈(최대 1536px) + JPEG 압축 + base64는 PreparedImage에서 한 번만 수행
+            # 이후 3번의 GPT 호출이 모두 같은 base64를 재사용
+            base64_image = prepared.base64
+            print(f"📊 원본 이미지 크기: {prepared.original_size_kb:.2f} KB")
             
             print(f"📊 최종 Base64 길이: {len(base64_image)} 문자")
             
-            # === 1단계: DB에서 대분류 목록 조회 ===
-            print("📋 [1단계] DB에서 대분류 목록 조회 중...")
-            food_classes = await get_all_food_classes(session)
+            # === 1단계: 분류 트리(캐시)에서 대분류 목록 조회 ===
+            print("📋 [1단계] 대분류 목록 조회 중...")
+            taxonomy = await get_food_taxonomy_cache().get(session)
+            food_classes = taxonomy.food_classes
             
             if not food_classes:
                 raise RuntimeError("DB에 대분류 데이터가 없습니다.")
             
-            print(f"✅ 대분류 {len(food_classes)}개 조회 완료")
+            print(f"✅ 대분류 {len(food_classes)}개 조회 완료 (version={taxonomy.version})")
             
             # === 2단계: GPT에게 대분류 판단 요청 ===
             print("🤖 [2단계] GPT에게 대분류 판단 요청 중...")
@@ -411,32 +392,22 @@ class GPTVisionService:
             print(f"📋 [2단계] 1차 GPT 응답에서 키워드 추출 중...")
             keywords = self._extract_keywords_from_gpt_response(gpt_response_step1)
             
-            # === 3단계: DB에서 대표식품명 목록 조회 ===
+            # === 3단계: 대표식품명 목록 조회 ===
             print(f"📋 [3단계] '{selected_class}' 대분류의 대표식품명 조회 중...")
-            from app.services.food_nutrients_service import get_representative_food_names
-            all_representative_names = await get_representative_food_names(session, selected_class)
+            class_names = taxonomy.representative_names(selected_class)
             
-            if not all_representative_names:
+            if not class_names:
                 raise RuntimeError(f"'{selected_class}' 대분류에 대표식품명이 없습니다.")
             
-            print(f"✅ 대표식품명 {len(all_representative_names)}개 조회 완료")
+            print(f"✅ 대표식품명 {len(class_names)}개 조회 완료")
             
             # 키워드 기반 필터링 (우선순위 정렬)
             if keywords:
                 print(f"🔍 키워드로 대표식품명 필터링: {keywords}")
-                priority_names = []
-                for keyword in keywords[:5]:  # 최대 5개 키워드
-                    for name in all_representative_names:
-                        if keyword in name and name not in priority_names:
-                            priority_names.append(name)
-                
-                # 나머지 대표식품명 추가
-                remaining_names = [n for n in all_representative_names if n not in priority_names]
-                representative_names = priority_names + remaining_names
-                
-                print(f"✅ 키워드 매칭: {len(priority_names)}개, 나머지: {len(remaining_names)}개")
+                representative_names, matched_count = class_names.ordered(keywords[:5])  # 최대 5개 키워드
+                print(f"✅ 키워드 매칭: {matched_count}개, 나머지: {len(class_names) - matched_count}개")
             else:
-                representative_names = all_representative_names
+                representative_names, _ = class_names.ordered()
             
             # GPT에게 전달할 목록 제한 (최대 30개)
             representative_names = representative_names[:30]
@@ -457,12 +428,7 @@ class GPTVisionService:
             
             # === 5단계: 해당 대표식품명의 모든 음식 조회 ===
             print(f"📋 [5단계] '{selected_representative}' 음식 조회 중...")
-            from app.services.food_nutrients_service import get_foods_by_representative_name
-            foods_in_representative = await get_foods_by_representative_name(
-                session,
-                selected_class,
-                selected_representative
-            )
+            foods_in_representative = taxonomy.foods(selected_class, selected_representative)
             
             if not foods_in_representative:
                 raise RuntimeError(f"'{selected_representative}'에 해당하는 음식이 없습니다.")
@@ -473,19 +439,10 @@ class GPTVisionService:
             # 키워드로 음식 필터링 (예: "페퍼로니" 키워드면 페퍼로니 피자 우선)
             if keywords and len(foods_in_representative) > 50:
                 print(f"🔍 키워드로 음식 우선순위 정렬: {keywords}")
-                priority_foods = []
-                for keyword in keywords[:5]:
-                    for food in foods_in_representative:
-                        if keyword in food.nutrient_name and food not in priority_foods:
-                            priority_foods.append(food)
-                
-                # 나머지 음식 추가
-                remaining_foods = [f for f in foods_in_representative if f not in priority_foods]
-                foods_sorted = priority_foods + remaining_foods
-                
-                print(f"✅ 키워드 매칭 음식: {len(priority_foods)}개 (우선 전달)")
+                foods_sorted, matched_count = foods_in_representative.ordered(keywords[:5])
+                print(f"✅ 키워드 매칭 음식: {matched_count}개 (우선 전달)")
             else:
-                foods_sorted = foods_in_representative
+                foods_sorted, _ = foods_in_representative.ordered()
             
             # === 6단계: GPT에게 구체적인 음식 선택 요청 ===
             print(f"🤖 [6단계] GPT에게 구체적인 음식 선택 요청 중...")
@@ -498,13 +455,22 @@ class GPTVisionService:
             
             print(f"✅ 최종 선택: {final_result['food_name']} (food_id: {final_result.get('food_id', 'N/A')})")
             
+            if cache_key is not None:
+                await get_vision_result_cache().set(cache_key, {
+                    "yolo": {
+                        "detected_objects": yolo_detection_result.get("detected_objects", []),
+                        "summary": yolo_detection_result.get("summary", ""),
+                    },
+                    "analysis": final_result,
+                })
+            
             return final_result
             
         except Exception as e:
             print(f"❌ DB 기반 GPT 분석 실패: {e}")
             # 폴백: 기존 방식 사용
             print("⚠️ 기존 방식으로 폴백...")
-            return self.analyze_food_with_detection(image_bytes, yolo_detection_result)
+            return await self.analyze_food_with_detection(prepared, yolo_detection_result)
     
     async def _ask_gpt_for_food_class(
         self,
@@ -568,7 +534,8 @@ class GPTVisionService:
 이미지를 인식할 수 없습니다. (이미지가 흐릿하거나, 음식이 명확하지 않음)
 """
         
-        response = await self.client.chat.completions.create(
+        response = await get_llm_gateway().chat_completion(
+            call_site="gpt_vision.food_class",
             model="gpt-4o",
             messages=[
                 {
@@ -669,7 +636,8 @@ class GPTVisionService:
 이유: 이미지에 둥근 도우 위에 토마토 소스, 치즈, 페퍼로니 토핑이 올려진 피자가 보입니다.
 """
         
-        response = await self.client.chat.completions.create(
+        response = await get_llm_gateway().chat_completion(
+            call_site="gpt_vision.representative_name",
             model="gpt-4o",
             messages=[
                 {
@@ -805,7 +773,7 @@ class GPTVisionService:
     async def _ask_gpt_for_specific_food(
         self,
         base64_image: str,
-        foods: List[FoodNutrient],
+        foods: List[Union[FoodNutrient, IndexedFood]],
         food_class: str,
         yolo_result: dict
     ) -> dict:
@@ -878,7 +846,8 @@ class GPTVisionService:
 - 치즈 양을 줄이면 칼로리를 낮출 수 있습니다.
 """
         
-        response = await self.client.chat.completions.create(
+        response = await get_llm_gateway().chat_completion(
+            call_site="gpt_vision.specific_food",
             model="gpt-4o",
             messages=[
                 {
@@ -914,7 +883,7 @@ class GPTVisionService:
     def _parse_specific_food_response(
         self, 
         gpt_response: str, 
-        foods: List[FoodNutrient]
+        foods: List[Union[FoodNutrient, IndexedFood]]
     ) -> dict:
         """2차 GPT 응답 파싱"""
         lines = gpt_response.strip().split('\n')
@@ -1026,7 +995,8 @@ class GPTVisionService:
 
 답변:"""
             
-            response = await self.client.chat.completions.create(
+            response = await get_llm_gateway().chat_completion(
+                call_site="gpt_vision.ingredient",
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -1043,7 +1013,8 @@ class GPTVisionService:
                     }
                 ],
                 max_tokens=50,
-                temperature=0.3
+                temperature=0,
+                validate=_first_line_answer,
             )
             
             raw_response = response.choices[0].message.content.strip()
@@ -1122,7 +1093,8 @@ class GPTVisionService:
 
 답변:"""
             
-            response = await self.client.chat.completions.create(
+            response = await get_llm_gateway().chat_completion(
+                call_site="gpt_vision.ingredients_with_boxes",
                 model="gpt-4o-mini",
                 messages=[
                     {
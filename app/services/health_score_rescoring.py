@@ -0,0 +1,229 @@
+"""과거 health_score 일괄 재계산
+
+DV 상수(NRF93_DAILY_VALUES)나 등급 기준(GRADE_THRESHOLDS)을 바꾼 뒤 기존 health_score 행을
+현재 공식으로 다시 계산한다. UserFoodHistory × health_score × food_nutrients를
+(history_id, food_id) keyset 청크로 읽고, 청크 단위로 배치 계산(nrf93_scores /
+korean_nutrition_scores)한 뒤 CASE 기반 UPDATE 한 번으로 되쓴다.
+
+- 점수는 음식의 기준량(reference_value, 기본 100g) 당 함량으로 계산한다.
+  (저장 시에도 NRF9.3은 100g 기준으로 정규화, 한국식은 기준량 함량을 그대로 사용)
+- food_nutrients에 없는 음식(TEMP_, 사용자 등록 음식 등)은 건너뛴다.
+- NRF9.3 행은 기본적으로 건너뛴다. `/meals/save-recommended`는 GPT가 추정한 영양소로
+  점수를 매긴 뒤 유사 매칭한 food_id를 저장하고, 레시피 저장은 비타민/무기질을 0으로 두고
+  계산하므로 food_id의 food_nutrients 행으로 다시 계산하면 공식이 같아도 값이 바뀐다.
+  food_nutrients로 계산한 행은 `/meals/save`의 한국식 점수뿐이다.
+
+실행: python -m app.commands.rescore_health_scores
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, case, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import HealthScore, UserFoodHistory
+from app.db.models_food_nutrients import FoodNutrient
+from app.services.health_score_service import (
+    KOREAN_NUTRIENTS,
+    KOREAN_SCORE_CALC_METHOD,
+    NRF93_NUTRIENTS,
+    korean_nutrition_scores,
+    nrf93_scores,
+)
+
+# calc_method 판별 및 --method 강제 시 저장할 값
+METHOD_NRF93 = "nrf93"
+METHOD_KOREAN = "korean"
+METHOD_AUTO = "auto"
+NRF93_METHOD_LABEL = "NRF9.3"
+
+# 한국식 점수 입력 → food_nutrients 컬럼 (sugar는 added_sugar)
+KOREAN_SOURCE_COLUMNS = {name: "added_sugar" if name == "sugar" else name for name in KOREAN_NUTRIENTS}
+
+# food_nutrients에 없는 NRF9.3 입력 (0으로 계산)
+_NRF93_MISSING_COLUMNS = {"vitamin_e"}
+
+_NUTRIENT_COLUMNS: Tuple[str, ...] = tuple(
+    dict.fromkeys(
+        [name for name in NRF93_NUTRIENTS if name not in _NRF93_MISSING_COLUMNS]
+        + list(KOREAN_SOURCE_COLUMNS.values())
+    )
+)
+
+
+@dataclass(frozen=True)
+class RescoreCursor:
+    """keyset 위치 (이 위치 다음 행부터 읽는다)"""
+
+    history_id: int = 0
+    food_id: str = ""
+
+
+@dataclass
+class ScoreUpdate:
+    """health_score 한 행의 새 값"""
+
+    history_id: int
+    user_id: int
+    food_id: str
+    positive_score: int
+    negative_score: int
+    final_score: int
+    food_grade: str
+    calc_method: Optional[str]
+
+
+def detect_method(calc_method: Optional[str]) -> Optional[str]:
+    """저장된 calc_method → 재계산 공식 (알 수 없으면 None)"""
+    if not calc_method:
+        return None
+    if calc_method.startswith("NRF9.3"):
+        return METHOD_NRF93
+    if calc_method.startswith("한국식"):
+        return METHOD_KOREAN
+    return None
+
+
+def rescore_chunk_query(cursor: RescoreCursor, chunk_size: int):
+    """cursor 다음부터 chunk_size개의 (기록, 점수, 영양소) 행 조회"""
+    after = or_(
+        UserFoodHistory.history_id > cursor.history_id,
+        and_(UserFoodHistory.history_id == cursor.history_id, HealthScore.food_id > cursor.food_id),
+    )
+    return (
+        select(
+            UserFoodHistory.history_id,
+            UserFoodHistory.user_id,
+            HealthScore.food_id,
+            HealthScore.calc_method,
+            HealthScore.positive_score,
+            HealthScore.negative_score,
+            HealthScore.final_score,
+            HealthScore.food_grade,
+            FoodNutrient.food_id.label("nutrient_food_id"),
+            FoodNutrient.reference_value,
+            *(getattr(FoodNutrient, column).label(f"n_{column}") for column in _NUTRIENT_COLUMNS),
+        )
+        .join(
+            HealthScore,
+            and_(
+                HealthScore.history_id == UserFoodHistory.history_id,
+                HealthScore.user_id == UserFoodHistory.user_id,
+            ),
+        )
+        .outerjoin(FoodNutrient, FoodNutrient.food_id == HealthScore.food_id)
+        .where(after)
+        .order_by(UserFoodHistory.history_id, HealthScore.food_id)
+        .limit(chunk_size)
+    )
+
+
+async def fetch_rescore_chunk(session: AsyncSession, cursor: RescoreCursor, chunk_size: int) -> List[Any]:
+    return list((await session.execute(rescore_chunk_query(cursor, chunk_size))).all())
+
+
+def _nutrient_values(rows: Sequence[Any], names: Sequence[str], source: dict) -> np.ndarray:
+    return np.array(
+        [
+            [None if source.get(name) is None else getattr(row, f"n_{source[name]}") for name in names]
+            for row in rows
+        ],
+        dtype=np.float64,
+    )
+
+
+def rescore_rows(
+    rows: Sequence[Any],
+    method: str = METHOD_AUTO,
+    include_nrf93: bool = False,
+) -> Tuple[List[ScoreUpdate], int]:
+    """
+    청크 행들의 점수를 현재 공식으로 배치 재계산
+
+    Args:
+        rows: rescore_chunk_query 결과 행
+        method: auto(저장된 calc_method 기준) / nrf93 / korean (강제 시 calc_method도 변경)
+        include_nrf93: auto일 때 NRF9.3 행도 food_nutrients 기준으로 다시 계산
+            (기본은 건너뜀, 저장 시 점수 입력이 food_nutrients 행이 아니기 때문)
+
+    Returns:
+        (값이 바뀐 행의 ScoreUpdate 목록, 건너뛴 행 수)
+    """
+    groups = {METHOD_NRF93: [], METHOD_KOREAN: []}
+    skipped = 0
+    for row in rows:
+        row_method = detect_method(row.calc_method) if method == METHOD_AUTO else method
+        if method == METHOD_AUTO and row_method == METHOD_NRF93 and not include_nrf93:
+            row_method = None
+        if row_method is None or row.nutrient_food_id is None:
+            skipped += 1
+            continue
+        groups[row_method].append(row)
+
+    updates: List[ScoreUpdate] = []
+    for row_method, group in groups.items():
+        if not group:
+            continue
+        if row_method == METHOD_NRF93:
+            source = {name: name for name in NRF93_NUTRIENTS if name not in _NRF93_MISSING_COLUMNS}
+            references = np.array([row.reference_value or 100.0 for row in group], dtype=np.float64)
+            scores = nrf93_scores(_nutrient_values(group, NRF93_NUTRIENTS, source), references)
+            label = NRF93_METHOD_LABEL
+        else:
+            scores = korean_nutrition_scores(_nutrient_values(group, KOREAN_NUTRIENTS, KOREAN_SOURCE_COLUMNS))
+            label = KOREAN_SCORE_CALC_METHOD
+
+        for i, row in enumerate(group):
+            new = ScoreUpdate(
+                history_id=row.history_id,
+                user_id=row.user_id,
+                food_id=row.food_id,
+                # INT 컬럼: 세부 점수는 반올림, 최종 점수는 저장 경로와 같게 절삭
+                positive_score=int(round(float(scores.positive_score[i]))),
+                negative_score=int(round(float(scores.negative_score[i]))),
+                final_score=int(scores.final_score[i]),
+                food_grade=scores.food_grade[i],
+                calc_method=row.calc_method if method == METHOD_AUTO else label,
+            )
+            current = (row.positive_score, row.negative_score, row.final_score, row.food_grade, row.calc_method)
+            if current != (new.positive_score, new.negative_score, new.final_score, new.food_grade, new.calc_method):
+                updates.append(new)
+    return updates, skipped
+
+
+def bulk_update_statement(updates: Sequence[ScoreUpdate]):
+    """여러 행의 점수를 UPDATE ... SET col = CASE ... END 한 문장으로 갱신"""
+    conditions = [
+        (and_(HealthScore.history_id == u.history_id, HealthScore.food_id == u.food_id), u)
+        for u in updates
+    ]
+
+    def column_case(name: str):
+        return case(*((condition, getattr(u, name)) for condition, u in conditions), else_=getattr(HealthScore, name))
+
+    return (
+        update(HealthScore)
+        .where(
+            tuple_(HealthScore.history_id, HealthScore.user_id, HealthScore.food_id).in_(
+                [(u.history_id, u.user_id, u.food_id) for u in updates]
+            )
+        )
+        .values(
+            {
+                name: column_case(name)
+                for name in ("positive_score", "negative_score", "final_score", "food_grade", "calc_method")
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_score_updates(session: AsyncSession, updates: Sequence[ScoreUpdate]) -> int:
+    """bulk UPDATE 실행 (commit은 호출자가 수행)"""
+    if not updates:
+        return 0
+    await session.execute(bulk_update_statement(updates))
+    return len(updates)
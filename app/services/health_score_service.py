@@ -1,7 +1,9 @@
 """건강 점수 서비스 - health_score 테이블"""
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import select, and_
+import numpy as np
+from sqlalchemy import insert, select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import HealthScore, UserFoodHistory
@@ -58,6 +60,29 @@ async def create_health_score(
     return score
 
 
+async def create_health_scores(
+    session: AsyncSession,
+    scores: Sequence[HealthScore],
+) -> None:
+    """
+    건강 점수 여러 건을 multi-row INSERT 한 번으로 저장
+    
+    Args:
+        session: DB 세션
+        scores: 저장할 HealthScore 객체 목록 (세션에 add 하지 않은 상태)
+    """
+    if not scores:
+        return
+    
+    columns = [column.key for column in HealthScore.__table__.columns]
+    await session.execute(
+        insert(HealthScore).values([
+            {column: getattr(score, column) for column in columns}
+            for score in scores
+        ])
+    )
+
+
 async def get_health_score_by_history_id(
     session: AsyncSession,
     history_id: int,
@@ -210,16 +235,215 @@ async def calculate_food_grade(final_score: int) -> str:
     Returns:
         음식 등급
     """
-    if final_score >= 90:
-        return "우수한 영양식품"
-    elif final_score >= 75:
-        return "좋은 영양식품"
-    elif final_score >= 50:
-        return "보통 영양식품"
-    elif final_score >= 25:
-        return "영양개선 필요"
-    else:
-        return "영양소 부족"
+    return food_grade_for(final_score)
+
+
+def food_grade_for(final_score: int) -> str:
+    """calculate_food_grade의 동기 버전"""
+    for threshold, grade in GRADE_THRESHOLDS:
+        if final_score >= threshold:
+            return grade
+    return LOWEST_GRADE
+
+
+# ============================================================================
+# 배치(벡터화) 점수 계산
+# ============================================================================
+#
+# N개 음식을 NumPy 배열로 한 번에 계산한다. 단건 함수(calculate_nrf93_score,
+# calculate_korean_nutrition_score)는 1행 배치를 호출하는 얇은 래퍼이며,
+# 합계는 기존 파이썬 sum과 같은 순서(열 순서대로 누적)로 더해 결과가 일치한다.
+
+GRADE_THRESHOLDS: Tuple[Tuple[int, str], ...] = (
+    (90, "우수한 영양식품"),
+    (75, "좋은 영양식품"),
+    (50, "보통 영양식품"),
+    (25, "영양개선 필요"),
+)
+LOWEST_GRADE = "영양소 부족"
+
+# NRF9.3 입력 열 순서 (권장영양소 9 + 제한영양소 3)
+NRF93_NUTRIENTS: Tuple[str, ...] = (
+    "protein", "fiber", "vitamin_a", "vitamin_c", "vitamin_e", "calcium",
+    "iron", "potassium", "magnesium", "saturated_fat", "added_sugar", "sodium",
+)
+
+# 일일 권장량 (한국인 영양소 섭취기준, 성인 기준)
+NRF93_DAILY_VALUES: Dict[str, float] = {
+    "protein": 55.0,  # g
+    "fiber": 25.0,  # g
+    "vitamin_a": 700.0,  # μg RAE
+    "vitamin_c": 100.0,  # mg
+    "vitamin_e": 12.0,  # mg α-TE
+    "calcium": 700.0,  # mg
+    "iron": 10.0,  # mg (남성 기준, 여성은 14mg)
+    "potassium": 3500.0,  # mg
+    "magnesium": 350.0,  # mg (남성 기준, 여성은 280mg)
+    "saturated_fat": 15.0,  # g (총 에너지의 7% 기준)
+    "added_sugar": 50.0,  # g (총 에너지의 10% 기준)
+    "sodium": 2000.0,  # mg
+}
+
+NRF93_CALC_METHOD = "NRF9.3 (Nutrient Rich Food Index) - 0~100점 정규화"
+
+
+def food_grades(final_scores) -> np.ndarray:
+    """최종 점수 배열 → 음식 등급 배열 (calculate_food_grade와 같은 기준, 점수는 int로 절삭)"""
+    scores = np.trunc(np.asarray(final_scores, dtype=np.float64))
+    return np.select(
+        [scores >= threshold for threshold, _ in GRADE_THRESHOLDS],
+        [grade for _, grade in GRADE_THRESHOLDS],
+        default=LOWEST_GRADE,
+    ).astype(object)
+
+
+def _sequential_sum(values: np.ndarray) -> np.ndarray:
+    """열 순서대로 누적한 행별 합계 (파이썬 sum과 같은 덧셈 순서)"""
+    total = np.zeros(values.shape[0])
+    for column in range(values.shape[1]):
+        total = total + values[:, column]
+    return total
+
+
+def _available_mean(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """0보다 큰 값만의 (평균, 개수) — 없으면 평균 0"""
+    available = values > 0
+    count = available.sum(axis=1)
+    total = _sequential_sum(np.where(available, values, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+    return mean, count
+
+
+@dataclass
+class NutritionScores:
+    """N개 음식의 점수 계산 결과 (열 배열)"""
+
+    positive_score: np.ndarray
+    negative_score: np.ndarray
+    final_score: np.ndarray
+    food_grade: np.ndarray
+    calc_method: str
+    decimals: Optional[int] = None  # None이면 int로 절삭 (한국식), 숫자면 반올림 자릿수 (NRF9.3)
+    details: Dict[str, np.ndarray] = field(default_factory=dict)
+    base_score: Optional[np.ndarray] = None
+    other_score: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.final_score)
+
+    def _number(self, value: float):
+        return int(value) if self.decimals is None else round(float(value), self.decimals)
+
+    def to_dict(self, index: int) -> dict:
+        """i번째 음식의 결과 (기존 단건 함수와 같은 형태의 딕셔너리)"""
+        result = {
+            "positive_score": self._number(self.positive_score[index]),
+            "negative_score": self._number(self.negative_score[index]),
+            "final_score": self._number(self.final_score[index]),
+            "food_grade": self.food_grade[index],
+            "calc_method": self.calc_method,
+        }
+        if self.details:
+            result["details"] = {
+                "positive_nutrients": {
+                    name: round(float(self.details[name][index]), 1) for name in NRF93_NUTRIENTS[:9]
+                },
+                "negative_nutrients": {
+                    name: round(float(self.details[name][index]), 1) for name in NRF93_NUTRIENTS[9:]
+                },
+            }
+        return result
+
+    def to_dicts(self) -> List[dict]:
+        return [self.to_dict(i) for i in range(len(self))]
+
+
+def nrf93_scores(values, reference_value_g=100.0) -> NutritionScores:
+    """
+    NRF9.3 영양 점수 배치 계산 (calculate_nrf93_score와 같은 공식)
+    
+    Args:
+        values: (N × 12) 배열, 열 순서는 NRF93_NUTRIENTS (None/NaN은 0)
+        reference_value_g: 기준량 (g) — 스칼라 또는 길이 N 배열
+    
+    Returns:
+        NutritionScores (details에 영양소별 일일권장량 대비 %)
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64).reshape(-1, len(NRF93_NUTRIENTS)))
+    reference = np.broadcast_to(np.asarray(reference_value_g, dtype=np.float64), values.shape[:1])
+    daily_values = np.array([NRF93_DAILY_VALUES[name] for name in NRF93_NUTRIENTS])
+    
+    # 100g 당으로 정규화 후 일일권장량 대비 % (최대 100%로 캡)
+    scale = 100.0 / reference
+    percents = np.minimum((values * scale[:, None] / daily_values) * 100, 100)
+    positive, negative = percents[:, :9], percents[:, 9:]
+    protein_score, fiber_score = positive[:, 0], positive[:, 1]
+    
+    # 기본 영양소 점수 (단백질 최대 60점 + 식이섬유 최대 40점)
+    protein_points = np.where(protein_score > 0, np.minimum(60, protein_score * 0.6), 0.0)
+    fiber_points = np.where(fiber_score > 0, np.minimum(40, fiber_score * 0.4), 0.0)
+    base_score = protein_points + fiber_points
+    
+    # 추가 영양소 (비타민A, C, E, 칼슘, 철분, 칼륨, 마그네슘) — 있는 항목 평균 × 보유 비율
+    other_avg, other_count = _available_mean(positive[:, 2:])
+    other_score = np.where(other_count > 0, np.minimum(50, other_avg * (other_count / 7.0) * 0.5), 0.0)
+    positive_score = np.minimum(100, base_score + other_score)
+    
+    # 제한 영양소 점수 (있는 항목 평균, 15%만 감점)
+    negative_score, _ = _available_mean(negative)
+    raw_score = positive_score - (negative_score * 0.15)
+    
+    # 비타민/미네랄 보너스 (최대 30점)
+    vitamin_bonus = np.where(other_count > 0, np.minimum(30, other_avg * other_count / 7.0 * 0.35), 0.0)
+    bounded = np.minimum(100, raw_score + vitamin_bonus)
+    
+    # 식단 유형별 최소 점수 보장
+    floor = np.select(
+        [
+            base_score >= 50,
+            base_score >= 30,
+            (fiber_score >= 20) | (other_count >= 4),
+            (fiber_score >= 15) | (other_count >= 3),
+            base_score > 0,
+        ],
+        [80, 70, 80, 75, 60],
+        default=0,
+    )
+    final_score = np.maximum(floor, bounded)
+    
+    # 단백질 중심 식단 보너스 (닭가슴살, 생선 등)
+    final_score = np.where(
+        protein_score >= 30,
+        np.minimum(100, final_score + np.minimum(20, protein_score / 2.5)),
+        final_score,
+    )
+    final_score = np.clip(final_score, 0, 100)
+    
+    return NutritionScores(
+        positive_score=positive_score,
+        negative_score=negative_score,
+        final_score=final_score,
+        food_grade=food_grades(final_score),
+        calc_method=NRF93_CALC_METHOD,
+        decimals=2,
+        details={name: percents[:, i] for i, name in enumerate(NRF93_NUTRIENTS)},
+        base_score=base_score,
+        other_score=other_score,
+    )
+
+
+def nrf93_inputs_from_matrix(matrix, food_ids: Sequence[str], portions_g: Sequence[Optional[float]]) -> np.ndarray:
+    """
+    영양소 행렬(NutrientMatrix)에서 섭취량 기준 NRF9.3 입력 (N × 12) 구성
+    
+    food_nutrients에 없는 비타민E는 0으로 둔다.
+    """
+    columns = [name for name in NRF93_NUTRIENTS if name != "vitamin_e"]
+    scaled = matrix.scale(food_ids, portions_g, columns)
+    values = np.zeros((len(food_ids), len(NRF93_NUTRIENTS)))
+    values[:, [NRF93_NUTRIENTS.index(name) for name in columns]] = scaled
+    return values
 
 
 async def calculate_nrf93_score(
@@ -266,176 +490,22 @@ async def calculate_nrf93_score(
     Returns:
         NRF9.3 점수 계산 결과
     """
-    # 일일 권장량 (한국인 영양소 섭취기준, 성인 기준)
-    DV = {
-        'protein': 55.0,  # g
-        'fiber': 25.0,  # g
-        'vitamin_a': 700.0,  # μg RAE
-        'vitamin_c': 100.0,  # mg
-        'vitamin_e': 12.0,  # mg α-TE
-        'calcium': 700.0,  # mg
-        'iron': 10.0,  # mg (남성 기준, 여성은 14mg)
-        'potassium': 3500.0,  # mg
-        'magnesium': 350.0,  # mg (남성 기준, 여성은 280mg)
-        'saturated_fat': 15.0,  # g (총 에너지의 7% 기준)
-        'added_sugar': 50.0,  # g (총 에너지의 10% 기준)
-        'sodium': 2000.0,  # mg
-    }
-    
-    # 100g 당으로 정규화
-    scale = 100.0 / reference_value_g
-    
-    # 권장영양소 9가지의 일일권장량 대비 % 계산 (최대 100%로 캡)
-    positive_nutrients = [
-        min((protein_g * scale / DV['protein']) * 100, 100),
-        min((fiber_g * scale / DV['fiber']) * 100, 100),
-        min((vitamin_a_ug * scale / DV['vitamin_a']) * 100, 100),
-        min((vitamin_c_mg * scale / DV['vitamin_c']) * 100, 100),
-        min((vitamin_e_mg * scale / DV['vitamin_e']) * 100, 100),
-        min((calcium_mg * scale / DV['calcium']) * 100, 100),
-        min((iron_mg * scale / DV['iron']) * 100, 100),
-        min((potassium_mg * scale / DV['potassium']) * 100, 100),
-        min((magnesium_mg * scale / DV['magnesium']) * 100, 100),
-    ]
-    
-    # 제한영양소 3가지의 일일권장량 대비 % 계산 (최대 100%로 캡)
-    negative_nutrients = [
-        min((saturated_fat_g * scale / DV['saturated_fat']) * 100, 100),
-        min((added_sugar_g * scale / DV['added_sugar']) * 100, 100),
-        min((sodium_mg * scale / DV['sodium']) * 100, 100),
-    ]
-    
-    # 영양소 정보가 있는 항목만 카운트 (0이 아닌 항목)
-    available_positive_nutrients = [n for n in positive_nutrients if n > 0]
-    available_negative_nutrients = [n for n in negative_nutrients if n > 0]
-    
-    # 기본 영양소 점수 (단백질, 식이섬유)
-    # positive_nutrients는 이미 일일 권장량 대비 % (0~100)
-    protein_score = positive_nutrients[0]  # 단백질 (%)
-    fiber_score = positive_nutrients[1]   # 식이섬유 (%)
-    
-    # 기본 영양소 점수 계산 (건강 식단에 유리하도록 개선)
-    # 단백질과 식이섬유를 각각 독립적으로 평가하여 합산
-    if protein_score > 0:
-        # 단백질 점수: 일일 권장량 대비 %를 그대로 점수로 사용 (최대 60점)
-        # 건강 식단이라면 단백질이 충분해야 하므로 더 높은 점수 부여
-        protein_points = min(60, protein_score * 0.6)
-    else:
-        protein_points = 0
-    
-    if fiber_score > 0:
-        # 식이섬유 점수: 일일 권장량 대비 %를 그대로 점수로 사용 (최대 40점)
-        # 건강 식단이라면 식이섬유가 충분해야 하므로 더 높은 점수 부여
-        fiber_points = min(40, fiber_score * 0.4)
-    else:
-        fiber_points = 0
-    
-    # 기본 영양소 점수 합산 (최대 100점)
-    base_score = protein_points + fiber_points
-    
-    # 추가 영양소 점수 (나머지 7개: 비타민A, C, E, 칼슘, 철분, 칼륨, 마그네슘)
-    # 샐러드, 채소 중심 식단에 유리하도록 비중 증가
-    other_nutrients = positive_nutrients[2:]
-    available_other = [n for n in other_nutrients if n > 0]
-    
-    if available_other:
-        # 있는 영양소들의 평균
-        other_avg = sum(available_other) / len(available_other)
-        # 전체 7개 중 몇 개가 있는지에 따라 가중치 조정
-        other_weight = len(available_other) / 7.0  # 0~1
-        # 추가 영양소는 최대 50점 (기존 30점 → 50점으로 증가)
-        # 샐러드처럼 비타민/미네랄이 풍부한 음식에 더 높은 점수
-        other_score = min(50, other_avg * other_weight * 0.5)
-    else:
-        # 추가 영양소가 없어도 기본 점수만으로도 충분히 높은 점수 가능
-        other_score = 0
-    
-    # 전체 긍정 점수 (기본 영양소 + 추가 영양소)
-    # base_score는 0~100점, other_score는 최대 50점 (총합 캡 100점)
-    positive_score = min(100, base_score + other_score)
-    
-    # 제한 영양소 점수 계산 (낮을수록 좋음)
-    if available_negative_nutrients:
-        # 제한 영양소가 있으면 감점 (평균)
-        negative_score = sum(available_negative_nutrients) / len(available_negative_nutrients)
-    else:
-        # 제한 영양소가 없으면 감점 없음
-        negative_score = 0
-    
-    # 최종 점수 계산
-    # positive_score는 0~100, negative_score도 0~100
-    # 건강 식단이라면 제한 영양소가 낮을 것이므로 감점을 최소화
-    # 최종 점수 = positive_score - negative_score * 0.15 (제한 영양소는 15%만 감점)
-    raw_score = positive_score - (negative_score * 0.15)
-    
-    # 점수 범위를 0~100으로 정규화
-    # 채소/과일 중심 식단(비타민 풍부)과 단백질 중심 식단 모두 고려
-    
-    # 비타민/미네랄 보너스 계산 (샐러드, 과일 등에 유리)
-    vitamin_minerals = [positive_nutrients[2], positive_nutrients[3], positive_nutrients[4],  # 비타민 A, C, E
-                        positive_nutrients[5], positive_nutrients[6], positive_nutrients[7], positive_nutrients[8]]  # 칼슘, 철분, 칼륨, 마그네슘
-    available_vitamins = [v for v in vitamin_minerals if v > 0]
-    
-    vitamin_bonus = 0
-    if available_vitamins:
-        vitamin_avg = sum(available_vitamins) / len(available_vitamins)
-        # 비타민/미네랄이 풍부하면 최대 30점 보너스 (추천 음식 우대)
-        vitamin_bonus = min(30, vitamin_avg * len(available_vitamins) / 7.0 * 0.35)
-    
-    # 건강 식단이라면 최소 점수 보장 (추천 음식 = 최소 80점)
-    if base_score >= 50:  # 단백질+식이섬유가 충분 (고단백 식단)
-        final_score = max(80, min(100, raw_score + vitamin_bonus))
-    elif base_score >= 30:  # 적당함
-        final_score = max(70, min(100, raw_score + vitamin_bonus))
-    elif fiber_score >= 20 or len(available_vitamins) >= 4:  # 식이섬유 풍부 또는 비타민 4개 이상 (채소/과일 중심)
-        final_score = max(80, min(100, raw_score + vitamin_bonus))  # 샐러드/과일 = 최소 80점
-    elif fiber_score >= 15 or len(available_vitamins) >= 3:  # 적당한 채소/과일
-        final_score = max(75, min(100, raw_score + vitamin_bonus))
-    elif base_score > 0:  # 기본 영양소 조금이라도 있으면
-        final_score = max(60, min(100, raw_score + vitamin_bonus))
-    else:
-        final_score = max(0, min(100, raw_score + vitamin_bonus))
-    
-    # 단백질 중심 식단 보너스 (닭가슴살, 생선 등)
-    if protein_score >= 30:
-        protein_bonus = min(20, protein_score / 2.5)
-        final_score = min(100, final_score + protein_bonus)
-    
-    # 최종 점수는 0~100 범위로 제한
-    final_score = max(0, min(100, final_score))
+    scores = nrf93_scores(
+        [[
+            protein_g, fiber_g, vitamin_a_ug, vitamin_c_mg, vitamin_e_mg, calcium_mg,
+            iron_mg, potassium_mg, magnesium_mg, saturated_fat_g, added_sugar_g, sodium_mg,
+        ]],
+        reference_value_g=reference_value_g,
+    )
     
     # 디버깅 로그
     print(f"📊 NRF9.3 계산 상세:")
-    print(f"  - 단백질: {protein_score:.1f}%, 식이섬유: {fiber_score:.1f}%")
-    print(f"  - 기본 점수: {base_score:.1f}, 추가 영양소: {other_score:.1f}")
-    print(f"  - 긍정 점수: {positive_score:.1f}, 제한 점수: {negative_score:.1f}")
-    print(f"  - 최종 점수: {final_score:.1f}")
+    print(f"  - 단백질: {scores.details['protein'][0]:.1f}%, 식이섬유: {scores.details['fiber'][0]:.1f}%")
+    print(f"  - 기본 점수: {scores.base_score[0]:.1f}, 추가 영양소: {scores.other_score[0]:.1f}")
+    print(f"  - 긍정 점수: {scores.positive_score[0]:.1f}, 제한 점수: {scores.negative_score[0]:.1f}")
+    print(f"  - 최종 점수: {scores.final_score[0]:.1f}")
     
-    return {
-        "positive_score": round(positive_score, 2),
-        "negative_score": round(negative_score, 2),
-        "final_score": round(final_score, 2),
-        "food_grade": await calculate_food_grade(int(final_score)),
-        "calc_method": "NRF9.3 (Nutrient Rich Food Index) - 0~100점 정규화",
-        "details": {
-            "positive_nutrients": {
-                "protein": round(positive_nutrients[0], 1),
-                "fiber": round(positive_nutrients[1], 1),
-                "vitamin_a": round(positive_nutrients[2], 1),
-                "vitamin_c": round(positive_nutrients[3], 1),
-                "vitamin_e": round(positive_nutrients[4], 1),
-                "calcium": round(positive_nutrients[5], 1),
-                "iron": round(positive_nutrients[6], 1),
-                "potassium": round(positive_nutrients[7], 1),
-                "magnesium": round(positive_nutrients[8], 1),
-            },
-            "negative_nutrients": {
-                "saturated_fat": round(negative_nutrients[0], 1),
-                "added_sugar": round(negative_nutrients[1], 1),
-                "sodium": round(negative_nutrients[2], 1),
-            }
-        }
-    }
+    return scores.to_dict(0)
 
 
 async def calculate_korean_nutrition_score(
@@ -464,17 +534,60 @@ async def calculate_korean_nutrition_score(
     Returns:
         점수 계산 결과 딕셔너리
     """
-    positive_score = protein + fiber + calcium + iron
-    negative_score = sodium + sugar + saturated_fat
-    final_score = positive_score - negative_score
+    return calculate_korean_nutrition_scores([{
+        "protein": protein,
+        "fiber": fiber,
+        "calcium": calcium,
+        "iron": iron,
+        "sodium": sodium,
+        "sugar": sugar,
+        "saturated_fat": saturated_fat,
+    }])[0]
+
+
+KOREAN_SCORE_CALC_METHOD = "한국식 점수 계산식: (단백질 + 섬유질 + 칼슘 + 철분) - (나트륨 + 당분 + 포화지방)"
+KOREAN_POSITIVE_NUTRIENTS = ("protein", "fiber", "calcium", "iron")
+KOREAN_NEGATIVE_NUTRIENTS = ("sodium", "sugar", "saturated_fat")
+KOREAN_NUTRIENTS = KOREAN_POSITIVE_NUTRIENTS + KOREAN_NEGATIVE_NUTRIENTS
+
+
+def korean_nutrition_scores(values) -> NutritionScores:
+    """
+    한국식 영양 점수 배치 계산
     
-    return {
-        "positive_score": int(positive_score),
-        "negative_score": int(negative_score),
-        "final_score": int(final_score),
-        "food_grade": await calculate_food_grade(int(final_score)),
-        "calc_method": "한국식 점수 계산식: (단백질 + 섬유질 + 칼슘 + 철분) - (나트륨 + 당분 + 포화지방)",
-    }
+    Args:
+        values: (N × 7) 배열, 열 순서는 KOREAN_NUTRIENTS (None/NaN은 0)
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64).reshape(-1, len(KOREAN_NUTRIENTS)))
+    positive_score = _sequential_sum(values[:, :4])
+    negative_score = _sequential_sum(values[:, 4:])
+    final_score = np.trunc(positive_score - negative_score)
+    return NutritionScores(
+        positive_score=np.trunc(positive_score),
+        negative_score=np.trunc(negative_score),
+        final_score=final_score,
+        food_grade=food_grades(final_score),
+        calc_method=KOREAN_SCORE_CALC_METHOD,
+    )
+
+
+def calculate_korean_nutrition_scores(rows: Sequence[Mapping[str, Optional[float]]]) -> List[dict]:
+    """
+    한국식 영양 점수 배치 계산 (딕셔너리 입력/출력)
+    
+    Args:
+        rows: 음식별 {protein, fiber, calcium, iron, sodium, sugar, saturated_fat} (None은 0)
+    
+    Returns:
+        rows와 같은 순서의 점수 계산 결과 딕셔너리 목록
+    """
+    if not rows:
+        return []
+    values = np.array(
+        [[row.get(name) for name in KOREAN_NUTRIENTS] for row in rows],
+        dtype=np.float64,
+    )
+    return korean_nutrition_scores(values).to_dicts()
 
 
 def calculate_daily_comprehensive_score(
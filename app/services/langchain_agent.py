@@ -2,22 +2,34 @@
 
 이 모듈은 단일 OpenAI API 키를 사용하는 LangChain AgentExecutor를 생성해
 각 LLM 기반 서비스(diet, recipe, food matching, vision)를 통합적으로 호출한다.
+
+도구/ReAct 프롬프트/에이전트 그래프는 (user_id, 프로필 버전)별로 한 번만 만들어 LRU에 보관하고
+매 메시지 재사용한다. 프로필 버전은 프롬프트에 들어가는 건강 목표/질병/알레르기의 해시이므로
+프로필이 바뀌면 자동으로 새로 만든다. 요청마다 달라지는 값(DB 세션, User, 오늘 섭취 현황,
+대화 요약)은 그래프에 넣지 않고 실행 시 AgentRun이 넘긴다.
+- 도구는 ContextVar로 현재 실행의 AgentContext를 읽는다.
+- 대화 기록은 저장된 요약(UserConversation.sum_chat)으로 채운다 (LLM으로 다시 요약하지 않음).
 """
 
 from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import json
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
 
 from langchain.agents import AgentExecutor, create_react_agent
-from langchain.memory import ConversationSummaryBufferMemory
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools import BaseTool
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
@@ -25,9 +37,15 @@ from app.db.models import User
 from app.db.models_food_nutrients import FoodNutrient
 from app.db.models_user_contributed import UserContributedFood
 from app.services.diet_recommendation_service import DietRecommendationService
-from app.services.food_matching_service import FoodMatchingService
+from app.services.food_matching_service import FoodMatchingService, FoodMatchQuery
 from app.services.gpt_vision_service import GPTVisionService
-from app.services.recipe_recommendation_service import RecipeRecommendationService
+from app.services.llm_gateway import get_llm_gateway
+from app.services.recipe_recommendation_service import (
+    RecipeRecommendationService,
+    get_recipe_recommendation_service,
+)
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
@@ -47,6 +65,34 @@ class AgentContext:
     meal_type: Optional[str] = None
 
 
+# 현재 실행 중인 에이전트 호출의 컨텍스트 (캐시된 도구가 요청별 값을 읽는 곳)
+_run_context: ContextVar[Optional[AgentContext]] = ContextVar("agent_run_context", default=None)
+
+
+def _current_context() -> AgentContext:
+    context = _run_context.get()
+    if context is None:
+        raise RuntimeError("에이전트 실행 컨텍스트 없이 도구가 호출되었습니다.")
+    return context
+
+
+def profile_version(context: AgentContext) -> str:
+    """프롬프트에 들어가는 사용자 프로필(건강 목표/질병/알레르기) 해시"""
+    health_goal = context.user.health_goal if context.user and context.user.health_goal else "maintain"
+    raw = json.dumps(
+        [health_goal, list(context.diseases or []), list(context.allergies or [])],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def summary_messages(conversation_summary: Optional[str]) -> List[BaseMessage]:
+    """저장된 대화 요약 → chat_history 메시지 (예전 메모리에 넣던 것과 같은 형태)"""
+    if not conversation_summary:
+        return []
+    return [HumanMessage(content="대화 요약"), AIMessage(content=conversation_summary)]
+
+
 class DietPlanTool(BaseTool):
     """DietRecommendationService를 호출하는 LangChain 도구."""
 
@@ -56,7 +102,6 @@ class DietPlanTool(BaseTool):
         "입력은 사용자의 자유로운 요청 문장이어야 하며, 반환값은 JSON 문자열입니다."
     )
     service: DietRecommendationService
-    user: User
 
     def _run(self, query: str) -> str:
         """Use the tool."""
@@ -64,7 +109,7 @@ class DietPlanTool(BaseTool):
 
     async def _arun(self, query: str) -> str:
         """Use the tool asynchronously."""
-        result = await self.service.generate_diet_plan_async(user=self.user, prompt=query)
+        result = await self.service.generate_diet_plan_async(user=_current_context().user, prompt=query)
         return json.dumps(result, ensure_ascii=False)
 
 
@@ -77,13 +122,6 @@ class RecipeRecommendationTool(BaseTool):
         "입력은 사용자의 요청 문장 혹은 JSON({\"prompt\": \"...\", \"meal_type\": \"lunch\"}) 형태를 지원합니다."
     )
     service: RecipeRecommendationService
-    user: User
-    diseases: List[str] = []
-    allergies: List[str] = []
-    has_eaten_today: bool = True
-    deficient_nutrients: List[Dict[str, Any]] = []
-    excess_warnings: List[str] = []
-    meal_type: Optional[str] = None
 
     def _run(self, query: str) -> str:
         """Use the tool."""
@@ -91,6 +129,7 @@ class RecipeRecommendationTool(BaseTool):
 
     async def _arun(self, query: str) -> str:
         """Use the tool asynchronously."""
+        context = _current_context()
         # 쿼리가 JSON 형태일 수 있으므로 파싱 시도
         try:
             params = json.loads(query)
@@ -98,16 +137,16 @@ class RecipeRecommendationTool(BaseTool):
             meal_type = params.get("meal_type")
         except json.JSONDecodeError:
             prompt = query
-            meal_type = self.meal_type
+            meal_type = context.meal_type
 
         result = await self.service.recommend_recipes_async(
             prompt=prompt,
-            user=self.user,
-            diseases=self.diseases,
-            allergies=self.allergies,
-            has_eaten_today=self.has_eaten_today,
-            deficient_nutrients=self.deficient_nutrients,
-            excess_warnings=self.excess_warnings,
+            user=context.user,
+            diseases=context.diseases or [],
+            allergies=context.allergies or [],
+            has_eaten_today=context.has_eaten_today if context.has_eaten_today is not None else True,
+            deficient_nutrients=context.deficient_nutrients or [],
+            excess_warnings=context.excess_warnings or [],
             meal_type=meal_type,
         )
         return json.dumps([r.dict() for r in result], ensure_ascii=False)
@@ -121,11 +160,10 @@ class FoodMatchingTool(BaseTool):
         "추천 음식명을 식약처 DB 또는 사용자 기여 음식과 매칭합니다. "
         "입력은 JSON 문자열이어야 하며 예시는 "
         '{"food_name": "닭가슴살 샐러드", "ingredients": ["닭가슴살", "양상추"], "food_class_hint": "샐러드"}. '
+        "여러 음식을 한 번에 매칭하려면 {\"items\": [{...}, {...}]} 형태로 입력합니다. "
         "결과는 매칭된 음식 정보 JSON 문자열입니다."
     )
     service: FoodMatchingService
-    session: AsyncSession
-    user_id: int
 
     def _run(self, query: str) -> str:
         """Use the tool."""
@@ -135,24 +173,44 @@ class FoodMatchingTool(BaseTool):
         """Use the tool asynchronously."""
         try:
             params = json.loads(query)
-            food_name = params["food_name"]
-            ingredients = params.get("ingredients")
-            food_class_hint = params.get("food_class_hint")
-        except (json.JSONDecodeError, KeyError) as e:
+            is_batch = "items" in params
+            items = [
+                FoodMatchQuery(
+                    food_name=item["food_name"],
+                    ingredients=item.get("ingredients") or [],
+                    food_class_hint=item.get("food_class_hint"),
+                )
+                for item in (params["items"] if is_batch else [params])
+            ]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
             return f"Error: Invalid JSON input for FoodMatchingTool. {e}"
 
-        matched_food = await self.service.match_food_item_async(
-            session=self.session,
-            user_id=self.user_id,
-            food_name=food_name,
-            ingredients=ingredients,
-            food_class_hint=food_class_hint,
-        )
-        if isinstance(matched_food, (FoodNutrient, UserContributedFood)):
-            return json.dumps(matched_food.to_dict(), ensure_ascii=False)
-        return json.dumps(
-            {"error": "Food not found or could not be matched."}, ensure_ascii=False
+        context = _current_context()
+        if context.session is None or context.user is None:
+            return "Error: FoodMatchingTool requires a signed-in user session."
+        matched_foods = await self.service.match_foods_to_db(
+            session=context.session,
+            items=items,
+            user_id=context.user.user_id,
         )
+        results = [_matched_food_to_dict(food) for food in matched_foods]
+        return json.dumps(results if is_batch else results[0], ensure_ascii=False)
+
+
+def _matched_food_to_dict(food: Optional[FoodNutrient | UserContributedFood]) -> Dict[str, Any]:
+    """매칭 결과를 도구 출력용 dict로 변환."""
+    if not isinstance(food, (FoodNutrient, UserContributedFood)):
+        return {"error": "Food not found or could not be matched."}
+    return {
+        "food_id": food.food_id,
+        "name": getattr(food, "nutrient_name", None) or getattr(food, "food_name", None),
+        "food_class1": food.food_class1,
+        "food_class2": food.food_class2,
+        "kcal": food.kcal,
+        "protein": food.protein,
+        "carb": food.carb,
+        "fat": food.fat,
+    }
 
 
 class VisionAnalysisTool(BaseTool):
@@ -185,86 +243,180 @@ class VisionAnalysisTool(BaseTool):
         return analysis_result
 
 
-class LangChainAgentFactory:
-    """LangChain AgentExecutor 생성기."""
+@dataclass
+class PreparedAgent:
+    """(user_id, 프로필 버전)별로 재사용하는 에이전트 그래프"""
+
+    executor: AgentExecutor
+    version: str
+    build_ms: float
+
+
+class AgentGraphCache:
+    """PreparedAgent LRU (사용자당 최신 프로필 버전 하나만 보관)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[int, str], PreparedAgent]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.build_ms_total = 0.0
+
+    def get(self, key: Tuple[int, str]) -> Optional[PreparedAgent]:
+        prepared = self._entries.get(key)
+        if prepared is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return prepared
+
+    def put(self, key: Tuple[int, str], prepared: PreparedAgent) -> None:
+        user_id = key[0]
+        # 프로필이 바뀐 사용자의 이전 버전은 다시 쓰이지 않는다
+        for stale in [k for k in self._entries if k[0] == user_id and k != key]:
+            del self._entries[stale]
+        self._entries[key] = prepared
+        self._entries.move_to_end(key)
+        self.builds += 1
+        self.build_ms_total += prepared.build_ms
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "builds": self.builds,
+            "avg_build_ms": round(self.build_ms_total / self.builds, 1) if self.builds else 0.0,
+        }
+
+
+class AgentRun:
+    """캐시된 에이전트 그래프 + 이번 요청의 컨텍스트"""
+
+    def __init__(self, prepared: PreparedAgent, context: AgentContext):
+        self.prepared = prepared
+        self.context = context
+
+    async def ainvoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        token = _run_context.set(self.context)
+        try:
+            return await self.prepared.executor.ainvoke(self._inputs(inputs))
+        finally:
+            _run_context.reset(token)
 
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.4):
-        if not settings.openai_api_key:
-            raise ValueError("OPENAI_API_KEY가 설정되지 않아 LangChain 에이전트를 초기화할 수 없습니다.")
+    async def astream_events(self, inputs: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """ainvoke와 같은 실행을 LangChain 이벤트(v2)로 (SSE 응답용)"""
+        token = _run_context.set(self.context)
+        try:
+            async for event in self.prepared.executor.astream_events(self._inputs(inputs), version="v2"):
+                yield event
+        finally:
+            _run_context.reset(token)
 
-        self.llm = ChatOpenAI(
-            api_key=settings.openai_api_key,
-            model=model,
-            temperature=temperature,
-        )
+    def _inputs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **inputs,
+            "chat_history": summary_messages(self.context.conversation_summary),
+            "conversation_summary": self.context.conversation_summary or "이전 요약 없음",
+        }
+
+
+class LangChainAgentFactory:
+    """LangChain AgentExecutor 생성기."""
 
-    async def create_executor(self, context: AgentContext) -> AgentExecutor:
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.4,
+        llm: Optional[BaseChatModel] = None,
+        cache_max_entries: Optional[int] = None,
+    ):
+        if llm is None:
+            if not settings.openai_api_key:
+                raise ValueError("OPENAI_API_KEY가 설정되지 않아 LangChain 에이전트를 초기화할 수 없습니다.")
+            llm = get_llm_gateway().chat_model(model=model, temperature=temperature)
+        self.llm = llm
+        self.cache = AgentGraphCache(cache_max_entries or settings.chat_agent_cache_max_entries)
+        self._services: Optional[Dict[str, Any]] = None
+
+    async def create_executor(self, context: AgentContext) -> AgentRun:
+        """캐시된 에이전트 그래프를 이번 요청의 컨텍스트에 묶어 반환 (없으면 만든다)"""
+        return AgentRun(self.get_prepared_agent(context), context)
+
+    def get_prepared_agent(self, context: AgentContext) -> PreparedAgent:
+        user_id = context.user.user_id if context.user else 0
+        version = profile_version(context)
+        key = (user_id, version)
+        prepared = self.cache.get(key)
+        if prepared is None:
+            prepared = self._build_agent(context, version)
+            self.cache.put(key, prepared)
+            logger.info("에이전트 그래프 생성 user=%s version=%s (%.1fms)", user_id, version, prepared.build_ms)
+        return prepared
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def _build_agent(self, context: AgentContext, version: str) -> PreparedAgent:
+        started = time.perf_counter()
         tools = self._build_tools(context)
         prompt = self._build_prompt(context)
         agent = create_react_agent(self.llm, tools, prompt)
-
-        memory = ConversationSummaryBufferMemory(
-            llm=self.llm,
-            memory_key="chat_history",
-            return_messages=True,
-            max_token_limit=1500,
-        )
-
-        if context.conversation_summary:
-            memory.save_context(
-                {"input": "대화 요약"},
-                {"output": context.conversation_summary},
-            )
-
-        return AgentExecutor(
+        executor = AgentExecutor(
             agent=agent,
             tools=tools,
-            memory=memory,
             handle_parsing_errors=True,
             max_iterations=8,
             max_execution_time=45,
         )
+        return PreparedAgent(
+            executor=executor,
+            version=version,
+            build_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    def _get_services(self) -> Dict[str, Any]:
+        """도구가 쓰는 서비스는 팩토리당 한 번만 생성"""
+        if self._services is None:
+            self._services = {
+                "diet": DietRecommendationService(),
+                "recipe": get_recipe_recommendation_service(),
+                "food_matching": FoodMatchingService(),
+                "vision": GPTVisionService(),
+            }
+        return self._services
 
     def _build_tools(self, context: AgentContext) -> List[BaseTool]:
+        services = self._get_services()
         tools: List[BaseTool] = []
         if context.user:
-            diet_service = DietRecommendationService()
-            tools.append(DietPlanTool(service=diet_service, user=context.user))
-
-            recipe_service = RecipeRecommendationService()
-            tools.append(
-                RecipeRecommendationTool(
-                    service=recipe_service,
-                    user=context.user,
-                    diseases=context.diseases or [],
-                    allergies=context.allergies or [],
-                    has_eaten_today=context.has_eaten_today if context.has_eaten_today is not None else True,
-                    deficient_nutrients=context.deficient_nutrients or [],
-                    excess_warnings=context.excess_warnings or [],
-                    meal_type=context.meal_type,
-                )
-            )
-
-        if context.session and context.user:
-            food_matching_service = FoodMatchingService()
-            tools.append(
-                FoodMatchingTool(
-                    service=food_matching_service,
-                    session=context.session,
-                    user_id=context.user.user_id,
-                )
-            )
+            tools.append(DietPlanTool(service=services["diet"]))
+            tools.append(RecipeRecommendationTool(service=services["recipe"]))
+            # 세션은 실행 시 컨텍스트에서 읽는다 (세션이 없으면 도구가 오류 문자열을 반환)
+            tools.append(FoodMatchingTool(service=services["food_matching"]))
 
-        vision_service = GPTVisionService()
-        tools.append(VisionAnalysisTool(service=vision_service))
+        tools.append(VisionAnalysisTool(service=services["vision"]))
         return tools
 
     def _build_prompt(self, context: AgentContext) -> ChatPromptTemplate:
         diseases_text = ", ".join(context.diseases or []) or "없음"
         allergies_text = ", ".join(context.allergies or []) or "없음"
         health_goal = context.user.health_goal if context.user and context.user.health_goal else "maintain"
-        summary_text = context.conversation_summary or "이전 요약 없음"
 
+        # 요청마다 바뀌는 대화 요약은 프롬프트 변수로 남긴다 (그래프 재사용)
         system_template = f"""
 당신은 Food Calorie Vision의 영양사 챗봇입니다.
 - 항상 사용자의 건강 목표({health_goal})와 기저질환({diseases_text})/알레르기({allergies_text})를 고려하세요.
@@ -274,7 +426,7 @@ class LangChainAgentFactory:
 - 반드시 사용자가 명시적으로 추천/레시피를 요청하거나 끼니 등 조건이 확정된 이후에만 도구({{tool_names}})를 호출하세요.
 - 임의로 도구를 호출하지 말고, 확인되지 않은 상태에서는 `TEXT_ONLY` 방식으로 답변하세요.
 - 건강 경고나 식단 제안은 사용자가 동의했을 때만 제공합니다.
-- 중요 대화 요약: {summary_text}
+- 중요 대화 요약: {{conversation_summary}}
 """
 
         prompt = ChatPromptTemplate.from_messages(
@@ -0,0 +1,370 @@
+"""공용 LLM 게이트웨이
+
+서비스마다 따로 만들던 ChatOpenAI / AsyncOpenAI 클라이언트를 한곳에서 공유하고,
+모든 LLM 호출을 `call_site` 이름과 함께 이 모듈을 거치게 한다.
+
+- 클라이언트 공유: 같은 (model, temperature, ...) 조합은 한 인스턴스를 재사용
+- 응답 캐시: 프롬프트(모델 파라미터 + 메시지) 해시를 키로 응답 본문을 보관
+  (프로세스 내 LRU + `redis_url`이 있으면 Redis). TTL은 호출 지점별 정책
+  (`CALL_SITE_TTLS`)을 따르며 정책이 없는 호출 지점은 캐시하지 않는다.
+  temperature가 0인 호출만, 그리고 응답 본문이 검증(`validate`, JSON 모드는 기본으로
+  JSON 파싱)을 통과했을 때만 저장한다. 잘못된 응답이 TTL 동안 재사용되지 않게 하기 위함.
+- 지표: 호출 지점별 호출 수 / 캐시 hit / miss / 오류 / upstream 지연 시간
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from app.core.config import get_settings
+from app.db.redis_session import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+REDIS_KEY_PREFIX = "llm:response"
+
+# 호출 지점별 응답 캐시 TTL (초). 입력이 같으면 같은 답을 써도 되는 호출만 등록한다.
+# 사용자 대화 맥락이 들어가는 호출(챗봇 응답, 식단/레시피 추천 등)은 등록하지 않는다.
+# 등록된 호출 지점도 temperature=0으로 호출하고 응답 검증 함수를 넘겨야 실제로 캐시된다.
+CALL_SITE_TTLS: Dict[str, int] = {
+    "food_matching.interpret_portion": 7 * 24 * 3600,
+    "food_matching.gpt_match": 24 * 3600,
+    "food_db_finder.estimate": 7 * 24 * 3600,
+    "food_db_finder.calculate": 7 * 24 * 3600,
+    "food_db_finder.validate": 24 * 3600,
+    "nutrient_estimator.estimate": 7 * 24 * 3600,
+    "recipe.ingredient_check": 24 * 3600,
+    "gpt_vision.ingredient": 24 * 3600,
+    "meals.nutrition_estimate": 7 * 24 * 3600,
+}
+
+
+@dataclass
+class CallSiteStats:
+    """호출 지점별 지표"""
+
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    errors: int = 0
+    upstream_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        upstream_calls = self.calls - self.cache_hits
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+            "errors": self.errors,
+            "avg_upstream_ms": round(self.upstream_ms / upstream_calls, 1) if upstream_calls else 0.0,
+        }
+
+
+class _ResponseCache:
+    """프로세스 내 LRU(항목별 TTL) + (선택) Redis"""
+
+    def __init__(self, max_entries: int, redis_client=None):
+        self.max_entries = max(1, max_entries)
+        self._redis = redis_client
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(f"{REDIS_KEY_PREFIX}:{key}")
+            if not raw:
+                return None
+            ttl = await self._redis.ttl(f"{REDIS_KEY_PREFIX}:{key}")
+            value = json.loads(raw)
+        except Exception as exc:
+            logger.warning("LLM 응답 캐시 Redis 조회 실패: %s", exc)
+            return None
+        if ttl and ttl > 0:
+            self._set_local(key, value, ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._set_local(key, value, ttl_seconds)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                f"{REDIS_KEY_PREFIX}:{key}", json.dumps(value, ensure_ascii=False), ex=ttl_seconds
+            )
+        except Exception as exc:
+            logger.warning("LLM 응답 캐시 Redis 저장 실패: %s", exc)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _set_local(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _serialize_messages(messages: Sequence[Any]) -> list:
+    """캐시 키용 메시지 직렬화 (LangChain 메시지 / OpenAI dict 모두 지원)"""
+    serialized = []
+    for message in messages:
+        if isinstance(message, BaseMessage):
+            serialized.append({"role": message.type, "content": message.content})
+        else:
+            serialized.append(message)
+    return serialized
+
+
+def _llm_params(llm: ChatOpenAI) -> Dict[str, Any]:
+    """응답에 영향을 주는 ChatOpenAI 파라미터"""
+    return {
+        "model": llm.model_name,
+        "temperature": llm.temperature,
+        "max_tokens": llm.max_tokens,
+        "model_kwargs": llm.model_kwargs,
+    }
+
+
+def prompt_hash(call_site: str, params: Dict[str, Any], messages: Sequence[Any]) -> str:
+    """호출 지점 + 모델 파라미터 + 메시지의 SHA-256"""
+    payload = json.dumps(
+        {"call_site": call_site, "params": params, "messages": _serialize_messages(messages)},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 응답 본문 검증 함수: 캐시해도 되는 응답이면 그대로 반환, 아니면 예외를 던진다.
+ResponseValidator = Callable[[str], Any]
+
+
+def _is_deterministic(temperature: Optional[float]) -> bool:
+    """temperature=0일 때만 같은 프롬프트에 같은 답을 기대할 수 있다 (미지정은 API 기본값 1)"""
+    return temperature is not None and temperature <= 0
+
+
+def _passes(validate: ResponseValidator, content: Optional[str], call_site: str) -> bool:
+    try:
+        validate(content or "")
+    except Exception as exc:
+        logger.info("LLM 응답 검증 실패, 캐시하지 않음 (%s): %s", call_site, exc)
+        return False
+    return True
+
+
+class LLMGateway:
+    """모든 LLM 호출이 거치는 게이트웨이"""
+
+    def __init__(
+        self,
+        cache_enabled: bool = True,
+        max_entries: int = 1024,
+        ttl_overrides: Optional[Dict[str, int]] = None,
+        redis_client=None,
+    ):
+        self.cache_enabled = cache_enabled
+        self._ttls = {**CALL_SITE_TTLS, **(ttl_overrides or {})}
+        self._cache = _ResponseCache(max_entries, redis_client)
+        self._stats: Dict[str, CallSiteStats] = defaultdict(CallSiteStats)
+        self._chat_models: Dict[Tuple, ChatOpenAI] = {}
+        self._openai_client: Optional[AsyncOpenAI] = None
+
+    # ------------------------------------------------------------------
+    # 클라이언트
+    # ------------------------------------------------------------------
+    def chat_model(
+        self,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+    ) -> ChatOpenAI:
+        """같은 설정의 ChatOpenAI 인스턴스를 공유해서 반환"""
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+        key = (model, temperature, max_tokens, json_mode)
+        llm = self._chat_models.get(key)
+        if llm is None:
+            kwargs: Dict[str, Any] = {}
+            if max_tokens is not None:
+                kwargs["max_tokens"] = max_tokens
+            if json_mode:
+                kwargs["model_kwargs"] = {"response_format": {"type": "json_object"}}
+            llm = ChatOpenAI(
+                api_key=settings.openai_api_key,
+                model=model,
+                temperature=temperature,
+                **kwargs,
+            )
+            self._chat_models[key] = llm
+        return llm
+
+    def openai_client(self) -> AsyncOpenAI:
+        """공유 AsyncOpenAI 클라이언트"""
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+        if self._openai_client is None:
+            self._openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        return self._openai_client
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+    def ttl_for(self, call_site: str) -> int:
+        """호출 지점의 캐시 TTL (0이면 캐시하지 않음)"""
+        if not self.cache_enabled:
+            return 0
+        return self._ttls.get(call_site, 0)
+
+    async def ainvoke(
+        self,
+        llm: ChatOpenAI,
+        messages: Sequence[BaseMessage],
+        call_site: str,
+        validate: Optional[ResponseValidator] = None,
+    ) -> AIMessage:
+        """
+        LangChain 채팅 모델 호출
+
+        캐시 정책이 있는 호출 지점이고 temperature=0이면 응답 본문(content)을 캐시하고,
+        hit 시 upstream 호출 없이 AIMessage로 돌려준다. 응답은 validate(JSON 모드 모델은
+        기본으로 json.loads)를 통과해야 저장되며, 검증 함수가 없으면 캐시하지 않는다.
+        """
+        if validate is None and (llm.model_kwargs or {}).get("response_format") == {"type": "json_object"}:
+            validate = json.loads
+
+        ttl = self.ttl_for(call_site) if validate and _is_deterministic(llm.temperature) else 0
+        key = prompt_hash(call_site, _llm_params(llm), messages) if ttl else None
+
+        cached = await self._lookup(call_site, key)
+        if cached is not None:
+            return AIMessage(content=cached)
+
+        response = await self._call_upstream(call_site, llm.ainvoke(list(messages)))
+        if key is not None and _passes(validate, response.content, call_site):
+            await self._cache.set(key, response.content, ttl)
+        return response
+
+    async def chat_completion(
+        self,
+        call_site: str,
+        validate: Optional[ResponseValidator] = None,
+        **request: Any,
+    ) -> ChatCompletion:
+        """
+        OpenAI chat.completions.create 호출 (이미지 입력 등 LangChain을 거치지 않는 호출용)
+
+        캐시 조건은 ainvoke와 같다 (temperature=0 + 첫 번째 choice 본문이 validate 통과).
+        캐시 hit 시 저장해 둔 ChatCompletion을 그대로 복원한다.
+        """
+        if validate is None and request.get("response_format") == {"type": "json_object"}:
+            validate = json.loads
+
+        ttl = self.ttl_for(call_site) if validate and _is_deterministic(request.get("temperature")) else 0
+        key = None
+        if ttl:
+            params = {k: v for k, v in request.items() if k != "messages"}
+            key = prompt_hash(call_site, params, request.get("messages", []))
+
+        cached = await self._lookup(call_site, key)
+        if cached is not None:
+            return ChatCompletion.model_validate(cached)
+
+        response = await self._call_upstream(
+            call_site, self.openai_client().chat.completions.create(**request)
+        )
+        if key is not None and _passes(validate, response.choices[0].message.content, call_site):
+            await self._cache.set(key, response.model_dump(mode="json"), ttl)
+        return response
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """호출 지점별 지표 + 전체 합계"""
+        total = CallSiteStats()
+        for site_stats in self._stats.values():
+            total.calls += site_stats.calls
+            total.cache_hits += site_stats.cache_hits
+            total.cache_misses += site_stats.cache_misses
+            total.errors += site_stats.errors
+            total.upstream_ms += site_stats.upstream_ms
+        return {
+            "total": total.as_dict(),
+            "call_sites": {site: s.as_dict() for site, s in sorted(self._stats.items())},
+            "cached_entries": len(self._cache),
+        }
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    async def _lookup(self, call_site: str, key: Optional[str]) -> Optional[Any]:
+        site_stats = self._stats[call_site]
+        site_stats.calls += 1
+        if key is None:
+            return None
+
+        cached = await self._cache.get(key)
+        if cached is not None:
+            site_stats.cache_hits += 1
+            logger.debug("LLM 응답 캐시 hit: %s", call_site)
+        else:
+            site_stats.cache_misses += 1
+        return cached
+
+    async def _call_upstream(self, call_site: str, awaitable):
+        site_stats = self._stats[call_site]
+        started_at = time.perf_counter()
+        try:
+            return await awaitable
+        except Exception:
+            site_stats.errors += 1
+            raise
+        finally:
+            site_stats.upstream_ms += (time.perf_counter() - started_at) * 1000
+
+
+# 싱글톤 인스턴스
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """LLMGateway 싱글톤 인스턴스 반환"""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway(
+            cache_enabled=settings.llm_cache_enabled,
+            max_entries=settings.llm_cache_max_entries,
+            ttl_overrides=settings.llm_cache_ttl_overrides,
+            redis_client=get_redis_client(),
+        )
+    return _llm_gateway
@@ -2,11 +2,12 @@
 import json
 from typing import Dict, List, Optional
 
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 
 from app.core.config import get_settings
+from app.services.llm_gateway import get_llm_gateway
+from app.utils.single_flight import SingleFlight
 
 
 class NutrientEstimatorService:
@@ -16,12 +17,8 @@ class NutrientEstimatorService:
         settings = get_settings()
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-        self.llm = ChatOpenAI(
-            api_key=settings.openai_api_key,
-            model="gpt-4o-mini",
-            temperature=0.3,
-            model_kwargs={"response_format": {"type": "json_object"}}
-        )
+        self.llm = get_llm_gateway().chat_model(model="gpt-4o-mini", temperature=0, json_mode=True)
+        self._estimate_flights: SingleFlight[Dict] = SingleFlight("nutrient_estimator.estimate")
     
     async def estimate_nutrients(
         self,
@@ -40,6 +37,14 @@ class NutrientEstimatorService:
         Returns:
             영양소 정보 딕셔너리
         """
+        # 프롬프트는 음식명 + 재료로만 만들어지므로 같은 조합의 동시 요청은 한 번만 호출
+        flight_key = (food_name, tuple(ingredients or ()))
+        return await self._estimate_flights.do(
+            flight_key, lambda: self._request_estimate(food_name, ingredients)
+        )
+
+    async def _request_estimate(self, food_name: str, ingredients: List[str]) -> Dict:
+        """estimate_nutrients의 실제 LLM 호출"""
         prompt = ChatPromptTemplate.from_messages([
             ("system", """당신은 영양학 전문가입니다. 음식명과 재료를 기반으로 영양소 정보를 추정하십시오.
 
@@ -78,14 +83,13 @@ class NutrientEstimatorService:
 위 음식의 1인분 기준 영양소 정보와 예상 중량을 JSON 형식으로 추정해주세요.""")
         ])
         
-        chain = prompt | self.llm | StrOutputParser()
-        
         try:
             ingredients_str = ", ".join(ingredients) if ingredients else "정보 없음"
-            response = await chain.ainvoke({
-                "food_name": food_name,
-                "ingredients": ingredients_str
-            })
+            messages = prompt.format_messages(food_name=food_name, ingredients=ingredients_str)
+            llm_response = await get_llm_gateway().ainvoke(
+                self.llm, messages, call_site="nutrient_estimator.estimate"
+            )
+            response = StrOutputParser().invoke(llm_response)
             
             # JSON 파싱
             nutrients = json.loads(response)
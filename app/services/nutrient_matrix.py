@@ -0,0 +1,232 @@
+"""food_nutrients 컬럼형 스냅샷 (NumPy 영양소 행렬)
+
+영양 계산(끼니 합산, 기간 집계 재계산 등)이 ORM 행을 한 건씩 읽어 getattr로 더하지 않도록
+food_nutrients 전체를 한 번 읽어
+- food_id → 행 번호 맵
+- float32 행렬 (음식 수 × 영양소 컬럼 수, NULL은 NaN)
+으로 보관한다. 여러 음식의 합산은 행 gather + 행렬-벡터 곱 한 번이다.
+
+food_nutrients는 거의 바뀌지 않으므로 분류 트리(food_taxonomy)와 같은 방식으로
+버전(행 수 + 최대 food_id)이 바뀌었을 때만 다시 읽는다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.models_food_nutrients import FoodNutrient
+from app.services.food_search_index import fetch_food_nutrients_version
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 행렬 컬럼 (FoodNutrient 속성명, 모두 reference_value(g) 기준 함량)
+NUTRIENT_COLUMNS: Tuple[str, ...] = (
+    "reference_value",
+    "kcal",
+    "protein",
+    "carb",
+    "fat",
+    "fiber",
+    "sodium",
+    "saturated_fat",
+    "added_sugar",
+    "trans_fat",
+    "cholesterol",
+    "vitamin_a",
+    "vitamin_c",
+    "calcium",
+    "iron",
+    "potassium",
+    "magnesium",
+)
+
+DEFAULT_REFERENCE_G = 100.0
+
+
+class NutrientMatrix:
+    """food_nutrients 영양소 행렬 스냅샷 (불변)"""
+
+    def __init__(self, food_ids: Sequence[str], values: np.ndarray, version: str = ""):
+        self.version = version
+        self.food_ids: Tuple[str, ...] = tuple(food_ids)
+        self.index: Dict[str, int] = {food_id: i for i, food_id in enumerate(self.food_ids)}
+        self.values = values.astype(np.float32, copy=False)
+        self.values.setflags(write=False)
+        self._column_index = {column: i for i, column in enumerate(NUTRIENT_COLUMNS)}
+        # 모르는 food_id는 마지막 NaN 행을 가리키게 해서 gather를 한 번에 처리
+        self._padded = np.vstack([self.values, np.full((1, len(NUTRIENT_COLUMNS)), np.nan, np.float32)])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], version: str = "") -> "NutrientMatrix":
+        """(food_id, *NUTRIENT_COLUMNS) 행 목록으로 구성 (None → NaN)"""
+        food_ids: List[str] = []
+        values: List[Sequence[Optional[float]]] = []
+        for food_id, *nutrients in rows:
+            food_ids.append(food_id)
+            values.append(nutrients)
+        matrix = np.array(values, dtype=np.float64).reshape(len(values), len(NUTRIENT_COLUMNS))
+        return cls(food_ids, matrix, version)
+
+    def __len__(self) -> int:
+        return len(self.food_ids)
+
+    def __contains__(self, food_id: str) -> bool:
+        return food_id in self.index
+
+    def missing(self, food_ids: Iterable[str]) -> List[str]:
+        """스냅샷에 없는 food_id 목록"""
+        return [food_id for food_id in dict.fromkeys(food_ids) if food_id not in self.index]
+
+    def rows_for(self, food_ids: Sequence[str]) -> np.ndarray:
+        """food_id 목록 → 행 번호 배열 (없는 ID는 NaN 행)"""
+        missing_row = len(self.food_ids)
+        return np.fromiter(
+            (self.index.get(food_id, missing_row) for food_id in food_ids),
+            dtype=np.intp,
+            count=len(food_ids),
+        )
+
+    def columns_for(self, columns: Optional[Sequence[str]]) -> np.ndarray:
+        if columns is None:
+            return np.arange(len(NUTRIENT_COLUMNS))
+        return np.array([self._column_index[column] for column in columns], dtype=np.intp)
+
+    def get_vectors(self, food_ids: Sequence[str], columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        음식별 영양소 벡터 (reference_value 기준 함량)
+
+        Returns:
+            float32 배열 (len(food_ids) × len(columns)), NULL/없는 음식은 NaN
+        """
+        return self._padded[np.ix_(self.rows_for(food_ids), self.columns_for(columns))]
+
+    def portion_ratios(self, food_ids: Sequence[str], portions_g: Sequence[Optional[float]]) -> np.ndarray:
+        """
+        섭취량(g) → 기준량 대비 배수
+
+        기준량이 없으면 100g, 섭취량이 없거나 0이면 기준량 1회분(1.0)으로 본다.
+        """
+        reference = self.get_vectors(food_ids, ("reference_value",))[:, 0].astype(np.float64)
+        reference = np.where(np.isnan(reference) | (reference == 0), DEFAULT_REFERENCE_G, reference)
+        portions = np.array([portion or np.nan for portion in portions_g], dtype=np.float64)
+        return np.where(np.isnan(portions), 1.0, portions / reference)
+
+    def scale(
+        self,
+        food_ids: Sequence[str],
+        portions_g: Sequence[Optional[float]],
+        columns: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        음식별 실제 섭취량 기준 영양소 (NULL/없는 음식은 0)
+
+        Returns:
+            float64 배열 (len(food_ids) × len(columns))
+        """
+        vectors = np.nan_to_num(self.get_vectors(food_ids, columns).astype(np.float64))
+        return vectors * self.portion_ratios(food_ids, portions_g)[:, None]
+
+    def combine(
+        self,
+        food_ids: Sequence[str],
+        weights: Sequence[float],
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, float]:
+        """
+        가중 합산 (gather + 행렬-벡터 곱)
+
+        Args:
+            food_ids: 음식 ID 목록
+            weights: 음식별 배수 (기준량 대비, portion_ratios 결과 등)
+            columns: 합산할 컬럼 (None이면 전체)
+
+        Returns:
+            {컬럼명: 합계} (NULL/없는 음식은 0으로 계산)
+        """
+        columns = tuple(columns or NUTRIENT_COLUMNS)
+        if not food_ids:
+            return {column: 0.0 for column in columns}
+        vectors = np.nan_to_num(self.get_vectors(food_ids, columns).astype(np.float64))
+        totals = np.asarray(weights, dtype=np.float64) @ vectors
+        return {column: float(total) for column, total in zip(columns, totals)}
+
+
+async def fetch_nutrient_rows(session: AsyncSession) -> List[Tuple]:
+    """food_nutrients 전체의 (food_id, *NUTRIENT_COLUMNS)를 한 번의 쿼리로 조회 (PK 순서)"""
+    stmt = select(
+        FoodNutrient.food_id,
+        *(getattr(FoodNutrient, column) for column in NUTRIENT_COLUMNS),
+    ).order_by(FoodNutrient.food_id)
+    result = await session.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+
+class NutrientMatrixCache:
+    """NutrientMatrix를 보관하고 food_nutrients 변경 시 다시 만든다."""
+
+    def __init__(self, check_interval_seconds: float):
+        self.check_interval_seconds = check_interval_seconds
+        self._matrix: Optional[NutrientMatrix] = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._matrix is not None and time.monotonic() - self._checked_at < self.check_interval_seconds
+
+    async def get(self, session: AsyncSession, force: bool = False) -> NutrientMatrix:
+        """
+        최신 영양소 행렬 반환
+
+        마지막 확인 후 check_interval_seconds가 지났거나 force=True일 때만 버전 쿼리 1회를
+        실행하고, 버전이 바뀐 경우에만 전체를 다시 읽는다.
+        """
+        if not force and self._fresh():
+            return self._matrix
+
+        async with self._lock:
+            if not force and self._fresh():
+                return self._matrix
+
+            version = await fetch_food_nutrients_version(session)
+            if self._matrix is None or self._matrix.version != version:
+                rows = await fetch_nutrient_rows(session)
+                self._matrix = await asyncio.to_thread(NutrientMatrix.from_rows, rows, version)
+                logger.info(
+                    "food_nutrients 영양소 행렬 구성 완료: %d개 음식 × %d개 컬럼 (version=%s)",
+                    len(self._matrix), len(NUTRIENT_COLUMNS), version,
+                )
+            self._checked_at = time.monotonic()
+            return self._matrix
+
+    async def get_covering(self, session: AsyncSession, food_ids: Iterable[str]) -> NutrientMatrix:
+        """food_ids가 모두 들어 있는 행렬 반환 (없는 ID가 있으면 버전을 즉시 다시 확인)"""
+        food_ids = list(food_ids)
+        matrix = await self.get(session)
+        if matrix.missing(food_ids):
+            matrix = await self.get(session, force=True)
+        return matrix
+
+    def invalidate(self) -> None:
+        """다음 get 호출에서 버전을 다시 확인하도록 표시 (food_nutrients 변경 직후 호출)"""
+        self._checked_at = float("-inf")
+
+
+# 싱글톤 인스턴스
+_nutrient_matrix_cache: Optional[NutrientMatrixCache] = None
+
+
+def get_nutrient_matrix_cache() -> NutrientMatrixCache:
+    """NutrientMatrixCache 싱글톤 인스턴스 반환"""
+    global _nutrient_matrix_cache
+    if _nutrient_matrix_cache is None:
+        _nutrient_matrix_cache = NutrientMatrixCache(settings.nutrient_matrix_check_interval_seconds)
+    return _nutrient_matrix_cache
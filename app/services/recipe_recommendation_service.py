@@ -1,18 +1,22 @@
 """레시피 추천 서비스 - LangChain 기반 개인화 레시피 추천 및 단계별 조리법"""
 import asyncio
+import hashlib
 import json
 import re
 import time
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage, AIMessage
 from app.core.config import get_settings
 from app.db.models import User
+from app.db.redis_session import get_redis_client
+from app.services.llm_gateway import get_llm_gateway
+from app.utils.single_flight import SingleFlight
 
 settings = get_settings()
 DETAIL_CACHE_TTL_SECONDS = 300
+DETAIL_REDIS_KEY_PREFIX = "recipe:detail"
 
 
 @dataclass
@@ -59,18 +63,17 @@ class RecipeRecommendationService:
     def __init__(self):
         if not settings.openai_api_key:
             raise ValueError("❌ OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-        self.chat_llm = ChatOpenAI(
-            api_key=settings.openai_api_key,
-            model="gpt-4o-mini",
-            temperature=0.7,
-        )
-        self.json_llm = ChatOpenAI(
-            api_key=settings.openai_api_key,
-            model="gpt-4o-mini",
-            temperature=0.4,
-            model_kwargs={"response_format": {"type": "json_object"}}
-        )
+        gateway = get_llm_gateway()
+        self.chat_llm = gateway.chat_model(model="gpt-4o-mini", temperature=0.7)
+        self.json_llm = gateway.chat_model(model="gpt-4o-mini", temperature=0.4, json_mode=True)
+        # 재료 목록처럼 같은 입력에 같은 답이면 되는 조회용 (게이트웨이 응답 캐시 대상)
+        self.lookup_llm = gateway.chat_model(model="gpt-4o-mini", temperature=0, json_mode=True)
         self._prefetched_detail_cache: Dict[tuple[int, str], Dict[str, Any]] = {}
+        self._detail_flights: SingleFlight[dict] = SingleFlight("recipe.detail")
+
+    async def _ainvoke_json(self, call_site: str, messages: List[Any], llm: Optional[Any] = None) -> AIMessage:
+        """JSON 응답 모델 호출 (LLM 게이트웨이 경유: 호출 지점별 캐시/지표)"""
+        return await get_llm_gateway().ainvoke(llm or self.json_llm, messages, call_site=call_site)
 
     def _build_prompt_context(
         self,
@@ -320,7 +323,7 @@ class RecipeRecommendationService:
                     if isinstance(result, Exception):
                         continue
                     details[name] = result
-                    self._store_prefetched_detail(user_for_detail, name, result)
+                    await self._store_prefetched_detail(user_for_detail, name, result)
                 return details
 
             detail_task = loop.create_task(_prefetch_details())
@@ -401,7 +404,7 @@ class RecipeRecommendationService:
         chat_messages.extend(self._prepare_conversation_messages(conversation_history))
         chat_messages.append(HumanMessage(content=prompt))
         
-        response = await self.json_llm.ainvoke(chat_messages)
+        response = await self._ainvoke_json("recipe.recommend", chat_messages)
         gpt_response = response.content
         print("✅ LangChain 응답 수신 완료")
         
@@ -513,7 +516,8 @@ class RecipeRecommendationService:
 }}"""
 
         try:
-            response = await self.json_llm.ainvoke(
+            response = await self._ainvoke_json(
+                "recipe.quick_intent",
                 [
                     SystemMessage(content="당신은 엄격하지만 친절한 한국어 영양사입니다. JSON으로만 응답하세요."),
                     HumanMessage(content=prompt),
@@ -590,7 +594,7 @@ class RecipeRecommendationService:
             SystemMessage(content="JSON으로만 답하는 판단 시스템입니다."),
             HumanMessage(content=prompt),
         ]
-        response = await self.json_llm.ainvoke(messages)
+        response = await self._ainvoke_json("recipe.decide_tool", messages)
         try:
             parsed = json.loads(response.content)
             suggestions = parsed.get("suggestions")
@@ -674,7 +678,7 @@ Generative UI에서 사용할 클릭형 추천 문구 2~3개를 JSON으로 만
 4. JSON 형식 {{"suggestions": ["...", "..."]}}으로만 응답하세요."""
         
         try:
-            response = await self.json_llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._ainvoke_json("recipe.action_suggestions", [HumanMessage(content=prompt)])
             parsed = json.loads(response.content)
             suggestions = parsed.get("suggestions")
             if isinstance(suggestions, list) and suggestions:
@@ -704,10 +708,10 @@ JSON 형식:
 }}
 
 마크다운을 쓰지 말고 JSON만 반환하세요."""
-        response = await self.json_llm.ainvoke([
+        response = await self._ainvoke_json("recipe.ingredient_check", [
             SystemMessage(content="당신은 재료 정리에 능한 한국어 셰프입니다. JSON으로만 응답하세요."),
             HumanMessage(content=prompt)
-        ])
+        ], llm=self.lookup_llm)
         try:
             parsed = json.loads(response.content)
             items = parsed.get("ingredients") or []
@@ -787,7 +791,7 @@ JSON 형식:
 }}
 
 JSON으로만 응답하세요."""
-        response = await self.json_llm.ainvoke([
+        response = await self._ainvoke_json("recipe.custom_steps", [
             SystemMessage(content="당신은 재료 변형에 능한 한국어 셰프입니다. JSON으로만 응답하세요."),
             HumanMessage(content=prompt)
         ])
@@ -950,7 +954,7 @@ JSON 형식:
 }}"""
         
         try:
-            response = await self.json_llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._ainvoke_json("recipe.health_warning", [HumanMessage(content=prompt)])
             return json.loads(response.content)
         except Exception:
             return {
@@ -1124,17 +1128,27 @@ JSON 형식:
 
 JSON 형식만 반환하세요."""
 
-        cached = self._get_prefetched_detail(user, recipe_name)
+        cached = await self._get_prefetched_detail(user, recipe_name)
         if cached:
             return cached
 
+        # 프롬프트를 결정하는 값이 같으면 동시 요청은 한 번의 LLM 호출을 공유
+        flight_key = (recipe_name, health_goal_kr, tuple(diseases or ()), tuple(allergies or ()))
+        result = await self._detail_flights.do(
+            flight_key, lambda: self._request_recipe_detail(recipe_name, prompt)
+        )
+        await self._store_prefetched_detail(user, recipe_name, result)
+        return result
+
+    async def _request_recipe_detail(self, recipe_name: str, prompt: str) -> dict:
+        """get_recipe_detail의 실제 LLM 호출 (파싱 실패 시 기본 레시피)"""
         print(f"🤖 LangChain LLM에게 '{recipe_name}' 레시피 상세 요청 중...")
         
         chat_messages = [
             SystemMessage(content="당신은 전문 요리사입니다. JSON 형식으로만 응답합니다."),
             HumanMessage(content=prompt)
         ]
-        response = await self.json_llm.ainvoke(chat_messages)
+        response = await self._ainvoke_json("recipe.detail", chat_messages)
         gpt_response = response.content
         print(f"✅ 레시피 상세 정보 수신 완료")
         
@@ -1147,14 +1161,11 @@ JSON 형식만 반환하세요."""
             if "total_weight_g" not in result:
                 result["total_weight_g"] = 250.0
             
-            self._store_prefetched_detail(user, recipe_name, result)
             return result
         except json.JSONDecodeError as e:
             print(f"❌ JSON 파싱 오류: {e}")
             # 파싱 실패 시 기본 레시피 반환
-            fallback = self._get_fallback_recipe(recipe_name)
-            self._store_prefetched_detail(user, recipe_name, fallback)
-            return fallback
+            return self._get_fallback_recipe(recipe_name)
     
     def _get_fallback_recipe(self, recipe_name: str) -> dict:
         """JSON 파싱 실패 시 기본 레시피 반환"""
@@ -1215,7 +1226,7 @@ JSON 형식만 반환하세요."""
             "total_weight_g": 250.0
         }
 
-    def _store_prefetched_detail(self, user: User, recipe_name: str, payload: Dict[str, Any]) -> None:
+    async def _store_prefetched_detail(self, user: User, recipe_name: str, payload: Dict[str, Any]) -> None:
         key = self._detail_cache_key(user, recipe_name)
         if not key:
             return
@@ -1223,18 +1234,40 @@ JSON 형식만 반환하세요."""
             "expires_at": time.time() + DETAIL_CACHE_TTL_SECONDS,
             "data": payload,
         }
+        # 별도 워커 프로세스가 미리 만든 상세도 API 프로세스에서 쓸 수 있도록 Redis에도 보관
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    self._detail_redis_key(key), json.dumps(payload, ensure_ascii=False), ex=DETAIL_CACHE_TTL_SECONDS
+                )
+            except Exception as exc:
+                print(f"⚠️ 레시피 상세 Redis 저장 실패: {exc}")
 
-    def _get_prefetched_detail(self, user: User, recipe_name: str) -> Optional[Dict[str, Any]]:
+    async def _get_prefetched_detail(self, user: User, recipe_name: str) -> Optional[Dict[str, Any]]:
         key = self._detail_cache_key(user, recipe_name)
         if not key:
             return None
         entry = self._prefetched_detail_cache.get(key)
-        if not entry:
+        if entry and entry["expires_at"] >= time.time():
+            return entry["data"]
+        self._prefetched_detail_cache.pop(key, None)
+
+        redis_client = get_redis_client()
+        if redis_client is None:
             return None
-        if entry["expires_at"] < time.time():
-            self._prefetched_detail_cache.pop(key, None)
+        try:
+            raw = await redis_client.get(self._detail_redis_key(key))
+        except Exception as exc:
+            print(f"⚠️ 레시피 상세 Redis 조회 실패: {exc}")
             return None
-        return entry["data"]
+        return json.loads(raw) if raw else None
+
+    @staticmethod
+    def _detail_redis_key(key: tuple[int, str]) -> str:
+        user_id, recipe_name = key
+        name_hash = hashlib.sha1(recipe_name.encode("utf-8")).hexdigest()
+        return f"{DETAIL_REDIS_KEY_PREFIX}:{user_id}:{name_hash}"
 
     def _detail_cache_key(self, user: User, recipe_name: str) -> Optional[tuple[int, str]]:
         if not user or not getattr(user, "user_id", None) or not recipe_name:
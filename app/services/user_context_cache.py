@@ -1,22 +1,46 @@
-"""Simple in-process cache for user health/chat context.
+"""사용자 건강/채팅 컨텍스트 캐시
 
-Redis 없이도 사용자별 기본 정보를 빠르게 재사용하기 위한 용도다.
+채팅/레시피 추천이 매 요청 DiseaseAllergyProfile과 오늘 식사 여부를 다시 조회하지 않도록
+사용자별 컨텍스트를 보관한다.
+
+- 1차: 프로세스 내 LRU (TTL + 최대 개수)
+- 2차(선택): 공유 저장소 - `redis_url`이 설정돼 있으면 Redis (워커 간 공유)
+- 무효화: 건강 프로필 추가/삭제, 식사 저장/삭제 직후 `invalidate_user_context` 호출
+  → 공유 저장소에서 지우고 pub/sub으로 다른 워커의 프로세스 내 사본도 지운다.
+- has_eaten_today는 사용자 시간대의 날짜가 바뀌면 자동으로 다시 조회한다.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, date, timedelta
-from typing import Dict, List
+import asyncio
+import json
 import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.db.models import DiseaseAllergyProfile, UserFoodHistory
+from app.db.redis_session import get_redis_client
+from app.utils.date_window import day_window, local_today
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 저장 형식이 바뀌면 올려서 이전 값을 무시
+CACHE_VERSION = "v1"
+REDIS_KEY_PREFIX = f"user:context:{CACHE_VERSION}"
+INVALIDATION_CHANNEL = "user:context:invalidate"
 
-_CACHE: Dict[int, "CachedUserContext"] = {}
-_TTL = timedelta(minutes=15)
+BACKEND_AUTO = "auto"
+BACKEND_MEMORY = "memory"
+BACKEND_REDIS = "redis"
 
 
 @dataclass
@@ -26,6 +50,236 @@ class CachedUserContext:
     allergies: List[str]
     has_eaten_today: bool
     last_refreshed: datetime
+    context_date: Optional[date] = None  # has_eaten_today 기준 날짜 (사용자 시간대)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "diseases": self.diseases,
+            "allergies": self.allergies,
+            "has_eaten_today": self.has_eaten_today,
+            "last_refreshed": self.last_refreshed.isoformat(),
+            "context_date": self.context_date.isoformat() if self.context_date else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedUserContext":
+        return cls(
+            user_id=int(data["user_id"]),
+            diseases=list(data["diseases"]),
+            allergies=list(data["allergies"]),
+            has_eaten_today=bool(data["has_eaten_today"]),
+            last_refreshed=datetime.fromisoformat(data["last_refreshed"]),
+            context_date=date.fromisoformat(data["context_date"]) if data.get("context_date") else None,
+        )
+
+
+class SharedContextStore(Protocol):
+    """워커 간 공유 저장소 (Redis 등) 인터페이스"""
+
+    async def get(self, user_id: int) -> Optional[CachedUserContext]: ...
+
+    async def set(self, context: CachedUserContext, ttl_seconds: int) -> None: ...
+
+    async def delete(self, user_id: int) -> None: ...
+
+
+class RedisContextStore:
+    """Redis 공유 저장소 + 무효화 pub/sub (실패해도 DB 조회로 계속 진행)"""
+
+    def __init__(self, redis_client):
+        self._redis = redis_client
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[CachedUserContext]:
+        try:
+            raw = await self._redis.get(self._key(user_id))
+        except Exception as exc:
+            logger.warning("사용자 컨텍스트 Redis 조회 실패: %s", exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return CachedUserContext.from_dict(json.loads(raw))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    async def set(self, context: CachedUserContext, ttl_seconds: int) -> None:
+        try:
+            payload = json.dumps(context.to_dict(), ensure_ascii=False)
+            await self._redis.set(self._key(context.user_id), payload, ex=ttl_seconds)
+        except Exception as exc:
+            logger.warning("사용자 컨텍스트 Redis 저장 실패: %s", exc)
+
+    async def delete(self, user_id: int) -> None:
+        try:
+            await self._redis.delete(self._key(user_id))
+        except Exception as exc:
+            logger.warning("사용자 컨텍스트 Redis 삭제 실패: %s", exc)
+
+    async def publish_invalidation(self, user_id: int) -> None:
+        try:
+            await self._redis.publish(INVALIDATION_CHANNEL, str(user_id))
+        except Exception as exc:
+            logger.warning("사용자 컨텍스트 무효화 발행 실패: %s", exc)
+
+    async def listen_invalidations(self, on_invalidate) -> None:
+        """무효화 채널을 구독해 받은 user_id마다 on_invalidate 호출 (연결이 끊기면 재구독)"""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        on_invalidate(int(message["data"]))
+                    except (TypeError, ValueError):
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("사용자 컨텍스트 무효화 구독 끊김, 5초 후 재시도: %s", exc)
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+class UserContextCache:
+    """프로세스 내 LRU + (선택) 공유 저장소 2단 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        shared_store: Optional[SharedContextStore] = None,
+        local_ttl_seconds: Optional[int] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # 공유 저장소가 있으면 프로세스 내 사본은 짧게 (무효화 메시지 유실 대비)
+        self.local_ttl_seconds = min(local_ttl_seconds or ttl_seconds, ttl_seconds)
+        self._shared = shared_store
+        # user_id -> (만료 시각, 컨텍스트)
+        self._entries: "OrderedDict[int, Tuple[float, CachedUserContext]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, user_id: int) -> Optional[CachedUserContext]:
+        """캐시된 컨텍스트 반환 (없거나 날짜가 바뀌었으면 None)"""
+        today = local_today()
+        context = self._get_local(user_id)
+        if context is None and self._shared is not None:
+            context = await self._shared.get(user_id)
+            if context is not None:
+                self._set_local(context)
+
+        if context is None or context.context_date != today:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return context
+
+    async def set(self, context: CachedUserContext) -> None:
+        self._set_local(context)
+        if self._shared is not None:
+            await self._shared.set(context, self.ttl_seconds)
+
+    async def invalidate(self, user_id: int) -> None:
+        """이 워커와 공유 저장소, 다른 워커의 사본까지 제거"""
+        self.drop_local(user_id)
+        if self._shared is not None:
+            await self._shared.delete(user_id)
+            publish = getattr(self._shared, "publish_invalidation", None)
+            if publish is not None:
+                await publish(user_id)
+
+    def drop_local(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # 워커 간 무효화 구독 (lifespan에서 시작/종료)
+    # ------------------------------------------------------------------
+    def start_invalidation_listener(self) -> None:
+        listen = getattr(self._shared, "listen_invalidations", None)
+        if listen is None or self._listener is not None:
+            return
+        self._listener = asyncio.create_task(listen(self.drop_local))
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    # ------------------------------------------------------------------
+    # 프로세스 내 LRU
+    # ------------------------------------------------------------------
+    def _get_local(self, user_id: int) -> Optional[CachedUserContext]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, context = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+
+        self._entries.move_to_end(user_id)
+        return context
+
+    def _set_local(self, context: CachedUserContext) -> None:
+        self._entries[context.user_id] = (time.monotonic() + self.local_ttl_seconds, context)
+        self._entries.move_to_end(context.user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# 싱글톤 인스턴스
+_user_context_cache: Optional[UserContextCache] = None
+
+
+def _shared_store_from_settings() -> Optional[SharedContextStore]:
+    backend = settings.user_context_cache_backend
+    if backend == BACKEND_MEMORY:
+        return None
+    redis_client = get_redis_client()
+    if redis_client is None:
+        if backend == BACKEND_REDIS:
+            logger.warning("user_context_cache_backend=redis 이지만 Redis가 없어 프로세스 내 캐시만 사용합니다.")
+        return None
+    return RedisContextStore(redis_client)
+
+
+def get_user_context_cache() -> UserContextCache:
+    """UserContextCache 싱글톤 인스턴스 반환"""
+    global _user_context_cache
+    if _user_context_cache is None:
+        shared_store = _shared_store_from_settings()
+        _user_context_cache = UserContextCache(
+            max_entries=settings.user_context_cache_max_entries,
+            ttl_seconds=settings.user_context_cache_ttl_seconds,
+            shared_store=shared_store,
+            local_ttl_seconds=settings.user_context_cache_local_ttl_seconds if shared_store else None,
+        )
+    return _user_context_cache
 
 
 async def _fetch_user_context(session: AsyncSession, user_id: int) -> CachedUserContext:
@@ -34,16 +288,18 @@ async def _fetch_user_context(session: AsyncSession, user_id: int) -> CachedUser
     profile_results = await session.execute(profile_stmt)
     profiles = profile_results.scalars().all()
 
-    diseases = list({p.disease_name for p in profiles if p.disease_name})
-    allergies = list({p.allergy_name for p in profiles if p.allergy_name})
+    # 등록 순서 유지 (프롬프트가 매번 같아야 LLM 응답 캐시가 맞는다)
+    diseases = list(dict.fromkeys(p.disease_name for p in profiles if p.disease_name))
+    allergies = list(dict.fromkeys(p.allergy_name for p in profiles if p.allergy_name))
 
-    today_start = datetime.combine(date.today(), datetime.min.time())
+    today_date = local_today()
+    today = day_window(today_date)
     meal_stmt = select(func.count(UserFoodHistory.history_id)).where(
         UserFoodHistory.user_id == user_id,
-        UserFoodHistory.consumed_at >= today_start,
+        today.clause(UserFoodHistory.consumed_at),
     )
     meal_result = await session.execute(meal_stmt)
-    has_eaten_today = meal_result.scalar_one_or_none() > 0
+    has_eaten_today = (meal_result.scalar_one_or_none() or 0) > 0
 
     return CachedUserContext(
         user_id=user_id,
@@ -51,30 +307,35 @@ async def _fetch_user_context(session: AsyncSession, user_id: int) -> CachedUser
         allergies=allergies,
         has_eaten_today=has_eaten_today,
         last_refreshed=datetime.utcnow(),
+        context_date=today_date,
     )
 
 
 async def get_or_build_user_context(session: AsyncSession, user_id: int) -> CachedUserContext:
     """캐시된 사용자 정보를 반환하거나 필요 시 새로 조회."""
-    cached = _CACHE.get(user_id)
-    now = datetime.utcnow()
-    if cached and now - cached.last_refreshed < _TTL:
-        logging.info("==캐시된 사용자 컨텍스트 재사용==\nuser_id=%s 질병=%s 알레르기=%s", user_id, cached.diseases, cached.allergies)
+    cache = get_user_context_cache()
+    cached = await cache.get(user_id)
+    if cached is not None:
+        logger.info("==캐시된 사용자 컨텍스트 재사용==\nuser_id=%s 질병=%s 알레르기=%s", user_id, cached.diseases, cached.allergies)
         return cached
 
-    logging.info("==DB에서 사용자 컨텍스트 새로 조회==\nuser_id=%s", user_id)
+    logger.info("==DB에서 사용자 컨텍스트 새로 조회==\nuser_id=%s", user_id)
     refreshed = await _fetch_user_context(session, user_id)
-    _CACHE[user_id] = refreshed
+    await cache.set(refreshed)
     return refreshed
 
 
 async def refresh_user_context(session: AsyncSession, user_id: int) -> CachedUserContext:
     """명시적으로 캐시를 갱신."""
     refreshed = await _fetch_user_context(session, user_id)
-    _CACHE[user_id] = refreshed
+    await get_user_context_cache().set(refreshed)
     return refreshed
 
 
-def invalidate_user_context(user_id: int) -> None:
-    """로그아웃 등에서 캐시를 제거."""
-    _CACHE.pop(user_id, None)
+async def invalidate_user_context(user_id: int) -> None:
+    """
+    캐시를 제거 (모든 워커)
+
+    로그아웃, 건강 프로필 추가/삭제, 식사 저장/삭제 등 컨텍스트가 바뀌는 작업의 commit 직후 호출한다.
+    """
+    await get_user_context_cache().invalidate(user_id)
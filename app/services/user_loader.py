@@ -0,0 +1,213 @@
+"""요청 단위 사용자 로더 (identity map) + 짧은 TTL 사용자 캐시
+
+인증 의존성(get_current_active_user)과 라우트 본문이 같은 User 행, 같은 질환/알레르기 목록을
+요청 안에서 여러 번 조회하지 않도록 한다.
+
+- UserLoader: 요청마다 하나 (FastAPI 의존성 캐시), 같은 요청의 두 번째 조회부터는 쿼리 없음
+- UserSnapshotCache: 요청 간 공유되는 User 컬럼 스냅샷 (user_id 별, updated_at 포함)
+  - `redis_url`이 있으면 Redis(워커 간 공유), 없으면 프로세스 내 LRU
+  - TTL을 짧게 두고, 프로필 수정 직후 `invalidate_cached_user`로 제거
+  - 비밀번호 해시와 대화 요약(major_conversation)은 캐시하지 않는다 (필요 시 refresh로 읽기)
+- 질환/알레르기 목록은 user_context_cache(질환/알레르기, 오늘 식사 여부)를 그대로 사용
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import get_settings
+from app.db.models import User
+from app.db.redis_session import get_redis_client
+from app.services import auth_service
+from app.services.user_context_cache import get_or_build_user_context
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+CACHE_VERSION = "v1"
+REDIS_KEY_PREFIX = f"user:row:{CACHE_VERSION}"
+
+# 캐시하지 않는 컬럼 (민감 정보 / 큰 텍스트)
+UNCACHED_COLUMNS = frozenset({"password", "major_conversation"})
+
+
+def _snapshot_columns() -> List[Any]:
+    return [column for column in inspect(User).columns if column.key not in UNCACHED_COLUMNS]
+
+
+def user_to_snapshot(user: User) -> Dict[str, Any]:
+    """User → JSON 직렬화 가능한 dict (UNCACHED_COLUMNS 제외)"""
+    snapshot = {}
+    for column in _snapshot_columns():
+        value = getattr(user, column.key)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        snapshot[column.key] = value
+    return snapshot
+
+
+def user_from_snapshot(snapshot: Dict[str, Any]) -> User:
+    """스냅샷 → detached User (세션에 add하면 조회 없이 persistent가 된다)"""
+    values = {}
+    for column in _snapshot_columns():
+        value = snapshot.get(column.key)
+        if value is not None:
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+        values[column.key] = value
+    user = User(**values)
+    # 속성 변경 이력을 지우고 PK 기준 detached 상태로 (제외 컬럼은 expired)
+    make_transient_to_detached(user)
+    return user
+
+
+def _version(snapshot: Dict[str, Any]) -> str:
+    return snapshot.get("updated_at") or ""
+
+
+class UserSnapshotCache:
+    """User 스냅샷 캐시 (프로세스 내 LRU 또는 Redis)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, redis_client=None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        # user_id -> (만료 시각, 스냅샷)
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._key(user_id))
+                return json.loads(raw) if raw else None
+            except Exception as exc:
+                logger.warning("사용자 캐시 Redis 조회 실패: %s", exc)
+                return None
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return snapshot
+
+    async def set(self, user_id: int, snapshot: Dict[str, Any]) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self._key(user_id), json.dumps(snapshot, ensure_ascii=False), ex=self.ttl_seconds
+                )
+            except Exception as exc:
+                logger.warning("사용자 캐시 Redis 저장 실패: %s", exc)
+            return
+
+        # 더 최근(updated_at)의 스냅샷을 오래된 값으로 덮어쓰지 않는다
+        current = self._entries.get(user_id)
+        if current is not None and _version(current[1]) > _version(snapshot):
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self._key(user_id))
+            except Exception as exc:
+                logger.warning("사용자 캐시 Redis 삭제 실패: %s", exc)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 싱글톤 인스턴스
+_user_snapshot_cache: Optional[UserSnapshotCache] = None
+
+
+def get_user_snapshot_cache() -> UserSnapshotCache:
+    """UserSnapshotCache 싱글톤 인스턴스 반환"""
+    global _user_snapshot_cache
+    if _user_snapshot_cache is None:
+        _user_snapshot_cache = UserSnapshotCache(
+            max_entries=settings.user_cache_max_entries,
+            ttl_seconds=settings.user_cache_ttl_seconds,
+            redis_client=get_redis_client(),
+        )
+    return _user_snapshot_cache
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """프로필 수정 등 User 행 변경 commit 직후 호출"""
+    await get_user_snapshot_cache().invalidate(user_id)
+
+
+class UserLoader:
+    """요청 단위 사용자/건강 프로필 로더 (같은 요청에서는 한 번만 조회)"""
+
+    def __init__(self, session: AsyncSession, cache: Optional[UserSnapshotCache] = None):
+        self.session = session
+        self.cache = cache
+        self._users: Dict[int, Optional[User]] = {}
+        self._health_profiles: Dict[int, Tuple[List[str], List[str]]] = {}
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """User 조회 (요청 내 메모 → 공유 캐시 → DB)"""
+        if user_id in self._users:
+            return self._users[user_id]
+
+        user = await self._load_user(user_id)
+        self._users[user_id] = user
+        return user
+
+    async def _load_user(self, user_id: int) -> Optional[User]:
+        # 같은 세션에서 이미 읽은 행이면 그대로 사용
+        existing = self.session.identity_map.get(inspect(User).identity_key_from_primary_key([user_id]))
+        if existing is not None:
+            return existing
+
+        if self.cache is not None:
+            snapshot = await self.cache.get(user_id)
+            if snapshot is not None:
+                user = user_from_snapshot(snapshot)
+                self.session.add(user)
+                return user
+
+        user = await auth_service.get_user_by_id(self.session, user_id)
+        if user is not None and self.cache is not None:
+            await self.cache.set(user_id, user_to_snapshot(user))
+        return user
+
+    async def get_health_goal(self, user_id: int) -> Optional[str]:
+        user = await self.get_user(user_id)
+        return user.health_goal if user else None
+
+    async def get_health_profile(self, user_id: int) -> Tuple[List[str], List[str]]:
+        """(질환 목록, 알레르기 목록) - user_context_cache 공유"""
+        if user_id not in self._health_profiles:
+            context = await get_or_build_user_context(self.session, user_id)
+            self._health_profiles[user_id] = (list(context.diseases), list(context.allergies))
+        return self._health_profiles[user_id]
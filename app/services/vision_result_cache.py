@@ -0,0 +1,240 @@
+"""음식 이미지 분석 결과 캐시 (content-addressed)
+
+같은 사진을 다시 올리거나 타임아웃 후 재시도하면 YOLO + GPT-Vision 호출이 처음부터
+다시 실행된다. 이 모듈은 이미지 내용의 해시를 키로 분석 결과(YOLO detection 요약 +
+GPT 분석/매칭 결과)를 보관해 재요청 시 OpenAI 토큰 없이 바로 응답한다.
+
+- 1차 키: 원본 바이트의 SHA-256 (동일 파일 재업로드/재시도)
+- 2차 키(선택): 9x8 그레이스케일 dHash (재압축/리사이즈된 거의 같은 사진)
+- 저장소: 프로세스 내 LRU (TTL + 최대 개수) → `redis_url`이 설정돼 있으면 Redis
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from PIL import Image, ImageOps
+
+from app.core.config import get_settings
+from app.db.redis_session import get_redis_client
+from app.utils.prepared_image import PreparedImage
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 프롬프트/파이프라인이 바뀌면 올려서 이전 결과를 무효화
+CACHE_VERSION = "v1"
+REDIS_KEY_PREFIX = "vision:result"
+
+# dHash 크기 (9x8 → 64bit)
+_DHASH_SIZE = 8
+
+
+def content_hash(image_bytes: bytes) -> str:
+    """이미지 원본 바이트의 SHA-256"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def perceptual_hash(image: Union[bytes, Image.Image]) -> Optional[str]:
+    """
+    difference hash (dHash) 64bit를 16진수 문자열로 반환
+
+    EXIF 회전을 반영한 뒤(PreparedImage는 이미 반영됨) 9x8 그레이스케일로 줄여
+    인접 픽셀 밝기 차이를 비트로 만든다.
+    JPEG 재압축이나 해상도 변경에는 같은 값이 나오므로 near-duplicate 판정에 쓴다.
+    디코딩에 실패하면 None.
+    """
+    try:
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(image))) if isinstance(image, bytes) else image
+        small = img.convert("L").resize((_DHASH_SIZE + 1, _DHASH_SIZE), Image.Resampling.LANCZOS)
+    except Exception:
+        return None
+
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(_DHASH_SIZE):
+        offset = row * (_DHASH_SIZE + 1)
+        for col in range(_DHASH_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:016x}"
+
+
+@dataclass(frozen=True)
+class VisionCacheKey:
+    """분석 결과 캐시 키 (pipeline별로 분리)"""
+
+    pipeline: str
+    content_hash: str
+    perceptual_hash: Optional[str] = None
+
+    @property
+    def content_key(self) -> str:
+        return f"{CACHE_VERSION}:{self.pipeline}:sha:{self.content_hash}"
+
+    @property
+    def perceptual_key(self) -> Optional[str]:
+        if not self.perceptual_hash:
+            return None
+        return f"{CACHE_VERSION}:{self.pipeline}:dhash:{self.perceptual_hash}"
+
+
+class VisionResultCache:
+    """프로세스 내 LRU + (선택) Redis 2단 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        use_perceptual_hash: bool = False,
+        redis_client=None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.use_perceptual_hash = use_perceptual_hash
+        self._redis = redis_client
+        # content_key -> (만료 시각, 결과)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # perceptual_key -> content_key
+        self._aliases: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, image: Union[bytes, PreparedImage], pipeline: str) -> VisionCacheKey:
+        """
+        이미지로 캐시 키 생성 (dHash 계산이 CPU 작업이므로 스레드에서 호출 권장)
+
+        PreparedImage를 넘기면 이미 계산된 해시와 디코딩된 픽셀을 재사용한다.
+        """
+        if isinstance(image, PreparedImage):
+            sha = image.content_hash
+            dhash = perceptual_hash(image.to_pil()) if self.use_perceptual_hash else None
+        else:
+            sha = content_hash(image)
+            dhash = perceptual_hash(image) if self.use_perceptual_hash else None
+        return VisionCacheKey(pipeline=pipeline, content_hash=sha, perceptual_hash=dhash)
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    async def get(self, key: VisionCacheKey) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 반환 (없으면 None)"""
+        lookup_keys = [key.content_key]
+        if key.perceptual_key:
+            lookup_keys.append(key.perceptual_key)
+
+        for lookup_key in lookup_keys:
+            value = self._get_local(lookup_key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+        if self._redis is not None:
+            for lookup_key in lookup_keys:
+                value = await self._get_redis(lookup_key)
+                if value is not None:
+                    self._set_local(key, value)
+                    self.hits += 1
+                    return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: VisionCacheKey, value: Dict[str, Any]) -> None:
+        """분석 결과 저장 (JSON 직렬화 가능한 dict만)"""
+        self._set_local(key, value)
+        if self._redis is not None:
+            await self._set_redis(key, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._aliases.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # 프로세스 내 LRU
+    # ------------------------------------------------------------------
+    def _get_local(self, lookup_key: str) -> Optional[Dict[str, Any]]:
+        content_key = self._aliases.get(lookup_key, lookup_key)
+        entry = self._entries.get(content_key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._drop_local(content_key)
+            return None
+
+        self._entries.move_to_end(content_key)
+        return value
+
+    def _set_local(self, key: VisionCacheKey, value: Dict[str, Any]) -> None:
+        self._entries[key.content_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key.content_key)
+        if key.perceptual_key:
+            self._aliases[key.perceptual_key] = key.content_key
+
+        while len(self._entries) > self.max_entries:
+            oldest_key, _ = self._entries.popitem(last=False)
+            self._drop_aliases(oldest_key)
+
+    def _drop_local(self, content_key: str) -> None:
+        self._entries.pop(content_key, None)
+        self._drop_aliases(content_key)
+
+    def _drop_aliases(self, content_key: str) -> None:
+        stale = [alias for alias, target in self._aliases.items() if target == content_key]
+        for alias in stale:
+            del self._aliases[alias]
+
+    # ------------------------------------------------------------------
+    # Redis (실패해도 분석은 계속 진행)
+    # ------------------------------------------------------------------
+    async def _get_redis(self, lookup_key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._redis.get(f"{REDIS_KEY_PREFIX}:{lookup_key}")
+        except Exception as exc:
+            logger.warning("Vision 결과 캐시 Redis 조회 실패: %s", exc)
+            return None
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    async def _set_redis(self, key: VisionCacheKey, value: Dict[str, Any]) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            pipe = self._redis.pipeline()
+            pipe.set(f"{REDIS_KEY_PREFIX}:{key.content_key}", payload, ex=self.ttl_seconds)
+            if key.perceptual_key:
+                pipe.set(f"{REDIS_KEY_PREFIX}:{key.perceptual_key}", payload, ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as exc:
+            logger.warning("Vision 결과 캐시 Redis 저장 실패: %s", exc)
+
+
+# 싱글톤 인스턴스
+_vision_result_cache: Optional[VisionResultCache] = None
+
+
+def get_vision_result_cache() -> VisionResultCache:
+    """VisionResultCache 싱글톤 인스턴스 반환"""
+    global _vision_result_cache
+    if _vision_result_cache is None:
+        _vision_result_cache = VisionResultCache(
+            max_entries=settings.vision_cache_max_entries,
+            ttl_seconds=settings.vision_cache_ttl_seconds,
+            use_perceptual_hash=settings.vision_cache_perceptual_hash,
+            redis_client=get_redis_client(),
+        )
+    return _vision_result_cache
@@ -1,7 +1,11 @@
 """YOLO 음식 detection 서비스"""
+import asyncio
 import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
 
 import cv2
 import numpy as np
@@ -9,9 +13,18 @@ from PIL import Image
 from ultralytics import YOLO
 
 from app.core.config import get_settings
+from app.services.yolo_batcher import YOLOMicroBatcher
+from app.utils.prepared_image import PreparedImage
 
 settings = get_settings()
 
+# 원본 바이트 또는 라우트에서 한 번 디코딩해 둔 PreparedImage
+ImageInput = Union[bytes, PreparedImage]
+
+
+class YOLOQueueFullError(RuntimeError):
+    """YOLO 추론 대기열이 가득 찬 경우 (호출자는 503 + Retry-After로 응답)"""
+
 
 class YOLOService:
     """YOLO 음식 detection 서비스"""
@@ -19,6 +32,36 @@ class YOLOService:
     def __init__(self):
         self.model: Optional[YOLO] = None
         self._load_model()
+        self._init_executor(
+            settings.yolo_max_workers,
+            settings.yolo_max_queue_size,
+            batch_max_size=settings.yolo_batch_max_size,
+            batch_max_wait_ms=settings.yolo_batch_max_wait_ms,
+        )
+    
+    def _init_executor(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        batch_max_size: int = 1,
+        batch_max_wait_ms: float = 0.0
+    ):
+        """추론 전용 스레드 풀 생성 (실행 중 + 대기 중 요청 수를 제한)"""
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yolo")
+        self._max_pending = max_workers + max_queue_size
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        
+        # batch_max_size > 1이면 동시 요청을 모아 한 번의 forward pass로 처리
+        self._batcher: Optional[YOLOMicroBatcher] = None
+        if batch_max_size > 1:
+            self._batcher = YOLOMicroBatcher(
+                run_batch=lambda images: self.detect_food_batch(images),
+                executor=self._executor,
+                max_batch_size=batch_max_size,
+                max_wait_ms=batch_max_wait_ms,
+                on_item_done=self._release_slot,
+            )
     
     def _load_model(self):
         """YOLO 모델 로드"""
@@ -39,12 +82,13 @@ class YOLOService:
             print(f"❌ YOLO 모델 로드 실패: {e}")
             self.model = None
     
-    def detect_food(self, image_bytes: bytes) -> dict:
+    def detect_food(self, image: ImageInput, include_annotated: bool = False) -> dict:
         """
         이미지에서 음식 객체 detection
         
         Args:
-            image_bytes: 이미지 바이트 데이터
+            image: 이미지 바이트 데이터 또는 PreparedImage (디코딩 결과 재사용)
+            include_annotated: True면 바운딩 박스를 그린 JPEG도 생성 (디버그/클라이언트 요청 시에만)
             
         Returns:
             detection 결과 딕셔너리
@@ -57,7 +101,7 @@ class YOLOService:
                     },
                     ...
                 ],
-                "image_with_boxes": bytes,  # 바운딩 박스가 그려진 이미지
+                "image_with_boxes": bytes | None,  # include_annotated=True일 때만 생성
                 "summary": "피자 1개 감지됨"
             }
         """
@@ -65,68 +109,169 @@ class YOLOService:
             raise RuntimeError("YOLO 모델이 로드되지 않았습니다.")
         
         try:
-            # 이미지 바이트 -> PIL Image
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # PIL Image -> numpy array (OpenCV 형식)
-            image_np = np.array(image)
-            if image_np.shape[-1] == 4:  # RGBA -> RGB
-                image_np = cv2.cvtColor(image_np, cv2.COLOR_RGBA2RGB)
-            elif len(image_np.shape) == 2:  # Grayscale -> RGB
-                image_np = cv2.cvtColor(image_np, cv2.COLOR_GRAY2RGB)
+            image_np = self._decode_image(image)
             
             # YOLO detection 실행
             results = self.model(image_np, conf=0.25)  # confidence threshold 25%
-            
-            # Detection 결과 파싱
-            detected_objects = []
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    # 클래스 이름 가져오기
-                    class_id = int(box.cls[0])
-                    class_name = result.names[class_id]
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
-                    
-                    detected_objects.append({
-                        "class_name": class_name,
-                        "confidence": confidence,
-                        "bbox": bbox
-                    })
-            
-            # 바운딩 박스가 그려진 이미지 생성
-            annotated_image = results[0].plot()  # OpenCV 형식 (BGR)
-            annotated_image_rgb = cv2.cvtColor(annotated_image, cv2.COLOR_BGR2RGB)
-            
-            # numpy array -> PIL Image -> bytes
-            annotated_pil = Image.fromarray(annotated_image_rgb)
-            img_byte_arr = io.BytesIO()
-            annotated_pil.save(img_byte_arr, format='JPEG')
-            annotated_image_bytes = img_byte_arr.getvalue()
-            
-            # 요약 생성
-            if detected_objects:
-                object_counts = {}
-                for obj in detected_objects:
-                    name = obj["class_name"]
-                    object_counts[name] = object_counts.get(name, 0) + 1
-                
-                summary_parts = [f"{name} {count}개" for name, count in object_counts.items()]
-                summary = ", ".join(summary_parts) + " 감지됨"
-            else:
-                summary = "음식이 감지되지 않았습니다."
-            
-            return {
-                "detected_objects": detected_objects,
-                "image_with_boxes": annotated_image_bytes,
-                "summary": summary,
-                "total_objects": len(detected_objects)
-            }
+            return self._build_result(results[0], include_annotated)
             
         except Exception as e:
             print(f"❌ YOLO detection 실패: {e}")
             raise RuntimeError(f"음식 detection 중 오류 발생: {str(e)}")
+    
+    def detect_food_batch(
+        self,
+        images: List[ImageInput],
+        include_annotated: bool = False
+    ) -> List[Union[dict, Exception]]:
+        """
+        여러 이미지를 한 번의 forward pass로 detection
+        
+        디코딩에 실패한 이미지는 해당 위치에 예외를 담고 나머지 이미지만 추론한다.
+        
+        Returns:
+            입력 순서와 동일한 detect_food 결과 또는 RuntimeError 리스트
+        """
+        if self.model is None:
+            raise RuntimeError("YOLO 모델이 로드되지 않았습니다.")
+        
+        outputs: List[Union[dict, Exception]] = [None] * len(images)
+        decoded = []
+        for i, image in enumerate(images):
+            try:
+                decoded.append((i, self._decode_image(image)))
+            except Exception as e:
+                outputs[i] = RuntimeError(f"음식 detection 중 오류 발생: {str(e)}")
+        
+        if decoded:
+            try:
+                results = self.model([image_np for _, image_np in decoded], conf=0.25)
+                for (i, _), result in zip(decoded, results):
+                    outputs[i] = self._build_result(result, include_annotated)
+            except Exception as e:
+                print(f"❌ YOLO batch detection 실패: {e}")
+                for i, _ in decoded:
+                    outputs[i] = RuntimeError(f"음식 detection 중 오류 발생: {str(e)}")
+        
+        return outputs
+    
+    def _decode_image(self, image: ImageInput) -> np.ndarray:
+        """이미지 바이트 -> RGB numpy array (PreparedImage면 디코딩 결과 재사용)"""
+        if isinstance(image, PreparedImage):
+            return image.array
+        image_bytes = image
+        # 이미지 바이트 -> PIL Image
+        image = Image.open(io.BytesIO(image_bytes))
+        
+        # PIL Image -> numpy array (OpenCV 형식)
+        image_np = np.array(image)
+        if image_np.shape[-1] == 4:  # RGBA -> RGB
+            image_np = cv2.cvtColor(image_np, cv2.COLOR_RGBA2RGB)
+        elif len(image_np.shape) == 2:  # Grayscale -> RGB
+            image_np = cv2.cvtColor(image_np, cv2.COLOR_GRAY2RGB)
+        return image_np
+    
+    def _build_result(self, result, include_annotated: bool = False) -> dict:
+        """YOLO 결과 1건(이미지 1장) -> detection 결과 딕셔너리"""
+        # Detection 결과 파싱
+        detected_objects = []
+        for box in result.boxes:
+            # 클래스 이름 가져오기
+            class_id = int(box.cls[0])
+            class_name = result.names[class_id]
+            confidence = float(box.conf[0])
+            bbox = box.xyxy[0].tolist()  # [x1, y1, x2, y2]
+            
+            detected_objects.append({
+                "class_name": class_name,
+                "confidence": confidence,
+                "bbox": bbox
+            })
+        
+        # 바운딩 박스 이미지는 plot + 색 변환 + JPEG 인코딩 비용이 커서 요청 시에만 생성
+        annotated_image_bytes = self.render_annotated(result) if include_annotated else None
+        
+        # 요약 생성
+        if detected_objects:
+            object_counts = {}
+            for obj in detected_objects:
+                name = obj["class_name"]
+                object_counts[name] = object_counts.get(name, 0) + 1
+            
+            summary_parts = [f"{name} {count}개" for name, count in object_counts.items()]
+            summary = ", ".join(summary_parts) + " 감지됨"
+        else:
+            summary = "음식이 감지되지 않았습니다."
+        
+        return {
+            "detected_objects": detected_objects,
+            "image_with_boxes": annotated_image_bytes,
+            "summary": summary,
+            "total_objects": len(detected_objects)
+        }
+    
+    @staticmethod
+    def render_annotated(result) -> bytes:
+        """YOLO 결과 1건 -> 바운딩 박스가 그려진 JPEG 바이트"""
+        annotated_image = result.plot()  # OpenCV 형식 (BGR)
+        annotated_image_rgb = cv2.cvtColor(annotated_image, cv2.COLOR_BGR2RGB)
+        
+        # numpy array -> PIL Image -> bytes
+        annotated_pil = Image.fromarray(annotated_image_rgb)
+        img_byte_arr = io.BytesIO()
+        annotated_pil.save(img_byte_arr, format='JPEG')
+        return img_byte_arr.getvalue()
+    
+    async def detect_food_async(self, image: ImageInput, include_annotated: bool = False) -> dict:
+        """
+        detect_food를 YOLO 전용 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+        
+        대기열이 가득 차 있으면 즉시 YOLOQueueFullError를 발생시킨다.
+        
+        마이크로 배치가 켜져 있으면(yolo_batch_max_size > 1) 동시 요청과 묶어서 추론한다.
+        박스 이미지가 필요한 요청(include_annotated=True)은 배치 없이 단독으로 실행한다.
+        
+        Returns:
+            detect_food 결과 + "timings": {"queue_wait_ms": 대기 시간, "inference_ms": 추론 시간,
+                                            "batch_size": 함께 추론한 이미지 수}
+        """
+        with self._pending_lock:
+            if self._pending >= self._max_pending:
+                raise YOLOQueueFullError("이미지 분석 요청이 많아 잠시 후 다시 시도해주세요.")
+            self._pending += 1
+        
+        if self._batcher is not None and not include_annotated:
+            return await self._batcher.submit(image)
+        
+        try:
+            future = self._executor.submit(
+                self._detect_with_timings, image, time.perf_counter(), include_annotated
+            )
+        except Exception:
+            self._release_slot()
+            raise
+        # 요청이 취소되어도 스레드 작업이 끝날 때까지 슬롯을 유지
+        future.add_done_callback(lambda _: self._release_slot())
+        return await asyncio.wrap_future(future)
+    
+    def _release_slot(self) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+    
+    def _detect_with_timings(
+        self,
+        image: ImageInput,
+        submitted_at: float,
+        include_annotated: bool = False
+    ) -> dict:
+        started_at = time.perf_counter()
+        result = self.detect_food(image, include_annotated=include_annotated)
+        result["timings"] = {
+            "queue_wait_ms": round((started_at - submitted_at) * 1000, 1),
+            "inference_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            "batch_size": 1,
+        }
+        return result
 
 
 # 싱글톤 인스턴스
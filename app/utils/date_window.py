@@ -0,0 +1,82 @@
+"""날짜 구간 필터 유틸리티
+
+`func.date(consumed_at) == today` 처럼 컬럼에 함수를 씌우면 (user_id, consumed_at)
+인덱스를 탈 수 없다. 이 모듈은 사용자 시간대의 날짜를 DB 시각(naive) 기준의
+반열린 구간 `start <= consumed_at < end` 로 바꿔 준다.
+
+- DB의 consumed_at 등은 `settings.db_timezone` 기준 naive datetime으로 저장된다.
+- 사용자 시간대는 `settings.default_user_timezone` (사용자별 값이 생기면 tz 인자로 전달)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+@lru_cache(maxsize=32)
+def get_timezone(name: Optional[str] = None) -> ZoneInfo:
+    """시간대 이름 → ZoneInfo (None이면 기본 사용자 시간대)"""
+    return ZoneInfo(name or settings.default_user_timezone)
+
+
+def _db_timezone() -> ZoneInfo:
+    return get_timezone(settings.db_timezone)
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    """반열린 시각 구간 [start, end) (DB 시각 기준 naive datetime)"""
+
+    start: datetime
+    end: datetime
+
+    def clause(self, column) -> ColumnElement[bool]:
+        """column >= start AND column < end (인덱스 range scan 가능)"""
+        return and_(column >= self.start, column < self.end)
+
+    def __contains__(self, value: datetime) -> bool:
+        return self.start <= value < self.end
+
+
+def local_today(tz: Optional[str] = None) -> date:
+    """사용자 시간대의 오늘 날짜"""
+    return datetime.now(get_timezone(tz)).date()
+
+
+def to_local_date(value: datetime, tz: Optional[str] = None) -> date:
+    """DB 시각(naive) → 사용자 시간대의 날짜"""
+    return value.replace(tzinfo=_db_timezone()).astimezone(get_timezone(tz)).date()
+
+
+def _local_midnight_in_db_time(day: date, tz: Optional[str]) -> datetime:
+    local_midnight = datetime.combine(day, time.min, tzinfo=get_timezone(tz))
+    return local_midnight.astimezone(_db_timezone()).replace(tzinfo=None)
+
+
+def date_range_window(start_day: date, end_day: date, tz: Optional[str] = None) -> DateWindow:
+    """사용자 시간대의 start_day 00:00 ~ end_day 다음 날 00:00 (end_day 포함)"""
+    return DateWindow(
+        start=_local_midnight_in_db_time(start_day, tz),
+        end=_local_midnight_in_db_time(end_day + timedelta(days=1), tz),
+    )
+
+
+def day_window(day: date, tz: Optional[str] = None) -> DateWindow:
+    """사용자 시간대의 하루"""
+    return date_range_window(day, day, tz)
+
+
+def last_days_window(days: int, tz: Optional[str] = None) -> DateWindow:
+    """오늘을 포함한 최근 days일"""
+    today = local_today(tz)
+    return date_range_window(today - timedelta(days=days - 1), today, tz)
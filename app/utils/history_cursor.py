@@ -0,0 +1,62 @@
+"""식사 기록 keyset 페이지 커서
+
+OFFSET 페이지는 뒤 페이지로 갈수록 앞의 행을 모두 읽고 버리므로 기록이 많은 사용자일수록
+느려진다. 대신 마지막으로 내려준 행의 (consumed_at, history_id)를 불투명 토큰으로 넘기고
+다음 페이지는 `(consumed_at, history_id) < (커서)` 조건으로 (user_id, consumed_at) 인덱스에서
+바로 이어 읽는다. (InnoDB 보조 인덱스 끝에는 PK(history_id)가 붙어 있어 정렬도 인덱스 순서)
+
+추천 식단 끼니는 history_id 자리에 -meal_id를 쓰므로 같은 커서로 함께 이어 읽을 수 있다.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidCursorError(ValueError):
+    """디코딩할 수 없거나 변조된 커서"""
+
+
+@dataclass(frozen=True)
+class HistoryCursor:
+    """마지막으로 내려준 행의 정렬 키 (이 행 다음부터 읽는다)"""
+
+    consumed_at: datetime
+    history_id: int
+
+    @classmethod
+    def of(cls, row: Any) -> "HistoryCursor":
+        """consumed_at / history_id 속성(또는 키)을 가진 행 → 커서"""
+        if isinstance(row, dict):
+            return cls(row["consumed_at"], row["history_id"])
+        return cls(row.consumed_at, row.history_id)
+
+    def encode(self) -> str:
+        payload = json.dumps(
+            {"t": self.consumed_at.isoformat(), "id": self.history_id},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "HistoryCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return cls(datetime.fromisoformat(payload["t"]), int(payload["id"]))
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError("잘못된 커서입니다.") from e
+
+    def before(self, time_column: Any, id_column: Any) -> ColumnElement[bool]:
+        """내림차순 정렬에서 이 커서 다음 행 조건 (range 조건으로 풀어 써서 인덱스를 탄다)"""
+        return or_(
+            time_column < self.consumed_at,
+            and_(time_column == self.consumed_at, id_column < self.history_id),
+        )
@@ -0,0 +1,108 @@
+"""업로드 이미지 전처리 유틸리티
+
+업로드 1건당 이미지를 한 번만 디코딩/리사이즈/인코딩해 YOLO와 GPT-Vision 각 단계가
+같은 결과를 재사용하도록 한다.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# EXIF Orientation 태그 (1이면 회전 없음)
+EXIF_ORIENTATION = 0x0112
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """
+    디코딩된 업로드 이미지
+
+    Attributes:
+        array: YOLO 입력용 RGB numpy array (원본 해상도, EXIF 회전 반영)
+        jpeg_bytes: GPT-Vision 전송용 JPEG (작은 JPEG는 원본 그대로, 나머지는 축소 후 재인코딩)
+        base64: jpeg_bytes의 base64 문자열
+        content_hash: 원본 바이트의 SHA-256 (분석 결과 캐시 키)
+        original_size_kb: 원본 파일 크기
+    """
+
+    array: np.ndarray
+    jpeg_bytes: bytes
+    base64: str
+    content_hash: str
+    original_size_kb: float
+
+    @classmethod
+    def from_bytes(
+        cls,
+        image_bytes: bytes,
+        max_size: Optional[int] = None,
+        jpeg_quality: Optional[int] = None,
+        max_passthrough_kb: Optional[int] = None,
+    ) -> "PreparedImage":
+        """
+        이미지 바이트를 한 번 디코딩해 PreparedImage 생성 (CPU 작업이므로 스레드에서 호출 권장)
+
+        휴대폰 사진의 EXIF 회전은 여기서 한 번 반영한다. 회전이 필요한 JPEG는 작더라도
+        원본을 그대로 보내지 않고 회전한 이미지를 재인코딩한다.
+
+        Args:
+            image_bytes: 업로드된 원본 바이트
+            max_size: GPT 전송용 이미지의 최대 변 길이 (기본: settings.vision_image_max_size,
+                단일 호출 분석은 settings.vision_detection_image_max_size를 넘긴다)
+            jpeg_quality: 재인코딩 JPEG 품질 (기본: settings.vision_image_jpeg_quality)
+            max_passthrough_kb: 이 크기 이하의 JPEG는 재인코딩 없이 그대로 전송
+                (기본: settings.vision_image_passthrough_kb)
+
+        Raises:
+            ValueError: 이미지로 디코딩할 수 없는 경우
+        """
+        max_size = max_size or settings.vision_image_max_size
+        jpeg_quality = jpeg_quality or settings.vision_image_jpeg_quality
+        if max_passthrough_kb is None:
+            max_passthrough_kb = settings.vision_image_passthrough_kb
+
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            image_format = image.format
+            orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+            if orientation != 1:
+                image = ImageOps.exif_transpose(image)
+            rgb = image.convert("RGB")  # RGBA/팔레트/그레이스케일 -> RGB
+        except Exception as e:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {e}") from e
+
+        size_kb = len(image_bytes) / 1024
+        if image_format == "JPEG" and orientation == 1 and size_kb <= max_passthrough_kb:
+            jpeg_bytes = image_bytes
+        else:
+            resized = rgb
+            if max(rgb.size) > max_size:
+                ratio = max_size / max(rgb.size)
+                new_size = tuple(int(dim * ratio) for dim in rgb.size)
+                resized = rgb.resize(new_size, Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format="JPEG", quality=jpeg_quality)
+            jpeg_bytes = buffer.getvalue()
+            print(f"🔧 이미지 전처리: {size_kb:.2f} KB → {len(jpeg_bytes) / 1024:.2f} KB ({resized.size})")
+
+        return cls(
+            array=np.asarray(rgb),
+            jpeg_bytes=jpeg_bytes,
+            base64=base64.b64encode(jpeg_bytes).decode("utf-8"),
+            content_hash=hashlib.sha256(image_bytes).hexdigest(),
+            original_size_kb=size_kb,
+        )
+
+    def to_pil(self) -> Image.Image:
+        """array를 PIL 이미지로 (복사 없이 가능한 경우 메모리 공유)"""
+        return Image.fromarray(self.array)
@@ -0,0 +1,67 @@
+"""동일 요청 병합 (single-flight)
+
+같은 키로 동시에 들어온 비동기 호출을 한 번만 실행하고, 나머지 호출자는 그 결과를
+함께 기다린다. 인기 음식 하나로 동시에 수십 개의 동일한 LLM 호출이나 무거운 DB 집계가
+나가는 것을 막기 위해 사용한다. 결과를 보관하지는 않으므로(캐시 아님) 실행이 끝나면
+다음 호출은 다시 실행된다.
+
+    flights = SingleFlight("nutrient_estimator")
+    result = await flights.do(("라멘", ("면", "계란")), lambda: self._estimate(...))
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    키별 in-flight 호출 병합기
+
+    - 첫 호출자(leader)가 작업을 Task로 시작하고, 같은 키의 후속 호출자는 그 Task를 기다린다.
+    - 작업이 예외로 끝나면 모든 대기자에게 같은 예외가 전파된다.
+    - 대기자 하나가 취소돼도 공유 작업은 취소되지 않는다 (asyncio.shield).
+    - 후속 호출자에게는 clone(결과)를 돌려줘 dict 등을 수정해도 서로 영향이 없게 한다.
+    """
+
+    def __init__(self, name: str, clone: Optional[Callable[[T], T]] = copy.deepcopy):
+        self.name = name
+        self._clone = clone
+        self._inflight: Dict[Hashable, "asyncio.Future[T]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """key로 진행 중인 호출이 있으면 합류하고, 없으면 fn()을 실행"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug("single-flight 합류: %s %r", self.name, key)
+            result = await asyncio.shield(task)
+            return self._clone(result) if self._clone else result
+
+        self.executions += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """현재 실행 중인 키 수"""
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[T]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않게 소비
+        if not task.cancelled():
+            task.exception()
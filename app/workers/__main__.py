@@ -0,0 +1,60 @@
+"""백그라운드 작업 워커 실행
+
+Redis 큐(`redis_url` 설정 필요)의 작업(대화 요약, 레시피 상세 미리 생성 등)을 처리한다.
+SIGINT/SIGTERM을 받으면 새 작업을 받지 않고 실행 중인 작업을 기다린 뒤 종료한다.
+
+    python -m app.workers
+    python -m app.workers --concurrency 8
+    python -m app.workers --requeue-stale   # 이전 워커가 처리 도중 종료돼 남은 작업을 다시 큐에
+"""
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.workers import jobs  # noqa: E402,F401  (핸들러 등록)
+from app.workers.queue import RedisJobQueue, get_job_queue  # noqa: E402
+from app.workers.worker import JOB_HANDLERS, Worker  # noqa: E402
+
+
+async def run_worker(concurrency: Optional[int], requeue_stale: bool) -> None:
+    queue = get_job_queue()
+    if not isinstance(queue, RedisJobQueue):
+        raise SystemExit("❌ 별도 워커는 Redis 큐에서만 동작합니다. REDIS_URL / JOB_QUEUE_BACKEND를 확인하세요.")
+
+    if requeue_stale:
+        moved = await queue.requeue_processing()
+        print(f"🔁 처리 중 목록에 남은 작업 {moved}개를 다시 큐에 넣었습니다.")
+
+    worker = Worker.from_settings(queue, concurrency=concurrency)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"🚀 작업 워커 시작: 동시 실행 {worker.concurrency}, 작업 {', '.join(sorted(JOB_HANDLERS))}")
+    worker.start()
+    await stop.wait()
+    print("🛑 종료 신호 수신, 실행 중인 작업을 기다립니다...")
+    await worker.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="백그라운드 작업 워커")
+    parser.add_argument("--concurrency", type=int, help="동시 실행 작업 수 (기본: job_worker_concurrency)")
+    parser.add_argument(
+        "--requeue-stale", action="store_true",
+        help="처리 중 목록에 남은 작업을 다시 큐에 넣기 (다른 워커가 실행 중이면 같은 작업이 두 번 실행될 수 있음)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(run_worker(args.concurrency, args.requeue_stale))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""백그라운드 작업 핸들러
+
+핸들러는 JSON 페이로드만 받고 DB 세션은 직접 연다 (요청 세션은 응답 후 이미 닫혀 있다).
+요청 경로에서는 아래 enqueue_* 함수로만 작업을 넣는다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from app.db.models import User
+from app.db.redis_session import get_redis_client
+from app.db.session import SessionLocal
+from app.workers.queue import enqueue_job
+from app.workers.worker import job_handler
+
+logger = logging.getLogger(__name__)
+
+CHAT_SUMMARIZE = "chat.summarize"
+MAJOR_CONVERSATION = "ingredients.major_conversation"
+RECIPE_DETAIL_PREFETCH = "recipes.prefetch_detail"
+
+
+async def enqueue_chat_summary(session_id: str, force: bool = False) -> bool:
+    """대화 증분 요약 (세션별로 하나만 대기 / 실행)"""
+    return await enqueue_job(
+        CHAT_SUMMARIZE,
+        {"session_id": session_id, "force": force},
+        key=f"{CHAT_SUMMARIZE}:{session_id}",
+    )
+
+
+async def enqueue_major_conversation(user_id: int, raw_text: str) -> bool:
+    """식재료 추천 결과 요약 → User.major_conversation"""
+    return await enqueue_job(MAJOR_CONVERSATION, {"user_id": user_id, "raw_text": raw_text})
+
+
+async def enqueue_recipe_detail_prefetch(
+    user_id: int,
+    recipe_names: List[str],
+    diseases: Optional[List[str]] = None,
+    allergies: Optional[List[str]] = None,
+) -> bool:
+    """추천 카드의 상세 조리법을 미리 생성 (상세 요청 시 캐시에서 바로 응답)"""
+    if not recipe_names:
+        return False
+    return await enqueue_job(
+        RECIPE_DETAIL_PREFETCH,
+        {"user_id": user_id, "recipe_names": recipe_names, "diseases": diseases, "allergies": allergies},
+        max_attempts=1,  # 미리 만들기는 실패해도 상세 요청 때 다시 만든다
+    )
+
+
+@job_handler(CHAT_SUMMARIZE)
+async def summarize_chat(payload: Dict) -> None:
+    from app.services.chat_service import ChatService
+
+    async with SessionLocal() as session:
+        service = ChatService(redis_client=get_redis_client(), db_session=session)
+        await service.summarize_conversation_if_needed(payload["session_id"], force=payload.get("force", False))
+
+
+@job_handler(MAJOR_CONVERSATION)
+async def save_major_conversation_job(payload: Dict) -> None:
+    from app.api.v1.routes.ingredients import save_major_conversation
+
+    async with SessionLocal() as session:
+        user = await session.get(User, payload["user_id"])
+        if user is None:
+            return
+        await save_major_conversation(session, user, payload["raw_text"])
+
+
+@job_handler(RECIPE_DETAIL_PREFETCH)
+async def prefetch_recipe_details(payload: Dict) -> None:
+    from app.services.recipe_recommendation_service import get_recipe_recommendation_service
+
+    async with SessionLocal() as session:
+        user = await session.get(User, payload["user_id"])
+    if user is None:
+        return
+
+    service = get_recipe_recommendation_service()
+    results = await asyncio.gather(
+        *[
+            service.get_recipe_detail(
+                recipe_name=name,
+                user=user,
+                diseases=payload.get("diseases"),
+                allergies=payload.get("allergies"),
+            )
+            for name in payload["recipe_names"]
+        ],
+        return_exceptions=True,
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        raise failures[0]
@@ -0,0 +1,276 @@
+"""백그라운드 작업 큐
+
+요청 처리 뒤에 이어지는 LLM 작업(대화 요약, 레시피 상세 미리 생성 등)을 응답 경로에서 떼어내
+워커(`app.workers.worker.Worker`)가 처리하게 한다. 작업은 이름 + JSON 페이로드로만 전달하므로
+요청의 AsyncSession / ORM 객체를 넘기지 않고, 핸들러가 필요한 것을 직접 다시 연다.
+
+- InMemoryJobQueue: 같은 프로세스 안의 asyncio 큐 (API 프로세스에 내장 워커를 띄워 처리)
+- RedisJobQueue: Redis 리스트 (`python -m app.workers`로 띄운 별도 워커 프로세스가 처리)
+  ready 리스트 → BLMOVE로 processing 리스트에 옮겨 가져가고, 끝나면 processing에서 지운다.
+  재시도는 실행 가능 시각을 점수로 한 sorted set에 두었다가 시간이 되면 ready로 옮긴다.
+- 같은 `key`의 작업이 아직 대기 중이면 새로 넣지 않는다 (예: 세션별 요약은 하나만 대기)
+- 같은 `key`의 작업은 동시에 실행하지 않는다. 실행 표시는 ack / retry / dead_letter까지 유지하고,
+  그 사이 꺼낸 같은 키의 작업은 잠시 뒤로 미룬다.
+- 최대 시도 횟수를 넘긴 작업은 dead-letter 목록에 남긴다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Protocol, Set
+
+from app.core.config import get_settings
+from app.db.redis_session import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+BACKEND_AUTO = "auto"
+BACKEND_MEMORY = "memory"
+BACKEND_REDIS = "redis"
+
+REDIS_KEY_PREFIX = "worker:jobs"
+DEAD_LETTER_LIMIT = 1000
+RUNNING_KEY_DEFER_SECONDS = 1.0  # 같은 키가 실행 중일 때 다시 꺼낼 때까지 대기
+
+
+@dataclass
+class Job:
+    """큐에 들어가는 작업 한 건"""
+
+    name: str
+    payload: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    key: Optional[str] = None  # 대기 중 중복 방지 + 실행 직렬화 키
+    attempts: int = 0  # 지금까지 실행한 횟수
+    max_attempts: int = 3
+    enqueued_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Job":
+        return cls(**json.loads(raw))
+
+
+class JobQueue(Protocol):
+    """워커가 쓰는 큐 인터페이스"""
+
+    async def enqueue(self, job: Job) -> bool: ...
+
+    async def dequeue(self, timeout: float) -> Optional[Job]: ...
+
+    async def ack(self, job: Job) -> None: ...
+
+    async def retry(self, job: Job, delay_seconds: float) -> None: ...
+
+    async def dead_letter(self, job: Job) -> None: ...
+
+
+class InMemoryJobQueue:
+    """프로세스 내 asyncio 큐 (프로세스가 종료되면 대기 중인 작업은 사라진다)"""
+
+    def __init__(self, dead_letter_limit: int = DEAD_LETTER_LIMIT):
+        self._ready: "asyncio.Queue[Job]" = asyncio.Queue()
+        self._pending_keys: Set[str] = set()
+        self._running_keys: Dict[str, str] = {}  # key -> 실행 중인 job.id
+        self._delayed: Set[asyncio.TimerHandle] = set()
+        self.dead_letters: Deque[Job] = deque(maxlen=dead_letter_limit)
+
+    async def enqueue(self, job: Job) -> bool:
+        if job.key:
+            if job.key in self._pending_keys:
+                return False
+            self._pending_keys.add(job.key)
+        self._ready.put_nowait(job)
+        return True
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        try:
+            job = await asyncio.wait_for(self._ready.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if job.key:
+            running = self._running_keys.get(job.key)
+            if running is not None and running != job.id:
+                # 같은 키가 실행 중이면 끝날 때까지 미룬다 (대기 표시는 그대로 둔다)
+                self._schedule(job, RUNNING_KEY_DEFER_SECONDS)
+                return None
+            self._running_keys[job.key] = job.id
+            # 실행이 시작되면 같은 키의 새 작업을 다시 받는다 (실행 중 추가된 내용도 처리되도록)
+            self._pending_keys.discard(job.key)
+        return job
+
+    async def ack(self, job: Job) -> None:
+        self._release(job)
+
+    async def retry(self, job: Job, delay_seconds: float) -> None:
+        self._release(job)
+        self._schedule(job, delay_seconds)
+
+    async def dead_letter(self, job: Job) -> None:
+        self._release(job)
+        self.dead_letters.append(job)
+
+    def qsize(self) -> int:
+        return self._ready.qsize() + len(self._delayed)
+
+    def _release(self, job: Job) -> None:
+        if job.key and self._running_keys.get(job.key) == job.id:
+            del self._running_keys[job.key]
+
+    def _schedule(self, job: Job, delay_seconds: float) -> None:
+        loop = asyncio.get_running_loop()
+
+        def _release() -> None:
+            self._delayed.discard(handle)
+            self._ready.put_nowait(job)
+
+        handle = loop.call_later(delay_seconds, _release)
+        self._delayed.add(handle)
+
+
+class RedisJobQueue:
+    """Redis 리스트 기반 큐 (여러 워커 프로세스가 나눠 처리)"""
+
+    def __init__(self, redis_client, prefix: str = REDIS_KEY_PREFIX, dead_letter_limit: int = DEAD_LETTER_LIMIT):
+        self._redis = redis_client
+        self.ready_key = f"{prefix}:ready"
+        self.processing_key = f"{prefix}:processing"
+        self.delayed_key = f"{prefix}:delayed"
+        self.dead_key = f"{prefix}:dead"
+        self.pending_prefix = f"{prefix}:pending"
+        self.running_prefix = f"{prefix}:running"
+        self.dead_letter_limit = dead_letter_limit
+        # processing 리스트에서 지울 때 필요한 원본 문자열
+        self._raw: Dict[str, str] = {}
+
+    async def enqueue(self, job: Job) -> bool:
+        if job.key:
+            # 대기 표시는 실행이 시작되면 지운다. 워커가 죽어도 영원히 막히지 않도록 TTL을 둔다.
+            acquired = await self._redis.set(
+                f"{self.pending_prefix}:{job.key}", job.id, nx=True, ex=settings.job_pending_key_ttl_seconds
+            )
+            if not acquired:
+                return False
+        await self._redis.lpush(self.ready_key, job.to_json())
+        return True
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        await self._promote_due()
+        raw = await self._redis.blmove(self.ready_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        job = Job.from_json(raw)
+        if job.key and not await self._acquire_running(job):
+            # 같은 키가 다른 워커에서 실행 중이면 delayed로 미룬다 (대기 표시는 그대로 둔다)
+            await self._redis.zadd(self.delayed_key, {raw: time.time() + RUNNING_KEY_DEFER_SECONDS})
+            await self._redis.lrem(self.processing_key, 1, raw)
+            return None
+        self._raw[job.id] = raw
+        if job.key:
+            await self._redis.delete(f"{self.pending_prefix}:{job.key}")
+        return job
+
+    async def ack(self, job: Job) -> None:
+        raw = self._raw.pop(job.id, None)
+        if raw is not None:
+            await self._redis.lrem(self.processing_key, 1, raw)
+        if job.key:
+            running_key = f"{self.running_prefix}:{job.key}"
+            if await self._redis.get(running_key) == job.id:
+                await self._redis.delete(running_key)
+
+    async def retry(self, job: Job, delay_seconds: float) -> None:
+        await self._redis.zadd(self.delayed_key, {job.to_json(): time.time() + delay_seconds})
+        await self.ack(job)
+
+    async def dead_letter(self, job: Job) -> None:
+        await self._redis.lpush(self.dead_key, job.to_json())
+        await self._redis.ltrim(self.dead_key, 0, self.dead_letter_limit - 1)
+        await self.ack(job)
+
+    async def _acquire_running(self, job: Job) -> bool:
+        """같은 키의 실행 표시를 잡는다 (워커가 죽어도 풀리도록 TTL을 둔다)"""
+        running_key = f"{self.running_prefix}:{job.key}"
+        if await self._redis.set(running_key, job.id, nx=True, ex=settings.job_running_key_ttl_seconds):
+            return True
+        # 비정상 종료 뒤 requeue_processing으로 돌아온 같은 작업이면 그대로 이어간다
+        return await self._redis.get(running_key) == job.id
+
+    async def requeue_processing(self) -> int:
+        """processing 리스트에 남은 작업(워커 비정상 종료)을 ready로 되돌린다"""
+        moved = 0
+        while await self._redis.lmove(self.processing_key, self.ready_key, "LEFT", "RIGHT"):
+            moved += 1
+        return moved
+
+    async def _promote_due(self) -> None:
+        """실행 시각이 된 재시도 작업을 ready로 옮긴다 (ZREM에 성공한 워커만 옮긴다)"""
+        due: List[str] = await self._redis.zrangebyscore(self.delayed_key, "-inf", time.time(), start=0, num=100)
+        for raw in due:
+            if await self._redis.zrem(self.delayed_key, raw):
+                await self._redis.rpush(self.ready_key, raw)
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def _queue_from_settings() -> JobQueue:
+    backend = settings.job_queue_backend
+    if backend == BACKEND_MEMORY:
+        return InMemoryJobQueue()
+    redis_client = get_redis_client()
+    if redis_client is None:
+        if backend == BACKEND_REDIS:
+            logger.warning("job_queue_backend=redis 이지만 Redis가 없어 프로세스 내 큐를 사용합니다.")
+        return InMemoryJobQueue()
+    return RedisJobQueue(redis_client)
+
+
+def get_job_queue() -> JobQueue:
+    """JobQueue 싱글톤 인스턴스 반환"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = _queue_from_settings()
+    return _job_queue
+
+
+def uses_in_process_worker(queue: Optional[JobQueue] = None) -> bool:
+    """API 프로세스 안에서 워커를 돌려야 하는지 (프로세스 내 큐이거나 설정으로 요청한 경우)"""
+    queue = queue or get_job_queue()
+    return isinstance(queue, InMemoryJobQueue) or settings.job_worker_in_process
+
+
+async def enqueue_job(
+    name: str,
+    payload: Dict[str, Any],
+    *,
+    key: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+) -> bool:
+    """
+    작업 추가 (요청 경로에서 호출)
+
+    큐에 넣지 못해도 요청은 실패시키지 않는다. 같은 key의 작업이 대기 중이면 False.
+    """
+    job = Job(
+        name=name,
+        payload=payload,
+        key=key,
+        max_attempts=max_attempts or settings.job_max_attempts,
+    )
+    try:
+        return await get_job_queue().enqueue(job)
+    except Exception as exc:
+        logger.warning("작업 추가 실패 (%s): %s", name, exc)
+        return False
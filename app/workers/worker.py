@@ -0,0 +1,162 @@
+"""백그라운드 작업 워커
+
+큐에서 작업을 꺼내 이름으로 등록된 핸들러를 실행한다.
+
+- 동시 실행 제한: `concurrency`개까지만 동시에 실행 (LLM 호출량 상한)
+- 재시도: 실패하면 지수 백오프(`retry_base_seconds * 2^(시도-1)`, 최대 `retry_max_seconds`)로 다시 넣는다.
+- dead-letter: `max_attempts`번 모두 실패했거나 핸들러가 없는 작업
+- 작업 시간 제한: `timeout_seconds`를 넘기면 실패로 처리
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import get_settings
+from app.workers.queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict], Awaitable[None]]
+
+# 작업 이름 → 핸들러 (app.workers.jobs에서 등록)
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(name: str) -> Callable[[JobHandler], JobHandler]:
+    """핸들러 등록 데코레이터"""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """attempts번째 실패 뒤 다시 실행하기까지 대기 시간"""
+    return min(max_seconds, base_seconds * (2 ** max(0, attempts - 1)))
+
+
+class Worker:
+    """큐 소비자"""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        concurrency: int = 4,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 60.0,
+        timeout_seconds: Optional[float] = 120.0,
+        poll_seconds: float = 1.0,
+    ):
+        self.queue = queue
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self.concurrency = max(1, concurrency)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.timeout_seconds = timeout_seconds
+        self.poll_seconds = poll_seconds
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, queue: JobQueue, concurrency: Optional[int] = None) -> "Worker":
+        settings = get_settings()
+        return cls(
+            queue,
+            concurrency=concurrency or settings.job_worker_concurrency,
+            retry_base_seconds=settings.job_retry_base_seconds,
+            retry_max_seconds=settings.job_retry_max_seconds,
+            timeout_seconds=settings.job_timeout_seconds,
+        )
+
+    async def run(self) -> None:
+        """stop()이 호출될 때까지 작업을 꺼내 실행"""
+        logger.info("작업 워커 시작 (동시 실행 %d)", self.concurrency)
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            try:
+                job = await self.queue.dequeue(self.poll_seconds)
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            except Exception as exc:
+                self._slots.release()
+                logger.warning("작업 큐 조회 실패: %s", exc)
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            if job is None:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def start(self) -> asyncio.Task:
+        """현재 이벤트 루프에서 백그라운드로 실행 (API 프로세스 내장 워커)"""
+        if self._loop_task is None or self._loop_task.done():
+            self._stopping.clear()
+            self._loop_task = asyncio.create_task(self.run())
+        return self._loop_task
+
+    async def stop(self, grace_seconds: float = 10.0) -> None:
+        """새 작업을 받지 않고 실행 중인 작업을 grace_seconds까지 기다린 뒤 종료"""
+        self._stopping.set()
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._running:
+            _, pending = await asyncio.wait(set(self._running), timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+
+    async def process(self, job: Job) -> None:
+        """작업 한 건 실행 + 결과에 따라 ack / 재시도 / dead-letter"""
+        job.attempts += 1
+        handler = self.handlers.get(job.name)
+        if handler is None:
+            job.last_error = f"등록되지 않은 작업: {job.name}"
+            logger.error("❌ %s", job.last_error)
+            await self.queue.dead_letter(job)
+            return
+
+        try:
+            if self.timeout_seconds:
+                await asyncio.wait_for(handler(job.payload), self.timeout_seconds)
+            else:
+                await handler(job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            job.last_error = f"{type(exc).__name__}: {exc}"
+            if job.attempts >= job.max_attempts:
+                logger.error("❌ 작업 %s(%s) %d회 실패 → dead-letter: %s", job.name, job.id, job.attempts, job.last_error)
+                await self.queue.dead_letter(job)
+            else:
+                delay = retry_delay(job.attempts, self.retry_base_seconds, self.retry_max_seconds)
+                logger.warning("⚠️ 작업 %s(%s) 실패 (%d/%d), %.1f초 후 재시도: %s",
+                               job.name, job.id, job.attempts, job.max_attempts, delay, job.last_error)
+                await self.queue.retry(job, delay)
+            return
+
+        await self.queue.ack(job)
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            await self.process(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # 큐 자체 오류 (ack/retry 실패)
+            logger.warning("작업 %s(%s) 처리 결과 기록 실패: %s", job.name, job.id, exc)
+        finally:
+            self._slots.release()
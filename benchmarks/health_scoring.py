@@ -0,0 +1,102 @@
+"""NRF9.3 / 한국식 점수 계산 벤치마크 - 음식 수별 음식당 비용 (단건 루프 vs 배치)
+
+단건은 기존처럼 음식마다 `await calculate_nrf93_score(...)`를 호출하는 비용이고,
+배치는 `nrf93_scores(values, references)` 한 번(배열 결과)의 비용이다.
+dicts 열은 배치 결과를 음식별 딕셔너리로 바꾸는 데까지 포함한 비용이다.
+
+    python -m benchmarks.health_scoring
+    python -m benchmarks.health_scoring --sizes 1 100 100000 --scalar-limit 10000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from app.services.health_score_service import (
+    KOREAN_NUTRIENTS,
+    NRF93_DAILY_VALUES,
+    NRF93_NUTRIENTS,
+    calculate_korean_nutrition_score,
+    calculate_nrf93_score,
+    korean_nutrition_scores,
+    nrf93_scores,
+)
+
+NRF93_ARGS = (
+    "protein_g", "fiber_g", "vitamin_a_ug", "vitamin_c_mg", "vitamin_e_mg", "calcium_mg",
+    "iron_mg", "potassium_mg", "magnesium_mg", "saturated_fat_g", "added_sugar_g", "sodium_mg",
+)
+
+
+def _foods(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    daily_values = np.array([NRF93_DAILY_VALUES[name] for name in NRF93_NUTRIENTS])
+    values = rng.uniform(0, 0.8, size=(count, len(NRF93_NUTRIENTS))) * daily_values
+    values[rng.random(values.shape) < 0.35] = 0.0
+    references = rng.choice([50.0, 100.0, 250.0, 400.0], size=count)
+    return values, references
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def _scalar_nrf93(values, references) -> None:
+    # 단건 함수의 디버깅 print는 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        for row, reference in zip(values.tolist(), references.tolist()):
+            await calculate_nrf93_score(**dict(zip(NRF93_ARGS, row)), reference_value_g=reference)
+
+
+async def _scalar_korean(values) -> None:
+    for row in values.tolist():
+        await calculate_korean_nutrition_score(*row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="크기별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--scalar-limit", type=int, default=100_000, help="이보다 큰 크기는 단건 루프 측정 생략")
+    args = parser.parse_args()
+
+    print(f"{'score':>7} {'foods':>8} {'scalar_us/food':>15} {'batch_us/food':>14} {'dicts_us/food':>14} {'speedup':>8}")
+    for size in args.sizes:
+        values, references = _foods(size)
+        korean_values = values[:, : len(KOREAN_NUTRIENTS)]
+
+        cases = [
+            (
+                "nrf9.3",
+                lambda: asyncio.run(_scalar_nrf93(values, references)),
+                lambda: nrf93_scores(values, references),
+            ),
+            (
+                "korean",
+                lambda: asyncio.run(_scalar_korean(korean_values)),
+                lambda: korean_nutrition_scores(korean_values),
+            ),
+        ]
+        for name, scalar, batch in cases:
+            batch_us = _best_of(args.repeat, batch) / size * 1e6
+            dicts_us = _best_of(args.repeat, lambda: batch().to_dicts()) / size * 1e6
+            if size <= args.scalar_limit:
+                scalar_us = _best_of(args.repeat if size < 10_000 else 1, scalar) / size * 1e6
+                print(
+                    f"{name:>7} {size:>8} {scalar_us:>15.2f} {batch_us:>14.2f} {dicts_us:>14.2f}"
+                    f" {scalar_us / batch_us:>7.1f}x"
+                )
+            else:
+                print(f"{name:>7} {size:>8} {'-':>15} {batch_us:>14.2f} {dicts_us:>14.2f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
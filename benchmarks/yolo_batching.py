@@ -0,0 +1,119 @@
+"""YOLO 마이크로 배치 벤치마크 - 동시성별 처리량 vs p99 지연시간
+
+기본은 forward pass 비용을 흉내 내는 가짜 모델(고정 오버헤드 + 이미지당 비용)로
+스케줄러 자체를 측정한다. `--model`을 주면 실제 YOLO 모델로 측정한다.
+
+    python -m benchmarks.yolo_batching
+    python -m benchmarks.yolo_batching --model models/yolo_food.pt --image sample.jpg
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from typing import List
+
+from PIL import Image
+
+from app.services.yolo_service import YOLOService
+
+
+class _FakeBoxes(list):
+    pass
+
+
+class _FakeResult:
+    names = {0: "food"}
+    boxes = _FakeBoxes()
+
+    def plot(self):
+        import numpy as np
+        return np.zeros((8, 8, 3), dtype="uint8")
+
+
+class FakeModel:
+    """배치 호출 1회당 overhead_ms + 이미지당 per_image_ms가 걸리는 모델"""
+
+    def __init__(self, overhead_ms: float, per_image_ms: float):
+        self.overhead = overhead_ms / 1000
+        self.per_image = per_image_ms / 1000
+
+    def __call__(self, images, conf=0.25):
+        batch = images if isinstance(images, list) else [images]
+        time.sleep(self.overhead + self.per_image * len(batch))
+        return [_FakeResult() for _ in batch]
+
+
+def _make_service(model, batch_size: int, wait_ms: float, workers: int) -> YOLOService:
+    service = YOLOService.__new__(YOLOService)
+    service.model = model
+    service._init_executor(
+        workers,
+        max_queue_size=10_000,
+        batch_max_size=batch_size,
+        batch_max_wait_ms=wait_ms,
+    )
+    return service
+
+
+async def _run(service: YOLOService, image_bytes: bytes, concurrency: int, total: int):
+    latencies: List[float] = []
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await service.detect_food_async(image_bytes)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return total / elapsed, statistics.median(latencies) * 1000, p99 * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="실제 YOLO 모델 경로 (없으면 가짜 모델 사용)")
+    parser.add_argument("--image", help="입력 이미지 경로 (없으면 640x480 단색 이미지)")
+    parser.add_argument("--requests", type=int, default=200, help="설정별 총 요청 수")
+    parser.add_argument("--workers", type=int, default=1, help="추론 스레드 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--wait-ms", type=float, nargs="+", default=[5.0, 20.0])
+    parser.add_argument("--overhead-ms", type=float, default=40.0, help="가짜 모델의 호출당 비용")
+    parser.add_argument("--per-image-ms", type=float, default=8.0, help="가짜 모델의 이미지당 비용")
+    args = parser.parse_args()
+
+    if args.model:
+        from ultralytics import YOLO
+        model = YOLO(args.model)
+    else:
+        model = FakeModel(args.overhead_ms, args.per_image_ms)
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            image_bytes = f.read()
+    else:
+        buffer = io.BytesIO()
+        Image.new("RGB", (640, 480), (200, 120, 80)).save(buffer, format="JPEG")
+        image_bytes = buffer.getvalue()
+
+    configs = [(1, 0.0)] + [(b, w) for b in args.batch_sizes if b > 1 for w in args.wait_ms]
+
+    print(f"{'batch':>5} {'wait_ms':>7} {'conc':>5} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8}")
+    for batch_size, wait_ms in configs:
+        for concurrency in args.concurrency:
+            service = _make_service(model, batch_size, wait_ms, args.workers)
+            throughput, p50, p99 = asyncio.run(_run(service, image_bytes, concurrency, args.requests))
+            service._executor.shutdown()
+            print(f"{batch_size:>5} {wait_ms:>7.1f} {concurrency:>5} {throughput:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
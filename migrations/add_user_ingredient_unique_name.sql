@@ -0,0 +1,39 @@
+-- ============================================================================
+-- UserIngredient (user_id, ingredient_name) 유니크 제약 추가
+-- ============================================================================
+--
+-- 목적: /ingredients/save 집합 단위 upsert (INSERT ... ON DUPLICATE KEY UPDATE)
+--       사용자별 같은 이름의 식재료는 한 행만 유지
+-- 중복 정리: 가장 최근 행(ingredient_id가 가장 큰 행)만 남긴다.
+--           중복 중 미사용(is_used = FALSE) 행이 있으면 남기는 행도 미사용으로 둔다.
+--
+-- ============================================================================
+
+USE tempdb;
+
+-- 1. 남길 행(가장 최근 ingredient_id)의 is_used 정리: 중복 중 하나라도 미사용이면 미사용
+UPDATE `UserIngredient` AS keep_row
+JOIN (
+    SELECT `user_id`, `ingredient_name`, MAX(`ingredient_id`) AS keep_id, MIN(`is_used`) AS is_used
+    FROM `UserIngredient`
+    GROUP BY `user_id`, `ingredient_name`
+    HAVING COUNT(*) > 1
+) AS grouped ON keep_row.`ingredient_id` = grouped.keep_id
+SET keep_row.`is_used` = grouped.is_used;
+
+-- 2. 남길 행을 제외한 중복 삭제
+DELETE older FROM `UserIngredient` AS older
+JOIN `UserIngredient` AS newer
+  ON newer.`user_id` = older.`user_id`
+ AND newer.`ingredient_name` = older.`ingredient_name`
+ AND newer.`ingredient_id` > older.`ingredient_id`;
+
+-- 3. 유니크 제약 추가
+ALTER TABLE `UserIngredient`
+ADD UNIQUE KEY `uq_user_ingredient_name` (`user_id`, `ingredient_name`);
+
+-- 변경사항 확인
+SHOW INDEX FROM `UserIngredient`;
+
+-- 완료 메시지
+SELECT '✅ UserIngredient (user_id, ingredient_name) 유니크 제약 추가 완료!' AS status;
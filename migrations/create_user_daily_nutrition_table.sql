@@ -0,0 +1,44 @@
+-- ============================================================================
+-- 사용자 일별 · 끼니별 섭취 영양 집계 테이블 생성
+-- ============================================================================
+--
+-- 목적: 대시보드가 UserFoodHistory × health_score × food_nutrients를 매번 다시
+--       합산하지 않도록 (user_id, date, meal_type) 단위 합계를 유지
+-- 갱신: 음식 기록 저장/삭제 API가 같은 트랜잭션에서 갱신
+-- 백필: python -m app.commands.rebuild_daily_nutrition
+--
+-- ============================================================================
+
+USE tempdb;
+
+CREATE TABLE IF NOT EXISTS `UserDailyNutrition` (
+    `user_id` BIGINT NOT NULL,
+    `date` DATE NOT NULL COMMENT '섭취 날짜 (consumed_at 기준)',
+    `meal_type` ENUM('breakfast', 'lunch', 'dinner', 'snack') NOT NULL COMMENT '식사 유형',
+    `item_count` INT NOT NULL DEFAULT 0 COMMENT '기록된 음식 수',
+    `kcal` INT NOT NULL DEFAULT 0 COMMENT 'SUM(health_score.kcal)',
+    `protein` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `carb` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `fat` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `fiber` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `sodium` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `saturated_fat` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `added_sugar` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `vitamin_a` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `vitamin_c` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `calcium` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `iron` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `potassium` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `magnesium` DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    `score_sum` INT NOT NULL DEFAULT 0 COMMENT 'SUM(health_score.final_score)',
+    `score_count` INT NOT NULL DEFAULT 0 COMMENT 'final_score가 있는 기록 수',
+    `top_foods` JSON NULL COMMENT '음식명별 섭취 횟수 {food_name: count}',
+    `updated_at` DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (`user_id`, `date`, `meal_type`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 일별 섭취 영양 집계';
+
+-- 변경사항 확인
+DESCRIBE `UserDailyNutrition`;
+
+-- 완료 메시지
+SELECT '✅ UserDailyNutrition 테이블 생성 완료! 이어서 python -m app.commands.rebuild_daily_nutrition 으로 백필하세요.' AS status;
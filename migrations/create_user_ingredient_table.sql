@@ -8,6 +8,7 @@ CREATE TABLE IF NOT EXISTS `UserIngredient` (
     `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '등록일',
     `is_used` BOOLEAN NOT NULL DEFAULT FALSE COMMENT '사용 여부',
     PRIMARY KEY (`ingredient_id`),
+    UNIQUE KEY `uq_user_ingredient_name` (`user_id`, `ingredient_name`),
     INDEX `idx_user_id` (`user_id`),
     INDEX `idx_user_id_is_used` (`user_id`, `is_used`),
     INDEX `idx_created_at` (`created_at`)
@@ -0,0 +1,127 @@
+"""채팅 에이전트 그래프 캐시 단위 테스트"""
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.db.models import User
+from app.services import langchain_agent as module
+from app.services.langchain_agent import AgentContext, LangChainAgentFactory, RecipeRecommendationTool
+
+
+class RecordingChatModel(FakeListChatModel):
+    """받은 메시지를 기록하는 가짜 모델"""
+
+    received: List[Any] = []
+
+    def _call(self, messages, *args, **kwargs):
+        self.received.append(messages)
+        return super()._call(messages, *args, **kwargs)
+
+    async def _astream(self, messages, *args, **kwargs):
+        # AgentExecutor는 스트리밍 경로로 호출한다
+        self.received.append(messages)
+        async for chunk in super()._astream(messages, *args, **kwargs):
+            yield chunk
+
+
+class FakeRecipeService:
+    def __init__(self):
+        self.calls = []
+
+    async def recommend_recipes_async(self, **kwargs):
+        self.calls.append(kwargs)
+        return []
+
+
+def _user(user_id=1, health_goal="loss"):
+    return User(user_id=user_id, username="tester", health_goal=health_goal)
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    def make(responses=("Final Answer: 안녕하세요",), max_entries=8):
+        llm = RecordingChatModel(responses=list(responses), received=[])
+        agent_factory = LangChainAgentFactory(llm=llm, cache_max_entries=max_entries)
+        monkeypatch.setattr(agent_factory, "_build_tools", lambda context: [])
+        return agent_factory
+
+    return make
+
+
+class TestAgentGraphCache:
+    """(user_id, 프로필 버전)별 재사용"""
+
+    @pytest.mark.asyncio
+    async def test_reused_until_profile_changes(self, factory):
+        agent_factory = factory()
+        context = AgentContext(user=_user(), diseases=["당뇨"], allergies=[])
+
+        first = await agent_factory.create_executor(context)
+        # 요약/섭취 현황만 다른 다음 메시지는 같은 그래프
+        second = await agent_factory.create_executor(
+            AgentContext(user=_user(), diseases=["당뇨"], conversation_summary="요약", has_eaten_today=False)
+        )
+        assert first.prepared is second.prepared
+
+        changed = await agent_factory.create_executor(AgentContext(user=_user(), diseases=["당뇨", "고혈압"]))
+        assert changed.prepared is not first.prepared
+
+        stats = agent_factory.stats()
+        assert (stats["hits"], stats["misses"], stats["builds"]) == (1, 2, 2)
+        assert stats["entries"] == 1  # 이전 프로필 버전은 버린다
+
+    @pytest.mark.asyncio
+    async def test_bounded_lru(self, factory):
+        agent_factory = factory(max_entries=2)
+        for user_id in (1, 2, 1, 3):
+            await agent_factory.create_executor(AgentContext(user=_user(user_id)))
+
+        assert len(agent_factory.cache) == 2
+        assert agent_factory.stats()["hits"] == 1
+        # 가장 오래 안 쓴 사용자 2가 밀려났다
+        await agent_factory.create_executor(AgentContext(user=_user(2)))
+        assert agent_factory.stats()["builds"] == 4
+
+
+class TestAgentRun:
+    """실행 시 요청별 값 전달"""
+
+    @pytest.mark.asyncio
+    async def test_summary_fed_from_storage(self, factory):
+        agent_factory = factory(responses=["Final Answer: 첫 답", "Final Answer: 둘째 답"])
+
+        run = await agent_factory.create_executor(AgentContext(user=_user(), conversation_summary="저염식 선호"))
+        result = await run.ainvoke({"input": "점심 추천"})
+        assert result["output"] == "첫 답"
+
+        messages = agent_factory.llm.received[0]
+        assert "중요 대화 요약: 저염식 선호" in messages[0].content
+        assert [m.content for m in messages[1:3]] == ["대화 요약", "저염식 선호"]
+
+        # 같은 그래프로 다른 요약 (이전 실행의 기록이 남지 않는다)
+        run = await agent_factory.create_executor(AgentContext(user=_user()))
+        await run.ainvoke({"input": "저녁 추천"})
+        messages = agent_factory.llm.received[1]
+        assert "중요 대화 요약: 이전 요약 없음" in messages[0].content
+        assert all("저염식" not in m.content for m in messages)
+
+    @pytest.mark.asyncio
+    async def test_tool_reads_request_context(self):
+        service = FakeRecipeService()
+        tool = RecipeRecommendationTool.model_construct(service=service)
+        user = _user()
+        token = module._run_context.set(
+            AgentContext(user=user, diseases=["당뇨"], has_eaten_today=False, meal_type="dinner")
+        )
+        try:
+            await tool._arun("가벼운 메뉴")
+        finally:
+            module._run_context.reset(token)
+
+        call = service.calls[0]
+        assert call["user"] is user
+        assert (call["diseases"], call["has_eaten_today"], call["meal_type"]) == (["당뇨"], False, "dinner")
+
+        with pytest.raises(RuntimeError):
+            await tool._arun("컨텍스트 없음")
@@ -0,0 +1,126 @@
+"""채팅 SSE 스트리밍 단위 테스트"""
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.api.v1.schemas.chat import ChatMessageResponse
+from app.db.models import User
+from app.services.chat_stream import (
+    ChatEvents,
+    _ReactTokenSplitter,
+    run_agent_with_events,
+    sse_event,
+    stream_chat_events,
+)
+from app.services.langchain_agent import AgentContext, LangChainAgentFactory
+
+
+def _parse(frames):
+    """SSE 프레임 → (event, data) 목록 (keep-alive 주석 제외)"""
+    parsed = []
+    for frame in frames:
+        if frame.startswith(":"):
+            continue
+        event_line, data_line = frame.strip().split("\n")
+        parsed.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return parsed
+
+
+async def _collect(run, **kwargs):
+    return [frame async for frame in stream_chat_events(run, **kwargs)]
+
+
+class TestSseFrames:
+    """SSE 프레임 / 토큰 채널 분리"""
+
+    def test_sse_event_format(self):
+        assert sse_event("token", {"text": "안녕"}) == 'event: token\ndata: {"text": "안녕"}\n\n'
+
+    def test_splitter_marks_answer_after_final_answer(self):
+        splitter = _ReactTokenSplitter()
+        chunks = ["Thought: 바로 답한다\nFinal ", "Answer: 안녕", "하세요"]
+        reasoning, answer = zip(*(splitter.split("run-1", chunk) for chunk in chunks))
+
+        assert "".join(reasoning) == "Thought: 바로 답한다\nFinal Answer:"
+        assert "".join(answer) == "안녕하세요"
+        # 다른 LLM 호출은 따로 센다
+        assert splitter.split("run-2", "Thought: 도구 호출") == ("Thought: 도구 호출", "")
+
+
+class TestStreamChatEvents:
+    """이벤트 → SSE 스트림"""
+
+    @pytest.mark.asyncio
+    async def test_events_then_final(self):
+        async def run(events: ChatEvents):
+            assert events.streaming
+            await events.send("health_check", {"disease_conflict": False, "allergy_conflict": False})
+            await events.send("token", {"channel": "answer", "text": "안녕"})
+            return ChatMessageResponse(session_id="s1", response="{}", needs_tool_call=False)
+
+        parsed = _parse(await _collect(run))
+
+        assert [event for event, _ in parsed] == ["health_check", "token", "final"]
+        assert parsed[-1][1]["session_id"] == "s1"
+
+    @pytest.mark.asyncio
+    async def test_errors_and_heartbeat(self):
+        async def run(events: ChatEvents):
+            await asyncio.sleep(0.05)
+            raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not configured.")
+
+        frames = await _collect(run, heartbeat_seconds=0.01)
+
+        assert frames[0] == ": keep-alive\n\n"
+        assert _parse(frames) == [("error", {"status_code": 500, "detail": "OPENAI_API_KEY is not configured."})]
+
+    @pytest.mark.asyncio
+    async def test_run_finishes_after_client_disconnect(self):
+        saved = asyncio.Event()
+
+        async def run(events: ChatEvents):
+            await events.send("health_check", {})
+            await asyncio.sleep(0.02)
+            saved.set()  # 대화 저장
+            return {}
+
+        stream = stream_chat_events(run)
+        await stream.__anext__()
+        await stream.aclose()  # 첫 이벤트만 받고 연결 종료
+
+        await asyncio.wait_for(saved.wait(), 1.0)
+
+
+class TestRunAgentWithEvents:
+    """에이전트 토큰 스트리밍"""
+
+    @pytest.fixture
+    def agent_factory(self, monkeypatch):
+        llm = FakeListChatModel(responses=["Thought: 바로 답한다\nFinal Answer: 안녕하세요"] * 2)
+        factory = LangChainAgentFactory(llm=llm, cache_max_entries=4)
+        monkeypatch.setattr(factory, "_build_tools", lambda context: [])
+        return factory
+
+    @pytest.mark.asyncio
+    async def test_streams_tokens_and_returns_output(self, agent_factory):
+        queue = asyncio.Queue()
+        run = await agent_factory.create_executor(AgentContext(user=User(user_id=1, username="tester")))
+
+        result = await run_agent_with_events(run, {"input": "안녕"}, ChatEvents(queue))
+
+        assert result["output"] == "안녕하세요"
+        sent = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert {event for event, _ in sent} == {"token"}
+        answer = "".join(data["text"] for _, data in sent if data["channel"] == "answer")
+        assert answer == "안녕하세요"
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_uses_ainvoke(self, agent_factory):
+        run = await agent_factory.create_executor(AgentContext(user=User(user_id=1, username="tester")))
+
+        result = await run_agent_with_events(run, {"input": "안녕"}, ChatEvents())
+
+        assert result["output"] == "안녕하세요"
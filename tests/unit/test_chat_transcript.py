@@ -0,0 +1,286 @@
+"""채팅 대화 기록 (ChatHistory append-only) 단위 테스트"""
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from app.db.models import Conversation
+from app.services import chat_service as chat_service_module
+from app.services.chat_service import ChatService
+from app.services.chat_transcript import (
+    chat_messages_query,
+    chat_turn_rows,
+    estimate_tokens,
+    format_transcript,
+    message_tokens,
+    summary_batches,
+)
+
+MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "alembic" / "versions" / "5d8b1e3f9a2c_split_conversation_all_chat.py"
+)
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("split_all_chat_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# 예전 all_chat 파서는 마이그레이션 파일에만 있다
+split_all_chat = _load_migration().split_all_chat
+
+
+def _old_all_chat(turns):
+    """예전 라우트가 all_chat에 이어 붙이던 형식"""
+    return "".join(f"Human: {human}\nAI: {ai}\n\n" for human, ai in turns)
+
+
+TURNS = [
+    ("점심 뭐 먹지?", "비빔밥 어떠세요?\n\n- 채소가 많아요"),
+    ("Human: 이라고 쓰면?", "AI: 라고 답할게요"),
+]
+
+
+class TestTranscriptFormat:
+    """all_chat 형식 ↔ 메시지 행"""
+
+    def test_split_round_trip_with_newlines(self):
+        messages = split_all_chat(_old_all_chat(TURNS))
+
+        assert messages == [
+            ("human", "점심 뭐 먹지?"),
+            ("ai", "비빔밥 어떠세요?\n\n- 채소가 많아요"),
+            ("human", "Human: 이라고 쓰면?"),
+            ("ai", "AI: 라고 답할게요"),
+        ]
+
+    def test_format_matches_old_all_chat(self):
+        rows = [SimpleNamespace(message_type=t, content=c) for t, c in split_all_chat(_old_all_chat(TURNS))]
+        assert format_transcript(rows) == _old_all_chat(TURNS)
+
+    def test_unparseable_tail_is_kept(self):
+        messages = split_all_chat(_old_all_chat(TURNS[:1]) + "잘린 내용")
+        assert messages[-1] == ("ai", "비빔밥 어떠세요?\n\n- 채소가 많아요\n\n잘린 내용")
+        assert split_all_chat("") == []
+
+    def test_turn_rows_are_human_then_ai(self):
+        rows = chat_turn_rows(1, "s1", "안녕", "안녕하세요")
+        assert [(r.message_type, r.content, r.session_id) for r in rows] == [
+            ("human", "안녕", "s1"),
+            ("ai", "안녕하세요", "s1"),
+        ]
+
+    def test_messages_query_uses_session_range(self):
+        query = chat_messages_query("s1", since=datetime(2025, 12, 1), limit=50)
+        sql = str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+        assert "`ChatHistory`.session_id = 's1'" in sql
+        assert "`ChatHistory`.created_at >= '2025-12-01 00:00:00'" in sql
+        assert "ORDER BY `ChatHistory`.created_at, `ChatHistory`.id" in sql
+
+
+def _history(turns, start_id=1):
+    """(질문, 응답) 목록 → id가 매겨진 ChatHistory 행"""
+    rows = []
+    for human, ai in turns:
+        rows.extend(chat_turn_rows(1, "s1", human, ai))
+    for offset, row in enumerate(rows):
+        row.id = start_id + offset
+        row.created_at = datetime(2025, 12, 1, 9, 0)
+    return rows
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class _FakeSession:
+    def __init__(self, conversation):
+        self.conversation = conversation
+        self.commits = 0
+
+    async def execute(self, stmt):
+        return _FakeResult(self.conversation)
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    """ChatHistory/LLM 대신 메모리 목록과 기록용 요약 함수를 쓰는 ChatService"""
+    history = []
+    prompts = []
+
+    async def fake_load(session, session_id, since=None, limit=None, after_id=None):
+        rows = [row for row in history if after_id is None or row.id > after_id]
+        return rows[:limit] if limit is not None else rows
+
+    async def fake_summary(old_summary, new_messages):
+        prompts.append(new_messages)
+        return f"{old_summary}+{len(prompts)}"
+
+    monkeypatch.setattr(chat_service_module, "load_chat_messages", fake_load)
+    settings = chat_service_module.get_settings()
+    monkeypatch.setattr(settings, "chat_summary_min_delta_tokens", 30)
+    monkeypatch.setattr(settings, "chat_summary_batch_token_budget", 40)
+    monkeypatch.setattr(settings, "chat_summary_max_messages", 400)
+
+    conversation = Conversation(
+        session_id="s1", user_id=1, sum_chat="", last_summarized_message_id=0,
+        transcript_tokens=0, summary_input_tokens=0,
+    )
+    service = ChatService.__new__(ChatService)
+    service.db_session = _FakeSession(conversation)
+    service._generate_incremental_summary = fake_summary
+    newer_session = []
+
+    async def fake_has_newer_session(conversation):
+        return bool(newer_session)
+
+    service._has_newer_session = fake_has_newer_session
+    return SimpleNamespace(newer_session=newer_session, service=service, conversation=conversation, history=history, prompts=prompts)
+
+
+class TestSummaryBatches:
+    """토큰 어림값과 턴 단위 배치"""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("비빔밥") == 3
+
+    def test_batches_keep_turns_under_budget(self):
+        rows = _history([("가" * 10, "나" * 10)] * 3)
+        turn_tokens = sum(message_tokens(row) for row in rows[:2])
+
+        batches = summary_batches(rows, token_budget=turn_tokens * 2)
+
+        assert [[row.id for row in batch] for batch in batches] == [[1, 2, 3, 4], [5, 6]]
+
+    def test_oversized_turn_is_its_own_batch(self):
+        rows = _history([("가" * 100, "나"), ("다", "라")])
+        batches = summary_batches(rows, token_budget=10)
+        assert [[row.id for row in batch] for batch in batches] == [[1, 2], [3, 4]]
+
+
+class TestIncrementalSummary:
+    """워터마크 이후 메시지만 요약"""
+
+    @pytest.mark.asyncio
+    async def test_skips_small_delta_unless_forced(self, summarizer):
+        summarizer.history.extend(_history([("안녕", "안녕하세요")]))
+
+        await summarizer.service.summarize_conversation_if_needed("s1")
+        assert summarizer.prompts == []
+
+        await summarizer.service.summarize_conversation_if_needed("s1", force=True)
+        assert summarizer.prompts == ["Human: 안녕\nAI: 안녕하세요\n\n"]
+        assert summarizer.conversation.last_summarized_message_id == 2
+
+    @pytest.mark.asyncio
+    async def test_left_session_is_forced(self, summarizer):
+        summarizer.history.extend(_history([("안녕", "안녕하세요")]))
+        summarizer.newer_session.append("s2")
+
+        # force 작업이 대기 중인 같은 세션 작업에 합쳐져도 남은 대화를 요약한다
+        await summarizer.service.summarize_conversation_if_needed("s1")
+        assert summarizer.prompts == ["Human: 안녕\nAI: 안녕하세요\n\n"]
+
+    @pytest.mark.asyncio
+    async def test_only_new_turns_are_sent(self, summarizer):
+        turn = ("가" * 10, "나" * 10)
+        summarizer.history.extend(_history([turn] * 3))
+
+        await summarizer.service.summarize_conversation_if_needed("s1")
+        # 예산(40) 안에 한 턴(24)씩만 들어가므로 3번 호출
+        assert len(summarizer.prompts) == 3
+        assert summarizer.conversation.last_summarized_message_id == 6
+        assert summarizer.service.db_session.commits == 3
+
+        summarizer.history.extend(_history([turn] * 2, start_id=7))
+        await summarizer.service.summarize_conversation_if_needed("s1")
+
+        new_prompts = summarizer.prompts[3:]
+        assert new_prompts == [format_transcript(summarizer.history[6:8]), format_transcript(summarizer.history[8:])]
+        assert summarizer.conversation.sum_chat == "+1+2+3+4+5"
+        assert summarizer.conversation.transcript_tokens == sum(message_tokens(row) for row in summarizer.history)
+        assert summarizer.conversation.summary_input_tokens > summarizer.conversation.transcript_tokens
+
+
+class TestSplitMigration:
+    """all_chat → ChatHistory 마이그레이션"""
+
+    def test_missing_leading_turns_are_restored(self):
+        migration = _load_migration()
+        engine = sa.create_engine("sqlite://")
+        metadata = sa.MetaData()
+        sa.Table(
+            "UserConversation", metadata,
+            sa.Column("session_id", sa.String, primary_key=True),
+            sa.Column("user_id", sa.BigInteger),
+            sa.Column("all_chat", sa.Text),
+            sa.Column("created_at", sa.DateTime),
+        )
+        sa.Table(
+            "ChatHistory", metadata,
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("user_id", sa.BigInteger),
+            sa.Column("session_id", sa.String),
+            sa.Column("message_type", sa.String),
+            sa.Column("content", sa.Text),
+            sa.Column("created_at", sa.DateTime),
+        )
+        metadata.create_all(engine)
+        created = datetime(2025, 11, 1, 9, 0)
+
+        with engine.begin() as conn:
+            conn.execute(migration.conversations.insert(), [
+                {"session_id": "old", "user_id": 1, "all_chat": _old_all_chat(TURNS), "created_at": created},
+                {"session_id": "new", "user_id": 1, "all_chat": _old_all_chat(TURNS[:1]), "created_at": created},
+                {"session_id": "mixed", "user_id": 1, "all_chat": _old_all_chat(TURNS), "created_at": created},
+                {"session_id": "empty", "user_id": 2, "all_chat": "", "created_at": created},
+            ])
+            # "new" 세션은 이미 ChatHistory에 기록돼 있고,
+            # "mixed" 세션은 ChatHistory 도입 후의 두 번째 턴만 기록돼 있음
+            conn.execute(migration.chat_history.insert(), [
+                {"user_id": 1, "session_id": "new", "message_type": m, "content": c, "created_at": created}
+                for m, c in split_all_chat(_old_all_chat(TURNS[:1]))
+            ] + [
+                {"user_id": 1, "session_id": "mixed", "message_type": m, "content": c, "created_at": created}
+                for m, c in split_all_chat(_old_all_chat(TURNS[1:]))
+            ])
+
+            migration._split_all_chat(conn)
+
+            rows = conn.execute(
+                sa.select(migration.chat_history.c.session_id, migration.chat_history.c.message_type,
+                          migration.chat_history.c.content)
+                .order_by(migration.chat_history.c.created_at, migration.chat_history.c.id)
+            ).all()
+
+        def session_rows(session_id):
+            return [(r.message_type, r.content) for r in rows if r.session_id == session_id]
+
+        assert session_rows("new") == split_all_chat(_old_all_chat(TURNS[:1]))
+        assert session_rows("old") == split_all_chat(_old_all_chat(TURNS))
+        assert session_rows("mixed") == split_all_chat(_old_all_chat(TURNS))
+        assert session_rows("empty") == []
+
+    def test_migration_does_not_import_app_code(self):
+        """앱 코드가 바뀌어도 마이그레이션 결과가 같도록 파서를 파일 안에 둔다"""
+        assert "from app" not in MIGRATION.read_text(encoding="utf-8")
@@ -0,0 +1,93 @@
+"""일별 영양 집계 계산 단위 테스트"""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.daily_nutrition_service import (
+    DailyNutritionSummary,
+    _empty_row,
+    apply_contribution,
+    meal_contribution,
+    summarize_by_date,
+)
+
+
+def _nutrient(**values):
+    """reference_value 100g 기준 FoodNutrient 목"""
+    return SimpleNamespace(reference_value=100.0, **values)
+
+
+class TestMealContribution:
+    """음식 1건 기여분 계산"""
+
+    def test_scales_by_portion(self):
+        """영양소는 섭취량 / 기준량 비율로 환산"""
+        contribution = meal_contribution(
+            food_name="김치찌개",
+            portion_size_g=250,
+            kcal=300,
+            final_score=70,
+            nutrient=_nutrient(protein=10.0, sodium=400.0),
+        )
+
+        assert contribution.kcal == 300
+        assert contribution.nutrients["protein"] == pytest.approx(25.0)
+        assert contribution.nutrients["sodium"] == pytest.approx(1000.0)
+        assert contribution.nutrients["fat"] == 0.0
+
+    def test_missing_nutrient_contributes_only_kcal(self):
+        """food_nutrients에 없는 음식은 kcal/점수만 반영"""
+        contribution = meal_contribution("직접입력", 100, 200, None, None)
+
+        assert contribution.kcal == 200
+        assert all(value == 0.0 for value in contribution.nutrients.values())
+
+
+class TestApplyContribution:
+    """집계 행 증감"""
+
+    def test_add_then_remove_restores_row(self):
+        """저장 후 같은 기록을 삭제하면 원래 값으로 돌아온다"""
+        row = _empty_row(1, date(2025, 11, 20), "lunch")
+        rice = meal_contribution("비빔밥", 300, 550, 80, _nutrient(protein=5.0, carb=30.0))
+        soup = meal_contribution("미역국", 200, 100, None, _nutrient(sodium=300.0))
+
+        apply_contribution(row, rice)
+        apply_contribution(row, soup)
+        apply_contribution(row, rice)
+
+        assert row.item_count == 3
+        assert row.kcal == 1200
+        assert row.score_sum == 160
+        assert row.score_count == 2
+        assert float(row.protein) == pytest.approx(30.0)
+        assert row.top_foods == {"비빔밥": 2, "미역국": 1}
+
+        apply_contribution(row, rice, sign=-1)
+        apply_contribution(row, soup, sign=-1)
+
+        assert row.item_count == 1
+        assert row.kcal == 550
+        assert float(row.sodium) == 0.0
+        assert row.top_foods == {"비빔밥": 1}
+
+
+class TestSummaries:
+    """끼니별 행 → 날짜별 합계"""
+
+    def test_summarize_by_date(self):
+        day = date(2025, 11, 20)
+        breakfast = _empty_row(1, day, "breakfast")
+        dinner = _empty_row(1, day, "dinner")
+        apply_contribution(breakfast, meal_contribution("토스트", 100, 250, 60, None))
+        apply_contribution(dinner, meal_contribution("토스트", 100, 250, 40, None))
+
+        summary = summarize_by_date([breakfast, dinner])[day]
+
+        assert summary.kcal == 500
+        assert summary.avg_score == pytest.approx(50.0)
+        assert summary.top_foods["토스트"] == 2
+
+    def test_empty_summary_has_no_average(self):
+        assert DailyNutritionSummary().avg_score is None
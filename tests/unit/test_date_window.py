@@ -0,0 +1,98 @@
+"""날짜 구간 필터 / 쿼리 플랜 회귀 테스트"""
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.services.daily_nutrition_service import daily_nutrition_rows_query
+from app.services.food_history_service import food_history_window_query
+from app.utils.date_window import date_range_window, day_window, to_local_date
+
+APP_DIR = Path(__file__).resolve().parents[2] / "app"
+
+
+def _compile(query) -> str:
+    return str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestDateWindow:
+    """사용자 시간대 날짜 → DB 시각 반열린 구간"""
+
+    def test_day_window_is_half_open(self):
+        window = day_window(date(2025, 11, 20), tz="Asia/Seoul")
+
+        assert window.start == datetime(2025, 11, 20)
+        assert window.end == datetime(2025, 11, 21)
+        assert datetime(2025, 11, 20, 23, 59, 59) in window
+        assert datetime(2025, 11, 21) not in window
+
+    def test_other_timezone_is_shifted_to_db_time(self):
+        """뉴욕(UTC-5) 하루는 서울(DB) 시각으로 14:00 ~ 다음 날 14:00"""
+        window = day_window(date(2025, 11, 20), tz="America/New_York")
+
+        assert window.start == datetime(2025, 11, 20, 14)
+        assert window.end == datetime(2025, 11, 21, 14)
+
+    def test_to_local_date_matches_window(self):
+        consumed_at = datetime(2025, 11, 21, 9, 30)  # 서울 아침 = 뉴욕 전날 밤
+
+        assert to_local_date(consumed_at, tz="Asia/Seoul") == date(2025, 11, 21)
+        assert to_local_date(consumed_at, tz="America/New_York") == date(2025, 11, 20)
+        assert consumed_at in day_window(date(2025, 11, 20), tz="America/New_York")
+
+
+class TestSargableQueries:
+    """대시보드 쿼리가 컬럼에 함수를 씌우지 않는지"""
+
+    def test_history_window_query_uses_range_predicates(self):
+        sql = _compile(food_history_window_query(1, date_range_window(date(2025, 11, 14), date(2025, 11, 20))))
+
+        assert re.search(r"consumed_at >= '2025-11-14 00:00:00'", sql)
+        assert re.search(r"consumed_at < '2025-11-21 00:00:00'", sql)
+        assert "date(" not in sql.lower()
+
+    def test_rollup_query_filters_on_date_key(self):
+        sql = _compile(daily_nutrition_rows_query(1, date(2025, 11, 14), date(2025, 11, 20)))
+
+        assert "`UserDailyNutrition`.user_id = 1" in sql
+        assert "`UserDailyNutrition`.date >= '2025-11-14'" in sql
+        assert "date(" not in sql.lower()
+
+    def test_no_function_wrapped_date_filters_in_app(self):
+        """func.date(...) 필터가 다시 들어오지 않도록 소스 검사"""
+        offenders = [
+            str(path.relative_to(APP_DIR))
+            for path in APP_DIR.rglob("*.py")
+            if path.name != "date_window.py" and "func.date(" in path.read_text(encoding="utf-8")
+        ]
+
+        assert offenders == []
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="TEST_DATABASE_URL(MySQL)이 설정된 경우에만 EXPLAIN 확인",
+)
+class TestQueryPlan:
+    """실제 MySQL EXPLAIN으로 인덱스 range scan 확인"""
+
+    @pytest.mark.asyncio
+    async def test_history_window_query_uses_index(self):
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engine = create_async_engine(os.environ["TEST_DATABASE_URL"])
+        sql = _compile(food_history_window_query(1, day_window(date.today())))
+        try:
+            async with engine.connect() as conn:
+                plan = (await conn.execute(text(f"EXPLAIN {sql}"))).mappings().all()
+        finally:
+            await engine.dispose()
+
+        history_plan = [row for row in plan if row["table"] == "UserFoodHistory"]
+        assert history_plan
+        assert all(row["type"] != "ALL" for row in history_plan)
+        assert history_plan[0]["key"] in ("idx_user_consumed_at", "idx_user_consumed_meal")
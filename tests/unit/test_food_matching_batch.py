@@ -0,0 +1,74 @@
+"""FoodMatchingService 일괄 매칭 단위 테스트"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.db.models_food_nutrients import FoodNutrient
+from app.services.food_matching_service import FoodMatchingService, FoodMatchQuery
+from app.services.food_search_index import FoodSearchIndex, IndexedFood
+
+
+ROWS = [
+    IndexedFood("D101-001", "김밥_참치", "김밥", "김밥류", "참치"),
+    IndexedFood("D101-002", "볶음밥_새우", "볶음밥", "볶음밥류", "새우"),
+]
+
+
+@pytest.fixture
+def search_index(monkeypatch) -> FoodSearchIndex:
+    index = FoodSearchIndex()
+    index.load_rows(ROWS)
+    monkeypatch.setattr(
+        "app.services.food_matching_service.get_food_search_index", lambda: index
+    )
+    return index
+
+
+def _session_returning(rows):
+    """execute() 결과로 rows를 돌려주는 세션 목"""
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session.execute.return_value = result
+    return session
+
+
+class TestMatchFoodsToDb:
+    """match_foods_to_db 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_results_follow_input_order_and_dedupe(self, search_index):
+        """중복 음식은 한 번만 매칭하고 결과는 입력 순서를 따른다"""
+        service = FoodMatchingService()
+        exact = FoodNutrient(food_id="D200-001", nutrient_name="비빔밥")
+        service._exact_name_match_bulk = AsyncMock(return_value={"비빔밥": exact})
+        hydrated = FoodNutrient(food_id="D101-002", nutrient_name="볶음밥_새우")
+        session = _session_returning([hydrated])
+
+        results = await service.match_foods_to_db(
+            session,
+            [
+                FoodMatchQuery("새우 볶음밥", ["새우"]),
+                "비빔밥",
+                FoodMatchQuery("새우 볶음밥", ["새우"]),
+                "없는음식",
+            ],
+        )
+
+        assert results == [hydrated, exact, hydrated, None]
+        names = service._exact_name_match_bulk.await_args.args[1]
+        assert sorted(names) == ["비빔밥", "새우 볶음밥", "없는음식"]
+        # 재료 기반 매칭 결과는 IN 쿼리 1회로 조회
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_exact_name_match_bulk_prefers_nutrient_name(self):
+        """nutrient_name 일치가 representative_food_name 일치보다 우선"""
+        service = FoodMatchingService()
+        by_rep = FoodNutrient(food_id="A", nutrient_name="김밥_참치", representative_food_name="김밥")
+        by_name = FoodNutrient(food_id="B", nutrient_name="김밥", representative_food_name="김밥")
+        session = _session_returning([by_rep, by_name])
+
+        matches = await service._exact_name_match_bulk(session, ["김밥", "김밥"])
+
+        assert matches == {"김밥": by_name}
+        assert session.execute.await_count == 1
@@ -0,0 +1,102 @@
+"""food_nutrients 인메모리 n-gram 색인 단위 테스트"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.food_search_index import INDEXED_COLUMNS, FoodSearchIndex, IndexedFood
+
+
+ROWS = [
+    IndexedFood("D101-003", "국밥_돼지머리", "국밥", "밥류", "돼지머리"),
+    IndexedFood("D101-001", "김밥_참치", "김밥", "김밥류", "참치"),
+    IndexedFood("D101-002", "볶음밥_새우", "볶음밥", "볶음밥류", "새우"),
+    IndexedFood("D102-001", "닭가슴살 샐러드", "샐러드", "샐러드류", "해당없음"),
+    IndexedFood("D103-001", "Pizza_Pepperoni", "피자", "빵 및 과자류", None),
+    IndexedFood("D104-001", None, None, None, None),
+]
+
+
+def _like(row: IndexedFood, term: str, class1_pattern: str = None) -> bool:
+    """LIKE '%term%' 조건을 파이썬으로 재현 (대소문자 무시)"""
+    def contains(value, t):
+        return value is not None and t.lower() in value.lower()
+
+    if not any(contains(getattr(row, column), term) for column in INDEXED_COLUMNS):
+        return False
+    return class1_pattern is None or contains(row.food_class1, class1_pattern)
+
+
+@pytest.fixture
+def index() -> FoodSearchIndex:
+    search_index = FoodSearchIndex()
+    search_index.load_rows(ROWS)
+    return search_index
+
+
+class TestFoodSearchIndex:
+    """FoodSearchIndex 테스트"""
+
+    @pytest.mark.parametrize(
+        "term",
+        ["밥", "김밥", "볶음밥", "돼지머리", "닭가슴살", "샐러드류", "pepperoni", "과자", "없는음식", ""],
+    )
+    def test_search_matches_like_semantics(self, index, term):
+        """색인 검색 결과가 LIKE 조건과 동일한지 확인"""
+        expected = sorted(row.food_id for row in ROWS if _like(row, term))
+        actual = [row.food_id for row in index.search(term, limit=100)]
+
+        assert actual == expected
+
+    def test_search_with_class1_pattern(self, index):
+        """food_class1 힌트 조건이 AND로 적용되는지 확인"""
+        actual = [row.food_id for row in index.search("밥", class1_pattern="볶음", limit=100)]
+
+        assert actual == ["D101-002"]
+
+    def test_search_respects_limit_in_pk_order(self, index):
+        """LIMIT은 PK 순서 기준으로 적용"""
+        actual = [row.food_id for row in index.search("밥", limit=2)]
+
+        assert actual == ["D101-001", "D101-002"]
+
+    def test_long_term_requires_full_substring(self, index):
+        """3-gram은 모두 포함하지만 연속 부분 문자열이 아니면 제외"""
+        search_index = FoodSearchIndex()
+        search_index.load_rows([IndexedFood("X1", "가나다라_나다라마", None, None, None)])
+
+        assert search_index.search("가나다라마") == []
+        assert [row.food_id for row in search_index.search("나다라마")] == ["X1"]
+
+    def test_invalidate_keeps_serving_old_index(self, index):
+        """invalidate는 버전 재확인만 표시하고 기존 색인은 그대로 검색에 쓴다"""
+        index.invalidate()
+
+        assert index.is_loaded
+        assert len(index) == len(ROWS)
+        assert not index._fresh()
+
+
+class TestEnsureLoaded:
+    """ensure_loaded 버전 확인/재구성 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_only_when_version_changes(self, monkeypatch):
+        fetch = AsyncMock(side_effect=[ROWS[:2], ROWS])
+        version = AsyncMock(side_effect=["2:D101-002", "2:D101-002", "6:D104-001"])
+        monkeypatch.setattr("app.services.food_search_index.fetch_indexed_foods", fetch)
+        monkeypatch.setattr("app.services.food_search_index.fetch_food_nutrients_version", version)
+        search_index = FoodSearchIndex(check_interval_seconds=3600)
+        session = MagicMock()
+
+        assert await search_index.ensure_loaded(session)
+        assert await search_index.ensure_loaded(session)  # 확인 주기 안에서는 쿼리 없음
+        assert version.await_count == 1 and len(search_index) == 2
+
+        search_index._checked_at = float("-inf")  # 확인 주기 경과
+        assert await search_index.ensure_loaded(session)
+        assert fetch.await_count == 1  # 버전이 같으면 재사용
+
+        search_index.invalidate()  # food_nutrients 변경 commit 직후
+        assert await search_index.ensure_loaded(session)
+        assert fetch.await_count == 2 and len(search_index) == len(ROWS)
+        assert search_index.version == "6:D104-001"
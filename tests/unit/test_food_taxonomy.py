@@ -0,0 +1,73 @@
+"""food_nutrients 분류 트리 단위 테스트"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.food_search_index import IndexedFood
+from app.services.food_taxonomy import FoodTaxonomy, FoodTaxonomyCache
+
+
+ROWS = [
+    IndexedFood("D1", "피자_페퍼로니 피자", "피자", "빵 및 과자류", None),
+    IndexedFood("D2", "피자_마르게리타 피자", "피자", "빵 및 과자류", None),
+    IndexedFood("D3", "피자_치즈 페퍼로니", "피자", "빵 및 과자류", None),
+    IndexedFood("D4", "케이크_치즈케이크", "케이크", "빵 및 과자류", None),
+    IndexedFood("D5", "쌀밥", None, "밥류", None),
+    IndexedFood("D6", "레시피", "레시피", None, None),
+]
+
+
+def _legacy_prioritize(items, texts, keywords):
+    """기존 vision 파이프라인의 키워드 우선 정렬 (O(n·k) + not in)"""
+    priority = []
+    for keyword in keywords:
+        for item, text in zip(items, texts):
+            if keyword in text and item not in priority:
+                priority.append(item)
+    return priority + [item for item in items if item not in priority]
+
+
+class TestFoodTaxonomy:
+    """FoodTaxonomy 테스트"""
+
+    def test_tree_matches_distinct_queries(self):
+        taxonomy = FoodTaxonomy(ROWS, version="6:D6")
+
+        assert taxonomy.food_classes == ["밥류", "빵 및 과자류"]
+        assert list(taxonomy.representative_names("빵 및 과자류").items) == ["케이크", "피자"]
+        assert len(taxonomy.representative_names("밥류")) == 0
+        assert [f.food_id for f in taxonomy.foods("빵 및 과자류", "피자").items] == ["D1", "D2", "D3"]
+        assert len(taxonomy.foods("밥류", "없음")) == 0
+
+    @pytest.mark.parametrize("keywords", [[], ["치즈"], ["치즈", "페퍼로니"], ["페퍼로니", "치즈"], ["없음"]])
+    def test_keyword_order_matches_legacy(self, keywords):
+        foods = FoodTaxonomy(ROWS, version="v").foods("빵 및 과자류", "피자")
+
+        ordered, matched = foods.ordered(keywords)
+
+        expected = _legacy_prioritize(list(foods.items), list(foods.texts), keywords)
+        assert ordered == expected
+        assert matched == sum(1 for f in foods.items if any(k in f.nutrient_name for k in keywords))
+
+
+class TestFoodTaxonomyCache:
+    """FoodTaxonomyCache 버전 확인/재구성 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_only_when_version_changes(self, monkeypatch):
+        fetch = AsyncMock(return_value=ROWS)
+        monkeypatch.setattr("app.services.food_taxonomy.fetch_indexed_foods", fetch)
+        cache = FoodTaxonomyCache(check_interval_seconds=3600)
+        cache._fetch_version = AsyncMock(side_effect=["6:D6", "6:D6", "7:D7"])
+        session = MagicMock()
+
+        first = await cache.get(session)
+        assert await cache.get(session) is first  # 확인 주기 안에서는 쿼리 없음
+        assert cache._fetch_version.await_count == 1
+
+        cache.invalidate()
+        assert await cache.get(session) is first  # 버전이 같으면 재사용
+        cache.invalidate()
+        rebuilt = await cache.get(session)
+
+        assert rebuilt is not first and rebuilt.version == "7:D7"
+        assert fetch.await_count == 2
@@ -0,0 +1,148 @@
+"""NRF9.3 / 한국식 점수 배치 계산 단위 테스트 (기존 공식과 일치 확인)"""
+import numpy as np
+import pytest
+
+from app.services.health_score_service import (
+    NRF93_DAILY_VALUES,
+    NRF93_NUTRIENTS,
+    calculate_food_grade,
+    calculate_korean_nutrition_score,
+    calculate_nrf93_score,
+    food_grades,
+    korean_nutrition_scores,
+    nrf93_inputs_from_matrix,
+    nrf93_scores,
+)
+from app.services.nutrient_matrix import NUTRIENT_COLUMNS, NutrientMatrix
+
+
+def _reference_nrf93(values, reference_value_g):
+    """배치화 이전 calculate_nrf93_score 공식 (단건, 파이썬 스칼라)"""
+    scale = 100.0 / reference_value_g
+    percents = [
+        min((value * scale / NRF93_DAILY_VALUES[name]) * 100, 100)
+        for name, value in zip(NRF93_NUTRIENTS, values)
+    ]
+    positive_nutrients, negative_nutrients = percents[:9], percents[9:]
+    available_negative = [n for n in negative_nutrients if n > 0]
+    protein_score, fiber_score = positive_nutrients[0], positive_nutrients[1]
+    protein_points = min(60, protein_score * 0.6) if protein_score > 0 else 0
+    fiber_points = min(40, fiber_score * 0.4) if fiber_score > 0 else 0
+    base_score = protein_points + fiber_points
+    available_other = [n for n in positive_nutrients[2:] if n > 0]
+    if available_other:
+        other_avg = sum(available_other) / len(available_other)
+        other_score = min(50, other_avg * (len(available_other) / 7.0) * 0.5)
+    else:
+        other_score = 0
+    positive_score = min(100, base_score + other_score)
+    negative_score = sum(available_negative) / len(available_negative) if available_negative else 0
+    raw_score = positive_score - (negative_score * 0.15)
+    vitamin_bonus = 0
+    if available_other:
+        vitamin_avg = sum(available_other) / len(available_other)
+        vitamin_bonus = min(30, vitamin_avg * len(available_other) / 7.0 * 0.35)
+    if base_score >= 50:
+        final_score = max(80, min(100, raw_score + vitamin_bonus))
+    elif base_score >= 30:
+        final_score = max(70, min(100, raw_score + vitamin_bonus))
+    elif fiber_score >= 20 or len(available_other) >= 4:
+        final_score = max(80, min(100, raw_score + vitamin_bonus))
+    elif fiber_score >= 15 or len(available_other) >= 3:
+        final_score = max(75, min(100, raw_score + vitamin_bonus))
+    elif base_score > 0:
+        final_score = max(60, min(100, raw_score + vitamin_bonus))
+    else:
+        final_score = max(0, min(100, raw_score + vitamin_bonus))
+    if protein_score >= 30:
+        final_score = min(100, final_score + min(20, protein_score / 2.5))
+    final_score = max(0, min(100, final_score))
+    return round(positive_score, 2), round(negative_score, 2), round(final_score, 2)
+
+
+def _random_foods(count, seed=7):
+    """영양소 일부가 0인 임의 음식 (실제 데이터처럼 결측이 섞이도록)"""
+    rng = np.random.default_rng(seed)
+    daily_values = np.array([NRF93_DAILY_VALUES[name] for name in NRF93_NUTRIENTS])
+    values = rng.uniform(0, 0.8, size=(count, len(NRF93_NUTRIENTS))) * daily_values
+    values[rng.random(values.shape) < 0.35] = 0.0
+    references = rng.choice([50.0, 100.0, 250.0, 400.0], size=count)
+    return values, references
+
+
+class TestNrf93Batch:
+    """NRF9.3 배치 계산"""
+
+    def test_matches_reference_formula(self):
+        values, references = _random_foods(500)
+
+        scores = nrf93_scores(values, references)
+
+        for i in range(len(values)):
+            expected = _reference_nrf93(values[i].tolist(), float(references[i]))
+            result = scores.to_dict(i)
+            assert (result["positive_score"], result["negative_score"], result["final_score"]) == expected
+
+    @pytest.mark.asyncio
+    async def test_scalar_wrapper_keeps_result_shape(self):
+        values, references = _random_foods(20, seed=11)
+        batch = nrf93_scores(values, references)
+
+        for i in range(len(values)):
+            kwargs = dict(zip(
+                ["protein_g", "fiber_g", "vitamin_a_ug", "vitamin_c_mg", "vitamin_e_mg", "calcium_mg",
+                 "iron_mg", "potassium_mg", "magnesium_mg", "saturated_fat_g", "added_sugar_g", "sodium_mg"],
+                values[i].tolist(),
+            ))
+            result = await calculate_nrf93_score(**kwargs, reference_value_g=float(references[i]))
+
+            assert result == batch.to_dict(i)
+            assert result["food_grade"] == await calculate_food_grade(int(result["final_score"]))
+            assert set(result["details"]["positive_nutrients"]) == set(NRF93_NUTRIENTS[:9])
+
+    def test_matrix_inputs(self):
+        """영양소 행렬에서 섭취량 기준 입력을 만든다 (비타민E는 0)"""
+        matrix = NutrientMatrix.from_rows([
+            ("D101", *(100.0 if column == "reference_value" else 10.0 if column == "protein" else None
+                       for column in NUTRIENT_COLUMNS)),
+        ])
+
+        values = nrf93_inputs_from_matrix(matrix, ["D101", "UNKNOWN"], [200.0, 100.0])
+
+        assert values[0, NRF93_NUTRIENTS.index("protein")] == pytest.approx(20.0)
+        assert values[0, NRF93_NUTRIENTS.index("vitamin_e")] == 0.0
+        assert not values[1].any()
+
+
+class TestKoreanBatch:
+    """한국식 점수 배치 계산"""
+
+    @pytest.mark.asyncio
+    async def test_matches_scalar(self):
+        rng = np.random.default_rng(3)
+        values = rng.uniform(-5, 60, size=(200, 7))
+
+        scores = korean_nutrition_scores(values)
+
+        for i, row in enumerate(values.tolist()):
+            positive, negative = sum(row[:4]), sum(row[4:])
+            expected_final = int(positive - negative)
+            result = scores.to_dict(i)
+            assert result["positive_score"] == int(positive)
+            assert result["negative_score"] == int(negative)
+            assert result["final_score"] == expected_final
+            assert result["food_grade"] == await calculate_food_grade(expected_final)
+
+    @pytest.mark.asyncio
+    async def test_scalar_wrapper(self):
+        result = await calculate_korean_nutrition_score(40, 20, 15, 30, 5, 2, 1)
+
+        assert result["final_score"] == 97
+        assert result["food_grade"] == "우수한 영양식품"
+
+
+def test_food_grades_boundaries():
+    assert list(food_grades([100, 90, 89.9, 75, 50, 25, 24.9, -3])) == [
+        "우수한 영양식품", "우수한 영양식품", "좋은 영양식품", "좋은 영양식품",
+        "보통 영양식품", "영양개선 필요", "영양소 부족", "영양소 부족",
+    ]
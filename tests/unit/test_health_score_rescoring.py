@@ -0,0 +1,127 @@
+"""health_score 일괄 재계산 단위 테스트"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.commands.rescore_health_scores import Checkpoint, RateLimiter
+from app.services.health_score_rescoring import (
+    METHOD_KOREAN,
+    NRF93_METHOD_LABEL,
+    bulk_update_statement,
+    rescore_chunk_query,
+    rescore_rows,
+    RescoreCursor,
+)
+from app.services.health_score_service import KOREAN_SCORE_CALC_METHOD, nrf93_scores
+
+
+def _row(history_id, calc_method, final_score=0, nutrient=True, **nutrients):
+    values = {f"n_{name}": nutrients.get(name) for name in (
+        "protein", "fiber", "vitamin_a", "vitamin_c", "calcium", "iron", "potassium",
+        "magnesium", "saturated_fat", "added_sugar", "sodium",
+    )}
+    return SimpleNamespace(
+        history_id=history_id, user_id=1, food_id=f"D{history_id}", calc_method=calc_method,
+        positive_score=0, negative_score=0, final_score=final_score, food_grade="영양소 부족",
+        nutrient_food_id=f"D{history_id}" if nutrient else None, reference_value=100.0, **values,
+    )
+
+
+class TestRescoreRows:
+    """청크 배치 재계산"""
+
+    def test_auto_keeps_each_rows_formula(self):
+        rows = [
+            _row(1, "NRF9.3", protein=30.0, fiber=10.0),
+            _row(2, KOREAN_SCORE_CALC_METHOD, protein=40.0, fiber=20.0, calcium=15.0, iron=30.0, sodium=5.0),
+            _row(3, None, protein=10.0),  # 공식을 알 수 없음
+            _row(4, "NRF9.3", nutrient=False),  # food_nutrients에 없음
+        ]
+
+        updates, skipped = rescore_rows(rows, include_nrf93=True)
+
+        assert skipped == 2
+        by_id = {update.history_id: update for update in updates}
+        expected_nrf = nrf93_scores([[30.0, 10.0] + [0.0] * 10]).final_score[0]
+        assert by_id[1].final_score == int(expected_nrf)
+        assert by_id[1].calc_method == "NRF9.3"
+        assert by_id[2].final_score == 100
+        assert by_id[2].food_grade == "우수한 영양식품"
+
+    def test_unchanged_rows_are_not_updated(self):
+        row = _row(1, KOREAN_SCORE_CALC_METHOD, protein=10.0)
+        row.positive_score, row.final_score, row.food_grade = 10, 10, "영양소 부족"
+
+        updates, skipped = rescore_rows([row])
+
+        assert updates == [] and skipped == 0
+
+    def test_noop_run_produces_no_updates(self):
+        """공식이 그대로면 갱신 0건 (food_nutrients로 계산하지 않은 NRF9.3 행은 기본적으로 건너뜀)"""
+        korean = _row(1, KOREAN_SCORE_CALC_METHOD, protein=10.0)
+        korean.positive_score, korean.final_score, korean.food_grade = 10, 10, "영양소 부족"
+        # GPT 추정 영양소로 저장된 점수 (food_nutrients 행으로 계산한 값과 다름)
+        recommended = _row(2, "NRF9.3", final_score=42, protein=30.0, fiber=10.0)
+
+        updates, skipped = rescore_rows([korean, recommended])
+
+        assert updates == []
+        assert skipped == 1
+
+    def test_forced_method_rewrites_calc_method(self):
+        updates, _ = rescore_rows([_row(1, "NRF9.3", protein=10.0)], METHOD_KOREAN)
+
+        assert updates[0].calc_method == KOREAN_SCORE_CALC_METHOD
+        assert updates[0].final_score == 10
+
+
+class TestStatements:
+    """keyset 조회 / bulk UPDATE 문장"""
+
+    def test_chunk_query_is_keyset(self):
+        sql = str(rescore_chunk_query(RescoreCursor(120, "D120"), 500).compile(dialect=mysql.dialect()))
+
+        assert "`UserFoodHistory`.history_id > %s" in sql
+        assert "OFFSET" not in sql.upper()
+        assert "LIMIT %s" in sql
+
+    def test_bulk_update_is_single_statement(self):
+        updates, _ = rescore_rows(
+            [_row(i, "NRF9.3", protein=float(i)) for i in range(1, 4)], include_nrf93=True
+        )
+
+        sql = str(bulk_update_statement(updates).compile(dialect=mysql.dialect()))
+
+        assert sql.startswith("UPDATE health_score SET")
+        assert sql.count("CASE") == 5
+        assert updates[0].calc_method == NRF93_METHOD_LABEL
+
+
+class TestCheckpointAndThrottle:
+    def test_checkpoint_roundtrip(self, tmp_path):
+        path = tmp_path / "checkpoint.json"
+        Checkpoint(history_id=42, food_id="D42", processed=100, updated=7).save(path)
+
+        loaded = Checkpoint.load(path)
+
+        assert loaded.cursor == RescoreCursor(42, "D42")
+        assert (loaded.processed, loaded.updated) == (100, 7)
+        assert Checkpoint.load(tmp_path / "missing.json") is None
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_sleeps_to_cap_throughput(self):
+        now = [0.0]
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(100, clock=lambda: now[0], sleep=fake_sleep)
+
+        await limiter.throttle(50)  # 0.5초 분량을 0초에 처리
+        now[0] += 2.0
+        await limiter.throttle(50)  # 이미 충분히 느림
+
+        assert slept == [pytest.approx(0.5)]
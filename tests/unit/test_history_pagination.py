@@ -0,0 +1,227 @@
+"""식사 기록 keyset 페이지 / 내보내기 단위 테스트"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+from app.api.v1.routes.meals import encode_export_chunk, get_meal_history
+from app.db.models import DietPlan, UserFoodHistory
+from app.services.food_history_service import (
+    count_food_history_capped,
+    food_history_page_query,
+    get_user_food_history_with_details,
+)
+from app.utils.history_cursor import HistoryCursor, InvalidCursorError
+
+BASE = datetime(2025, 11, 20, 12, 0)
+
+
+def _compile(query) -> str:
+    return str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar(self):
+        return self._scalar
+
+
+class FakeSession:
+    """쿼리 대상 테이블에 따라 미리 정한 결과를 돌려주는 가짜 AsyncSession"""
+
+    def __init__(self, history_rows=(), diet_rows=(), scalar=None):
+        self.history_rows = list(history_rows)
+        self.diet_rows = list(diet_rows)
+        self.scalar = scalar
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        limit = statement._limit_clause.value if statement._limit_clause is not None else None
+        if "DietPlanMeal" in _compile(statement) and limit is not None:
+            return _Result(self.diet_rows[:limit])
+        if limit is not None:
+            return _Result(self.history_rows[:limit])
+        return _Result(scalar=self.scalar)
+
+
+def _history(history_id, minutes_ago):
+    history = SimpleNamespace(
+        history_id=history_id, user_id=1, food_id=f"F{history_id}", food_name=f"음식{history_id}",
+        consumed_at=BASE - timedelta(minutes=minutes_ago), portion_size_g=Decimal("150.00"),
+        meal_type="lunch",
+    )
+    score = SimpleNamespace(kcal=300, final_score=50, food_grade="B")
+    return history, score
+
+
+def _diet(meal_id, minutes_ago):
+    meal = SimpleNamespace(
+        meal_id=meal_id, diet_plan_id="plan_1", meal_name="아침", food_description=None,
+        calories=Decimal("400.00"), meal_type="breakfast",
+    )
+    plan = SimpleNamespace(plan_name="고단백 식단", created_at=BASE - timedelta(minutes=minutes_ago))
+    return meal, plan
+
+
+class TestHistoryCursor:
+    """불투명 커서 인코딩"""
+
+    def test_round_trip(self):
+        cursor = HistoryCursor(datetime(2025, 11, 20, 8, 30, 15), 12345)
+
+        token = cursor.encode()
+
+        assert "=" not in token
+        assert HistoryCursor.decode(token) == cursor
+
+    def test_negative_id_for_diet_plan_meal(self):
+        cursor = HistoryCursor(BASE, -7)
+        assert HistoryCursor.decode(cursor.encode()).history_id == -7
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", "eyJ0IjoxfQ", "!!!"])
+    def test_invalid_token(self, token):
+        with pytest.raises(InvalidCursorError):
+            HistoryCursor.decode(token)
+
+
+class TestHistoryPageQuery:
+    """keyset 페이지 쿼리"""
+
+    def test_first_page_has_no_offset(self):
+        query = food_history_page_query(select(UserFoodHistory), None, 20)
+        sql = _compile(query)
+
+        assert "OFFSET" not in sql
+        assert "LIMIT 21" in sql
+        assert 'ORDER BY `UserFoodHistory`.consumed_at DESC, `UserFoodHistory`.history_id DESC' in sql
+
+    def test_cursor_is_range_predicate(self):
+        cursor = HistoryCursor(BASE, 500)
+        sql = _compile(food_history_page_query(select(UserFoodHistory), cursor, 20))
+
+        assert "OFFSET" not in sql
+        assert "`UserFoodHistory`.consumed_at < '2025-11-20 12:00:00'" in sql
+        assert "`UserFoodHistory`.history_id < 500" in sql
+
+    @pytest.mark.asyncio
+    async def test_details_returns_next_cursor_without_count_query(self):
+        rows = [
+            SimpleNamespace(**vars(_history(i, i)[0]), food_class_1=None, food_class_2=None,
+                            category=None, image_ref=None)
+            for i in range(10, 0, -1)
+        ]
+        session = FakeSession(history_rows=rows)
+
+        histories, next_cursor = await get_user_food_history_with_details(session, user_id=1, limit=3)
+
+        assert len(session.statements) == 1
+        assert [h["history_id"] for h in histories] == [10, 9, 8]
+        assert HistoryCursor.decode(next_cursor) == HistoryCursor(histories[-1]["consumed_at"], 8)
+
+    @pytest.mark.asyncio
+    async def test_details_last_page_has_no_cursor(self):
+        rows = [
+            SimpleNamespace(**vars(_history(1, 0)[0]), food_class_1=None, food_class_2=None,
+                            category=None, image_ref=None)
+        ]
+        histories, next_cursor = await get_user_food_history_with_details(FakeSession(rows), 1, limit=3)
+
+        assert len(histories) == 1
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_capped_count(self):
+        session = FakeSession(scalar=10001)
+
+        assert await count_food_history_capped(session, 1, cap=10000) == (10000, True)
+        assert "LIMIT 10001" in _compile(session.statements[0])
+
+
+class TestMealHistoryRoute:
+    """GET /meals/history 페이지 병합"""
+
+    @pytest.mark.asyncio
+    async def test_merges_diet_plans_in_order(self):
+        # 기록: 0, 10, 20분 전 / 추천 식단: 5, 10분 전 (같은 시각이면 기록이 먼저)
+        session = FakeSession(
+            history_rows=[_history(3, 0), _history(2, 10), _history(1, 20)],
+            diet_rows=[_diet(7, 5), _diet(8, 10)],
+        )
+
+        response = await get_meal_history(
+            limit=3, cursor=None, offset=0, include_diet_plans=True, include_count=False,
+            session=session, user_id=1,
+        )
+
+        assert [r.history_id for r in response.data] == [3, -7, 2]
+        assert HistoryCursor.decode(response.next_cursor) == HistoryCursor(BASE - timedelta(minutes=10), 2)
+        # 추천 식단도 페이지 크기만큼만 조회
+        diet_sql = _compile(session.statements[1])
+        assert "LIMIT 4" in diet_sql
+        assert "OFFSET" not in diet_sql
+
+    @pytest.mark.asyncio
+    async def test_cursor_applies_to_diet_plan_query(self):
+        session = FakeSession()
+        cursor = HistoryCursor(BASE, 2).encode()
+
+        response = await get_meal_history(
+            limit=3, cursor=cursor, offset=0, include_diet_plans=True, include_count=False,
+            session=session, user_id=1,
+        )
+
+        assert response.data == []
+        assert response.next_cursor is None
+        assert f"{DietPlan.__tablename__}`.created_at < '2025-11-20 12:00:00'" in _compile(session.statements[1])
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_meal_history(
+                limit=3, cursor="broken", offset=0, include_diet_plans=True, include_count=False,
+                session=FakeSession(), user_id=1,
+            )
+        assert exc_info.value.status_code == 400
+
+
+class TestHistoryExport:
+    """내보내기 청크 인코딩"""
+
+    def _rows(self):
+        return [
+            SimpleNamespace(
+                history_id=1, consumed_at=BASE, meal_type="lunch", food_id="F1", food_name="김치, 찌개",
+                portion_size_g=Decimal("150.50"), kcal=300, final_score=None, food_grade=None,
+            )
+        ]
+
+    def test_ndjson(self):
+        chunk = encode_export_chunk(self._rows(), "ndjson")
+
+        record = json.loads(chunk.splitlines()[0])
+        assert chunk.endswith("\n")
+        assert record["consumed_at"] == "2025-11-20T12:00:00"
+        assert record["portion_size_g"] == 150.5
+        assert record["calories"] == 300
+        assert record["health_score"] is None
+
+    def test_csv_quotes_values(self):
+        chunk = encode_export_chunk(self._rows(), "csv")
+
+        row = next(csv.reader(io.StringIO(chunk)))
+        assert row[4] == "김치, 찌개"
+        assert row[5] == "150.5"
@@ -0,0 +1,104 @@
+"""식재료 집합 단위 저장 (/ingredients/save) 단위 테스트"""
+from datetime import datetime
+from itertools import count
+
+import pytest
+from sqlalchemy.sql import Insert, Select, Update
+
+from app.api.v1.routes.ingredients import save_ingredients
+from app.api.v1.schemas.ingredient import IngredientItem, SaveIngredientsRequest
+from app.db.models import UserIngredient
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+
+class FakeSession:
+    """UserIngredient 행을 메모리에 두고 실행된 문장을 기록하는 가짜 AsyncSession"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self._ids = count(100)
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        params = statement.compile().construct_params()
+        if isinstance(statement, Update):
+            ids = set(next(value for key, value in params.items() if key.startswith("ingredient_id")))
+            for row in self.rows:
+                if row.ingredient_id in ids:
+                    row.is_used = False
+            return _Result([])
+        if isinstance(statement, Insert):
+            names = [value for key, value in params.items() if key.startswith("ingredient_name")]
+            for name in names:
+                self.rows.append(UserIngredient(
+                    ingredient_id=next(self._ids), user_id=1, ingredient_name=name,
+                    created_at=datetime(2025, 11, 20), is_used=False,
+                ))
+            return _Result([])
+        names = set(next(value for key, value in params.items() if key.startswith("ingredient_name")))
+        return _Result([row for row in self.rows if row.ingredient_name in names])
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def _ingredient(ingredient_id, name, is_used):
+    return UserIngredient(
+        ingredient_id=ingredient_id, user_id=1, ingredient_name=name,
+        created_at=datetime(2025, 11, 1), is_used=is_used,
+    )
+
+
+class TestSaveIngredients:
+    """재활용 / 추가 / 스킵을 집합 단위 쿼리로 처리"""
+
+    @pytest.mark.asyncio
+    async def test_recycle_add_and_skip_in_constant_statements(self):
+        session = FakeSession([_ingredient(1, "양파", is_used=True), _ingredient(2, "당근", is_used=False)])
+        names = ["양파", "당근", "감자", "대파", "감자"]
+
+        response = await save_ingredients(
+            SaveIngredientsRequest(ingredients=[IngredientItem(name=name) for name in names]),
+            session=session,
+            user_id=1,
+        )
+
+        # 기존 행 조회, 재활용 UPDATE, 신규 INSERT, 신규 행 조회
+        kinds = [Select, Update, Insert, Select]
+        assert len(session.statements) == len(kinds)
+        assert all(isinstance(statement, kind) for statement, kind in zip(session.statements, kinds))
+
+        data = response.data
+        assert data.saved_count == 5
+        assert [item.ingredient_name for item in data.ingredients] == names
+        assert [item.ingredient_id for item in data.ingredients][:2] == [1, 2]
+        assert data.ingredients[2].ingredient_id == data.ingredients[4].ingredient_id
+        assert all(item.is_used is False for item in data.ingredients)
+
+    @pytest.mark.asyncio
+    async def test_all_existing_unused_only_reads(self):
+        """모두 보유 중이면 조회 한 번으로 끝난다"""
+        session = FakeSession([_ingredient(1, "양파", is_used=False)])
+
+        response = await save_ingredients(
+            SaveIngredientsRequest(ingredients=[IngredientItem(name="양파")]),
+            session=session,
+            user_id=1,
+        )
+
+        assert len(session.statements) == 1
+        assert response.data.ingredients[0].ingredient_id == 1
@@ -0,0 +1,241 @@
+"""백그라운드 작업 큐 / 워커 단위 테스트"""
+import asyncio
+import time
+
+import pytest
+
+from app.workers.queue import InMemoryJobQueue, Job, RedisJobQueue
+from app.workers.worker import Worker, retry_delay
+
+
+class FakeRedis:
+    """RedisJobQueue가 쓰는 명령만 흉내 낸 메모리 구현"""
+
+    def __init__(self):
+        self.lists = {}
+        self.zsets = {}
+        self.strings = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def delete(self, key):
+        return int(self.strings.pop(key, None) is not None)
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def lmove(self, source, destination, src, dest):
+        items = self.lists.get(source) or []
+        if not items:
+            return None
+        value = items.pop(0 if src == "LEFT" else -1)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0, value) if dest == "LEFT" else target.append(value)
+        return value
+
+    async def blmove(self, source, destination, timeout, src, dest):
+        return await self.lmove(source, destination, src, dest)
+
+    async def lrem(self, key, count, value):
+        items = self.lists.get(key) or []
+        if value in items:
+            items.remove(value)
+            return 1
+        return 0
+
+    async def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1]
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None):
+        members = sorted((score, member) for member, score in self.zsets.get(key, {}).items() if score <= high)
+        return [member for _, member in members][start:start + num if num else None]
+
+    async def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+
+async def _run_until(worker: Worker, done, timeout: float = 2.0) -> None:
+    """done()이 참이 될 때까지 워커 실행"""
+    worker.start()
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+
+class TestInMemoryWorker:
+    """프로세스 내 큐 + 워커"""
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_then_succeeds(self):
+        calls = []
+
+        async def flaky(payload):
+            calls.append(time.monotonic())
+            if len(calls) < 3:
+                raise RuntimeError("일시 오류")
+
+        queue = InMemoryJobQueue()
+        worker = Worker(queue, {"flaky": flaky}, retry_base_seconds=0.02, poll_seconds=0.01)
+        await queue.enqueue(Job(name="flaky", payload={}, max_attempts=3))
+
+        await _run_until(worker, lambda: len(calls) == 3 and not worker._running)
+
+        assert len(calls) == 3
+        assert calls[2] - calls[1] >= calls[1] - calls[0]  # 대기 시간이 늘어난다
+        assert not queue.dead_letters
+
+    @pytest.mark.asyncio
+    async def test_dead_letter_after_max_attempts(self):
+        async def broken(payload):
+            raise ValueError("항상 실패")
+
+        queue = InMemoryJobQueue()
+        worker = Worker(queue, {"broken": broken}, retry_base_seconds=0.01, poll_seconds=0.01)
+        await queue.enqueue(Job(name="broken", payload={"x": 1}, max_attempts=2))
+        await queue.enqueue(Job(name="unknown", payload={}))
+
+        await _run_until(worker, lambda: len(queue.dead_letters) == 2)
+
+        dead = {job.name: job for job in queue.dead_letters}
+        assert dead["broken"].attempts == 2
+        assert dead["broken"].last_error == "ValueError: 항상 실패"
+        assert dead["unknown"].attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        running = 0
+        peak = 0
+        finished = []
+
+        async def slow(payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            finished.append(payload)
+
+        queue = InMemoryJobQueue()
+        worker = Worker(queue, {"slow": slow}, concurrency=2, poll_seconds=0.01)
+        for _ in range(6):
+            await queue.enqueue(Job(name="slow", payload={}))
+
+        await _run_until(worker, lambda: len(finished) == 6)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_queued_once_until_started(self):
+        queue = InMemoryJobQueue()
+
+        assert await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+        assert not await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+
+        await queue.dequeue(timeout=0.1)
+        # 실행이 시작된 뒤 들어온 요청은 다시 받는다
+        assert await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+
+    @pytest.mark.asyncio
+    async def test_same_key_runs_one_at_a_time(self):
+        queue = InMemoryJobQueue()
+        await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+        first = await queue.dequeue(timeout=0.1)
+        await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+
+        # 앞 작업이 끝나기 전에는 꺼내지 않고 미룬다
+        assert await queue.dequeue(timeout=0.1) is None
+        assert not await queue.enqueue(Job(name="chat.summarize", payload={}, key="s1"))
+
+        await queue.ack(first)
+        assert (await queue.dequeue(timeout=2.0)).key == "s1"
+
+    def test_retry_delay_is_capped(self):
+        assert [retry_delay(n, 2.0, 10.0) for n in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 10.0]
+
+
+class TestRedisJobQueue:
+    """Redis 리스트 큐"""
+
+    @pytest.mark.asyncio
+    async def test_fifo_ack_and_dedup(self):
+        redis = FakeRedis()
+        queue = RedisJobQueue(redis, prefix="t")
+
+        assert await queue.enqueue(Job(name="a", payload={"n": 1}, key="k"))
+        assert not await queue.enqueue(Job(name="a", payload={"n": 2}, key="k"))
+        await queue.enqueue(Job(name="b", payload={"n": 3}))
+
+        first = await queue.dequeue(timeout=0)
+        assert (first.name, first.payload) == ("a", {"n": 1})
+        assert redis.lists["t:processing"]
+        assert "t:pending:k" not in redis.strings
+
+        await queue.ack(first)
+        second = await queue.dequeue(timeout=0)
+        await queue.ack(second)
+        assert second.name == "b"
+        assert redis.lists["t:processing"] == []
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_deferred_until_ack(self):
+        redis = FakeRedis()
+        queue = RedisJobQueue(redis, prefix="t")
+        await queue.enqueue(Job(name="a", payload={}, key="k"))
+        first = await queue.dequeue(timeout=0)
+        assert redis.strings["t:running:k"] == first.id
+
+        await queue.enqueue(Job(name="a", payload={}, key="k"))
+        assert await RedisJobQueue(redis, prefix="t").dequeue(timeout=0) is None
+        assert len(redis.zsets["t:delayed"]) == 1
+        assert "t:pending:k" in redis.strings
+
+        await queue.ack(first)
+        assert "t:running:k" not in redis.strings
+        redis.zsets["t:delayed"] = {raw: 0 for raw in redis.zsets["t:delayed"]}
+        second = await queue.dequeue(timeout=0)
+        assert second.id != first.id
+        assert redis.strings["t:running:k"] == second.id
+
+    @pytest.mark.asyncio
+    async def test_retry_is_delayed_and_dead_letter_kept(self):
+        redis = FakeRedis()
+        queue = RedisJobQueue(redis, prefix="t", dead_letter_limit=1)
+        await queue.enqueue(Job(name="a", payload={}))
+
+        job = await queue.dequeue(timeout=0)
+        job.attempts = 1
+        await queue.retry(job, delay_seconds=60)
+        assert await queue.dequeue(timeout=0) is None  # 아직 실행 시각 전
+
+        redis.zsets["t:delayed"] = {raw: 0 for raw in redis.zsets["t:delayed"]}
+        retried = await queue.dequeue(timeout=0)
+        assert (retried.id, retried.attempts) == (job.id, 1)
+
+        await queue.dead_letter(retried)
+        await queue.dead_letter(Job(name="old", payload={}))
+        assert len(redis.lists["t:dead"]) == 1
+        assert redis.lists["t:processing"] == []
+
+    @pytest.mark.asyncio
+    async def test_requeue_processing(self):
+        redis = FakeRedis()
+        queue = RedisJobQueue(redis, prefix="t")
+        await queue.enqueue(Job(name="a", payload={}))
+        await queue.dequeue(timeout=0)  # 처리 도중 워커 종료
+
+        assert await queue.requeue_processing() == 1
+        assert (await RedisJobQueue(redis, prefix="t").dequeue(timeout=0)).name == "a"
@@ -0,0 +1,136 @@
+"""LLM 게이트웨이 단위 테스트"""
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.services.llm_gateway import LLMGateway
+
+
+class FakeChatModel:
+    """ChatOpenAI 대신 쓰는 목 (호출 횟수 기록)"""
+
+    model_name = "gpt-4o-mini"
+    max_tokens = None
+
+    def __init__(self, fail: bool = False, temperature: float = 0, json_mode: bool = False, replies=None):
+        self.calls = 0
+        self.fail = fail
+        self.temperature = temperature
+        self.model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        self.replies = list(replies or [])
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream error")
+        if self.replies:
+            return AIMessage(content=self.replies.pop(0))
+        return AIMessage(content=f"응답 {self.calls}: {messages[-1].content}")
+
+
+def _accept(content: str) -> str:
+    return content
+
+
+def _messages(text: str = "김치찌개 1인분 칼로리"):
+    return [SystemMessage(content="영양 전문가"), HumanMessage(content=text)]
+
+
+class TestLLMGateway:
+    """응답 캐시 / 지표 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_cached_call_site_skips_upstream(self):
+        """TTL이 있는 호출 지점은 같은 프롬프트를 한 번만 upstream으로 보낸다"""
+        gateway = LLMGateway(ttl_overrides={"test.cached": 60})
+        llm = FakeChatModel()
+
+        first = await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+        second = await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+        other = await gateway.ainvoke(llm, _messages("된장찌개"), call_site="test.cached", validate=_accept)
+
+        assert llm.calls == 2
+        assert first.content == second.content
+        assert other.content != first.content
+
+        stats = gateway.stats()["call_sites"]["test.cached"]
+        assert stats["calls"] == 3
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unlisted_call_site_is_not_cached(self):
+        """TTL 정책이 없는 호출 지점은 매번 upstream 호출"""
+        gateway = LLMGateway()
+        llm = FakeChatModel()
+
+        await gateway.ainvoke(llm, _messages(), call_site="test.uncached")
+        await gateway.ainvoke(llm, _messages(), call_site="test.uncached")
+
+        assert llm.calls == 2
+        assert gateway.stats()["call_sites"]["test.uncached"]["cache_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self):
+        """cache_enabled=False면 정책이 있어도 캐시하지 않는다"""
+        gateway = LLMGateway(cache_enabled=False, ttl_overrides={"test.cached": 60})
+        llm = FakeChatModel()
+
+        await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+        await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+
+        assert llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_nonzero_temperature_is_not_cached(self):
+        """temperature > 0 호출은 정책이 있어도 캐시하지 않는다"""
+        gateway = LLMGateway(ttl_overrides={"test.cached": 60})
+        llm = FakeChatModel(temperature=0.3)
+
+        await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+        await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+
+        assert llm.calls == 2
+        assert gateway.stats()["cached_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_response_is_not_cached(self):
+        """검증을 통과하지 못한 응답은 저장하지 않고 다음 호출에서 다시 요청한다"""
+        gateway = LLMGateway(ttl_overrides={"test.cached": 60})
+        llm = FakeChatModel(replies=["weight_g: 210", '{"weight_g": 210}'])
+
+        first = await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=json.loads)
+        second = await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=json.loads)
+        third = await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=json.loads)
+
+        assert first.content == "weight_g: 210"
+        assert second.content == third.content == '{"weight_g": 210}'
+        assert llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_without_validator_only_json_mode_is_cached(self):
+        """검증 함수가 없으면 JSON 모드 모델만 (JSON 파싱 검증 후) 캐시한다"""
+        gateway = LLMGateway(ttl_overrides={"test.cached": 60})
+        text_llm = FakeChatModel()
+        json_llm = FakeChatModel(json_mode=True, replies=['{"ok": true}'])
+
+        await gateway.ainvoke(text_llm, _messages(), call_site="test.cached")
+        await gateway.ainvoke(text_llm, _messages(), call_site="test.cached")
+        await gateway.ainvoke(json_llm, _messages(), call_site="test.cached")
+        await gateway.ainvoke(json_llm, _messages(), call_site="test.cached")
+
+        assert text_llm.calls == 2
+        assert json_llm.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted_and_not_cached(self):
+        """upstream 오류는 그대로 전파되고 오류 수에 집계된다"""
+        gateway = LLMGateway(ttl_overrides={"test.cached": 60})
+        llm = FakeChatModel(fail=True)
+
+        with pytest.raises(RuntimeError):
+            await gateway.ainvoke(llm, _messages(), call_site="test.cached", validate=_accept)
+
+        assert gateway.stats()["call_sites"]["test.cached"]["errors"] == 1
+        assert gateway.stats()["cached_entries"] == 0
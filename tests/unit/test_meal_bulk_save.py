@@ -0,0 +1,145 @@
+"""음식 기록 일괄 저장 경로 단위 테스트"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.sql import Insert, Select
+
+from app.api.v1.routes.meals import FoodItem, SaveMealRequest, save_meal_records
+from app.db.models import UserDailyNutrition, UserFoodHistory
+from app.services.food_history_service import bulk_create_food_history
+from app.services.health_score_service import (
+    calculate_korean_nutrition_score,
+    calculate_korean_nutrition_scores,
+)
+
+
+class _Result:
+    def __init__(self, rows=(), lastrowid=None):
+        self._rows = list(rows)
+        self.lastrowid = lastrowid
+
+    def scalars(self):
+        return SimpleNamespace(all=lambda: list(self._rows))
+
+
+class FakeSession:
+    """실행된 문장을 기록하는 가짜 AsyncSession (UserFoodHistory ID는 101부터)"""
+
+    def __init__(self, nutrients):
+        self.nutrients = nutrients
+        self.statements = []
+        self.inserted = {}
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if isinstance(statement, Insert):
+            table = statement.table.name
+            self.inserted[table] = statement.compile().construct_params()
+            count = sum(1 for key in self.inserted[table] if key.startswith("user_id"))
+            self.inserted[table + "_rows"] = count
+            return _Result(lastrowid=101)
+        entity = statement.column_descriptions[0]["entity"]
+        if entity is UserFoodHistory:
+            return _Result(range(101, 101 + self.inserted["UserFoodHistory_rows"]))
+        if entity is UserDailyNutrition:
+            return _Result()
+        return _Result(self.nutrients)
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def delete(self, row):
+        pass
+
+
+def _nutrient(food_id):
+    return SimpleNamespace(
+        food_id=food_id, reference_value=100.0, protein=20.0, fiber=5.0, calcium=10.0,
+        iron=5.0, sodium=15.0, added_sugar=3.0, saturated_fat=2.0, carb=0.0, fat=0.0,
+        vitamin_a=0.0, vitamin_c=0.0, potassium=0.0, magnesium=0.0,
+    )
+
+
+class TestSaveMealRecordsBulk:
+    """save_meal_records 일괄 저장"""
+
+    @pytest.mark.asyncio
+    async def test_ten_foods_use_constant_statement_count(self):
+        """음식 10개도 문장 수는 고정 (음식당 반복 쿼리 없음)"""
+        foods = [
+            FoodItem(food_id=f"F{i}", food_name=f"음식{i}", portion_size_g=100, calories=200)
+            for i in range(10)
+        ]
+        # 마지막 음식은 food_nutrients에 없음 → 점수 없음
+        session = FakeSession([_nutrient(f"F{i}") for i in range(9)])
+
+        response = await save_meal_records(
+            SaveMealRequest(meal_type="점심", foods=foods), session=session, user_id=1
+        )
+
+        # 영양소 IN 조회, 기록 INSERT, ID 조회, 점수 INSERT, 집계 행 INSERT, 집계 행 잠금 SELECT
+        assert len(session.statements) == 6
+        assert session.inserted["UserFoodHistory_rows"] == 10
+        assert session.inserted["health_score_rows"] == 9
+
+        records = response.data
+        assert [record.history_id for record in records] == list(range(101, 111))
+        assert records[0].health_score == 20  # (20+5+10+5) - (15+3+2)
+        assert records[0].food_grade == "영양소 부족"
+        assert records[-1].health_score is None
+
+
+class TestBulkCreateFoodHistory:
+    """bulk_create_food_history ID 조회 조건"""
+
+    @pytest.mark.asyncio
+    async def test_id_lookup_uses_lastrowid_range_not_consumed_at(self):
+        """ID 재조회는 lastrowid 구간 + user_id로만 찾는다 (초 단위로 저장되는 consumed_at 제외)"""
+        session = FakeSession([])
+        histories = [
+            UserFoodHistory(user_id=7, food_id=f"F{i}", food_name=f"음식{i}", portion_size_g=100)
+            for i in range(3)
+        ]
+
+        saved = await bulk_create_food_history(session, histories)
+
+        select_statement = session.statements[1]
+        assert isinstance(select_statement, Select)
+        compiled = select_statement.compile()
+        where_sql = str(select_statement.whereclause.compile())
+        assert "BETWEEN" in where_sql
+        assert "consumed_at" not in where_sql
+        scalar_params = [value for value in compiled.params.values() if isinstance(value, int)]
+        list_params = [list(value) for value in compiled.params.values() if not isinstance(value, int)]
+        assert sorted(scalar_params) == [101, 103]
+        assert list_params == [[7]]
+
+        assert [history.history_id for history in saved] == [101, 102, 103]
+        assert all(history.consumed_at.microsecond == 0 for history in saved)
+        assert all(isinstance(history.consumed_at, datetime) for history in saved)
+
+
+class TestKoreanScoreBatch:
+    """배치 계산은 기존 단건 계산과 같은 결과"""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_scalar(self):
+        rows = [
+            {"protein": 40.5, "fiber": 20, "calcium": 15, "iron": 30, "sodium": 5, "sugar": 2, "saturated_fat": 1},
+            {"protein": 1, "fiber": 0, "calcium": 0, "iron": 0, "sodium": 60, "sugar": 30, "saturated_fat": 20},
+            {"protein": None, "fiber": None, "calcium": None, "iron": None, "sodium": None, "sugar": None, "saturated_fat": None},
+        ]
+
+        batch = calculate_korean_nutrition_scores(rows)
+
+        for row, result in zip(rows, batch):
+            scalar = await calculate_korean_nutrition_score(**{key: value or 0 for key, value in row.items()})
+            assert result == scalar
+        assert batch[0]["food_grade"] == "우수한 영양식품"
@@ -0,0 +1,71 @@
+"""food_nutrients 영양소 행렬 단위 테스트"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.daily_nutrition_service import ROLLUP_NUTRIENTS, meal_contribution
+from app.services.nutrient_matrix import NUTRIENT_COLUMNS, NutrientMatrix
+
+
+def _row(food_id, **values):
+    return (food_id, *(values.get(column) for column in NUTRIENT_COLUMNS))
+
+
+@pytest.fixture
+def matrix():
+    return NutrientMatrix.from_rows(
+        [
+            _row("D101", reference_value=100.0, kcal=150.0, protein=10.0, sodium=400.0, carb=20.0),
+            _row("D102", reference_value=200.0, kcal=300.0, protein=4.0, fat=12.5),
+            _row("D103", protein=1.0),  # 기준량 없음 → 100g
+        ],
+        version="3:D103",
+    )
+
+
+class TestNutrientMatrix:
+    """행 gather / 섭취량 환산 / 가중 합산"""
+
+    def test_nulls_and_unknown_ids_are_nan(self, matrix):
+        vectors = matrix.get_vectors(["D102", "UNKNOWN"], ["protein", "sodium"])
+
+        assert vectors.dtype == np.float32
+        assert vectors[0, 0] == pytest.approx(4.0)
+        assert np.isnan(vectors[0, 1])
+        assert np.isnan(vectors[1]).all()
+        assert matrix.missing(["D101", "UNKNOWN"]) == ["UNKNOWN"]
+
+    def test_scale_matches_meal_contribution(self, matrix):
+        """섭취량 환산은 일별 집계의 meal_contribution과 같다"""
+        food_ids = ["D101", "D102", "D103", "UNKNOWN"]
+        portions = [250.0, 100.0, None, 50.0]
+
+        scaled = matrix.scale(food_ids, portions, ROLLUP_NUTRIENTS)
+
+        for i, (food_id, portion) in enumerate(zip(food_ids, portions)):
+            nutrient = None
+            if food_id in matrix:
+                values = matrix.get_vectors([food_id])[0]
+                nutrient = SimpleNamespace(**{
+                    column: None if np.isnan(value) else float(value)
+                    for column, value in zip(NUTRIENT_COLUMNS, values)
+                })
+            expected = meal_contribution(food_id, portion, None, None, nutrient).nutrients
+            assert scaled[i] == pytest.approx([expected[name] for name in ROLLUP_NUTRIENTS])
+
+    def test_combine_is_weighted_sum(self, matrix):
+        totals = matrix.combine(["D101", "D102", "D101"], [0.5, 0.25, 1.0], ["protein", "fat", "kcal"])
+
+        assert totals == {
+            "protein": pytest.approx(10.0 * 1.5 + 4.0 * 0.25),
+            "fat": pytest.approx(12.5 * 0.25),
+            "kcal": pytest.approx(150.0 * 1.5 + 300.0 * 0.25),
+        }
+
+    def test_empty_snapshot(self):
+        empty = NutrientMatrix.from_rows([])
+
+        assert len(empty) == 0
+        assert np.isnan(empty.get_vectors(["D101"])).all()
+        assert empty.combine([], [], ["protein"]) == {"protein": 0.0}
@@ -0,0 +1,63 @@
+"""PreparedImage 전처리 단위 테스트"""
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.yolo_service import YOLOService
+from app.utils.prepared_image import PreparedImage
+
+
+def _encode(size, image_format="JPEG", mode="RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color=(200, 100, 50, 255)[:len(mode)]).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestPreparedImage:
+    """PreparedImage 테스트"""
+
+    def test_small_jpeg_is_sent_as_is(self):
+        """작은 JPEG는 재인코딩하지 않고 원본을 그대로 사용"""
+        raw = _encode((40, 30))
+        prepared = PreparedImage.from_bytes(raw, max_size=1536, jpeg_quality=90, max_passthrough_kb=1000)
+
+        assert prepared.jpeg_bytes is raw
+        assert base64.b64decode(prepared.base64) == raw
+        assert prepared.array.shape == (30, 40, 3)
+
+    def test_png_is_converted_and_downscaled(self):
+        """JPEG가 아니거나 큰 이미지는 최대 변 길이로 축소 후 JPEG 인코딩"""
+        raw = _encode((400, 200), image_format="PNG", mode="RGBA")
+        prepared = PreparedImage.from_bytes(raw, max_size=100, jpeg_quality=80, max_passthrough_kb=1000)
+
+        assert prepared.array.shape == (200, 400, 3)  # YOLO 입력은 원본 해상도 RGB
+        encoded = Image.open(io.BytesIO(prepared.jpeg_bytes))
+        assert encoded.format == "JPEG"
+        assert encoded.size == (100, 50)
+
+    def test_exif_rotation_is_applied_once(self):
+        """EXIF 회전이 있는 JPEG는 회전을 반영해 YOLO 배열과 GPT 전송 이미지를 만든다"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # 시계 방향 90도 회전해서 봐야 하는 사진
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 30), color=(200, 100, 50)).save(buffer, format="JPEG", exif=exif)
+        raw = buffer.getvalue()
+
+        prepared = PreparedImage.from_bytes(raw, max_size=1536, jpeg_quality=90, max_passthrough_kb=1000)
+
+        assert prepared.array.shape == (40, 30, 3)
+        assert prepared.jpeg_bytes is not raw
+        assert Image.open(io.BytesIO(prepared.jpeg_bytes)).size == (30, 40)
+
+    def test_invalid_bytes_raise_value_error(self):
+        with pytest.raises(ValueError):
+            PreparedImage.from_bytes(b"not an image")
+
+    def test_yolo_reuses_decoded_array(self):
+        """YOLO는 PreparedImage의 배열을 다시 디코딩하지 않고 사용"""
+        prepared = PreparedImage.from_bytes(_encode((40, 30)))
+        service = YOLOService.__new__(YOLOService)
+
+        assert service._decode_image(prepared) is prepared.array
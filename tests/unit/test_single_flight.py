@@ -0,0 +1,96 @@
+"""single-flight 요청 병합 단위 테스트"""
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """동시 동일 키 호출 병합 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """같은 키의 동시 호출은 한 번만 실행되고 결과를 나눠 받는다"""
+        flights = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"calories": 500}
+
+        results = await asyncio.gather(*(flights.do("라멘", fetch) for _ in range(10)))
+
+        assert calls == 1
+        assert all(result == {"calories": 500} for result in results)
+        assert flights.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+        # 결과는 호출자별 복사본
+        results[1]["calories"] = 0
+        assert results[2]["calories"] == 500
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """키가 다르면 각각 실행"""
+        flights = SingleFlight("test")
+
+        async def fetch(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flights.do("a", lambda: fetch(1)),
+            flights.do("b", lambda: fetch(2)),
+        )
+
+        assert results == [1, 2]
+        assert flights.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(self):
+        """작업이 실패하면 모든 대기자가 같은 예외를 받는다"""
+        flights = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream error")
+
+        results = await asyncio.gather(
+            *(flights.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flights.executions == 1
+        assert flights.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """대기자 하나가 취소돼도 나머지는 결과를 받는다"""
+        flights = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.ensure_future(flights.do("key", fetch))
+        follower = asyncio.ensure_future(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+
+    @pytest.mark.asyncio
+    async def test_next_call_after_completion_runs_again(self):
+        """완료 후의 호출은 다시 실행된다 (캐시 아님)"""
+        flights = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("key", fetch) == 1
+        assert await flights.do("key", fetch) == 2
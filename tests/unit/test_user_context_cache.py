@@ -0,0 +1,155 @@
+"""사용자 컨텍스트 캐시 단위 테스트"""
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import user_context_cache as module
+from app.services.user_context_cache import (
+    INVALIDATION_CHANNEL,
+    CachedUserContext,
+    RedisContextStore,
+    UserContextCache,
+    get_or_build_user_context,
+    invalidate_user_context,
+)
+from app.utils.date_window import local_today
+
+
+class FakeRedis:
+    """get/set/delete/publish만 지원하는 인메모리 Redis 목"""
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def _context(user_id, context_date=None, diseases=("당뇨",)):
+    return CachedUserContext(
+        user_id=user_id,
+        diseases=list(diseases),
+        allergies=["땅콩"],
+        has_eaten_today=False,
+        last_refreshed=datetime(2025, 11, 20, 9, 0),
+        context_date=context_date or local_today(),
+    )
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def scalars(self):
+        return SimpleNamespace(all=lambda: list(self._rows))
+
+    def scalar_one_or_none(self):
+        return self._scalar
+
+
+class FakeSession:
+    """프로필 조회 → 오늘 식사 수 조회 순서로 응답"""
+
+    def __init__(self, meals_today=0):
+        self.meals_today = meals_today
+        self.executed = 0
+
+    async def execute(self, statement):
+        self.executed += 1
+        if self.executed % 2 == 1:
+            return _Result([SimpleNamespace(disease_name="고혈압", allergy_name=None)])
+        return _Result(scalar=self.meals_today)
+
+
+class TestUserContextCache:
+    """프로세스 내 LRU + 공유 저장소"""
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = UserContextCache(max_entries=2, ttl_seconds=60)
+        for user_id in (1, 2):
+            await cache.set(_context(user_id))
+        await cache.get(1)  # 1을 최근 사용으로
+        await cache.set(_context(3))
+
+        assert len(cache) == 2
+        assert await cache.get(2) is None
+        assert await cache.get(1) is not None
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self, monkeypatch):
+        cache = UserContextCache(max_entries=4, ttl_seconds=60)
+        await cache.set(_context(1))
+        now = module.time.monotonic()
+        monkeypatch.setattr(module.time, "monotonic", lambda: now + 61)
+
+        assert await cache.get(1) is None
+
+    @pytest.mark.asyncio
+    async def test_previous_day_context_is_miss(self):
+        """날짜가 바뀌면 has_eaten_today를 다시 조회하도록 미스 처리"""
+        cache = UserContextCache(max_entries=4, ttl_seconds=60)
+        await cache.set(_context(1, context_date=local_today() - timedelta(days=1)))
+
+        assert await cache.get(1) is None
+
+    @pytest.mark.asyncio
+    async def test_shared_store_across_workers(self):
+        """한 워커가 저장한 컨텍스트를 다른 워커가 DB 없이 재사용하고, 무효화는 모두에 전파"""
+        redis = FakeRedis()
+        worker_a = UserContextCache(4, 900, RedisContextStore(redis), local_ttl_seconds=60)
+        worker_b = UserContextCache(4, 900, RedisContextStore(redis), local_ttl_seconds=60)
+
+        await worker_a.set(_context(7))
+        cached = await worker_b.get(7)
+        assert cached.diseases == ["당뇨"]
+        assert cached.context_date == local_today()
+
+        await worker_a.invalidate(7)
+        assert redis.store == {}
+        assert redis.published == [(INVALIDATION_CHANNEL, "7")]
+        # worker_b는 구독 메시지를 받아 프로세스 내 사본을 지운다
+        worker_b.drop_local(7)
+        assert await worker_b.get(7) is None
+
+    def test_round_trip_serialization(self):
+        context = _context(3, context_date=date(2025, 11, 20))
+        assert CachedUserContext.from_dict(context.to_dict()) == context
+
+
+class TestUserContextHelpers:
+    """get_or_build_user_context / invalidate_user_context"""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self, monkeypatch):
+        monkeypatch.setattr(module, "_user_context_cache", UserContextCache(max_entries=4, ttl_seconds=900))
+
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self):
+        session = FakeSession(meals_today=0)
+
+        first = await get_or_build_user_context(session, 1)
+        await get_or_build_user_context(session, 1)
+        assert session.executed == 2
+        assert first.has_eaten_today is False
+
+        # 식사 저장 직후 무효화 → 다음 조회에서 최신 값
+        session.meals_today = 1
+        await invalidate_user_context(1)
+        refreshed = await get_or_build_user_context(session, 1)
+
+        assert session.executed == 4
+        assert refreshed.has_eaten_today is True
+        assert refreshed.diseases == ["고혈압"]
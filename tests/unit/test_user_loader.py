@@ -0,0 +1,105 @@
+"""요청 단위 사용자 로더 / 사용자 캐시 단위 테스트"""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import User
+from app.services import user_loader as module
+from app.services.user_loader import (
+    UserLoader,
+    UserSnapshotCache,
+    user_from_snapshot,
+    user_to_snapshot,
+)
+
+
+def _user(user_id=1, nickname="토끼", updated_at=datetime(2025, 11, 20, 9, 0)):
+    return User(
+        user_id=user_id, username="tester", email="t@example.com", password="hashed",
+        gender="F", age=30, weight=Decimal("55.50"), height=Decimal("162.00"),
+        health_goal="loss", nickname=nickname, major_conversation="요약",
+        created_at=datetime(2025, 1, 1), updated_at=updated_at,
+    )
+
+
+@pytest.fixture
+def db_calls(monkeypatch):
+    """auth_service.get_user_by_id 호출 기록"""
+    calls = []
+
+    async def fake_get_user_by_id(session, user_id):
+        calls.append(user_id)
+        return _user(user_id)
+
+    monkeypatch.setattr(module.auth_service, "get_user_by_id", fake_get_user_by_id)
+    return calls
+
+
+class TestUserSnapshot:
+    """User ↔ 스냅샷"""
+
+    def test_round_trip_excludes_secrets(self):
+        snapshot = user_to_snapshot(_user())
+
+        assert "password" not in snapshot
+        assert "major_conversation" not in snapshot
+        assert snapshot["weight"] == "55.50"
+
+        user = user_from_snapshot(snapshot)
+        assert user.weight == Decimal("55.50")
+        assert user.updated_at == datetime(2025, 11, 20, 9, 0)
+        assert user.health_goal == "loss"
+
+    @pytest.mark.asyncio
+    async def test_local_cache_keeps_newer_version(self):
+        cache = UserSnapshotCache(max_entries=4, ttl_seconds=30)
+        await cache.set(1, user_to_snapshot(_user(nickname="새이름", updated_at=datetime(2025, 11, 21))))
+        # 수정 전에 읽은 요청이 늦게 저장해도 덮어쓰지 않는다
+        await cache.set(1, user_to_snapshot(_user(nickname="옛이름", updated_at=datetime(2025, 11, 20))))
+
+        assert (await cache.get(1))["nickname"] == "새이름"
+
+
+class TestUserLoader:
+    """요청 내 메모 + 요청 간 캐시"""
+
+    @pytest.mark.asyncio
+    async def test_one_query_per_request_then_cached(self, db_calls):
+        cache = UserSnapshotCache(max_entries=4, ttl_seconds=30)
+
+        first_request = UserLoader(AsyncSession(), cache)
+        user = await first_request.get_user(1)
+        assert await first_request.get_user(1) is user
+        assert await first_request.get_health_goal(1) == "loss"
+        assert db_calls == [1]
+
+        # 다음 요청: DB 조회 없이 캐시에서 세션에 붙인다 (변경 사항 없음)
+        session = AsyncSession()
+        cached_user = await UserLoader(session, cache).get_user(1)
+        assert db_calls == [1]
+        assert cached_user in session
+        assert not session.dirty and not session.new
+        assert cached_user.nickname == "토끼"
+
+        # 프로필 수정 후 무효화 → 다시 DB
+        await cache.invalidate(1)
+        await UserLoader(AsyncSession(), cache).get_user(1)
+        assert db_calls == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_health_profile_memoized(self, monkeypatch):
+        calls = []
+
+        async def fake_context(session, user_id):
+            calls.append(user_id)
+            return SimpleNamespace(diseases=["당뇨"], allergies=["땅콩"])
+
+        monkeypatch.setattr(module, "get_or_build_user_context", fake_context)
+        loader = UserLoader(AsyncSession())
+
+        assert await loader.get_health_profile(1) == (["당뇨"], ["땅콩"])
+        assert await loader.get_health_profile(1) == (["당뇨"], ["땅콩"])
+        assert calls == [1]
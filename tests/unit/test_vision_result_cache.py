@@ -0,0 +1,103 @@
+"""이미지 분석 결과 캐시 단위 테스트"""
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from app.services.vision_result_cache import VisionResultCache, perceptual_hash
+
+
+def _jpeg(size=(64, 48), quality=90) -> bytes:
+    """좌→우 그라데이션 테스트 이미지"""
+    img = Image.new("RGB", size)
+    img.putdata([(x * 4 % 256, y * 5 % 256, 128) for y in range(size[1]) for x in range(size[0])])
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class FakeRedis:
+    """get/set/pipeline만 지원하는 인메모리 Redis 목"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    def pipeline(self):
+        redis = self
+
+        class _Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def set(self, key, value, ex=None):
+                self.ops.append((key, value))
+
+            async def execute(self):
+                redis.store.update(self.ops)
+
+        return _Pipeline()
+
+
+class TestVisionResultCache:
+    """VisionResultCache 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_set(self):
+        """같은 바이트는 캐시에서 반환"""
+        cache = VisionResultCache(max_entries=4, ttl_seconds=60)
+        image = _jpeg()
+        key = cache.make_key(image, "detection")
+
+        assert await cache.get(key) is None
+        await cache.set(key, {"analysis": {"food_name": "피자"}})
+
+        assert await cache.get(cache.make_key(image, "detection")) == {"analysis": {"food_name": "피자"}}
+        assert await cache.get(cache.make_key(image, "db_guidance")) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_ttl(self):
+        """최대 개수를 넘으면 가장 오래 안 쓴 항목부터, TTL이 지나면 만료"""
+        cache = VisionResultCache(max_entries=2, ttl_seconds=60)
+        keys = [cache.make_key(bytes([i]), "detection") for i in range(3)]
+        await cache.set(keys[0], {"n": 0})
+        await cache.set(keys[1], {"n": 1})
+        await cache.get(keys[0])
+        await cache.set(keys[2], {"n": 2})
+
+        assert await cache.get(keys[1]) is None
+        assert await cache.get(keys[0]) == {"n": 0}
+
+        expired = VisionResultCache(max_entries=2, ttl_seconds=0)
+        await expired.set(keys[0], {"n": 0})
+        assert await expired.get(keys[0]) is None
+
+    @pytest.mark.asyncio
+    async def test_perceptual_hash_matches_reencoded_image(self):
+        """재압축된 같은 사진은 dHash로 매칭"""
+        cache = VisionResultCache(max_entries=4, ttl_seconds=60, use_perceptual_hash=True)
+        original, reencoded = _jpeg(quality=95), _jpeg(quality=60)
+        assert original != reencoded
+        assert perceptual_hash(original) == perceptual_hash(reencoded)
+
+        await cache.set(cache.make_key(original, "detection"), {"n": 1})
+
+        assert await cache.get(cache.make_key(reencoded, "detection")) == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_redis_layer_shared_between_instances(self):
+        """다른 워커의 프로세스 캐시가 비어 있어도 Redis에서 조회"""
+        redis = FakeRedis()
+        writer = VisionResultCache(max_entries=4, ttl_seconds=60, redis_client=redis)
+        reader = VisionResultCache(max_entries=4, ttl_seconds=60, redis_client=redis)
+        key = writer.make_key(b"image", "detection")
+
+        await writer.set(key, {"analysis": {"food_id": "D101-001"}})
+
+        assert json.loads(next(iter(redis.store.values()))) == {"analysis": {"food_id": "D101-001"}}
+        assert await reader.get(key) == {"analysis": {"food_id": "D101-001"}}
+        assert len(reader) == 1
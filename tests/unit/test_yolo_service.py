@@ -0,0 +1,149 @@
+"""YOLO 추론 스레드 풀 단위 테스트"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.yolo_service import YOLOQueueFullError, YOLOService
+
+
+def _make_service(max_workers: int, max_queue_size: int) -> YOLOService:
+    """모델 로드 없이 스레드 풀만 초기화한 서비스"""
+    service = YOLOService.__new__(YOLOService)
+    service._init_executor(max_workers, max_queue_size)
+    return service
+
+
+class TestDetectFoodAsync:
+    """detect_food_async 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_returns_result_with_timings(self):
+        """스레드 풀에서 실행하고 대기/추론 시간을 함께 반환"""
+        service = _make_service(max_workers=1, max_queue_size=0)
+        service.detect_food = lambda image_bytes, include_annotated=False: {
+            "summary": "ok", "size": len(image_bytes)
+        }
+
+        result = await service.detect_food_async(b"abc")
+
+        assert result["summary"] == "ok"
+        assert result["size"] == 3
+        assert set(result["timings"]) == {"queue_wait_ms", "inference_ms", "batch_size"}
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        """실행 중 + 대기 중 요청이 한도에 도달하면 즉시 거절"""
+        service = _make_service(max_workers=1, max_queue_size=1)
+        release = threading.Event()
+
+        def blocking_detect(image_bytes, include_annotated=False):
+            release.wait(timeout=5)
+            return {"summary": "ok"}
+
+        service.detect_food = blocking_detect
+        running = [asyncio.ensure_future(service.detect_food_async(b"x")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(YOLOQueueFullError):
+            await service.detect_food_async(b"x")
+
+        release.set()
+        await asyncio.gather(*running)
+        # 슬롯이 반환되면 다시 받을 수 있음
+        result = await service.detect_food_async(b"x")
+        assert result["summary"] == "ok"
+
+
+class TestMicroBatching:
+    """마이크로 배치 스케줄러 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        """동시 요청은 한 번의 배치 호출로 묶이고 결과는 각 요청에 분배"""
+        service = YOLOService.__new__(YOLOService)
+        calls = []
+
+        def fake_batch(images):
+            calls.append(list(images))
+            return [{"summary": image.decode()} for image in images]
+
+        service.detect_food_batch = fake_batch
+        service._init_executor(1, 8, batch_max_size=4, batch_max_wait_ms=50)
+
+        results = await asyncio.gather(
+            *(service.detect_food_async(f"img{i}".encode()) for i in range(3))
+        )
+
+        assert calls == [[b"img0", b"img1", b"img2"]]
+        assert [r["summary"] for r in results] == ["img0", "img1", "img2"]
+        assert all(r["timings"]["batch_size"] == 3 for r in results)
+        assert service._pending == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_splits_at_max_size_and_propagates_errors(self):
+        """max_batch_size를 넘으면 나눠서 실행하고 항목별 예외는 해당 요청에만 전달"""
+        service = YOLOService.__new__(YOLOService)
+        calls = []
+
+        def fake_batch(images):
+            calls.append(len(images))
+            return [RuntimeError("bad") if image == b"bad" else {"summary": "ok"} for image in images]
+
+        service.detect_food_batch = fake_batch
+        service._init_executor(1, 8, batch_max_size=2, batch_max_wait_ms=50)
+
+        results = await asyncio.gather(
+            service.detect_food_async(b"a"),
+            service.detect_food_async(b"bad"),
+            service.detect_food_async(b"c"),
+            return_exceptions=True,
+        )
+
+        assert calls == [2, 1]
+        assert results[0]["summary"] == "ok"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2]["summary"] == "ok"
+
+
+class FakeResult:
+    """ultralytics Results 목 (pizza 박스 1개)"""
+
+    def __init__(self):
+        box = SimpleNamespace(
+            cls=[0],
+            conf=[0.9],
+            xyxy=[SimpleNamespace(tolist=lambda: [0.0, 0.0, 1.0, 1.0])],
+        )
+        self.boxes = [box]
+        self.names = {0: "pizza"}
+        self.plot_calls = 0
+
+    def plot(self):
+        self.plot_calls += 1
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+
+class TestAnnotatedImage:
+    """바운딩 박스 이미지 지연 생성 테스트"""
+
+    def test_not_rendered_by_default(self):
+        result = FakeResult()
+        service = YOLOService.__new__(YOLOService)
+
+        built = service._build_result(result)
+
+        assert built["image_with_boxes"] is None
+        assert built["summary"] == "pizza 1개 감지됨"
+        assert result.plot_calls == 0
+
+    def test_rendered_on_request(self):
+        result = FakeResult()
+        service = YOLOService.__new__(YOLOService)
+
+        built = service._build_result(result, include_annotated=True)
+
+        assert built["image_with_boxes"][:2] == b"\xff\xd8"  # JPEG SOI
+        assert result.plot_calls == 1